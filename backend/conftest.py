@@ -0,0 +1,186 @@
+"""
+Shared pytest setup: src/ and notebooks/ go on sys.path for every test module
+(pytest already puts backend/ there, as it has no __init__.py).
+
+`fit_model_path` writes a small dense XGBoost fit pipeline (TF-IDF with and
+without row normalisation, plus the text statistics) trained on `fit_pairs`,
+laid out exactly as AdvancedFitClassifier builds its input rows.
+
+`fake_gemini` replaces Gemini in llm_utils with a local fake: one test key, no
+configure call, and fresh health / single-flight / JSON-stats state, with the
+response cache off. No API key or network is needed. The fixture returns the
+fake, so each test module sets only the behavior it needs (response text,
+stream chunks, delay, quota errors, ...) and reads back what Gemini was sent.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../notebooks')))
+
+QUOTA_ERROR = "429 Resource has been exhausted (e.g. check quota)."
+
+
+@pytest.fixture
+def fit_pairs():
+    import pandas as pd
+    return pd.DataFrame({
+        "resume_text": ["Python developer. Django and SQL!", "Retail cashier; customer service.",
+                        "Data analyst with SQL, Tableau, Python.", "Chef at an Italian restaurant.",
+                        "Backend Engineer: Go, Kubernetes, SQL.", "Sales associate. Cold calling."] * 2,
+        "job_description_text": ["Backend engineer: Python, SQL.", "Backend engineer: Python, SQL.",
+                                 "Analyst role. SQL dashboards!", "Analyst role. SQL dashboards!",
+                                 "Platform team: Kubernetes.", "Platform team: Kubernetes."] * 2,
+        "label": ["Good Fit", "No Fit", "Potential Fit", "No Fit", "Good Fit", "No Fit"] * 2,
+    })
+
+
+@pytest.fixture
+def fit_model_path(fit_pairs, tmp_path):
+    import joblib
+    import numpy as np
+    import pandas as pd
+    import xgboost as xgb
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import LabelEncoder
+    from fit_classifier import STAT_NAMES, TEXT_COLUMNS, AdvancedFitClassifier, preprocess_text
+
+    vectorizers = {"resume_text": TfidfVectorizer(norm=None), "job_description_text": TfidfVectorizer()}
+    for col, vectorizer in vectorizers.items():
+        vectorizer.fit(fit_pairs[col].map(preprocess_text))
+    columns = [f"{col}_{stat}" for col in TEXT_COLUMNS for stat in STAT_NAMES]
+    columns += [f"{col}_tfidf_{i}" for col, v in vectorizers.items() for i in range(len(v.vocabulary_))]
+
+    # The serving feature layout, so training sees exactly what predict_advanced builds
+    layout = AdvancedFitClassifier.__new__(AdvancedFitClassifier)
+    layout.vectorizers, layout.feature_columns = vectorizers, columns
+    layout._build_feature_layout()
+    rows = [layout._create_feature_row(r, j) for r, j in zip(fit_pairs["resume_text"], fit_pairs["job_description_text"])]
+
+    le = LabelEncoder().fit(fit_pairs["label"])
+    model = xgb.XGBClassifier(n_estimators=5, max_depth=2)
+    model.fit(pd.DataFrame(np.vstack(rows), columns=columns), le.transform(fit_pairs["label"]))
+    path = tmp_path / "ml_pipeline_xgboost_20250101_000000.pkl"
+    joblib.dump({
+        "model": model, "vectorizers": vectorizers, "label_encoder": le, "feature_columns": columns,
+        "target_names": le.classes_.tolist(), "performance_metrics": {"accuracy": 1.0, "auc_score": 1.0},
+    }, path)
+    return path
+
+
+class FakeGemini:
+    """
+    Stand-in for genai.GenerativeModel, shared by every model name.
+
+    Behavior (set by tests):
+        text          response text, or a callable(prompt) -> text
+        responses     texts returned first, one per call, before `text` is used
+        chunks        texts yielded one by one by stream=True calls
+        delay         seconds each call takes
+        quota_errors  the next N calls raise a 429
+        fail          every call raises a 500
+        fail_after    a stream breaks off after this many chunks
+    Recorded: prompts (one per call), models, sent (stream chunks delivered), in_flight / peak.
+    """
+
+    def __init__(self, monkeypatch):
+        self._monkeypatch = monkeypatch
+        self.text = '{"ok": true}'
+        self.responses = []
+        self.chunks = []
+        self.delay = 0
+        self.quota_errors = 0
+        self.fail = False
+        self.fail_after = None
+        self.prompts = []
+        self.models = []
+        self.sent = []
+        self.in_flight = self.peak = 0
+
+    @property
+    def calls(self):
+        return len(self.prompts)
+
+    def use_cache(self, **kwargs):
+        """Turn the response cache on for this test (in memory unless path= is given); returns it"""
+        import llm_utils
+        from llm_cache import LLMCache
+        cache = LLMCache(**{"path": None, "enabled": True, **kwargs})
+        self._monkeypatch.setattr(llm_utils, 'llm_cache', cache)
+        return cache
+
+    def model(self, name):
+        return FakeModel(self, name)
+
+    def _start(self, name, prompt):
+        self.prompts.append(prompt)
+        self.models.append(name)
+        if self.quota_errors:
+            self.quota_errors -= 1
+            raise RuntimeError(QUOTA_ERROR)
+        if self.fail:
+            raise RuntimeError("500 Internal error")
+
+    def _text(self, prompt):
+        if self.responses:
+            return self.responses.pop(0)
+        return self.text(prompt) if callable(self.text) else self.text
+
+    def _stream(self):
+        for i, text in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise RuntimeError("stream reset")
+            self.sent.append(text)
+            yield type("Chunk", (), {"text": text})()
+
+
+class FakeModel:
+    def __init__(self, fake, name):
+        self.fake = fake
+        self.name = name
+
+    def generate_content(self, prompt, generation_config=None):
+        time.sleep(self.fake.delay)
+        self.fake._start(self.name, prompt)
+        return type("Response", (), {"text": self.fake._text(prompt)})()
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        fake = self.fake
+        fake.in_flight += 1
+        fake.peak = max(fake.peak, fake.in_flight)
+        try:
+            await asyncio.sleep(fake.delay)
+            fake._start(self.name, prompt)
+        finally:
+            fake.in_flight -= 1
+        if stream:
+            async def chunks():
+                for chunk in fake._stream():
+                    yield chunk
+            return chunks()
+        return type("Response", (), {"text": fake._text(prompt)})()
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    import llm_json
+    import llm_utils
+    from llm_cache import LLMCache
+    from llm_health import LLMHealth
+    from llm_singleflight import SingleFlight
+
+    fake = FakeGemini(monkeypatch)
+    stats = llm_json.JSONStats()
+    monkeypatch.setattr(llm_utils, 'llm_cache', LLMCache(path=None, enabled=False))
+    monkeypatch.setattr(llm_utils, 'llm_health', LLMHealth())
+    monkeypatch.setattr(llm_utils, 'llm_flights', SingleFlight())
+    monkeypatch.setattr(llm_json, 'json_stats', stats)
+    monkeypatch.setattr(llm_utils, 'json_stats', stats)
+    monkeypatch.setattr(llm_utils, 'API_KEYS', ['test-key'])
+    monkeypatch.setattr(llm_utils, 'configure_genai', lambda key: None)
+    monkeypatch.setattr(llm_utils.genai, 'GenerativeModel', fake.model)
+    return fake
@@ -1,7 +1,10 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
+from contextlib import asynccontextmanager
 import sys
 import os
 import shutil
@@ -18,14 +21,32 @@ from fpdf import FPDF
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from llm_utils import generate_company_prep_plan, generate_report_card_analysis
+from inference_runtime import configure_runtime
+INFERENCE_RUNTIME = configure_runtime()
+from llm_cache import LLM_CACHE_SHORT_TTL
+from llm_utils import (
+    generate_company_prep_plan_async, generate_report_card_analysis_async,
+    stream_company_prep_plan, stream_report_card_analysis,
+)
 from activity_logger import log_activity, get_user_activity
+import chat_classifier
+from batch_inference import BatchRequest, run_batch_async
+from inference_adapter import latency_stats
+from model_registry import registry as models
+from inference_service import (
+    Student, JobRoleInput, SalaryInput, DomainFitInput, ModelUnavailable, inference_client, prediction_cache,
+)
 
 from skills import extract_skills
 from fit_classifier import predict_fit
 from learning_resources import get_learning_resources
-from llm_enhancer import enhance_resume_section
-from project_ideas import generate_project_ideas
+from llm_enhancer import enhance_resume_section_async, stream_enhance_resume_section
+from prompt_compactor import compact
+from llm_schemas import (
+    ApplicationEmail, ChatJobsReply, CodingProblem, EducationEntries, ExperienceEntries, InterviewQuestion,
+    InterviewReport, MultipleChoiceQuestion, QuestionList, ResumeAnalysis, ResumeDetails, ResumeRoleAnalysis,
+)
+from project_ideas import generate_project_ideas_async
 from ner_skill_extractor import extract_skills_ner, extract_name_ner
 from resume_generator import generate_questions, generate_resume_html
 from parsing import extract_text_from_pdf, extract_text_from_docx, extract_text_from_txt
@@ -52,7 +73,14 @@ except ImportError:
 except Exception as e:
     print(f"⚠️  Error loading .env: {e}")
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Without a built chat classifier, train one in memory before serving (never inside a chat request)
+    chat_classifier.ensure_trained()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -63,6 +91,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def _sse(event: str, data) -> str:
+    """One Server-Sent Event; the /stream endpoints send token/section/partial events, then done (or error)"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @app.get("/")
 async def root():
     return {"message": "SkillSync AI Backend is running!", "status": "online"}
@@ -282,7 +315,8 @@ async def analyze_files(
     resume: Optional[UploadFile] = File(None),
 
     jd: UploadFile = File(...),
-    email: Optional[str] = Form(None) # Added for tracking
+    email: Optional[str] = Form(None), # Added for tracking
+    explain: bool = Form(False) # Include top contributing features in the prediction
 ):
 
     resume_path = None
@@ -339,7 +373,8 @@ async def analyze_files(
             job_description=jd_text,
             match_score=match_score,
             num_matched=len(matched_skills),
-            num_missing=len(missing_skills)
+            num_missing=len(missing_skills),
+            explain=explain
         )
         
         # Learning Resources
@@ -390,15 +425,31 @@ async def analyze_files(
 @app.post("/api/enhance-resume")
 async def api_enhance_resume(request: EnhanceResumeRequest):
     try:
-        enhanced = enhance_resume_section(request.resume_text, request.jd_text, request.missing_skills)
+        enhanced = await enhance_resume_section_async(request.resume_text, request.jd_text, request.missing_skills)
         return {"enhanced_content": enhanced}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/enhance-resume/stream")
+async def api_enhance_resume_stream(request: EnhanceResumeRequest):
+    """SSE version: suggestions as "token" events, then "done" with the full enhanced_content"""
+    async def events():
+        chunks = []
+        try:
+            async for chunk in stream_enhance_resume_section(request.resume_text, request.jd_text, request.missing_skills):
+                chunks.append(chunk)
+                yield _sse("token", {"text": chunk})
+            yield _sse("done", {"enhanced_content": "".join(chunks)})
+        except Exception as e:
+            print(f"Error streaming resume enhancement: {e}")
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @app.post("/api/project-ideas")
 async def api_project_ideas(request: ProjectIdeasRequest):
     try:
-        ideas = generate_project_ideas(request.resume_text, request.resume_skills)
+        ideas = await generate_project_ideas_async(request.resume_text, request.resume_skills)
         return {"project_ideas": ideas}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -435,11 +486,11 @@ class GenerateRoleBasedResumeRequest(BaseModel):
 @app.post("/api/resume/questions")
 async def api_resume_questions(request: GenerateQuestionsRequest):
     try:
-        from llm_utils import get_ai_json
+        from llm_utils import get_ai_json_async
         
         prompt = f"""
         Generate 5 technical interview questions based on this Job Description.
-        Job Description: "{request.jd_text[:1000]}..."
+        Job Description: "{compact(request.jd_text, "resume_questions_jd")}"
         
         Output JSON format:
         [
@@ -447,7 +498,7 @@ async def api_resume_questions(request: GenerateQuestionsRequest):
             ...
         ]
         """
-        questions_data = get_ai_json(prompt)
+        questions_data = await get_ai_json_async(prompt, schema=QuestionList)
         if questions_data and isinstance(questions_data, list):
             # Extract only the question text if it's a list of objects
             if len(questions_data) > 0 and isinstance(questions_data[0], dict):
@@ -471,8 +522,8 @@ async def api_resume_questions(request: GenerateQuestionsRequest):
 @app.post("/api/enhance-resume")
 async def api_enhance_resume(request: EnhanceResumeRequest):
     try:
-        from llm_enhancer import enhance_resume_section
-        result = enhance_resume_section(request.resume_text, request.jd_text, request.missing_skills)
+        from llm_enhancer import enhance_resume_section_async
+        result = await enhance_resume_section_async(request.resume_text, request.jd_text, request.missing_skills)
         return result
     except Exception as e:
         print(f"Error enhancing resume: {e}")
@@ -483,8 +534,8 @@ async def api_enhance_resume(request: EnhanceResumeRequest):
 @app.post("/api/project-ideas")
 async def api_project_ideas(request: ProjectIdeasRequest):
     try:
-        from project_ideas import generate_project_ideas
-        result = generate_project_ideas(request.resume_text, request.resume_skills)
+        from project_ideas import generate_project_ideas_async
+        result = await generate_project_ideas_async(request.resume_text, request.resume_skills)
         return result
     except Exception as e:
          print(f"Error generating project ideas: {e}")
@@ -503,7 +554,7 @@ async def api_resume_generate(request: GenerateResumeRequest):
 @app.post("/api/resume/role-questions")
 async def api_role_questions(request: GenerateRoleQuestionsRequest):
     try:
-        from llm_utils import get_ai_json
+        from llm_utils import get_ai_json_async
         
         prompt = f"""
         Generate 5-7 role-specific questions for a {request.target_role} resume.
@@ -521,7 +572,7 @@ async def api_role_questions(request: GenerateRoleQuestionsRequest):
             ...
         ]
         """
-        questions_data = get_ai_json(prompt)
+        questions_data = await get_ai_json_async(prompt, schema=QuestionList)
         if questions_data and isinstance(questions_data, list):
             return {"questions": questions_data}
         else:
@@ -538,159 +589,223 @@ async def api_role_questions(request: GenerateRoleQuestionsRequest):
         print(f"Error generating role questions: {e}")
         return {"questions": [f"Tell us about your experience as a {request.target_role}."]}
 
+def _role_based_prompts(request: GenerateRoleBasedResumeRequest):
+    """Prompts for the professional summary (text), experience and education (JSON)"""
+    answers_text = '. '.join(request.answers.values()) if request.answers else ''
+    
+    summary_prompt = f"""
+    Create a compelling professional summary for a {request.target_role} position.
+    
+    Candidate Information:
+    - Skills: {', '.join(request.skills)}
+    - Experience: {answers_text}
+    - Target Company: {request.target_company or 'General'}
+    
+    Requirements:
+    - Use action verbs (Led, Developed, Implemented, etc.)
+    - Include quantifiable achievements (%, numbers, metrics)
+    - Avoid generic phrases like "hardworking" or "passionate"
+    - Keep it concise (2-3 sentences)
+    - Tailor to {request.target_role} role
+    
+    Output only the summary text.
+    """
+    
+    experience_prompt = f"""
+    Create 1-2 professional experience entries for a {request.target_role} resume.
+    
+    Information:
+    - Skills: {', '.join(request.skills)}
+    - Answers: {answers_text}
+    - Target: {request.target_role}
+    
+    Requirements:
+    - Use real-world impact statements
+    - Include metrics and achievements
+    - Avoid fake experience unless implied by answers
+    - Use action verbs
+    - Format as bullet points
+    
+    Output JSON format:
+    {{
+        "experience": [
+            {{
+                "role": "{request.target_role}",
+                "company": "Previous Company",
+                "duration": "Recent",
+                "description": "• Achievement 1\\n• Achievement 2\\n• Achievement 3"
+            }}
+        ]
+    }}
+    """
+    
+    education_prompt = f"""
+    Create relevant education entries for a {request.target_role}.
+    
+    Output JSON format:
+    {{
+        "education": [
+            {{
+                "degree": "Relevant Degree",
+                "institution": "University Name",
+                "year": "2024"
+            }}
+        ]
+    }}
+    """
+    return summary_prompt, experience_prompt, education_prompt
+
+def _role_based_resume_data(request: GenerateRoleBasedResumeRequest, professional_summary, experience_data, education_data):
+    answers_text = '. '.join(request.answers.values()) if request.answers else ''
+    return {
+        'personal_info': request.personal_info,
+        'summary': professional_summary,
+        'experience': (experience_data or {}).get('experience', [{
+            'role': request.target_role,
+            'company': 'Previous Experience',
+            'duration': 'Recent',
+            'description': answers_text
+        }]),
+        'education': (education_data or {}).get('education', [{
+            'degree': 'B.Tech/S.Degree',
+            'institution': 'University Name',
+            'year': '2024'
+        }]),
+        'skills': request.skills
+    }
+
 @app.post("/api/resume/generate-role-based")
 async def api_generate_role_based_resume(request: GenerateRoleBasedResumeRequest):
     try:
-        from llm_utils import get_ai_response
-        
-        # Generate professional summary based on answers
-        answers_text = '. '.join(request.answers.values()) if request.answers else ''
-        
-        summary_prompt = f"""
-        Create a compelling professional summary for a {request.target_role} position.
-        
-        Candidate Information:
-        - Skills: {', '.join(request.skills)}
-        - Experience: {answers_text}
-        - Target Company: {request.target_company or 'General'}
-        
-        Requirements:
-        - Use action verbs (Led, Developed, Implemented, etc.)
-        - Include quantifiable achievements (%, numbers, metrics)
-        - Avoid generic phrases like "hardworking" or "passionate"
-        - Keep it concise (2-3 sentences)
-        - Tailor to {request.target_role} role
-        
-        Output only the summary text.
-        """
-        
-        professional_summary = get_ai_response(summary_prompt, temperature=0.7)
-        
-        # Generate experience entries
-        experience_prompt = f"""
-        Create 1-2 professional experience entries for a {request.target_role} resume.
-        
-        Information:
-        - Skills: {', '.join(request.skills)}
-        - Answers: {answers_text}
-        - Target: {request.target_role}
-        
-        Requirements:
-        - Use real-world impact statements
-        - Include metrics and achievements
-        - Avoid fake experience unless implied by answers
-        - Use action verbs
-        - Format as bullet points
-        
-        Output JSON format:
-        {{
-            "experience": [
-                {{
-                    "role": "{request.target_role}",
-                    "company": "Previous Company",
-                    "duration": "Recent",
-                    "description": "• Achievement 1\\n• Achievement 2\\n• Achievement 3"
-                }}
-            ]
-        }}
-        """
-        
-        experience_data = get_ai_json(experience_prompt, temperature=0.7)
+        from llm_utils import get_ai_response_async, get_ai_json_async
         
-        # Generate education entries
-        education_prompt = f"""
-        Create relevant education entries for a {request.target_role}.
-        
-        Output JSON format:
-        {{
-            "education": [
-                {{
-                    "degree": "Relevant Degree",
-                    "institution": "University Name",
-                    "year": "2024"
-                }}
-            ]
-        }}
-        """
-        
-        education_data = get_ai_json(education_prompt, temperature=0.7)
+        summary_prompt, experience_prompt, education_prompt = _role_based_prompts(request)
+        professional_summary = await get_ai_response_async(summary_prompt, temperature=0.7, ttl=LLM_CACHE_SHORT_TTL)
+        experience_data = await get_ai_json_async(experience_prompt, temperature=0.7, ttl=LLM_CACHE_SHORT_TTL,
+                                                  schema=ExperienceEntries)
+        education_data = await get_ai_json_async(education_prompt, temperature=0.7, ttl=LLM_CACHE_SHORT_TTL,
+                                                 schema=EducationEntries)
         
         # Prepare data for resume template
-        resume_data = {
-            'personal_info': request.personal_info,
-            'summary': professional_summary,
-            'experience': experience_data.get('experience', [{
-                'role': request.target_role,
-                'company': 'Previous Experience',
-                'duration': 'Recent',
-                'description': answers_text
-            }]),
-            'education': education_data.get('education', [{
-                'degree': 'B.Tech/S.Degree',
-                'institution': 'University Name',
-                'year': '2024'
-            }]),
-            'skills': request.skills
-        }
-        
+        resume_data = _role_based_resume_data(request, professional_summary, experience_data, education_data)
         html_content = generate_resume_html(resume_data)
         return {"html_content": html_content}
         
     except Exception as e:
         print(f"Error generating role-based resume: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-# Placement Prediction Dependencies
-import joblib
-import pandas as pd
-import xgboost as xgb
-
-# --- Mock Model for Hackathon Reliability ---
-# This ensures the feature works 100% even if .pkl files are missing/corrupted
-class MockPipeline:
-    def predict_proba(self, data):
-        # Simple logic: If CGPA > 7 and 12th Marks > 75, likely placed
-        cgpa = float(data.iloc[0]['Cgpa'])
-        marks_12 = float(data.iloc[0]['12th marks'])
-        
-        if cgpa >= 7.0 and marks_12 >= 70:
-            return [[0.1, 0.85]] # High prob of placement
-        else:
-            return [[0.8, 0.2]] # Low prob
 
-# Load the pipeline (Try Real -> Fallback to Mock)
-# Load the pipeline (Try Real -> Fallback to Mock)
-try:
-    model_path = os.path.join(os.path.dirname(__file__), '../src/xgboost_pipeline.pkl')
-    pipeline = joblib.load(model_path)
-    print(f"✅ Loaded REAL XGBoost Pipeline from {model_path}")
-except Exception as e:
-    print(f"⚠️  Real Model not found at expected path: {e}")
-    print("⚠️  Using MOCK Pipeline for Demo.")
-    pipeline = MockPipeline()
+@app.post("/api/resume/generate-role-based/stream")
+async def api_generate_role_based_resume_stream(request: GenerateRoleBasedResumeRequest):
+    """
+    SSE version: the summary arrives as "token" events and experience/education
+    as "section" events while the three generations run side by side, then
+    "done" carries the rendered html_content.
+    """
+    from llm_utils import stream_ai_response, stream_ai_json
+    summary_prompt, experience_prompt, education_prompt = _role_based_prompts(request)
 
-# Load Label Encoder
-try:
-    le_path = os.path.join(os.path.dirname(__file__), '../src/label_encoder.pkl')
-    le = joblib.load(le_path)
-    print(f"✅ Loaded Label Encoder from {le_path}")
-except:
-    le = None
-
-class Student(BaseModel):
-    Gender: str
-    board_10: str
-    marks_10: float
-    board_12: str
-    marks_12: float
-    Stream: str
-    Cgpa: float
-    Internships: str
-    Training: str
-    Backlog_5th: str
-    Innovative_Project: str
-    Communication_level: int
-    Technical_Course: str
-    email: Optional[str] = None # Added for tracking
+    async def events():
+        queue = asyncio.Queue()
+
+        async def pump(name, stream):
+            try:
+                async for item in stream:
+                    await queue.put((name, item))
+            finally:
+                await queue.put((name, None))
+
+        producers = [
+            asyncio.create_task(pump("summary", stream_ai_response(summary_prompt, temperature=0.7, ttl=LLM_CACHE_SHORT_TTL))),
+            asyncio.create_task(pump("json", stream_ai_json(experience_prompt, temperature=0.7, ttl=LLM_CACHE_SHORT_TTL,
+                                                             schema=ExperienceEntries))),
+            asyncio.create_task(pump("json", stream_ai_json(education_prompt, temperature=0.7, ttl=LLM_CACHE_SHORT_TTL,
+                                                             schema=EducationEntries))),
+        ]
+        summary, sections, running = [], {}, len(producers)
+        try:
+            while running:
+                name, item = await queue.get()
+                if item is None:
+                    running -= 1
+                elif name == "summary":
+                    summary.append(item)
+                    yield _sse("token", {"section": "summary", "text": item})
+                else:
+                    key, value = item
+                    sections[key] = value
+                    yield _sse("section", {"name": key, "value": value})
+            resume_data = _role_based_resume_data(request, "".join(summary), sections, sections)
+            yield _sse("done", {"html_content": generate_resume_html(resume_data)})
+        except Exception as e:
+            print(f"Error streaming role-based resume: {e}")
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            for task in producers:
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+# Placement Prediction (models and encoding live in src/inference_service.py)
+def _placement_recommendations(student: Student, is_placed: bool) -> dict:
+    # --- Premium Recommendations ---
+    if is_placed:
+        # Recommend Companies based on CGPA/Skills
+        if student.Cgpa > 8.5:
+            return {
+                "type": "companies",
+                "list": ["Google", "Microsoft", "Amazon", "Goldman Sachs"],
+                "avg_package": "12-18 LPA",
+                "role": "Software Development Engineer (SDE-1)"
+            }
+        elif student.Cgpa > 7.5:
+            return {
+                "type": "companies",
+                "list": ["TCS Digital", "Accenture", "Wipro Turbo", "Infosys Power"],
+                "avg_package": "6-9 LPA",
+                "role": "System Engineer / Analyst"
+            }
+        return {
+            "type": "companies",
+            "list": ["Capgemini", "Cognizant", "HCL", "Tech Mahindra"],
+            "avg_package": "3.5-5 LPA",
+            "role": "Associate Software Engineer"
+        }
+
+    # Explain WHY and suggest resources
+    reasons = []
+    if student.Cgpa < 6.0: reasons.append("Academic Score (CGPA) needs improvement.")
+    if student.Communication_level < 3: reasons.append("Communication Skills are low.")
+    if student.Internships == "No": reasons.append("Lack of Internship experience.")
+
+    return {
+        "type": "improvement",
+        "reasons": reasons if reasons else ["Needs more holistic profile building."],
+        "resources": [
+            {"name": "DSA Masterclass", "link": "https://leetcode.com"},
+            {"name": "System Design", "link": "https://github.com/donnemartin/system-design-primer"},
+            {"name": "Communication Skills", "link": "https://www.toastmasters.org/"}
+        ]
+    }
+
+async def _score_placements(students: List[Student]):
+    """Score all students with one predict_proba call (inference service)"""
+    outputs, errors = await inference_client.score_async("placement", students)
+    # Probabilities include the academic safeguard (low CGPA / 12th marks)
+    pred_prob = np.array([np.nan if out is None else out["probability"] for out in outputs], dtype=float)
+
+    results = []
+    for i, student in enumerate(students):
+        if i in errors:
+            results.append(None)
+            continue
+        is_placed = bool(pred_prob[i] > 0.5)
+        results.append({
+            "prediction": "Placed" if is_placed else "Not Placed",
+            "probability": float(pred_prob[i]),
+            "recommendations": _placement_recommendations(student, is_placed),
+        })
+    return results, errors
 
 @app.post("/api/placement/predict")
 async def predict_placement(student: Student):
@@ -702,88 +817,29 @@ async def predict_placement(student: Student):
                 "prediction": "Pending" 
             })
 
-        data = pd.DataFrame([{
-            "Gender": student.Gender,
-            "10th board": student.board_10,
-            "10th marks": student.marks_10,
-            "12th board": student.board_12,
-            "12th marks": student.marks_12,
-            "Stream": student.Stream,
-            "Cgpa": student.Cgpa,
-            "Internships(Y/N)": student.Internships,
-            "Training(Y/N)": student.Training,
-            "Backlog in 5th sem": student.Backlog_5th,
-            "Innovative Project(Y/N)": student.Innovative_Project,
-            "Communication level": student.Communication_level,
-            "Technical Course(Y/N)": student.Technical_Course
-        }])
-
-        # Predict
-        # Note: pipeline.predict_proba usually returns [[prob_0, prob_1]]
-        # We want prob_1 (probability of being placed)
-        pred_prob = pipeline.predict_proba(data)[0][1]
-        
-        # --- Hard Academic Safeguard ---
-        # If CGPA is extremely low or 0, it's virtually impossible to be placed.
-        # This overrides potential ML model bias for outliers.
-        if student.Cgpa < 5.0 or student.marks_12 < 50:
-             pred_prob = min(pred_prob, 0.1) # Force low probability
-             
-        is_placed = pred_prob > 0.5
-        
-        result = {
-            "prediction": "Placed" if is_placed else "Not Placed",
-            "probability": float(pred_prob),
-            "status": "success"
-        }
-        
-        # --- Premium Recommendations ---
-        if is_placed:
-            # Recommend Companies based on CGPA/Skills
-            if student.Cgpa > 8.5:
-                 result["recommendations"] = {
-                     "type": "companies",
-                     "list": ["Google", "Microsoft", "Amazon", "Goldman Sachs"],
-                     "avg_package": "12-18 LPA",
-                     "role": "Software Development Engineer (SDE-1)"
-                 }
-            elif student.Cgpa > 7.5:
-                result["recommendations"] = {
-                     "type": "companies",
-                     "list": ["TCS Digital", "Accenture", "Wipro Turbo", "Infosys Power"],
-                     "avg_package": "6-9 LPA",
-                     "role": "System Engineer / Analyst"
-                 }
-            else:
-                 result["recommendations"] = {
-                     "type": "companies",
-                     "list": ["Capgemini", "Cognizant", "HCL", "Tech Mahindra"],
-                     "avg_package": "3.5-5 LPA",
-                     "role": "Associate Software Engineer"
-                 }
-        else:
-             # Explain WHY and suggest resources
-             reasons = []
-             if student.Cgpa < 6.0: reasons.append("Academic Score (CGPA) needs improvement.")
-             if student.Communication_level < 3: reasons.append("Communication Skills are low.")
-             if student.Internships == "No": reasons.append("Lack of Internship experience.")
-             
-             result["recommendations"] = {
-                 "type": "improvement",
-                 "reasons": reasons if reasons else ["Needs more holistic profile building."],
-                 "resources": [
-                     {"name": "DSA Masterclass", "link": "https://leetcode.com"},
-                     {"name": "System Design", "link": "https://github.com/donnemartin/system-design-primer"},
-                     {"name": "Communication Skills", "link": "https://www.toastmasters.org/"}
-                 ]
-             }
-             
-        return result
+        results, errors = await _score_placements([student])
+        if errors:
+            raise ValueError(errors[0])
+        return {"status": "success", **results[0]}
 
     except Exception as e:
         print(f"Prediction Error: {e}")
         return {"status": "error", "message": str(e)}
 
+@app.post("/api/placement/predict/batch")
+async def predict_placement_batch(request: BatchRequest):
+    try:
+        response = await run_batch_async(Student, request.items, _score_placements)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if request.email:
+        log_activity(request.email, "placement_batch_prediction", {
+            "rows": response["count"],
+            "failed": response["failed"]
+        })
+    return response
+
 # ------------------------------------------------------------------------
 import requests
 from dotenv import load_dotenv
@@ -833,7 +889,7 @@ async def chat_query(request: ChatQueryRequest):
     print(f"DEBUG: Received chat query: {query}")
     
     # Imports
-    from llm_utils import get_ai_response, get_ai_json
+    from chat_assistant import chat_reply, match_jobs, clean_job_query, ADVICE_SUGGESTIONS, BLOCKED_SUGGESTIONS, EXPLORE_SUGGESTIONS
     import re
 
     # 0. Basic Conversational Intents
@@ -843,140 +899,48 @@ async def chat_query(request: ChatQueryRequest):
             "response": "Hello! 👋 I'm your AI Career Assistant. Ask me about specific job roles (like 'Data Scientist') to see open opportunities, or ask for career advice!",
             "roles": []
         }
-    
-    # 0.5 AI Intent Detection (Advice vs Job Search)
-    intent = "JOB_SEARCH" # Default
-    try:
-        intent_prompt = f"""
-        Analyze the user query: "{request.query}"
-        Is the user looking for a specific job/role listings (JOB_SEARCH) or asking a general career/personal advice question (ADVICE)?
-        
-        Examples:
-        - "NLP jobs" -> JOB_SEARCH
-        - "what can i do" -> ADVICE
-        - "how to start a career in AI" -> ADVICE
-        - "Data Scientist roles in Google" -> JOB_SEARCH
-        
-        Answer with ONLY 'JOB_SEARCH' or 'ADVICE'.
-        """
-        classification = get_ai_response(intent_prompt).strip().upper()
-        if "ADVICE" in classification:
-             intent = "ADVICE"
-        print(f"DEBUG: Detected Intent: {intent}")
-    except:
-        pass
 
-    # 0.6 Relevance Guard (Check if Career/Tech related & Appropriate)
-    # 0.6 Relevance Guard (Relaxed)
-    try:
-        guard_prompt = f"""
-        Is the following query potentially related to a job search, career advice, professional skills, technology, or general self-improvement? 
-        Query: '{query}'
-        
-        Rules:
-        - ALLOW: "nlp", "jobs", "what can i do", "advice", "Help", "learning", "roadmaps".
-        - BLOCK ONLY: "sax", explicit sexual content, hate speech, or complete gibberish (e.g., "asdfgh").
-        
-        Answer with ONLY 'Yes' (if allowed) or 'No' (if blocked).
-        """
-        is_relevant = get_ai_response(guard_prompt).strip().lower()
-        if "no" in is_relevant:
-            return {
-                "response": "no idea about that this is not in my memory",
-                "roles": [],
-                "suggestions": ["Data Science", "Machine Learning", "NLP"]
-            }
-    except:
-        pass 
-    if intent == "ADVICE":
-        try:
-            advice_prompt = f"""
-            User Query: "{request.query}"
-            TASK: provide a helpful, conversational, and specific career advice response.
-            - If they ask "what can i do", suggest exploring domains like Data Science, NLP, or MLOps based on current trends.
-            - Keep it encouraging and under 60 words.
-            - Do NOT return a list of jobs, just a professional response.
-            """
-            ai_advice = get_ai_response(advice_prompt)
-            return {
-                "response": ai_advice,
-                "roles": [],
-                "suggestions": ["Data Scientist", "NLP Engineer", "MLOps Analyst"]
-            }
-        except Exception as e:
-            return {
-                "response": "That's a great question! I recommend exploring emerging fields in AI like Generative AI, MLOps, or Data Engineering. What specific area are you most interested in?",
-                "suggestions": ["Data Science", "NLP", "Machine Learning"]
-            }
+    # 1. Intent, relevance guard and answer in one structured LLM call (local rules if unavailable)
+    matches = match_jobs(query, JOBS_DATA)
+    reply = await chat_reply(request.query, matches)
+    print(f"DEBUG: Detected Intent: {reply.intent}, relevant: {reply.relevant}")
 
-    # 2. Job Search Flow (Existing Logic)
-    matches = []
-    clean_query = re.sub(r"\b(jobs|roles|openings|tell|me|about|find|search|for)\b", "", query).strip()
-    
-    for category in JOBS_DATA.get("machine_learning_jobs", []):
-        domain = category.get("domain", "").lower()
-        if clean_query and (clean_query in domain or domain in clean_query):
-             matches.extend(category.get("roles", []))
-             continue
-
-        for role in category.get("roles", []):
-            title = role.get("job_title", "").lower()
-            if clean_query and (clean_query in title or title in clean_query):
-                matches.append(role)
-    
+    if not reply.relevant:
+        return {
+            "response": "no idea about that this is not in my memory",
+            "roles": [],
+            "suggestions": BLOCKED_SUGGESTIONS
+        }
+    if reply.intent == "ADVICE":
+        return {
+            "response": reply.response,
+            "roles": [],
+            "suggestions": ADVICE_SUGGESTIONS
+        }
+
+    # 2. Job Search Flow
     if matches:
-        try:
-            context = "\n".join([f"- Role: {m['job_title']} at {m.get('company', 'Tech Company')}. Skills: {', '.join(m.get('skills', []))}" for m in matches[:5]])
-            prompt = f"""
-            User Query: "{query}"
-            Matched Jobs: {context}
-            TASK: Be a helpful Career Advisor. List top 3 with Title, Company, Package. Max 50 words.
-            """
-            ai_response = get_ai_response(prompt)
-            return { "response": ai_response, "roles": matches[:4] }
-        except Exception as e:
-            return { "response": f"I found some roles related to '{clean_query}':", "roles": matches[:4] }
+        return { "response": reply.response or f"I found some roles related to '{clean_job_query(query)}':", "roles": matches[:4] }
 
-    # 3. AI Selection Fallback (For roles not in DB)
-    else:
-        try:
-            print("DEBUG: Calling Gemini for fallback job generation...")
-            prompt = f"""
-            User Query: "{query}"
-            TASK: Generate 3 realistic tech job listings for this query.
-            Output JSON format list:
-            [{{ "job_title": "...", "company": "...", "location": "...", "package": "...", "skills": ["..."], "description": "..." }}]
-            """
-            ai_roles = get_ai_json(prompt)
-            
-            if isinstance(ai_roles, dict) and ai_roles.get("error") == "quota_exceeded":
-                return {
-                    "response": "I'm currently receiving too many requests. Please try again in a few seconds! ⏳",
-                    "roles": [],
-                    "suggestions": ["Data Science", "Machine Learning", "NLP"]
-                }
-            
-            if not ai_roles or not isinstance(ai_roles, list):
-                 raise Exception("No roles generated")
+    # 3. AI Selection Fallback (For roles not in DB, generated in the same call)
+    if not reply.roles:
+        return {
+            "response": f"I couldn't find specific details for '{request.query}' right now. Would you like to explore these domains instead?",
+            "suggestions": EXPLORE_SUGGESTIONS
+        }
 
-            for role in ai_roles:
-                raw_role = role.get('job_title', 'Software Engineer')
-                raw_company = role.get('company', 'Tech Firm')
-                clean_role = re.split(r"[/,]", re.sub(r"\(.*?\)", "", raw_role))[0].strip()
-                clean_company = re.split(r"[/,]", raw_company)[0].strip()
-                query_string = f"{clean_role} {clean_company} jobs".replace(" ", "+")
-                role['apply_link'] = f"https://www.google.com/search?q={query_string}&ibp=htl;jobs"
-            
-            return {
-                "response": f"While I don't have exact matches in my local database, here are 3 trending opportunities for '{request.query}':",
-                "roles": ai_roles,
-                "suggestions": []
-            }
-        except Exception as e:
-            return {
-                "response": f"I couldn't find specific details for '{request.query}' right now. Would you like to explore these domains instead?",
-                "suggestions": ["Data Science", "Machine Learning", "NLP", "Computer Vision"]
-            }
+    ai_roles = [role.model_dump() for role in reply.roles]
+    for role in ai_roles:
+        clean_role = re.split(r"[/,]", re.sub(r"\(.*?\)", "", role['job_title']))[0].strip()
+        clean_company = re.split(r"[/,]", role['company'])[0].strip()
+        query_string = f"{clean_role} {clean_company} jobs".replace(" ", "+")
+        role['apply_link'] = f"https://www.google.com/search?q={query_string}&ibp=htl;jobs"
+
+    return {
+        "response": f"While I don't have exact matches in my local database, here are 3 trending opportunities for '{request.query}':",
+        "roles": ai_roles,
+        "suggestions": []
+    }
 
 # --- Report Card Analysis ---
 class ReportCardRequest(BaseModel):
@@ -985,13 +949,37 @@ class ReportCardRequest(BaseModel):
 @app.post("/api/report/analyze")
 async def analyze_report_card(request: ReportCardRequest):
     try:
-        from llm_utils import generate_report_card_analysis
-        analysis = generate_report_card_analysis(request.report_data)
+        from llm_utils import generate_report_card_analysis_async
+        analysis = await generate_report_card_analysis_async(request.report_data)
         return analysis
     except Exception as e:
         print(f"Report Card Analysis Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/report/analyze/stream")
+async def analyze_report_card_stream(request: ReportCardRequest, partial: bool = False):
+    """
+    SSE version: each top-level field of the report as a "section" event (with
+    ?partial=true, the whole report so far as "partial" events), then "done"
+    with the whole report
+    """
+    async def events():
+        report = {}
+        try:
+            if partial:
+                async for report in stream_report_card_analysis(request.report_data, partial=True):
+                    yield _sse("partial", report)
+            else:
+                async for key, value in stream_report_card_analysis(request.report_data):
+                    report[key] = value
+                    yield _sse("section", {"name": key, "value": value})
+            yield _sse("done", report)
+        except Exception as e:
+            print(f"Report Card Analysis Error: {e}")
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 
 @app.post("/api/chat-analyze")
 async def chat_analyze(file: UploadFile = File(...)):
@@ -1005,14 +993,14 @@ async def chat_analyze(file: UploadFile = File(...)):
 
         # 2. Gemini Analysis
         try:
-            from llm_utils import get_ai_json
+            from llm_utils import get_ai_json_async
             
             prompt = f"""
             Act as an Expert Career Coach and Recruiter. 
             Analyze the following resume text to identify the candidate's core strengths and best-fit roles.
 
             RESUME TEXT:
-            {text[:3000]}
+            {compact(text, "chat_analyze")}
 
             TASK:
             1. Identify the Top 3 Job Roles this candidate has a HIGH chance of getting hired for.
@@ -1033,7 +1021,7 @@ async def chat_analyze(file: UploadFile = File(...)):
             }}
             """
             
-            ai_data = get_ai_json(prompt)
+            ai_data = await get_ai_json_async(prompt, schema=ResumeRoleAnalysis)
             
             if isinstance(ai_data, dict) and ai_data.get("error") == "quota_exceeded":
                 return { 
@@ -1267,15 +1255,6 @@ async def verify_otp(request: VerifyOTPRequest):
 # ------------------------------------------------------------------------
 
 # --- 1. Job Role Prediction ---
-job_role_model = None
-
-try:
-    path = os.path.join(os.path.dirname(__file__), '../src/job_role_model.pkl')
-    job_role_model = joblib.load(path)
-    print("✅ Loaded Job Role Model")
-except Exception as e:
-    print(f"⚠️  Job Role Model not found: {e}")
-
 # RICH DATA FOR JOB ROLES
 JOB_ROLE_DETAILS = {
     "Data Scientist": {
@@ -1328,62 +1307,7 @@ JOB_ROLE_DETAILS = {
     }
 }
 
-class JobRoleInput(BaseModel):
-    gender: str
-    ssc_p: float
-    ssc_b: str
-    hsc_p: float
-    hsc_b: str
-    hsc_s: str
-    degree_p: float
-    degree_t: str
-    workex: str
-    etest_p: float
-    specialisation: str
-    mba_p: float
-
-@app.post("/api/predict/job-role")
-async def predict_job_role(data: JobRoleInput):
-    pred_role = "Data Scientist" # Default fallback
-    prob = 0.85
-    
-    if job_role_model:
-        try:
-            # Construct feature array
-            X = np.array([[
-                data.gender, 
-                data.ssc_p, 
-                data.ssc_b, 
-                data.hsc_p, 
-                data.hsc_b, 
-                data.hsc_s, 
-                data.degree_p, 
-                data.degree_t, 
-                data.workex, 
-                data.etest_p, 
-                data.specialisation, 
-                data.mba_p
-            ]], dtype=object)
-
-            # Use pandas if needed for mixed types handling in pipeline
-            import pandas as pd
-            df = pd.DataFrame(X, columns=['gender', 'ssc_p', 'ssc_b', 'hsc_p', 'hsc_b', 'hsc_s', 'degree_p', 'degree_t', 'workex', 'etest_p', 'specialisation', 'mba_p'])
-            
-            # Ensure numeric columns are float
-            numeric_cols = ['ssc_p', 'hsc_p', 'degree_p', 'etest_p', 'mba_p']
-            for col in numeric_cols:
-                df[col] = df[col].astype(float)
-
-            pred_role = str(job_role_model.predict(df)[0])
-            
-            try:
-                 prob = job_role_model.predict_proba(df).max()
-            except:
-                 prob = 0.85
-        except Exception as e:
-            print(f"Prediction Error: {e}")
-            # Fallback will be used
-            
+def _job_role_result(pred_role: str, prob: float) -> dict:
     # Get Details or Default
     details = JOB_ROLE_DETAILS.get(pred_role.strip(), {
         "description": f"A promising career in {pred_role}. Focusing on your strengths will lead to success.",
@@ -1400,62 +1324,57 @@ async def predict_job_role(data: JobRoleInput):
         "details": details
     }
 
-# --- 2. Salary Prediction ---
-salary_model = None
+async def _score_job_roles(rows: List[JobRoleInput]):
+    """Score all rows with one predict call (inference service)"""
+    try:
+        outputs, errors = await inference_client.score_async("job_role", rows)
+    except ModelUnavailable:
+        outputs, errors = [None] * len(rows), {}
+
+    results = []
+    for i, out in enumerate(outputs):
+        if i in errors:
+            results.append(None)
+            continue
+        # Default fallback when no model is loaded
+        pred_role, prob = ("Data Scientist", 0.85) if out is None else (out["label"], out["confidence"])
+        results.append(_job_role_result(pred_role, prob))
+    return results, errors
 
-try:
-    path = os.path.join(os.path.dirname(__file__), '../src/gradient_boosting_salary.pkl')
-    salary_model = joblib.load(path)
-    print("✅ Loaded Salary Model")
-except Exception as e:
-    print(f"⚠️  Salary Model not found: {e}")
-
-class SalaryInput(BaseModel):
-    age: float
-    gender: str
-    education: str
-    job_title: str
-    experience: float
-
-# Dummy encoders map (same as training)
-gender_map = {"Male": 1, "Female": 0}
-education_map = {"Bachelor's": 1, "Master's": 2, "PhD": 3}
-job_map_salary = {
-    "Software Engineer": 1,
-    "Data Analyst": 2,
-    "Senior Manager": 3,
-    "Sales Associate": 4,
-    "Director": 5
-}
+@app.post("/api/predict/job-role")
+async def predict_job_role(data: JobRoleInput):
+    results, errors = await _score_job_roles([data])
+    if errors:
+        print(f"Prediction Error: {errors[0]}")
+        # Fallback will be used
+        return _job_role_result("Data Scientist", 0.85)
+    return results[0]
+
+@app.post("/api/predict/job-role/batch")
+async def predict_job_role_batch(request: BatchRequest):
+    try:
+        return await run_batch_async(JobRoleInput, request.items, _score_job_roles)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
-@app.post("/api/predict/salary")
-async def predict_salary(data: SalaryInput):
-    predicted_salary = 85000.0 # Default fallback
-    
-    if salary_model:
-        try:
-            g = gender_map.get(data.gender, 0)
-            e = education_map.get(data.education, 0)
-            j = job_map_salary.get(data.job_title, 0)
-            features = np.array([[data.age, g, e, j, data.experience]])
-            predicted_salary = float(salary_model.predict(features)[0])
-        except Exception as e:
-            print(f"Salary Prediction Error: {e}")
+# --- 2. Salary Prediction ---
+DEFAULT_SALARY = 85000.0 # Default fallback
+
+# Mock Insights based on Role
+SALARY_INSIGHTS = {
+    "Software Engineer": {"growth": "+22%", "demand": "Very High", "tips": "Focus on System Design & AI skills."},
+    "Data Analyst": {"growth": "+18%", "demand": "High", "tips": "Master SQL and advanced visualization."},
+    "Senior Manager": {"growth": "+10%", "demand": "Stable", "tips": "Leadership and strategic planning are key."},
+    "Sales Associate": {"growth": "+12%", "demand": "Moderate", "tips": "Build strong client relationships."},
+    "Director": {"growth": "+8%", "demand": "Niche", "tips": "Visionary leadership drives value."}
+}
 
+def _salary_result(predicted_salary: float, job_title: str) -> dict:
     # Calculate Range & Insights
     min_salary = round(predicted_salary * 0.9, -3) # -10%
     max_salary = round(predicted_salary * 1.15, -3) # +15%
-    
-    # Mock Insights based on Role
-    insights = {
-        "Software Engineer": {"growth": "+22%", "demand": "Very High", "tips": "Focus on System Design & AI skills."},
-        "Data Analyst": {"growth": "+18%", "demand": "High", "tips": "Master SQL and advanced visualization."},
-        "Senior Manager": {"growth": "+10%", "demand": "Stable", "tips": "Leadership and strategic planning are key."},
-        "Sales Associate": {"growth": "+12%", "demand": "Moderate", "tips": "Build strong client relationships."},
-        "Director": {"growth": "+8%", "demand": "Niche", "tips": "Visionary leadership drives value."}
-    }
-    
-    role_insights = insights.get(data.job_title, {"growth": "+15%", "demand": "High", "tips": "Continuous learning is essential."})
+
+    role_insights = SALARY_INSIGHTS.get(job_title, {"growth": "+15%", "demand": "High", "tips": "Continuous learning is essential."})
 
     return {
         "predicted_salary": round(predicted_salary, -3),
@@ -1466,123 +1385,196 @@ async def predict_salary(data: SalaryInput):
         "tips": role_insights["tips"]
     }
 
+async def _score_salaries(rows: List[SalaryInput]):
+    """Score all rows with one predict call (inference service)"""
+    try:
+        outputs, errors = await inference_client.score_async("salary", rows)
+    except ModelUnavailable:
+        outputs, errors = [None] * len(rows), {}
+
+    results = [
+        None if i in errors else _salary_result(DEFAULT_SALARY if out is None else out["salary"], row.job_title)
+        for i, (row, out) in enumerate(zip(rows, outputs))
+    ]
+    return results, errors
+
+@app.post("/api/predict/salary")
+async def predict_salary(data: SalaryInput):
+    results, errors = await _score_salaries([data])
+    if errors:
+        print(f"Salary Prediction Error: {errors[0]}")
+        return _salary_result(DEFAULT_SALARY, data.job_title)
+    return results[0]
+
+@app.post("/api/predict/salary/batch")
+async def predict_salary_batch(request: BatchRequest):
+    try:
+        return await run_batch_async(SalaryInput, request.items, _score_salaries)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
 # --- 3. Domain Fit Prediction ---
-domain_fit_model = None
-domain_fit_encoder = None
+# --- Rich Details for "Advanced" Output ---
+DOMAIN_DETAILS = {
+    "Data Science": {
+        "description": "You have a knack for finding patterns in chaos. Data Science involves extracting insights from messy data to drive decision-making.",
+        "roles": ["Data Scientist", "Data Analyst", "Machine Learning Engineer"],
+        "avg_salary": "₹8,00,000 - ₹18,00,000 per annum",
+        "skills_needed": ["Python", "SQL", "Statistics", "Machine Learning"],
+        "roadmap_link": "/roadmap/data-science"
+    },
+    "Web Development": {
+        "description": "You enjoy building things that people interact with. Web Development is about creating functional and beautiful digital experiences.",
+        "roles": ["Frontend Developer", "Backend Developer", "Full Stack Engineer"],
+        "avg_salary": "₹5,00,000 - ₹14,00,000 per annum",
+        "skills_needed": ["React.js", "Node.js", "HTML/CSS", "System Design"],
+        "roadmap_link": "/roadmap/web-development" 
+    },
+    "Android Development": {
+        "description": "You want to build apps that live in people's pockets. Mobile dev is fast-paced and user-centric.",
+        "roles": ["Android Developer", "iOS Developer", "Mobile Architect"],
+        "avg_salary": "₹6,00,000 - ₹15,00,000 per annum",
+        "skills_needed": ["Kotlin", "Flutter", "Java", "Mobile UI/UX"],
+        "roadmap_link": "/roadmap/android"
+    },
+    "Machine Learning": {
+        "description": "You are interested in teaching computers to learn. ML is the cutting edge of AI and automation.",
+        "roles": ["ML Engineer", "AI Researcher", "NLP Scientist"],
+        "avg_salary": "₹10,00,000 - ₹25,00,000 per annum",
+        "skills_needed": ["TensorFlow", "PyTorch", "Deep Learning", "Mathematics"],
+        "roadmap_link": "/roadmap/machine-learning"
+    }
+}
 
-try:
-    path = os.path.join(os.path.dirname(__file__), '../src/domain_fit_model.pkl')
-    domain_fit_model = joblib.load(path)
-    print("✅ Loaded Domain Fit Model")
-    
-    # Try loading encoder if it exists, otherwise use fallback
-    enc_path = os.path.join(os.path.dirname(__file__), '../src/domain_fit_encoder.pkl')
-    if os.path.exists(enc_path):
-        domain_fit_encoder = joblib.load(enc_path)
-        print("✅ Loaded Domain Fit Encoder")
-    else:
-        print("⚠️ Domain Fit Encoder not found. Using raw prediction.")
-except Exception as e:
-    print(f"⚠️  Domain Fit Model/Encoder error: {e}")
+def _domain_fit_result(domain: str, prob: float) -> dict:
+    # Default fallback
+    details = DOMAIN_DETAILS.get(domain, {
+        "description": f"You show strong potential for {domain}. It's a growing field with many opportunities.",
+        "roles": [f"{domain} Specialist", "Consultant"],
+        "avg_salary": "Competitive",
+        "skills_needed": ["Core Technical Skills", "Problem Solving"],
+        "roadmap_link": "/roadmap"
+    })
 
+    return {
+        "domain_fit": domain,
+        "confidence": float(prob),
+        "details": details
+    }
+
+async def _score_domain_fits(rows: List[DomainFitInput]):
+    """Score all rows with one predict call (inference service); raises ModelUnavailable"""
+    outputs, errors = await inference_client.score_async("domain_fit", rows)
+    results = [None if out is None else _domain_fit_result(out["label"], out["confidence"]) for out in outputs]
+    return results, errors
 
-class DomainFitInput(BaseModel):
-    Age: float
-    Gender: str
-    Vocational_Program: str
-    Academic_Performance: float
-    Certifications_Count: int
-    Internship_Experience: int
-    Skill_1: int
-    Skill_2: int
-    Skill_3: int
+MOCK_DOMAIN_FIT = {
+    "domain_fit": "Web Development (Mock)",
+    "confidence": 0.92
+}
 
 @app.post("/api/predict/domain-fit")
 async def predict_domain_fit(data: DomainFitInput):
-    if not domain_fit_model:
-        return {
-            "domain_fit": "Web Development (Mock)",
-            "confidence": 0.92
-        }
     try:
-        # Assuming model expects specific encoding for categorical if not handled
-        # Using numeric features as per the previous file
-        # Model expects 7 features in this specific order:
-        # ['Age', 'Skill_1', 'Skill_2', 'Skill_3', 'Academic_Performance', 'Certifications_Count', 'Internship_Experience']
-        features = np.array([[
-            data.Age,
-            data.Skill_1, 
-            data.Skill_2, 
-            data.Skill_3,
-            data.Academic_Performance,
-            data.Certifications_Count,
-            data.Internship_Experience
-        ]])
-        
-        pred = domain_fit_model.predict(features)[0]
-        
-        domain = str(pred)
-        if domain_fit_encoder:
-            try:
-                domain = domain_fit_encoder.inverse_transform([pred])[0]
-            except:
-                pass # keep raw if transform fails
-
-        # If proba is available
-        try:
-            prob = domain_fit_model.predict_proba(features)[0][pred]
-        except:
-             prob = 0.8
-        
-        # --- Rich Details for "Advanced" Output ---
-        domain_details = {
-            "Data Science": {
-                "description": "You have a knack for finding patterns in chaos. Data Science involves extracting insights from messy data to drive decision-making.",
-                "roles": ["Data Scientist", "Data Analyst", "Machine Learning Engineer"],
-                "avg_salary": "₹8,00,000 - ₹18,00,000 per annum",
-                "skills_needed": ["Python", "SQL", "Statistics", "Machine Learning"],
-                "roadmap_link": "/roadmap/data-science"
-            },
-            "Web Development": {
-                "description": "You enjoy building things that people interact with. Web Development is about creating functional and beautiful digital experiences.",
-                "roles": ["Frontend Developer", "Backend Developer", "Full Stack Engineer"],
-                "avg_salary": "₹5,00,000 - ₹14,00,000 per annum",
-                "skills_needed": ["React.js", "Node.js", "HTML/CSS", "System Design"],
-                "roadmap_link": "/roadmap/web-development" 
-            },
-            "Android Development": {
-                "description": "You want to build apps that live in people's pockets. Mobile dev is fast-paced and user-centric.",
-                "roles": ["Android Developer", "iOS Developer", "Mobile Architect"],
-                "avg_salary": "₹6,00,000 - ₹15,00,000 per annum",
-                "skills_needed": ["Kotlin", "Flutter", "Java", "Mobile UI/UX"],
-                "roadmap_link": "/roadmap/android"
-            },
-            "Machine Learning": {
-                "description": "You are interested in teaching computers to learn. ML is the cutting edge of AI and automation.",
-                "roles": ["ML Engineer", "AI Researcher", "NLP Scientist"],
-                "avg_salary": "₹10,00,000 - ₹25,00,000 per annum",
-                "skills_needed": ["TensorFlow", "PyTorch", "Deep Learning", "Mathematics"],
-                "roadmap_link": "/roadmap/machine-learning"
-            }
-        }
-        
-        # Default fallback
-        details = domain_details.get(domain, {
-            "description": f"You show strong potential for {domain}. It's a growing field with many opportunities.",
-            "roles": [f"{domain} Specialist", "Consultant"],
-            "avg_salary": "Competitive",
-            "skills_needed": ["Core Technical Skills", "Problem Solving"],
-            "roadmap_link": "/roadmap"
-        })
-
-        return {
-            "domain_fit": domain,
-            "confidence": float(prob),
-            "details": details
-        }
+        results, errors = await _score_domain_fits([data])
+        if errors:
+            raise ValueError(errors[0])
+        return results[0]
+    except ModelUnavailable:
+        return MOCK_DOMAIN_FIT
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+async def _score_domain_fits_or_mock(rows: List[DomainFitInput]):
+    try:
+        return await _score_domain_fits(rows)
+    except ModelUnavailable:
+        return [dict(MOCK_DOMAIN_FIT) for _ in rows], {}
+
+@app.post("/api/predict/domain-fit/batch")
+async def predict_domain_fit_batch(request: BatchRequest):
+    try:
+        return await run_batch_async(DomainFitInput, request.items, _score_domain_fits_or_mock)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+@app.get("/api/admin/inference-latency")
+async def inference_latency():
+    """Per-model call counts and latency percentiles (recorded by InferenceAdapter)"""
+    return {"models": latency_stats()}
+
+@app.get("/api/admin/prediction-cache")
+async def prediction_cache_stats():
+    """Hit rate of the memoized tabular predictions (in-process inference only)"""
+    return prediction_cache.stats()
+
+@app.post("/api/admin/prediction-cache/clear")
+def clear_prediction_cache():
+    """Clears the memo where predictions run: this process and its pool, or the inference service"""
+    return inference_client.clear_cache()
+
+@app.get("/api/admin/llm-cache")
+async def llm_cache_stats():
+    """Hits, misses and Gemini latency saved by the LLM response cache"""
+    from llm_cache import llm_cache
+    return llm_cache.stats()
+
+@app.post("/api/admin/llm-cache/clear")
+async def clear_llm_cache(expired_only: bool = False):
+    from llm_cache import llm_cache
+    return {"cleared": llm_cache.clear(expired_only=expired_only)}
+
+@app.get("/api/admin/llm-singleflight")
+async def llm_singleflight_stats():
+    """Gemini calls made vs. identical concurrent requests that shared one of them"""
+    from llm_singleflight import llm_flights
+    return llm_flights.stats()
+
+@app.get("/api/admin/prompt-compaction")
+async def prompt_compaction_stats():
+    """Document tokens received vs. sent to Gemini per prompt slot (see prompt_compactor)"""
+    from prompt_compactor import compaction_stats
+    return compaction_stats.stats()
+
+@app.get("/api/admin/llm-json")
+async def llm_json_stats():
+    """Per schema: Gemini JSON responses parsed clean / repaired / rejected, retry and fallback rates"""
+    from llm_json import json_stats
+    return json_stats.stats()
+
+@app.get("/api/admin/llm-health")
+async def llm_health_stats():
+    """Circuit breaker state and recent latency per Gemini API key / model pair"""
+    from llm_health import llm_health
+    return llm_health.stats()
+
+@app.post("/api/admin/llm-health/reset")
+async def reset_llm_health():
+    """Close every breaker (e.g. after adding quota to a key)"""
+    from llm_health import llm_health
+    llm_health.reset()
+    return {"reset": True}
+
+@app.get("/api/admin/models")
+async def list_models():
+    """
+    Registered models: available versions, load time and approximate memory of
+    loaded ones (memory_tracked is false unless measured: serve.py preload or MODEL_TRACK_MEMORY=1)
+    """
+    return {"models": models.stats()}
+
+@app.post("/api/admin/models/{name}/unload")
+async def unload_model(name: str, version: Optional[str] = None):
+    """Drop a loaded model from memory; it is loaded again on its next use"""
+    if name not in models.names():
+        raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+    return {"model": name, "unloaded": models.unload(name, version)}
+
+@app.post("/api/admin/models/unload-idle")
+async def unload_idle_models(idle_seconds: float = 600):
+    """Unload every model that hasn't been used for idle_seconds"""
+    return {"unloaded": models.unload_idle(idle_seconds)}
+
 # --- 4. Skill Match Recommender ---
 class SkillMatchInput(BaseModel):
     skills: List[str]
@@ -1675,14 +1667,14 @@ async def analyze_resume(data: ResumeAnalysisInput):
             "skills_count": len(data.skills)
         })
 
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     
     prompt = f"""
     Act as an Expert Recruiter and Career Coach. 
     Analyze the candidate's skills against the Job Description and the culture/expectations of the Target Company.
 
     Candidate Skills: {", ".join(data.skills)}
-    Job Description: "{data.jd_text[:1500]}..."
+    Job Description: "{compact(data.jd_text, "analyze_resume_jd", query=" ".join(data.skills))}"
     Target Company: "{data.target_company}"
 
     Provide a professional analysis including:
@@ -1702,7 +1694,7 @@ async def analyze_resume(data: ResumeAnalysisInput):
     """
     
     try:
-        analysis = get_ai_json(prompt)
+        analysis = await get_ai_json_async(prompt, schema=ResumeAnalysis)
         if not analysis:
             raise Exception("Gemini returned empty JSON")
             
@@ -1754,7 +1746,7 @@ from question_bank import get_aptitude_question, get_technical_question, get_cod
 
 @app.post("/api/prep/aptitude")
 async def get_aptitude(request: PrepRequest):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     prompt = f"""
     Generate 1 short but highly challenging logic or mathematical aptitude question for a {request.role} role. 
     Keep it strictly plain text (NO LaTeX, NO dollar signs, NO complex symbols).
@@ -1762,12 +1754,13 @@ async def get_aptitude(request: PrepRequest):
     Output JSON format: {{'q': 'Concise question text', 'options': ['A', 'B', 'C', 'D'], 'correct': 'The correct option text'}}
     """
 
-    return get_ai_json(prompt, fallback_data=get_aptitude_question())
+    return await get_ai_json_async(prompt, fallback_data=get_aptitude_question(), cache=False,
+                                  schema=MultipleChoiceQuestion)
 
 
 @app.post("/api/prep/technical")
 async def get_technical(request: PrepRequest):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     prompt = f"""
     Generate 1 core technical interview question for a {request.role} role. 
     Keep it strictly plain text (NO LaTeX). 
@@ -1775,12 +1768,13 @@ async def get_technical(request: PrepRequest):
     Output JSON format: {{'q': 'The question text', 'options': ['A', 'B', 'C', 'D'], 'correct': 'The correct option value'}}
     """
 
-    return get_ai_json(prompt, fallback_data=get_technical_question())
+    return await get_ai_json_async(prompt, fallback_data=get_technical_question(), cache=False,
+                                  schema=MultipleChoiceQuestion)
 
 
 @app.post("/api/prep/coding")
 async def get_coding(request: PrepRequest):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     prompt = f"""
     Generate 1 concise coding/algorithmic problem statement for a {request.role} interview. 
     Focus on logic or DSA. 
@@ -1788,19 +1782,21 @@ async def get_coding(request: PrepRequest):
     Output JSON format: {{'problem': 'The problem text'}}
     """
 
-    return get_ai_json(prompt, fallback_data={"problem": get_coding_problem()})
+    return await get_ai_json_async(prompt, fallback_data={"problem": get_coding_problem()}, cache=False,
+                                  schema=CodingProblem)
 
 
 @app.post("/api/prep/interview")
 async def get_interview(request: PrepRequest):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     prompt = f"Generate 1 high-quality behavioral or situational interview question for a {request.role} role. Strictly plain text. Output JSON: {{'question': 'The question text'}}"
-    return get_ai_json(prompt, fallback_data={"question": get_interview_question()})
+    return await get_ai_json_async(prompt, fallback_data={"question": get_interview_question()}, cache=False,
+                                  schema=InterviewQuestion)
 
 
 @app.post("/api/prep/interview/analyze")
 async def analyze_interview(request: PrepRequest):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     import random
     
     # Format history for the prompt
@@ -1841,7 +1837,7 @@ async def analyze_interview(request: PrepRequest):
     """
     
     try:
-        report = get_ai_json(prompt)
+        report = await get_ai_json_async(prompt, schema=InterviewReport)
         if report: return report
     except:
         pass
@@ -1916,7 +1912,7 @@ async def get_company_prep_plan(request: CompanyPrepRequest):
         })
 
     try:
-        plan = generate_company_prep_plan(request.company_type, request.company_name, request.time_period)
+        plan = await generate_company_prep_plan_async(request.company_type, request.company_name, request.time_period)
         
         if not plan or "error" in plan:
             return {"success": False, "message": plan.get("error", "Failed to generate plan due to AI quota or error.") if plan else "Empty response from AI."}
@@ -1926,14 +1922,48 @@ async def get_company_prep_plan(request: CompanyPrepRequest):
         print(f"Error generating company prep plan: {e}")
         return {"success": False, "message": "Failed to generate plan"}
 
+@app.post("/api/company-prep/stream")
+async def get_company_prep_plan_stream(request: CompanyPrepRequest, partial: bool = False):
+    """
+    SSE version: "insights" and then "weeks" as "section" events (with
+    ?partial=true, the plan so far as "partial" events), then "done" with the
+    whole plan
+    """
+    if request.email:
+        log_activity(request.email, "company_prep_plan", {
+            "company": request.company_name, 
+            "type": request.company_type
+        })
+
+    async def events():
+        plan = {}
+        try:
+            if partial:
+                async for plan in stream_company_prep_plan(request.company_type, request.company_name,
+                                                           request.time_period, partial=True):
+                    yield _sse("partial", plan)
+            else:
+                async for key, value in stream_company_prep_plan(request.company_type, request.company_name, request.time_period):
+                    plan[key] = value
+                    yield _sse("section", {"name": key, "value": value})
+            if plan:
+                yield _sse("done", {"success": True, "plan": plan})
+            else:
+                yield _sse("done", {"success": False, "message": "Failed to generate plan due to AI quota or error."})
+        except Exception as e:
+            print(f"Error streaming company prep plan: {e}")
+            yield _sse("error", {"detail": "Failed to generate plan"})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 class ReportCardRequest(BaseModel):
     report_data: dict
 
 @app.post("/api/report/analyze")
 async def analyze_report_card(request: ReportCardRequest):
-    from llm_utils import generate_report_card_analysis
+    from llm_utils import generate_report_card_analysis_async
     try:
-        report = generate_report_card_analysis(request.report_data)
+        report = await generate_report_card_analysis_async(request.report_data)
         return report
     except Exception as e:
         print(f"Error generating report card: {e}")
@@ -1957,7 +1987,7 @@ async def generate_report_from_history(request: HistoryReportRequest):
         }
         
         # 3. Generate Analysis
-        report = generate_report_card_analysis(summary_data)
+        report = await generate_report_card_analysis_async(summary_data)
         return report
     except Exception as e:
         print(f"Error generating history report: {e}")
@@ -2042,7 +2072,7 @@ class ChatQueryRequest(BaseModel):
 
 @app.post("/api/chat-query")
 async def chat_query(request: ChatQueryRequest):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     
     prompt = f"""
     Act as a friendly Career Assistant. User asks: "{request.query}"
@@ -2060,7 +2090,7 @@ async def chat_query(request: ChatQueryRequest):
     """
     
     # Use optimized get_ai_json (uses gemini-1.5-flash-8b for speed)
-    return get_ai_json(prompt, temperature=0.7, fallback_data={
+    return await get_ai_json_async(prompt, temperature=0.7, ttl=LLM_CACHE_SHORT_TTL, schema=ChatJobsReply, fallback_data={
         "response": "I'm having trouble connecting to the AI right now, but I can still help you browse jobs!",
         "roles": [],
         "suggestions": ["Search Jobs", "Upload Resume"]
@@ -2068,7 +2098,7 @@ async def chat_query(request: ChatQueryRequest):
 
 @app.post("/api/chat-analyze")
 async def chat_analyze(file: UploadFile = File(...)):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     from parsing import extract_text_from_pdf, extract_text_from_docx, extract_text_from_txt
 
     try:
@@ -2096,7 +2126,7 @@ async def chat_analyze(file: UploadFile = File(...)):
 
         prompt = f"""
         Analyze this resume content contextually:
-        {content[:3000]}... (truncated)
+        {compact(content, "chat_analyze")}
         
         1. Summarize the profile briefly.
         2. Suggest 3 best-fit job roles based on skills.
@@ -2111,7 +2141,8 @@ async def chat_analyze(file: UploadFile = File(...)):
         }}
         """
         
-        return get_ai_json(prompt, temperature=0.5, fallback_data={
+        return await get_ai_json_async(prompt, temperature=0.5, ttl=LLM_CACHE_SHORT_TTL, schema=ChatJobsReply,
+                                       fallback_data={
             "response": "I see your resume! It looks great. You might be a good fit for Software Engineering roles.",
             "roles": [{ "job_title": "Software Engineer", "description": "Based on general keywords", "apply_link": "#" }],
             "suggestions": []
@@ -2132,7 +2163,7 @@ class HREmailGenerateRequest(BaseModel):
 
 @app.post("/api/hr-emailer/analyze")
 async def hr_emailer_analyze(file: UploadFile = File(...)):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     from parsing import extract_text_from_pdf, extract_text_from_docx, extract_text_from_txt
 
     try:
@@ -2158,7 +2189,7 @@ async def hr_emailer_analyze(file: UploadFile = File(...)):
 
         prompt = f"""
         Extract professional details from this resume:
-        {content[:4000]}
+        {compact(content, "hr_emailer")}
         
         Output JSON format:
         {{
@@ -2169,7 +2200,7 @@ async def hr_emailer_analyze(file: UploadFile = File(...)):
         }}
         """
         
-        return get_ai_json(prompt, temperature=0.3, fallback_data={
+        return await get_ai_json_async(prompt, temperature=0.3, schema=ResumeDetails, fallback_data={
             "name": "Priyabrata Biswal",
             "skills": ["Python", "Machine Learning", "React"],
             "summary": "Aspiring engineer with focus on AI and Web Dev.",
@@ -2182,7 +2213,7 @@ async def hr_emailer_analyze(file: UploadFile = File(...)):
 
 @app.post("/api/hr-emailer/generate-email")
 async def hr_emailer_generate_email(request: HREmailGenerateRequest):
-    from llm_utils import get_ai_json
+    from llm_utils import get_ai_json_async
     
     prompt = f"""
     Generate a professional and concise job application email.
@@ -2200,11 +2231,17 @@ async def hr_emailer_generate_email(request: HREmailGenerateRequest):
     }}
     """
     
-    return get_ai_json(prompt, temperature=0.7, fallback_data={
+    # Each application email should read differently, so it is never cached
+    return await get_ai_json_async(prompt, temperature=0.7, cache=False, schema=ApplicationEmail, fallback_data={
         "email_content": f"Hello {request.hr_name},\n\nI’m {request.user_name}, a fresher with skills in {', '.join(request.skills)} and strong projects. I’m applying for the {request.target_role} role at {request.company}.\n\nMy resume is attached.\nThank you for your time.\n\nRegards,\n{request.user_name.split(' ')[0]}"
     })
 
 
+# Load every registered model at import instead of on first use (single-process uvicorn).
+# backend/serve.py doesn't use this: it calls models.preload(track_memory=True) in its master before forking.
+if os.getenv("PRELOAD_MODELS", "0") == "1":
+    print(f"📦 Preloaded models: {', '.join(models.preload()) or 'none'}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
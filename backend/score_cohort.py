@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Cohort scoring CLI
+Scores a CSV or Parquet export (e.g. 5,000 students) with one of the tabular
+models without going through the HTTP API. The input is read in chunks; every
+row is validated with the model's Pydantic schema; valid rows are scored in a
+process pool with one vectorized call per chunk; and results are appended to
+the output in input order as chunks finish. At most 2 chunks per process are
+held at a time (running, or finished and waiting for an earlier chunk to be
+written), so memory stays bounded by the chunk size, not the input size.
+
+Column names must match the schema fields (see /infer or src/inference_service.py).
+
+Usage:
+    python backend/score_cohort.py students.csv --model placement --output placement_results.csv
+    python backend/score_cohort.py cohort.parquet --model salary --output salaries.parquet --id-column roll_no
+"""
+import argparse
+import math
+import os
+import resource
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+# Each pool process scores in-process; the CLI owns the pool
+os.environ["INFERENCE_PROCESSES"] = "0"
+from batch_inference import validate_rows
+from inference_runtime import configure_runtime, default_threads
+import inference_service
+from inference_service import MODELS, ModelUnavailable
+
+
+def read_chunks(path, chunk_size):
+    """DataFrames of at most chunk_size rows"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        # Strings as read; the schema does the type coercion (and reports bad values per row)
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+def count_rows(path):
+    """Row count for progress (Parquet metadata, or newlines for CSV)"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    with open(path, 'rb') as f:
+        lines = sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+    return max(0, lines - 1)
+
+
+def score_chunk(model, start, records, id_column):
+    """Validate and score one chunk (runs in a pool process). Returns a result DataFrame"""
+    ids = [record.pop(id_column, None) for record in records] if id_column else None
+    indices, rows, errors = validate_rows(MODELS[model][0], records)
+
+    outputs = {}
+    if rows:
+        scored, row_errors = inference_service.score(model, rows)
+        for position, index in enumerate(indices):
+            if position in row_errors:
+                errors[index] = row_errors[position]
+            else:
+                outputs[index] = scored[position]
+
+    results = []
+    for i in range(len(records)):
+        result = {"row": start + i}
+        if ids is not None:
+            result[id_column] = ids[i]
+        if i in outputs:
+            result.update(status="success", message="", **outputs[i])
+            if model == "placement":
+                result["prediction"] = "Placed" if outputs[i]["probability"] > 0.5 else "Not Placed"
+        else:
+            result.update(status="error", message=errors[i])
+        results.append(result)
+    return pd.DataFrame(results)
+
+
+class ResultWriter:
+    """Appends result chunks to a CSV or Parquet file (schema fixed by the first chunk)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self.columns = None
+        self._writer = None
+
+    def write(self, frame):
+        if self.columns is None:
+            self.columns = list(frame.columns)
+        # Chunks where every row failed lack the output columns
+        frame = frame.reindex(columns=self.columns + [c for c in frame.columns if c not in self.columns])[self.columns]
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            frame.to_csv(self.path, mode='a' if self._writer else 'w', header=not self._writer, index=False)
+            self._writer = True
+
+    def close(self):
+        if self.parquet and self._writer is not None:
+            self._writer.close()
+
+
+def _init_process(threads):
+    configure_runtime(threads)
+
+
+def peak_memory_mb():
+    """Peak RSS of this process and of the finished/running pool processes (Linux reports kB)"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return own, children
+
+
+def run(args):
+    if args.model not in MODELS:
+        raise SystemExit(f"❌ Unknown model '{args.model}' (available: {', '.join(MODELS)})")
+    total = count_rows(args.input)
+    n_chunks = math.ceil(total / args.chunk_size) if total else 0
+    print(f"🚀 Scoring {total:,} rows from {args.input} with '{args.model}' "
+          f"({n_chunks} chunk(s) of {args.chunk_size}, {args.processes} process(es))")
+
+    writer = ResultWriter(args.output)
+    threads = default_threads(workers=1, pool_size=args.processes)
+    done_rows = succeeded = 0
+    start_time = time.perf_counter()
+    next_chunk, finished = 0, {}  # chunk number -> result frame (written in input order)
+
+    with ProcessPoolExecutor(args.processes, initializer=_init_process, initargs=(threads,)) as pool:
+        pending = set()
+        chunks = enumerate(read_chunks(args.input, args.chunk_size))
+        exhausted = False
+        try:
+            while pending or not exhausted:
+                # Keep the pool busy without reading the whole input ahead. Finished chunks
+                # waiting behind a slow earlier one count too, or they would pile up unbounded
+                while not exhausted and len(pending) + len(finished) < 2 * args.processes:
+                    try:
+                        number, frame = next(chunks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = pool.submit(score_chunk, args.model, number * args.chunk_size,
+                                         frame.to_dict('records'), args.id_column)
+                    future.chunk = number
+                    pending.add(future)
+
+                completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    finished[future.chunk] = future.result()
+
+                while next_chunk in finished:
+                    frame = finished.pop(next_chunk)
+                    writer.write(frame)
+                    done_rows += len(frame)
+                    succeeded += int((frame["status"] == "success").sum())
+                    next_chunk += 1
+
+                elapsed = time.perf_counter() - start_time
+                rate = done_rows / elapsed if elapsed else 0
+                eta = (total - done_rows) / rate if rate and total > done_rows else 0
+                print(f"  📊 {done_rows:,}/{total:,} rows ({done_rows / max(total, 1):.0%}) | "
+                      f"{rate:,.0f} rows/s | ETA {eta:.0f}s", flush=True)
+        except ModelUnavailable as e:
+            raise SystemExit(f"❌ {e}")
+        finally:
+            writer.close()
+
+    own, children = peak_memory_mb()
+    print(f"✅ Wrote {done_rows:,} rows to {args.output} ({succeeded:,} scored, {done_rows - succeeded:,} invalid/failed) "
+          f"in {time.perf_counter() - start_time:.1f}s")
+    print(f"💾 Peak memory: {own:.0f}MB (main), {children:.0f}MB (largest pool process)")
+    return done_rows, succeeded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="CSV or .parquet file")
+    parser.add_argument('--model', required=True, choices=list(MODELS))
+    parser.add_argument('--output', required=True, help="CSV or .parquet file (overwritten)")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--processes', type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument('--id-column', help="input column copied to the output (not passed to the model)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Preload-then-fork server
+Imports the app and loads every model (and the spaCy pipeline) once in a master
+process, freezes the GC, then forks the uvicorn workers. Workers share the
+model pages copy-on-write instead of each unpickling a private copy.
+
+gc.freeze() moves every object that exists at fork time into a permanent
+generation the collector never scans. Without it, the first collection in each
+worker writes to the GC headers of all those objects and copies their pages.
+
+    python backend/serve.py --workers 4 --port 8000
+    python backend/serve.py --workers 4 --no-preload   # fork first, load per worker (for comparison)
+
+Crashed workers are re-forked from the master, so they share the same pages.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+
+def preload(track_memory=False):
+    """
+    Import the app with every model loaded; returns the ASGI app. The master
+    is single-threaded here, so it is the one place where per-model memory
+    (registry memory_mb) can be measured without counting other threads.
+    """
+    import main
+    print(f"📦 Preloaded models: {', '.join(main.models.preload(track_memory=track_memory)) or 'none'}")
+    main.chat_classifier.ensure_trained()
+    from ner_skill_extractor import load_nlp
+    load_nlp()
+    return main.app
+
+
+def bind_socket(host, port):
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock, args):
+    """Serve on the shared listening socket until told to stop (runs in the forked child)"""
+    gc.enable()
+    if app is None:
+        app = preload()
+    config = uvicorn.Config(app, log_level=args.log_level, timeout_keep_alive=args.keep_alive)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(app, sock, args):
+    pid = os.fork()
+    if pid == 0:
+        # Child: default signal handling so uvicorn can install its own
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 0
+        try:
+            run_worker(app, sock, args)
+        except BaseException as e:
+            print(f"❌ Worker {os.getpid()} crashed: {e}")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preload-then-fork server for backend/main.py")
+    parser.add_argument('--host', default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument('--port', type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument('--workers', type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    parser.add_argument('--no-preload', action='store_true', help="load models in each worker after forking")
+    parser.add_argument('--keep-alive', type=int, default=5)
+    parser.add_argument('--log-level', default='info')
+    args = parser.parse_args()
+
+    # Thread budgets (inference_runtime) are split across the workers
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    sock = bind_socket(args.host, args.port)
+
+    app = None
+    if args.no_preload:
+        # Train a missing chat classifier once here (workers inherit it) rather than in every worker
+        import chat_classifier
+        chat_classifier.ensure_trained()
+    else:
+        # No collections while loading: nothing gets moved or touched before the freeze
+        gc.disable()
+        start = time.perf_counter()
+        app = preload(track_memory=True)
+        gc.freeze()
+        print(f"📦 Preloaded app in {time.perf_counter() - start:.1f}s, froze {gc.get_freeze_count():,} objects")
+
+    workers = {spawn(app, sock, args) for _ in range(args.workers)}
+    print(f"🚀 Master {os.getpid()} serving on {args.host}:{args.port} with {args.workers} worker(s): "
+          f"{', '.join(map(str, sorted(workers)))}")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.discard(pid)
+        if not stopping:
+            print(f"⚠️  Worker {pid} exited ({os.waitstatus_to_exitcode(status)}), restarting")
+            time.sleep(1)  # don't spin if workers die on startup
+            workers.add(spawn(app, sock, args))
+    print("👋 All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Batch endpoint checks on the main app: results come back in input order and
+match the single-row endpoints, invalid rows are reported at their index
+without failing the others, and a batch over MAX_BATCH_ROWS is refused with 413.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import batch_inference
+from main import app
+
+client = TestClient(app)
+
+STUDENT = {
+    "Gender": "Male", "board_10": "CBSE", "marks_10": 80, "board_12": "CBSE", "marks_12": 75,
+    "Stream": "Science", "Cgpa": 8, "Internships": "Yes", "Training": "Yes", "Backlog_5th": "No",
+    "Innovative_Project": "Yes", "Communication_level": 4, "Technical_Course": "Yes",
+}
+JOB_ROLE = {
+    "gender": "M", "ssc_p": 70, "ssc_b": "Central", "hsc_p": 72, "hsc_b": "Central", "hsc_s": "Science",
+    "degree_p": 68, "degree_t": "Sci&Tech", "workex": "No", "etest_p": 75, "specialisation": "Mkt&Fin", "mba_p": 62,
+}
+SALARY = {"age": 30, "gender": "Female", "education": "Master's", "job_title": "Data Analyst", "experience": 5}
+DOMAIN_FIT = {
+    "Age": 22, "Gender": "Male", "Vocational_Program": "IT", "Academic_Performance": 80,
+    "Certifications_Count": 2, "Internship_Experience": 1, "Skill_1": 3, "Skill_2": 4, "Skill_3": 5,
+}
+
+# (batch path, single path, base row, field varied across rows, values, field to break)
+ENDPOINTS = [
+    ("/api/placement/predict/batch", "/api/placement/predict", STUDENT, "Cgpa", [5.0, 7.0, 9.5], "marks_10"),
+    ("/api/predict/job-role/batch", "/api/predict/job-role", JOB_ROLE, "mba_p", [55, 65, 80], "ssc_p"),
+    ("/api/predict/salary/batch", "/api/predict/salary", SALARY, "experience", [1, 8, 20], "age"),
+    ("/api/predict/domain-fit/batch", "/api/predict/domain-fit", DOMAIN_FIT, "Skill_1", [1, 3, 5], "Age"),
+]
+
+
+def strip(result):
+    return {k: v for k, v in result.items() if k not in ("index", "status")}
+
+
+@pytest.mark.parametrize("batch_path, single_path, row, field, values, _", ENDPOINTS)
+def test_results_in_input_order(batch_path, single_path, row, field, values, _):
+    items = [dict(row, **{field: value}) for value in values]
+    response = client.post(batch_path, json={"items": items}).json()
+
+    assert (response["count"], response["succeeded"], response["failed"]) == (3, 3, 0)
+    assert [result["index"] for result in response["results"]] == [0, 1, 2]
+    for item, result in zip(items, response["results"]):
+        single = client.post(single_path, json=item).json()
+        single.pop("status", None)
+        assert strip(result) == single
+
+
+@pytest.mark.parametrize("batch_path, single_path, row, field, values, broken", ENDPOINTS)
+def test_one_bad_row_among_valid_ones(batch_path, single_path, row, field, values, broken):
+    missing = {k: v for k, v in row.items() if k != field}
+    items = [row, dict(row, **{broken: "not a number"}), missing, row]
+    response = client.post(batch_path, json={"items": items}).json()
+
+    assert (response["count"], response["succeeded"], response["failed"]) == (4, 2, 2)
+    assert [result["status"] for result in response["results"]] == ["success", "error", "error", "success"]
+    assert broken in response["results"][1]["message"]
+    assert response["results"][2]["message"] == f"{field}: Field required"
+    assert strip(response["results"][0]) == strip(response["results"][3])
+
+
+@pytest.mark.parametrize("batch_path, single_path, row, field, values, _", ENDPOINTS)
+def test_oversized_batch_is_refused(monkeypatch, batch_path, single_path, row, field, values, _):
+    monkeypatch.setattr(batch_inference, 'MAX_BATCH_ROWS', 2)
+    response = client.post(batch_path, json={"items": [row] * 3})
+
+    assert response.status_code == 413
+    assert "max 2" in response.json()["detail"]
+    assert client.post(batch_path, json={"items": [row] * 2}).json()["succeeded"] == 2
@@ -0,0 +1,93 @@
+"""
+Chatbot reply checks: messages the local classifier is sure about need no
+routing call (blocked ones no call at all), the rest get one LLM call that
+returns intent, relevance and answer together; invalid or missing LLM output
+falls back to the local rules with the same shape. A local block needs the
+keyword rules to agree, so acronyms always reach the LLM. Gemini is replaced
+by a local fake.
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+import chat_classifier
+import llm_json
+from chat_assistant import ChatReply, chat_reply, local_reply, match_jobs
+
+with open(os.path.join(os.path.dirname(__file__), '../src/jobs.json')) as f:
+    JOBS_DATA = json.load(f)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def trained_classifier():
+    chat_classifier.ensure_trained()  # the app's startup hook
+
+
+def test_single_call_returns_everything(fake_gemini):
+    fake_gemini.text = json.dumps({"intent": "JOB_SEARCH", "relevant": True, "response": "Try these.",
+                                        "roles": [{"job_title": "Quantum Engineer", "company": "IBM"}]})
+    reply = asyncio.run(chat_reply("quantum jobs", []))
+
+    assert fake_gemini.calls == 1
+    assert "3 realistic tech job listings" in fake_gemini.prompts[0]
+    assert (reply.intent, reply.relevant, reply.roles[0].job_title) == ("JOB_SEARCH", True, "Quantum Engineer")
+
+
+def test_confident_block_needs_no_llm_call(fake_gemini):
+    reply = asyncio.run(chat_reply("send nudes", []))
+    assert reply.relevant is False and fake_gemini.prompts == []
+
+
+def test_low_confidence_uses_the_combined_prompt(fake_gemini, monkeypatch):
+    monkeypatch.setattr(chat_classifier, 'CHAT_CLASSIFIER_THRESHOLD', 1.01)
+    monkeypatch.setattr(chat_classifier, 'CHAT_CLASSIFIER_BLOCK_THRESHOLD', 1.01)
+    fake_gemini.text = json.dumps({"intent": "ADVICE", "relevant": True, "response": "Learn Python."})
+    reply = asyncio.run(chat_reply("what can i do", []))
+
+    assert fake_gemini.calls == 1 and '"intent"' in fake_gemini.prompts[0]
+    assert (reply.intent, reply.response) == ("ADVICE", "Learn Python.")
+
+
+def test_matched_jobs_go_into_the_prompt(fake_gemini):
+    matches = match_jobs("nlp jobs", JOBS_DATA)
+    fake_gemini.text = json.dumps({"intent": "JOB_SEARCH", "relevant": True, "response": "Top 3: ..."})
+    asyncio.run(chat_reply("NLP jobs", matches))
+
+    assert matches and matches[0]["job_title"] in fake_gemini.prompts[0]
+
+
+def test_wrong_shape_tries_the_next_model_and_is_not_cached(fake_gemini, monkeypatch):
+    monkeypatch.setattr(chat_classifier, 'classify', lambda text: None)
+    cache = fake_gemini.use_cache()
+    fake_gemini.responses = [json.dumps({"intent": "MAYBE", "response": "?"})]
+    fake_gemini.text = json.dumps({"intent": "ADVICE", "relevant": True, "response": "Learn Python."})
+    reply = asyncio.run(chat_reply("how to start a career in AI", []))
+
+    assert reply.response == "Learn Python." and fake_gemini.calls == 2
+    assert llm_json.json_stats.stats()["ChatReply"]["invalid"] == 1
+    assert cache.stats()["memory_entries"] == 1
+
+
+def test_invalid_output_falls_back_to_local_reply(fake_gemini):
+    fake_gemini.text = json.dumps({"intent": "MAYBE", "response": "?"})
+    reply = asyncio.run(chat_reply("how to start a career in AI", []))
+    assert isinstance(reply, ChatReply) and reply.intent == "ADVICE" and reply.relevant
+
+
+@pytest.mark.parametrize("query", ["gcp", "upsc", "llm", "k8s", "html", "vlsi"])
+def test_acronyms_are_never_blocked_locally(fake_gemini, monkeypatch, query):
+    # Even a classifier sure they are BLOCKED needs the keyword rules to agree
+    monkeypatch.setattr(chat_classifier, 'classify', lambda text: ("BLOCKED", 0.99))
+    fake_gemini.text = json.dumps({"intent": "JOB_SEARCH", "relevant": True, "response": "Here you go."})
+    reply = asyncio.run(chat_reply(query, []))
+    assert reply.relevant and fake_gemini.calls == 1
+
+
+def test_local_reply_rules():
+    assert local_reply("asdfgh", []).relevant is False
+    assert local_reply("sax", []).relevant is False
+    assert local_reply("what can i do", []).intent == "ADVICE"
+    nlp = local_reply("NLP jobs", match_jobs("nlp jobs", JOBS_DATA))
+    assert (nlp.intent, nlp.relevant) == ("JOB_SEARCH", True) and "nlp" in nlp.response
@@ -0,0 +1,67 @@
+"""
+Local chat classifier checks: the dict-based scorer gives the same
+probabilities as the sklearn pipeline, the chat prompt's own examples are
+classified confidently, one-word skills and acronyms are not blocked, a
+message takes well under a millisecond, and without an artifact a classifier
+is trained in memory at startup, never inside a request.
+"""
+import time
+
+import numpy as np
+import pytest
+
+import chat_classifier
+from chat_classifier import PROMPT_EXAMPLES, ChatClassifier, is_confident, load_jobs_data, seed_examples, train
+from model_registry import ModelRegistry
+
+PIPELINE = train(seed_examples(load_jobs_data()))
+CLASSIFIER = ChatClassifier(PIPELINE)
+QUERIES = ["NLP jobs at Google", "how do i learn docker", "qwerty", "", "unseen words zebra", "ML ENGINEER ROLES!!"]
+ACRONYMS = ["gcp", "upsc", "llm", "k8s", "html", "vlsi", "sql", "css", "gate", "ux"]
+
+
+def test_scorer_matches_sklearn():
+    for query in QUERIES:
+        expected = PIPELINE.predict_proba([query])[0]
+        assert np.allclose(CLASSIFIER.predict_proba(query), expected), query
+
+
+def test_prompt_examples_are_confident():
+    for text, label in PROMPT_EXAMPLES:
+        predicted, probability = CLASSIFIER.classify(text)
+        assert predicted == label and is_confident(predicted, probability), (text, predicted, probability)
+
+
+@pytest.mark.parametrize("query", ACRONYMS + [a.upper() for a in ACRONYMS])
+def test_acronyms_are_not_blocked(query):
+    label, probability = CLASSIFIER.classify(query)
+    assert label != "BLOCKED", (query, probability)
+
+
+def test_trained_at_startup_in_memory(tmp_path, monkeypatch):
+    path = tmp_path / "chat_classifier.pkl"
+    models = ModelRegistry(artifacts={})
+    models.register("chat_intent", path, loader=chat_classifier._load_classifier)
+    monkeypatch.setattr(chat_classifier, 'registry', models)
+    monkeypatch.setattr(chat_classifier, '_seed_classifier', None)
+    trained = []
+    monkeypatch.setattr(chat_classifier, 'train', lambda examples: trained.append(1) or PIPELINE)
+
+    assert chat_classifier.classify("NLP jobs") is None  # no artifact: escalate, don't train
+    chat_classifier.ensure_trained()
+    chat_classifier.ensure_trained()
+    assert chat_classifier.classify("NLP jobs")[0] == "JOB_SEARCH"
+    assert trained == [1] and list(tmp_path.iterdir()) == []  # once, and nothing written
+
+    chat_classifier.save(PIPELINE, path)  # a built artifact takes over
+    assert [p.name for p in tmp_path.iterdir()] == ["chat_classifier.pkl"]  # no temp file left
+    models.unload("chat_intent")
+    assert chat_classifier.get_classifier() is not chat_classifier._seed_classifier
+
+
+def test_sub_millisecond():
+    started = time.perf_counter()
+    for _ in range(200):
+        for query in QUERIES:
+            CLASSIFIER.classify(query)
+    assert (time.perf_counter() - started) / (200 * len(QUERIES)) < 1e-3
@@ -0,0 +1,72 @@
+"""
+Fit model explanation checks: explain=True returns the same probabilities
+from a single contributions call, the per-feature contributions sum to the
+booster's margin, the top features map back to real vocabulary terms with
+their TF-IDF values, it costs less than twice a plain prediction, and a
+pipeline without performance metrics still loads.
+"""
+import time
+
+import joblib
+import numpy as np
+import pytest
+
+from fit_classifier import AdvancedFitClassifier, preprocess_text
+
+RESUME, JD = "Data analyst with SQL, Tableau and Python.", "Analyst role. SQL dashboards!"
+
+
+@pytest.fixture
+def classifier(fit_model_path):
+    return AdvancedFitClassifier("xgboost", model_path=str(fit_model_path))
+
+
+def test_contributions_sum_to_the_margin(classifier):
+    dmatrix = classifier._to_dmatrix(classifier._create_feature_row(RESUME, JD))
+    proba, contributions = classifier._booster_proba(dmatrix, explain=True)
+
+    margin = classifier.booster.predict(dmatrix, output_margin=True, validate_features=False)[0]
+    np.testing.assert_allclose(contributions.sum(axis=1), margin, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(proba, classifier._booster_proba(dmatrix, explain=False)[0], rtol=1e-5)
+
+
+def test_top_features_are_real_terms(classifier, fit_pairs):
+    plain = classifier.predict_advanced(RESUME, JD)
+    result = classifier.predict_advanced(RESUME, JD, explain=True)
+    assert result["prediction"] == plain["prediction"] and result["explanations"]
+    assert result["probabilities"] == pytest.approx(plain["probabilities"], rel=1e-5)
+
+    columns = {"resume": "resume_text", "job_description": "job_description_text"}
+    terms = 0
+    for resume, jd in zip(fit_pairs["resume_text"], fit_pairs["job_description_text"]):
+        texts = {"resume_text": resume, "job_description_text": jd}
+        for explanation in classifier.predict_advanced(resume, jd, explain=True, top_k=50)["explanations"]:
+            if explanation["source"] == "statistic":
+                continue
+            vectorizer = classifier.vectorizers[columns[explanation["source"]]]
+            column = vectorizer.vocabulary_[explanation["feature"]]
+            tfidf = vectorizer.transform([preprocess_text(texts[columns[explanation["source"]]])])[0, column]
+            assert explanation["value"] == pytest.approx(tfidf, rel=1e-6)
+            terms += 1
+    assert terms
+
+
+def test_explain_costs_less_than_twice_a_prediction(classifier):
+    def best_ms(explain, repeats=50):
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            classifier.predict_advanced(RESUME, JD, explain=explain)
+            times.append(time.perf_counter() - started)
+        return min(times) * 1000
+
+    best_ms(True, repeats=5)  # warm up
+    assert best_ms(True) < 2 * best_ms(False)
+
+
+def test_loads_without_performance_metrics(fit_model_path, tmp_path):
+    data = joblib.load(fit_model_path)
+    del data["performance_metrics"]
+    path = tmp_path / "no_metrics.pkl"
+    joblib.dump(data, path)
+    assert AdvancedFitClassifier("xgboost", model_path=str(path)).is_loaded
@@ -0,0 +1,58 @@
+"""
+Sparse fit model checks: a booster trained on notebooks/train_fit_sparse.py
+features (CSR, zeros = missing) loads through AdvancedFitClassifier with
+sparse_input, and the serving path builds exactly the training features for
+both hashed and TF-IDF vectorizers, so single and batch predictions match the
+booster on the training matrix.
+"""
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.preprocessing import LabelEncoder
+
+from fit_classifier import AdvancedFitClassifier
+from train_fit_sparse import feature_columns, featurize, fit_vectorizers_in_memory, make_vectorizers, prepare_batch
+
+PAIRS = pd.DataFrame({
+    "resume_text": ["Python developer. Django and SQL!", "Retail cashier; customer service.",
+                    "Data analyst with SQL, Tableau, Python.", "Chef at an Italian restaurant.",
+                    "Backend Engineer: Go, Kubernetes, SQL.", "Sales associate. Cold calling."] * 2,
+    "job_description_text": ["Backend engineer: Python, SQL.", "Backend engineer: Python, SQL.",
+                             "Analyst role. SQL dashboards!", "Analyst role. SQL dashboards!",
+                             "Platform team: Kubernetes.", "Platform team: Kubernetes."] * 2,
+    "label": ["Good Fit", "No Fit", "Potential Fit", "No Fit", "Good Fit", "No Fit"] * 2,
+})
+
+
+@pytest.fixture(params=["hashing", "tfidf"])
+def sparse_model(request, tmp_path):
+    prepared = prepare_batch(PAIRS)
+    vectorizers = make_vectorizers(request.param, 2 ** 8)
+    fit_vectorizers_in_memory(vectorizers, prepared)
+    le = LabelEncoder().fit(prepared["label"])
+    X = featurize(prepared, vectorizers)
+    booster = xgb.train({"objective": "multi:softprob", "num_class": 3, "max_depth": 3},
+                        xgb.DMatrix(X, label=le.transform(prepared["label"])), num_boost_round=5)
+
+    path = tmp_path / "ml_pipeline_xgboost_test.pkl"
+    joblib.dump({
+        "model": booster, "vectorizers": vectorizers, "label_encoder": le,
+        "feature_columns": feature_columns(vectorizers), "target_names": le.classes_.tolist(),
+        "sparse_input": True, "performance_metrics": {"accuracy": 1.0, "auc_score": 1.0},
+    }, path)
+    return AdvancedFitClassifier("xgboost", model_path=str(path)), booster.predict(xgb.DMatrix(X))
+
+
+def test_serving_features_match_training(sparse_model):
+    classifier, expected = sparse_model
+    assert classifier.is_loaded and classifier.sparse_input
+
+    batch = classifier.predict_proba_batch(PAIRS["resume_text"].tolist(), PAIRS["job_description_text"].tolist())
+    np.testing.assert_allclose(batch, expected, rtol=1e-6)
+
+    result = classifier.predict_advanced(PAIRS["resume_text"][2], PAIRS["job_description_text"][2], explain=True)
+    assert result["probabilities"] == pytest.approx(dict(zip(classifier.target_names, expected[2])), rel=1e-5)
+    assert result["prediction"] == classifier.target_names[int(expected[2].argmax())]
+    assert result["explanations"]
@@ -0,0 +1,56 @@
+"""
+Distilled fit model checks: a student trained on soft labels with
+notebooks/distill_fit_model.py loads through AdvancedFitClassifier('student'),
+predicts with the same hashed features and probabilities as the saved model,
+ignores explain (hashed buckets have no terms) and records its latency.
+"""
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from distill_fit_model import featurize, fit_on_soft_labels, make_vectorizers
+from fit_classifier import AdvancedFitClassifier
+from inference_adapter import latency_stats
+
+PAIRS = pd.DataFrame({
+    "resume_text": ["Python developer, Django and SQL", "Retail cashier, customer service",
+                    "Data analyst with SQL, Tableau, Python", "Chef at an Italian restaurant"] * 3,
+    "job_description_text": ["Backend engineer: Python, SQL", "Backend engineer: Python, SQL",
+                             "Analyst role: SQL dashboards", "Analyst role: SQL dashboards"] * 3,
+    "label": ["Good Fit", "No Fit", "Good Fit", "No Fit"] * 3,
+})
+
+
+@pytest.fixture(scope="module")
+def student_path(tmp_path_factory):
+    le = LabelEncoder().fit(PAIRS["label"])
+    y = le.transform(PAIRS["label"])
+    soft_labels = np.eye(2)[y] * 0.8 + 0.1  # teacher-like, not one-hot
+
+    vectorizers = make_vectorizers(2 ** 10)
+    student = fit_on_soft_labels(featurize(vectorizers, PAIRS), soft_labels, C=10.0)
+    path = tmp_path_factory.mktemp("models") / "ml_pipeline_student_test.pkl"
+    joblib.dump({
+        "model": student, "vectorizers": vectorizers, "label_encoder": le,
+        "target_names": le.classes_.tolist(), "model_type": "student",
+        "performance_metrics": {"accuracy": 1.0, "auc_score": 1.0},
+    }, path)
+    return path
+
+
+def test_student_predictions_match_the_saved_model(student_path):
+    classifier = AdvancedFitClassifier("student", model_path=str(student_path))
+    assert classifier.is_loaded
+
+    saved = joblib.load(student_path)
+    expected = saved["model"].predict_proba(featurize(saved["vectorizers"], PAIRS.head(2)))
+    for (_, pair), proba in zip(PAIRS.head(2).iterrows(), expected):
+        result = classifier.predict_advanced(pair["resume_text"], pair["job_description_text"], explain=True)
+        assert result["model_type"] == "distilled_ml"
+        assert result["prediction"] == saved["target_names"][int(proba.argmax())]
+        assert result["probabilities"] == pytest.approx(dict(zip(saved["target_names"], proba)))
+        assert "explanations" not in result
+
+    assert latency_stats()["fit_student"]["calls"] >= 2
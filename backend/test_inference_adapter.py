@@ -0,0 +1,62 @@
+"""
+Inference adapter checks: labels come from one predict_proba call (argmax
+over classes_, never a second predict), models without probabilities fall
+back to predict with the default confidence, and calls / rows / latency
+percentiles are recorded per model.
+"""
+import time
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.svm import SVC
+
+import inference_adapter
+from inference_adapter import InferenceAdapter, latency_stats, n_rows, timed
+
+X = np.random.RandomState(0).rand(60, 4)
+y = np.array(["Low", "Mid", "High"])[np.arange(60) % 3]
+
+
+@pytest.fixture(autouse=True)
+def fresh_latency(monkeypatch):
+    monkeypatch.setattr(inference_adapter, '_latency', {})
+
+
+class CountingForest(RandomForestClassifier):
+    def predict(self, X):
+        raise AssertionError("predict must not be called when predict_proba exists")
+
+
+def test_single_predict_proba_call():
+    model = CountingForest(n_estimators=10, random_state=0).fit(X, y)
+    labels, confidences, proba = InferenceAdapter("forest", model).predict(X[:5])
+
+    expected = RandomForestClassifier.predict(model, X[:5])
+    np.testing.assert_array_equal(labels, expected)
+    np.testing.assert_allclose(confidences, proba.max(axis=1))
+    assert InferenceAdapter("forest", model).predict_one(X[:1])[0] == expected[0]
+
+
+def test_models_without_probabilities_use_predict():
+    model = SVC(probability=False).fit(X, y)
+    adapter = InferenceAdapter("svc", model, default_confidence=0.75)
+    labels, confidences, proba = adapter.predict(X[:3])
+
+    assert not adapter.has_proba and proba is None
+    np.testing.assert_array_equal(labels, model.predict(X[:3]))
+    assert list(confidences) == [0.75] * 3
+
+
+def test_latency_stats_per_model():
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    adapter = InferenceAdapter("forest", model)
+    adapter.predict(X[:10])
+    adapter.predict_one(X[:1])
+    with timed("sleepy", rows=n_rows({"a": [1, 2, 3]})):
+        time.sleep(0.02)
+
+    stats = latency_stats()
+    assert (stats["forest"]["calls"], stats["forest"]["rows"]) == (2, 11)
+    assert stats["sleepy"]["rows"] == 3 and stats["sleepy"]["p50_ms"] >= 20
+    assert stats["sleepy"]["p50_ms"] <= stats["sleepy"]["p95_ms"] <= stats["sleepy"]["max_ms"]
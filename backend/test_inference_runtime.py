@@ -0,0 +1,61 @@
+"""
+Inference runtime checks: the per-prediction thread default splits the CPUs
+across workers and pool slots, INFERENCE_THREADS overrides it, user-set
+OMP/BLAS variables are left alone, and nthread is pinned on XGBoost models
+whether they come as a booster, an sklearn wrapper or inside a Pipeline.
+"""
+import os
+
+import numpy as np
+import pytest
+import xgboost as xgb
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+import inference_runtime
+from inference_runtime import THREAD_ENV_VARS, apply_model_threads, configure_thread_env, default_threads
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    for var in THREAD_ENV_VARS + ["INFERENCE_THREADS", "WEB_CONCURRENCY", "INFERENCE_POOL_SIZE"]:
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(inference_runtime, 'RUNTIME', {})
+    monkeypatch.setattr(inference_runtime, 'limit_native_threads', lambda threads: True)
+
+
+def test_default_threads_split_the_cpus(clean_env, monkeypatch):
+    assert default_threads(cpu_count=16) == 16
+    assert default_threads(cpu_count=16, workers=4, pool_size=2) == 2
+    assert default_threads(cpu_count=4, workers=8) == 1  # never below one thread
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    monkeypatch.setenv("INFERENCE_POOL_SIZE", "not a number")
+    assert default_threads(cpu_count=16) == 4
+
+
+def test_env_override_and_user_values_kept(clean_env, monkeypatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "3")
+    monkeypatch.setenv("INFERENCE_THREADS", "2")
+
+    assert inference_runtime.get_threads() == 2
+    assert os.environ["OMP_NUM_THREADS"] == "3"
+    assert all(os.environ[var] == "2" for var in THREAD_ENV_VARS if var != "OMP_NUM_THREADS")
+
+    configure_thread_env(5)
+    assert os.environ["MKL_NUM_THREADS"] == "2"
+
+
+def test_nthread_pinned_on_every_model_shape():
+    X, y = np.random.RandomState(0).rand(40, 3), np.arange(40) % 2
+    wrapper = xgb.XGBClassifier(n_estimators=3, max_depth=2).fit(X, y)
+    pipeline = Pipeline([("scale", StandardScaler()), ("model", xgb.XGBClassifier(n_estimators=3).fit(X, y))])
+    booster = xgb.train({"max_depth": 2}, xgb.DMatrix(X, label=y), num_boost_round=3)
+
+    for model in (wrapper, pipeline, booster):
+        assert apply_model_threads(model, 2)
+    assert wrapper.get_params()["n_jobs"] == 2
+    assert pipeline.steps[-1][1].get_params()["n_jobs"] == 2
+    assert '"nthread":"2"' in booster.save_config().replace(" ", "")
+    assert not apply_model_threads(None, 2)
+    assert not apply_model_threads(StandardScaler(), 2)
@@ -0,0 +1,146 @@
+"""
+Inference service checks: /infer single and batch requests, unknown models,
+the process pool returning the same predictions as in-process scoring, and
+the prediction memo (hits, invalidation on registry unload, clearing the pool
+processes' memos). score_async keeps
+the event loop free and InferenceClient.score_async talks to the service over
+an async HTTP client.
+"""
+import asyncio
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+import inference_service
+from inference_service import DomainFitInput, InferenceClient, app, prediction_cache
+from model_registry import registry
+
+DOMAIN_FIT = {
+    "Age": 22, "Gender": "Male", "Vocational_Program": "IT", "Academic_Performance": 80,
+    "Certifications_Count": 2, "Internship_Experience": 1, "Skill_1": 3, "Skill_2": 4, "Skill_3": 5,
+}
+STUDENT = {
+    "Gender": "Male", "board_10": "CBSE", "marks_10": 80, "board_12": "CBSE", "marks_12": 75,
+    "Stream": "Science", "Cgpa": 8, "Internships": "Yes", "Training": "Yes", "Backlog_5th": "No",
+    "Innovative_Project": "Yes", "Communication_level": 4, "Technical_Course": "Yes",
+}
+
+client = TestClient(app)
+
+
+def test_single_and_batch_agree():
+    single = client.post("/infer/domain_fit", json=DOMAIN_FIT).json()
+    batch = client.post("/infer/domain_fit", json={"items": [DOMAIN_FIT, {"Age": 30}]}).json()
+
+    assert single["model"] == "domain_fit"
+    assert (batch["succeeded"], batch["failed"]) == (1, 1)
+    assert batch["results"][0]["label"] == single["label"]
+    assert batch["results"][0]["confidence"] == single["confidence"]
+    assert batch["results"][1]["status"] == "error"
+
+
+def test_errors():
+    assert client.post("/infer/unknown", json=DOMAIN_FIT).status_code == 404
+    assert client.post("/infer/placement", json={"Cgpa": 8}).status_code == 422
+    assert 0 <= client.post("/infer/placement", json=STUDENT).json()["probability"] <= 1
+
+
+def test_process_pool_matches_in_process(monkeypatch):
+    rows = [DomainFitInput(**dict(DOMAIN_FIT, Skill_1=skill)) for skill in range(10)]
+    expected = inference_service.score("domain_fit", rows)
+
+    monkeypatch.setattr(inference_service, 'INFERENCE_PROCESSES', 2)
+    monkeypatch.setattr(inference_service, '_pool', None)
+    try:
+        assert inference_service.score("domain_fit", rows) == expected
+        assert asyncio.run(inference_service.score_async("domain_fit", rows)) == expected
+    finally:
+        inference_service.get_pool().shutdown()
+
+
+def test_clear_reaches_the_pool_processes(monkeypatch):
+    rows = [DomainFitInput(**dict(DOMAIN_FIT, Skill_3=skill)) for skill in range(4)]
+    monkeypatch.setattr(inference_service, 'INFERENCE_PROCESSES', 1)
+    monkeypatch.setattr(inference_service, '_pool', None)
+    try:
+        inference_service.score("domain_fit", rows)
+        before = prediction_cache.stats()["models"]["domain_fit"]
+        inference_service.score("domain_fit", rows)  # memoized in the pool process
+        cleared = inference_service.inference_client.clear_cache()
+        inference_service.score("domain_fit", rows)  # scored again after the clear
+        after = prediction_cache.stats()["models"]["domain_fit"]
+    finally:
+        inference_service.get_pool().shutdown()
+
+    assert cleared["pool_processes"] == 1
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (4, 4)
+
+
+def test_score_async_keeps_the_event_loop_free(monkeypatch):
+    schema, scorer = inference_service.MODELS["domain_fit"]
+    monkeypatch.setitem(inference_service.MODELS, "domain_fit", (schema, lambda rows: time.sleep(0.3) or scorer(rows)))
+    prediction_cache.invalidate()
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        outputs, errors = await inference_service.score_async("domain_fit", [DomainFitInput(**DOMAIN_FIT)])
+        ticker.cancel()
+        return outputs, errors, ticks
+
+    outputs, errors, ticks = asyncio.run(run())
+    assert errors == {} and outputs[0]["label"]
+    assert ticks >= 10  # the loop kept running while the model was busy
+
+
+def test_remote_client_async(monkeypatch):
+    # The client's httpx.AsyncClient is routed to the service app in-process
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, 'AsyncClient', lambda **kwargs: real_client(transport=httpx.ASGITransport(app=app), **kwargs))
+    remote = InferenceClient("http://inference")
+    rows = [DomainFitInput(**DOMAIN_FIT)]
+
+    outputs, errors = asyncio.run(remote.score_async("domain_fit", rows))
+    assert errors == {} and outputs == inference_service.score("domain_fit", rows)[0]
+    try:
+        asyncio.run(remote.score_async("unknown", rows))
+        assert False, "unknown model should raise KeyError"
+    except KeyError:
+        pass
+
+
+def test_memoized_rows_skip_the_model(monkeypatch):
+    prediction_cache.invalidate()
+    rows = [DomainFitInput(**dict(DOMAIN_FIT, Skill_2=skill)) for skill in range(5)]
+    first = inference_service.score("domain_fit", rows)
+    before = prediction_cache.stats()["models"]["domain_fit"]
+
+    calls = []
+    original = inference_service.MODELS["domain_fit"]
+    monkeypatch.setitem(inference_service.MODELS, "domain_fit", (original[0], lambda rows: calls.append(len(rows)) or original[1](rows)))
+
+    # 5 repeated rows + 1 new one: only the new row reaches the model
+    again = inference_service.score("domain_fit", rows + [DomainFitInput(**dict(DOMAIN_FIT, Skill_2=9))])
+    after = prediction_cache.stats()["models"]["domain_fit"]
+
+    assert again[0][:5] == first[0]
+    assert calls == [1]
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (5, 1)
+
+
+def test_registry_unload_invalidates_memo():
+    row = [DomainFitInput(**DOMAIN_FIT)]
+    inference_service.score("domain_fit", row)
+    assert prediction_cache.stats()["entries"] > 0
+
+    registry.unload("domain_fit_encoder")
+    assert not any(key[0] == "domain_fit" for key in prediction_cache._entries)
+    assert inference_service.score("domain_fit", row)[1] == {}
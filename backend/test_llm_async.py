@@ -0,0 +1,50 @@
+"""
+Async Gemini helpers: concurrent calls overlap instead of queueing behind each
+other, the semaphore caps requests in flight, and a 429 moves on to the next
+key/model pair without blocking the event loop. Gemini is replaced by a local fake.
+"""
+import asyncio
+import time
+
+import pytest
+
+import llm_utils
+
+DELAY = 0.1
+
+
+@pytest.fixture(autouse=True)
+def fake(fake_gemini):
+    fake_gemini.delay = DELAY
+    return fake_gemini
+
+
+def test_calls_overlap_up_to_the_semaphore(fake, monkeypatch):
+    async def run():
+        monkeypatch.setattr(llm_utils, '_llm_slots', asyncio.Semaphore(4))
+        return await asyncio.gather(*(llm_utils.get_ai_json_async(f"prompt {i}") for i in range(8)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert results == [{"ok": True}] * 8
+    assert fake.peak == 4
+    assert elapsed < 8 * DELAY / 2  # two waves of 4, not 8 sequential calls
+
+
+def test_quota_error_does_not_block_the_loop(fake):
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.05)
+
+    async def run():
+        fake.quota_errors = 1
+        return (await asyncio.gather(llm_utils.get_ai_response_async("hello", cache=False), ticker()))[0]
+
+    assert asyncio.run(run()) == '{"ok": true}'
+    assert [pair["state"] for pair in llm_utils.llm_health.stats()["pairs"]].count("open") == 1
+    assert len(ticks) == 5 and max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
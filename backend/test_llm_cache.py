@@ -0,0 +1,80 @@
+"""
+LLM response cache checks: repeated prompts skip Gemini (memory and sqlite
+tiers), TTL expiry, cache=False bypass, sampled prompts using the short TTL, and
+failures/fallback data never being cached. Gemini is replaced by a local fake; no API key is needed.
+"""
+import json
+import time
+
+import pytest
+
+import llm_enhancer
+import llm_utils
+import project_ideas
+from llm_cache import LLM_CACHE_SHORT_TTL, LLMCache, cache_key
+from llm_health import LLMHealth
+
+
+@pytest.fixture
+def fake(fake_gemini, monkeypatch):
+    fake_gemini.text = lambda prompt: json.dumps({"n": fake_gemini.calls})
+    monkeypatch.setattr(llm_utils, 'llm_health', LLMHealth(cooldown=0))  # failed pairs are retried at once
+    return fake_gemini
+
+
+@pytest.fixture
+def cache(fake, tmp_path):
+    return fake.use_cache(max_entries=8, path=str(tmp_path / 'llm.sqlite'), default_ttl=60)
+
+
+def test_repeated_prompt_hits_memory_then_disk(fake, cache):
+    first = llm_utils.get_ai_json("plan for Google")
+    assert llm_utils.get_ai_json("plan for Google") == first
+    llm_utils.get_ai_response("plan for Google")  # text calls have their own key
+    assert fake.calls == 2
+
+    # A new process (empty memory tier) still finds it on disk
+    restarted = LLMCache(max_entries=8, path=cache.path, default_ttl=60, enabled=True)
+    assert restarted.get(cache_key("json", "plan for Google", 0.5, llm_utils.MODELS)) == first
+
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["disk_entries"]) == (1, 2, 2)
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_key_covers_temperature_and_schema_version(fake, cache):
+    llm_utils.get_ai_json("roadmap", temperature=0.3)
+    llm_utils.get_ai_json("roadmap", temperature=0.7)
+    llm_utils.get_ai_json("roadmap", temperature=0.7, schema_version="2")
+    llm_utils.get_ai_json("roadmap", temperature=0.7, schema_version="2")
+    assert fake.calls == 3
+
+
+def test_ttl_and_bypass(fake, cache):
+    llm_utils.get_ai_response("question", ttl=0.05)
+    time.sleep(0.1)
+    llm_utils.get_ai_response("question")
+    llm_utils.get_ai_response("question", cache=False)
+    assert fake.calls == 3
+    assert cache.stats()["bypassed"] == 1
+
+
+def test_sampled_prompts_use_the_short_ttl(fake, cache, monkeypatch):
+    _, plan = llm_utils._company_prep_request("Product", "Google", "4 Weeks")
+    fake.text = lambda prompt: json.dumps(plan)
+    ttls, put = [], cache.put
+    monkeypatch.setattr(cache, 'put', lambda key, value, latency, ttl=None: (ttls.append(ttl), put(key, value, latency, ttl)))
+
+    llm_utils.generate_company_prep_plan("Product", "Google")
+    project_ideas.generate_project_ideas("Python developer", ["python"])
+    llm_enhancer.enhance_resume_section("Python developer", "Data engineer", ["spark"])
+    llm_utils.get_ai_json("extract the skills", temperature=0.3)  # deterministic: long default
+    assert ttls == [LLM_CACHE_SHORT_TTL] * 3 + [None]
+
+
+def test_failures_are_not_cached(fake, cache):
+    fake.fail = True
+    assert llm_utils.get_ai_json("report", fallback_data={"mock": True}) == {"mock": True}
+    fake.fail = False
+    assert "n" in llm_utils.get_ai_json("report", fallback_data={"mock": True})
+    assert cache.stats()["stores"] == 1
@@ -0,0 +1,58 @@
+"""
+Key/model health table checks: breakers open on failure with a doubling
+cooldown, a half-open breaker lets one trial through, the fastest healthy pair
+is tried first, and calls fall back at once when every breaker is open.
+"""
+import llm_utils
+from llm_health import LLMHealth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_doubles_and_recovers():
+    clock = Clock()
+    health = LLMHealth(cooldown=10, max_cooldown=25, clock=clock)
+
+    assert health.record_failure("k1", "m1", "429 quota") == 10
+    assert health.candidates(["k1"], ["m1", "m2"]) == [("k1", "m2")]
+
+    clock.now += 10  # cooldown over: one trial only
+    assert health.candidates(["k1"], ["m1", "m2"]) == [("k1", "m2"), ("k1", "m1")]
+    assert health.begin("k1", "m1") and not health.begin("k1", "m1")
+
+    assert health.record_failure("k1", "m1", "429 quota") == 20
+    clock.now += 20
+    assert health.record_failure("k1", "m1", "429 quota") == 25  # capped
+
+    clock.now += 25
+    assert health.begin("k1", "m1")
+    health.record_success("k1", "m1", 0.5)
+    row = health.stats()["pairs"][0]
+    assert (row["state"], row["failures"], row["consecutive_failures"], row["key"]) == ("closed", 3, 0, "...k1")
+
+
+def test_fastest_healthy_pair_first():
+    health = LLMHealth()
+    health.record_success("k1", "m1", 2.0)
+    health.record_success("k2", "m1", 0.5)
+    health.record_success("k1", "m2", 1.0)
+    # k2/m2 was never measured, so it is tried before the measured pairs
+    assert health.candidates(["k1", "k2"], ["m1", "m2"]) == [("k2", "m2"), ("k2", "m1"), ("k1", "m2"), ("k1", "m1")]
+
+
+def test_open_breakers_fall_back_without_calling(fake_gemini, monkeypatch):
+    fake_gemini.quota_errors = 100
+    monkeypatch.setattr(llm_utils, 'API_KEYS', ['key-a', 'key-b'])
+
+    assert llm_utils.get_ai_json("prompt", fallback_data={"mock": True}) == {"mock": True}
+    assert fake_gemini.calls == 2 * len(llm_utils.MODELS)  # each pair once, no retries
+
+    assert llm_utils.get_ai_response("prompt") == llm_utils.QUOTA_MESSAGE
+    assert fake_gemini.calls == 2 * len(llm_utils.MODELS)  # every breaker open: nothing called
+    assert {pair["state"] for pair in llm_utils.llm_health.stats()["pairs"]} == {"open"}
@@ -0,0 +1,115 @@
+"""
+Tolerant JSON checks: the first JSON value is found in prose / code fences and
+common defects are repaired, cut-off text is flagged as truncated, streamed
+text yields partial objects, responses that don't match the call site's schema
+or were cut off move on to the next model (counted in json_stats), and
+streamed sections that don't validate are replaced from the fallback. Gemini
+is replaced by a local fake.
+"""
+import asyncio
+import json
+
+import pytest
+
+import llm_json
+import llm_utils
+from llm_json import JSONExtractor, JSONStats, extract_json, parse_llm_json
+from llm_schemas import CompanyPrepPlan, MultipleChoiceQuestion, ResumeAnalysis
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Here is the analysis:\n{"a": [1, 2,], "b": True, "c": None}\nGood luck!', {"a": [1, 2], "b": True, "c": None}),
+    ("{'q': 'Pick one', 'options': ['A', 'B'], 'correct': 'A'}", {"q": "Pick one", "options": ["A", "B"], "correct": "A"}),
+    ('{"d": "line 1\nline 2", // note\n "e": 1e3, "f": -2.5}', {"d": "line 1\nline 2", "e": 1000.0, "f": -2.5}),
+    ('{status: Hired, score: 80}', {"status": "Hired", "score": 80}),
+    ('{"weeks": [{"day": 1}, {"day": 2, "topic": "Gra', {"weeks": [{"day": 1}, {"day": 2}]}),
+    ('Use {braces} wisely: ["x", "y"]', ["x", "y"]),
+])
+def test_extract_json_repairs_common_defects(text, expected):
+    assert extract_json(text)[0] == expected
+
+
+def test_clean_json_is_not_marked_repaired():
+    assert extract_json('{"a": "b, {c}"}') == ({"a": "b, {c}"}, False, False)
+    with pytest.raises(ValueError):
+        extract_json("Sorry, I can't help with that.")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"insights": {}, "weeks": [{"week_number": 1}, {', {"insights": {}, "weeks": [{"week_number": 1}]}),
+    ('{"insights": {}, "weeks": [{"week_number": 1}, {"topics": ["gra', {"insights": {}, "weeks": [{"week_number": 1}]}),
+    ('{"a": 1, "b": [], "c": {"d": [', {"a": 1, "b": []}),
+])
+def test_truncation_is_flagged_and_empty_open_containers_dropped(text, expected):
+    assert extract_json(text) == (expected, False, True)
+
+
+def test_partial_objects_while_streaming():
+    extractor = JSONExtractor()
+    snapshots = []
+    for chunk in ['{"summary": "Stro', 'ng fit", "skills": ["Py', 'thon", "SQL"], "sco', 're": 8', '1}']:
+        extractor.feed(chunk)
+        snapshots.append(extractor.partial())
+    assert snapshots == [
+        {"summary": "Stro"},
+        {"summary": "Strong fit", "skills": ["Py"]},
+        {"summary": "Strong fit", "skills": ["Python", "SQL"]},
+        {"summary": "Strong fit", "skills": ["Python", "SQL"], "score": 8},
+        {"summary": "Strong fit", "skills": ["Python", "SQL"], "score": 81},
+    ]
+    assert extractor.complete
+
+
+def test_schema_validation_is_counted(monkeypatch):
+    monkeypatch.setattr(llm_json, 'json_stats', JSONStats())
+    assert parse_llm_json("{'q': 'x', 'options': ['a'], 'correct': 'a'}", MultipleChoiceQuestion)["q"] == "x"
+    with pytest.raises(ValueError):
+        parse_llm_json('{"question": "x"}', MultipleChoiceQuestion)
+
+    with pytest.raises(ValueError):
+        parse_llm_json('{"q": "x", "options": ["a", "b"], "correct": "a", "explanation": "Beca', MultipleChoiceQuestion)
+
+    stats = llm_json.json_stats.stats()["MultipleChoiceQuestion"]
+    assert (stats["repaired"], stats["truncated"], stats["invalid"], stats["retry_rate"]) == (1, 1, 1, 0.6667)
+
+
+def test_wrong_shape_tries_the_next_model(fake_gemini):
+    fake_gemini.use_cache()
+    fake_gemini.responses = ['{"score": "high"}', 'Analysis:\n{"score": 80, "matched_skills": ["SQL"], "missing_skills": []}']
+    analysis = asyncio.run(llm_utils.get_ai_json_async("analyze", schema=ResumeAnalysis))
+
+    assert analysis["score"] == 80 and analysis["missing_skills"] == []
+    stats = llm_json.json_stats.stats()["ResumeAnalysis"]
+    assert (stats["invalid"], stats["repaired"], stats["fallbacks"]) == (1, 1, 0)
+
+
+def test_truncated_response_tries_the_next_model_and_is_not_cached(fake_gemini):
+    cache = fake_gemini.use_cache()
+    week = {"week_number": 1, "focus": "DSA"}
+    fake_gemini.responses = ['{"insights": {}, "weeks": [{"week_number": 1, "focus": "DSA"}, {"week_number": 2, "fo',
+                             json.dumps({"insights": {}, "weeks": [week, {"week_number": 2}]})]
+    plan = asyncio.run(llm_utils.get_ai_json_async("plan", schema=CompanyPrepPlan))
+    assert plan["weeks"] == [week, {"week_number": 2}] and fake_gemini.calls == 2
+    assert llm_json.json_stats.stats()["CompanyPrepPlan"]["truncated"] == 1
+
+    fake_gemini.text = '{"insights": {}, "weeks": [{"week_number": 1}, {'
+    fallback = {"insights": {}, "weeks": []}
+    assert asyncio.run(llm_utils.get_ai_json_async("other plan", schema=CompanyPrepPlan, fallback_data=fallback)) == fallback
+    assert cache.stats()["memory_entries"] == 1
+
+
+def test_stream_partial_snapshots_and_invalid_sections(fake_gemini):
+    fake_gemini.use_cache()
+    fake_gemini.chunks = ['{"insights": {"focus": "DSA"}, ', '"weeks": "four"}']
+    fallback = {"insights": {}, "weeks": [{"week_number": 1}]}
+
+    async def run():
+        stream = llm_utils.stream_ai_json_partial("plan", fallback_data=fallback, schema=CompanyPrepPlan)
+        return [snapshot async for snapshot in stream]
+    snapshots = asyncio.run(run())
+
+    assert snapshots[0] == {"insights": {"focus": "DSA"}}
+    assert snapshots[-1] == {"insights": {"focus": "DSA"}, "weeks": [{"week_number": 1}]}
+    assert llm_utils.llm_cache.stats()["memory_entries"] == 0
+    assert llm_json.json_stats.stats()["CompanyPrepPlan"]["invalid"] == 1
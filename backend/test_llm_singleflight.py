@@ -0,0 +1,73 @@
+"""
+Single-flight checks: concurrent identical prompts (async or from threads)
+share one Gemini call and each caller gets its own copy of the result, calls
+that bypass the cache are not coalesced, a cancelled caller doesn't cancel the
+call for the others, and a failed call still gives every caller its own
+fallback. Gemini is replaced by a local fake.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import llm_utils
+
+DELAY = 0.1
+
+
+@pytest.fixture(autouse=True)
+def fake(fake_gemini):
+    fake_gemini.text = '{"weeks": [1, 2]}'
+    fake_gemini.delay = DELAY
+    return fake_gemini
+
+
+def gather(*calls):
+    async def run():
+        return await asyncio.gather(*calls)
+    return asyncio.run(run())
+
+
+def test_concurrent_identical_prompts_share_one_call(fake):
+    results = gather(*(llm_utils.get_ai_json_async("Google prep plan") for _ in range(5)))
+
+    assert fake.calls == 1
+    assert all(result == {"weeks": [1, 2]} for result in results)
+    assert len({id(result) for result in results}) == 5
+    stats = llm_utils.llm_flights.stats()
+    assert (stats["calls"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+
+
+def test_different_or_uncached_prompts_are_not_coalesced(fake):
+    gather(llm_utils.get_ai_json_async("Google"), llm_utils.get_ai_json_async("TCS"),
+           llm_utils.get_ai_json_async("Google", temperature=0.9))
+    assert fake.calls == 3
+
+    gather(*(llm_utils.get_ai_json_async("questions", cache=False) for _ in range(3)))
+    assert fake.calls == 6
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call(fake):
+    async def run():
+        first = asyncio.ensure_future(llm_utils.get_ai_json_async("plan"))
+        second = asyncio.ensure_future(llm_utils.get_ai_json_async("plan"))
+        await asyncio.sleep(DELAY / 2)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == {"weeks": [1, 2]}
+    assert fake.calls == 1
+
+
+def test_threads_share_one_call(fake):
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: llm_utils.get_ai_response("summary"), range(4)))
+    assert fake.calls == 1 and len(set(results)) == 1
+
+
+def test_failed_call_gives_each_caller_its_fallback(fake):
+    fake.fail = True
+    results = gather(llm_utils.get_ai_json_async("plan", fallback_data={"mock": 1}),
+                     llm_utils.get_ai_json_async("plan", fallback_data={"mock": 2}))
+    assert results == [{"mock": 1}, {"mock": 2}]
+    assert fake.calls == len(llm_utils.MODELS)
@@ -0,0 +1,79 @@
+"""
+Streaming Gemini helpers: JSON sections are handed out as soon as they are
+complete (before the response ends), a 429 before the first chunk moves on to
+the next key/model pair, and a stream that breaks off is completed from the
+fallback data without being cached. Gemini is replaced by a local fake.
+"""
+import asyncio
+import json
+
+import pytest
+
+import llm_utils
+from llm_json import TopLevelSections
+
+PLAN = {"insights": {"focus": "DSA", "tips": ["a, b", "{c}"]}, "weeks": [{"week": 1}, {"week": 2}]}
+
+
+def chunked(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.fixture(autouse=True)
+def fake(fake_gemini):
+    fake_gemini.chunks = chunked("```json\n" + json.dumps(PLAN) + "\n```")
+    fake_gemini.use_cache()
+    return fake_gemini
+
+
+def collect(fake, stream):
+    async def run():
+        return [(item, len(fake.sent)) async for item in stream]
+    return asyncio.run(run())
+
+
+def test_top_level_sections_from_chunks():
+    sections = TopLevelSections()
+    found = [item for chunk in chunked('Sure! {"a": "x, {y}", "b": [1, {"c": 2}], "d": null} trailing', 3)
+             for item in sections.feed(chunk)]
+    assert found == [("a", "x, {y}"), ("b", [1, {"c": 2}]), ("d", None)]
+    assert sections.done
+
+
+def test_sections_arrive_before_the_response_ends(fake):
+    items = collect(fake, llm_utils.stream_ai_json("plan", fallback_data={"insights": {}, "weeks": []}))
+
+    assert [key for (key, _), _ in items] == ["insights", "weeks"]
+    assert dict(item for item, _ in items) == PLAN
+    assert items[0][1] < len(fake.chunks)  # "insights" was out while "weeks" was still generating
+
+
+def test_quota_error_before_output_tries_the_next_model(fake):
+    fake.quota_errors = 1
+    items = collect(fake, llm_utils.stream_ai_json("plan"))
+    assert dict(item for item, _ in items) == PLAN
+
+
+def test_completed_stream_is_cached(fake):
+    collect(fake, llm_utils.stream_ai_json("plan"))
+    fake.chunks = []
+    assert dict(item for item, _ in collect(fake, llm_utils.stream_ai_json("plan"))) == PLAN
+    assert llm_utils.get_ai_json("plan") == PLAN
+
+
+def test_broken_stream_is_completed_from_fallback(fake):
+    fake.fail_after = len(fake.chunks) - 3
+    fallback = {"insights": {}, "weeks": ["fallback"]}
+    items = dict(item for item, _ in collect(fake, llm_utils.stream_ai_json("plan", fallback_data=fallback)))
+
+    assert items == {"insights": PLAN["insights"], "weeks": ["fallback"]}
+    assert llm_utils.llm_cache.stats()["memory_entries"] == 0
+
+
+def test_text_stream_and_fallback_text(fake):
+    fake.chunks = ["Add ", "Docker ", "to skills."]
+    assert "".join(item for item, _ in collect(fake, llm_utils.stream_ai_response("tips"))) == "Add Docker to skills."
+
+    fake.quota_errors = len(llm_utils.MODELS)
+    chunks = [item for item, _ in collect(fake, llm_utils.stream_ai_response("other", fallback_text="static tips"))]
+    assert chunks == ["static tips"]
@@ -0,0 +1,109 @@
+"""
+ModelRegistry checks: lazy loading, versions, reload on file change, unload,
+memory measured only when preloading asks for it.
+"""
+import os
+import tempfile
+import time
+
+import joblib
+
+import model_registry
+from model_registry import ModelRegistry
+
+
+def bump_mtime(path):
+    """Move the mtime forward so the change is visible on coarse-grained filesystems"""
+    ns = time.time_ns() + 10**9
+    os.utime(path, ns=(ns, ns))
+
+
+def make_registry(tmp):
+    return ModelRegistry(artifacts={
+        "fixed": os.path.join(tmp, 'fixed.pkl'),
+        "family": os.path.join(tmp, 'family_*.pkl'),
+    })
+
+
+def test_loads_lazily_and_caches():
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib.dump({"v": 1}, os.path.join(tmp, 'fixed.pkl'))
+        calls = []
+        registry = make_registry(tmp)
+        registry.register("fixed", loader=lambda path: calls.append(path) or joblib.load(path))
+
+        assert registry.stats()["fixed"]["loaded"] == {}
+        assert registry.get("fixed") == {"v": 1}
+        assert registry.get("fixed") is registry.get("fixed")
+        assert len(calls) == 1
+
+        info = registry.stats()["fixed"]["loaded"]["latest"]
+        assert info["loaded"] and info["load_ms"] >= 0 and info["calls"] == 3
+
+
+def test_versions_and_latest():
+    with tempfile.TemporaryDirectory() as tmp:
+        for version in ('20250101', '20250202'):
+            joblib.dump(version, os.path.join(tmp, f'family_{version}.pkl'))
+            time.sleep(0.01)
+        registry = make_registry(tmp)
+
+        assert list(registry.versions("family")) == ['20250101', '20250202']
+        assert registry.get("family") == '20250202'
+        assert registry.get("family", '20250101') == '20250101'
+        assert registry.try_get("family", 'missing') is None
+
+
+def test_reloads_when_file_changes(monkeypatch):
+    monkeypatch.setattr(model_registry, 'RELOAD_CHECK_SECONDS', 0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fixed.pkl')
+        registry = make_registry(tmp)
+        assert registry.try_get("fixed") is None  # not there yet
+
+        joblib.dump("first", path)
+        assert registry.get("fixed") == "first"
+
+        joblib.dump("second", path)
+        bump_mtime(path)
+        assert registry.get("fixed") == "second"
+
+
+def test_unload():
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib.dump([1, 2, 3], os.path.join(tmp, 'fixed.pkl'))
+        registry = make_registry(tmp)
+        first = registry.get("fixed")
+
+        assert registry.unload("fixed")
+        assert not registry.unload("fixed")
+        assert registry.stats()["fixed"]["loaded"] == {}
+        assert registry.get("fixed") == first and registry.get("fixed") is not first
+        assert registry.unload_idle(0) == [("fixed", None)]
+
+
+def test_unload_idle_keeps_recently_used_versions():
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib.dump("v1", os.path.join(tmp, 'family_1.pkl'))
+        joblib.dump("v2", os.path.join(tmp, 'family_2.pkl'))
+        registry = make_registry(tmp)
+        registry.get("family", "1")
+        registry.get("family", "2")
+        registry.entry("family", "1").last_used -= 60
+
+        assert registry.unload_idle(30) == [("family", "1")]
+        assert list(registry.stats()["family"]["loaded"]) == ["2"]
+
+
+def test_memory_measured_only_on_request():
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib.dump(list(range(10000)), os.path.join(tmp, 'fixed.pkl'))
+        joblib.dump("v1", os.path.join(tmp, 'family_1.pkl'))
+        registry = make_registry(tmp)
+
+        registry.get("family")
+        assert registry.preload(["fixed", "family"], track_memory=True) == ["fixed", "family"]
+        assert registry.stats()["fixed"]["loaded"]["latest"]["memory_mb"] > 0
+        # Loaded lazily (as in a serving worker): tracemalloc stays off
+        assert registry.stats()["family"]["loaded"]["latest"]["memory_mb"] is None
+        assert not registry.stats()["family"]["loaded"]["latest"]["memory_tracked"]
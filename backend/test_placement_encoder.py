@@ -0,0 +1,83 @@
+"""
+Parity check: PlacementEncoder fast path vs the sklearn pipeline path.
+Run with pytest, or `python backend/test_placement_encoder.py` to also print timings.
+"""
+import itertools
+import os
+import random
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import conftest  # noqa: F401  (puts src/ on sys.path when run as a script)
+from placement_encoder import PlacementEncoder
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '../src/xgboost_pipeline.pkl')
+
+
+def load():
+    pipeline = joblib.load(MODEL_PATH)
+    return pipeline, PlacementEncoder(pipeline)
+
+
+def random_columns(encoder, n, seed=42):
+    """Every known category, plus unseen values to exercise handle_unknown"""
+    rng = random.Random(seed)
+    columns = {}
+    for kind, column, spec in encoder.blocks:
+        if kind == 'numeric':
+            high = 5 if column == 'Communication level' else (10 if column == 'Cgpa' else 100)
+            columns[column] = [round(rng.uniform(0, high), 2) for _ in range(n)]
+        else:
+            categories = list(spec[0]) + ['Unknown Board', 'maybe']
+            columns[column] = [rng.choice(categories) for _ in range(n)]
+    return columns
+
+
+def test_probabilities_match_pipeline_exactly():
+    pipeline, encoder = load()
+    columns = random_columns(encoder, 2000)
+
+    expected = pipeline.predict_proba(pd.DataFrame(columns))
+    actual = encoder.predict_proba(columns)
+
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual, expected), f"max abs diff {np.abs(actual - expected).max()}"
+
+
+def test_single_rows_match_pipeline_exactly():
+    pipeline, encoder = load()
+    columns = random_columns(encoder, 50, seed=7)
+
+    for i in range(50):
+        row = {column: values[i:i + 1] for column, values in columns.items()}
+        assert np.array_equal(encoder.predict_proba(row), pipeline.predict_proba(pd.DataFrame(row)))
+
+
+def test_every_category_combination_of_binary_flags():
+    pipeline, encoder = load()
+    flags = ['Internships(Y/N)', 'Training(Y/N)', 'Backlog in 5th sem', 'Innovative Project(Y/N)', 'Technical Course(Y/N)']
+    base = {column: values[0] for column, values in random_columns(encoder, 1).items()}
+
+    rows = [dict(base, **dict(zip(flags, combo))) for combo in itertools.product(['Yes', 'No'], repeat=len(flags))]
+    columns = {column: [row[column] for row in rows] for column in base}
+
+    assert np.array_equal(encoder.predict_proba(columns), pipeline.predict_proba(pd.DataFrame(columns)))
+
+
+if __name__ == "__main__":
+    test_probabilities_match_pipeline_exactly()
+    test_single_rows_match_pipeline_exactly()
+    test_every_category_combination_of_binary_flags()
+    print("✅ Encoder probabilities identical to the pipeline path")
+
+    pipeline, encoder = load()
+    row = {column: values for column, values in random_columns(encoder, 1).items()}
+    for name, fn in [("pipeline", lambda: pipeline.predict_proba(pd.DataFrame(row))), ("encoder", lambda: encoder.predict_proba(row))]:
+        fn()
+        start = time.perf_counter()
+        for _ in range(200):
+            fn()
+        print(f"⚡ {name}: {(time.perf_counter() - start) / 200 * 1000:.3f} ms per single-row prediction")
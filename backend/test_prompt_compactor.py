@@ -0,0 +1,66 @@
+"""
+Prompt compaction checks: a resume over budget keeps its skills section and
+skill-heavy bullets (which blind truncation cut off) and drops boilerplate,
+stays within the token budget in document order, short text is sent
+unchanged, and saved tokens are counted per endpoint.
+"""
+import pytest
+
+import prompt_compactor
+from prompt_compactor import CompactionStats, compact, estimate_tokens, split_sections
+
+RESUME = """Jane Doe
+Software Engineer
+
+SUMMARY
+Hardworking and passionate team player who is always eager to learn new things every day.
+
+EXPERIENCE
+• Attended daily stand-ups and weekly planning meetings with the wider team.
+• Deployed FastAPI services with Docker and Kubernetes on AWS, cutting latency by 40%.
+• Wrote onboarding documents for new joiners in the department.
+
+HOBBIES
+Cricket, chess, travelling, photography and cooking with friends on the weekend.
+
+DECLARATION
+I hereby declare that the above information is true to the best of my knowledge.
+
+SKILLS
+Python, Django, React, PostgreSQL, Redis, Terraform
+"""
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(prompt_compactor, 'compaction_stats', CompactionStats())
+
+
+def test_sections_are_detected():
+    kinds = [kind for _, kind, _ in split_sections(RESUME)]
+    assert kinds == [None, "summary", "experience", "interests", "declaration", "skills"]
+
+
+def test_packs_relevant_sentences_in_budget():
+    packed = compact(RESUME, "project_ideas", query="Kubernetes AWS", budget=60)
+    lines = packed.splitlines()
+
+    assert estimate_tokens(packed) <= 60
+    assert lines[0] == "Jane Doe"
+    assert "SKILLS" in lines and "Python, Django, React, PostgreSQL, Redis, Terraform" in lines
+    assert any("Kubernetes" in line for line in lines)
+    assert lines.index("EXPERIENCE") < lines.index("SKILLS")
+    assert "hereby declare" not in packed and "stand-ups" not in packed
+
+
+def test_short_text_is_unchanged_and_savings_are_counted():
+    assert compact("Python developer", "project_ideas") == "Python developer"
+    compact(RESUME, "project_ideas", budget=60)
+
+    stats = prompt_compactor.compaction_stats.stats()["endpoints"]["project_ideas"]
+    assert (stats["calls"], stats["compacted"]) == (2, 1)
+    assert stats["saved_tokens"] == stats["original_tokens"] - stats["sent_tokens"] > 0
+
+
+def test_run_on_text_is_split_into_windows():
+    blob = " ".join(["filler words here"] * 100) + " pytorch tensorflow docker"
+    packed = compact(blob, "chat_analyze", budget=40)
+    assert estimate_tokens(packed) <= 40 and "pytorch" in packed
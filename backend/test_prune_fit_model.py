@@ -0,0 +1,49 @@
+"""
+Fit model pruning checks: a small booster pruned with
+notebooks/prune_fit_model.py gives identical probabilities on seen and unseen
+pairs, unnormalised vocabularies shrink while l2-normalised ones are kept
+whole, and the pruned artifact is only served once promoted.
+"""
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from fit_classifier import AdvancedFitClassifier
+from model_registry import ModelRegistry
+from prune_fit_model import prune, promote
+
+UNSEEN = (["Go and Python engineer", "", "Italian chef, SQL curious"], ["SQL dashboards", "Kubernetes", ""])
+
+
+@pytest.fixture
+def original(fit_model_path):
+    return AdvancedFitClassifier("xgboost", model_path=str(fit_model_path))
+
+
+def test_pruned_predictions_are_identical(original, fit_pairs, tmp_path):
+    data = prune(original)
+    path = tmp_path / "pruned.pkl"
+    joblib.dump(data, path)
+    pruned = AdvancedFitClassifier("xgboost", model_path=str(path))
+
+    assert len(pruned.feature_columns) < len(original.feature_columns)
+    vocabulary = lambda classifier, col: classifier.vectorizers[col].vocabulary_
+    assert len(vocabulary(pruned, "resume_text")) < len(vocabulary(original, "resume_text"))  # norm=None
+    assert vocabulary(pruned, "job_description_text") == vocabulary(original, "job_description_text")  # l2
+    for resumes, jds in [(fit_pairs["resume_text"].tolist(), fit_pairs["job_description_text"].tolist()), UNSEEN]:
+        np.testing.assert_array_equal(pruned.predict_proba_batch(resumes, jds),
+                                      original.predict_proba_batch(resumes, jds))
+
+
+def test_served_only_once_promoted(original, tmp_path):
+    models = ModelRegistry(artifacts={"fit_xgboost": tmp_path / "served" / "ml_pipeline_xgboost_*.pkl"})
+    pruned_dir = tmp_path / "served" / "pruned"
+    pruned_dir.mkdir(parents=True)
+    path = pruned_dir / "ml_pipeline_xgboost_20250101_000000_pruned.pkl"
+    joblib.dump(prune(original), path)
+    assert models.versions("fit_xgboost") == {}
+
+    promoted = promote(str(path), str(tmp_path / "served"))
+    assert list(models.versions("fit_xgboost").values()) == [pruned_dir.parent / os.path.basename(promoted)]
@@ -0,0 +1,89 @@
+"""
+SalaryLookup checks: table values equal model predictions, out-of-grid rows
+fall back to the model, and a changed model file rebuilds the table.
+Uses a synthetic 5-feature GBR so it runs without the shipped salary pickle.
+Run with pytest, or `python backend/test_salary_lookup.py` to also print timings.
+"""
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor
+
+import conftest  # noqa: F401  (puts src/ on sys.path when run as a script)
+from salary_lookup import SalaryLookup, SALARY_GRID
+
+
+def train_model(seed=42, n_estimators=50):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.uniform(18, 70, 2000), rng.integers(0, 2, 2000), rng.integers(0, 4, 2000),
+        rng.integers(0, 6, 2000), rng.uniform(0, 40, 2000),
+    ])
+    y = 30000 + 2500 * X[:, 4] + 8000 * X[:, 2] + rng.normal(0, 5000, len(X))
+    return GradientBoostingRegressor(n_estimators=n_estimators, max_depth=3, random_state=seed).fit(X, y)
+
+
+def make_lookup(tmp):
+    model_path = os.path.join(tmp, 'salary.pkl')
+    joblib.dump(train_model(), model_path)
+    return SalaryLookup(model_path, cache_dir=os.path.join(tmp, 'cache')), model_path
+
+
+def test_table_matches_model_on_whole_grid():
+    with tempfile.TemporaryDirectory() as tmp:
+        lookup, _ = make_lookup(tmp)
+        rows = lookup.grid_rows(0, lookup.table.size)
+        assert np.array_equal(lookup.predict(rows), lookup.model.predict(rows))
+        assert lookup.fallbacks == 0
+
+
+def test_out_of_grid_rows_use_model():
+    with tempfile.TemporaryDirectory() as tmp:
+        lookup, _ = make_lookup(tmp)
+        (age_lo, age_hi), *_, (_, exp_hi) = SALARY_GRID
+        X = np.array([
+            [30, 1, 2, 1, 5],             # in grid
+            [30.5, 1, 2, 1, 5],           # fractional age
+            [age_hi + 5, 0, 1, 3, 10],    # age above the grid
+            [age_lo, 1, 3, 5, exp_hi + 1],  # experience above the grid
+            [40, 1, 7, 1, 12],            # unseen education code
+        ], dtype=float)
+        assert np.array_equal(lookup.predict(X), lookup.model.predict(X))
+        assert (lookup.lookups, lookup.fallbacks) == (1, 4)
+
+
+def test_rebuilds_when_model_file_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        lookup, model_path = make_lookup(tmp)
+        row = np.array([[35, 0, 3, 4, 10]], dtype=float)
+        before = lookup.predict(row)
+
+        retrained = train_model(seed=7, n_estimators=80)
+        joblib.dump(retrained, model_path)
+        os.utime(model_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        lookup._next_check = 0.0
+
+        after = lookup.predict(row)
+        assert np.array_equal(after, retrained.predict(row))
+        assert not np.array_equal(before, after)
+        assert len(os.listdir(os.path.join(tmp, 'cache'))) == 1
+
+
+if __name__ == "__main__":
+    test_table_matches_model_on_whole_grid()
+    test_out_of_grid_rows_use_model()
+    test_rebuilds_when_model_file_changes()
+    print("✅ Salary lookup table matches the model")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lookup, _ = make_lookup(tmp)
+        row = np.array([[30, 1, 2, 1, 5]], dtype=float)
+        for name, fn in [("model", lambda: lookup.model.predict(row)), ("lookup", lambda: lookup.predict(row))]:
+            fn()
+            start = time.perf_counter()
+            for _ in range(1000):
+                fn()
+            print(f"⚡ {name}: {(time.perf_counter() - start):.3f} ms per single-row prediction")
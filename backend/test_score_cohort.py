@@ -0,0 +1,98 @@
+"""
+Cohort scoring CLI checks: chunked CSV/Parquet input, per-row validation errors,
+output in input order, results equal to direct scoring, and a bounded number of
+chunks held while a slow first chunk blocks the in-order writes.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import score_cohort
+import inference_service
+from inference_service import DomainFitInput
+
+
+def make_cohort(n=53, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "student_id": [f"S{i:03d}" for i in range(n)],
+        "Age": rng.integers(18, 30, n), "Gender": rng.choice(["Male", "Female"], n),
+        "Vocational_Program": "IT", "Academic_Performance": rng.uniform(40, 100, n).round(1),
+        "Certifications_Count": rng.integers(0, 6, n), "Internship_Experience": rng.integers(0, 3, n),
+        "Skill_1": rng.integers(0, 10, n), "Skill_2": rng.integers(0, 10, n), "Skill_3": rng.integers(0, 10, n),
+    })
+
+
+def test_csv_chunks_keep_order_and_report_invalid_rows():
+    cohort = make_cohort().astype({"Skill_2": object})
+    cohort.loc[5, "Skill_2"] = "seven"
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = os.path.join(tmp, 'cohort.csv'), os.path.join(tmp, 'results.csv')
+        cohort.to_csv(source, index=False)
+
+        done, succeeded = score_cohort.main([source, '--model', 'domain_fit', '--output', target,
+                                             '--chunk-size', '10', '--processes', '2', '--id-column', 'student_id'])
+        results = pd.read_csv(target, keep_default_na=False)
+
+    assert (done, succeeded) == (len(cohort), len(cohort) - 1)
+    assert results["row"].tolist() == list(range(len(cohort)))
+    assert results["student_id"].tolist() == cohort["student_id"].tolist()
+    assert results.loc[5, "status"] == "error" and "Skill_2" in results.loc[5, "message"]
+
+    expected, _ = inference_service.score("domain_fit", [DomainFitInput(**cohort.iloc[0].drop("student_id").to_dict())])
+    assert results.loc[0, "label"] == expected[0]["label"]
+    assert np.isclose(float(results.loc[0, "confidence"]), expected[0]["confidence"])
+
+
+def test_parquet_round_trip():
+    cohort = make_cohort(n=25, seed=1).drop(columns="student_id")
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = os.path.join(tmp, 'cohort.parquet'), os.path.join(tmp, 'results.parquet')
+        cohort.to_parquet(source)
+        score_cohort.main([source, '--model', 'domain_fit', '--output', target, '--chunk-size', '7', '--processes', '1'])
+        results = pd.read_parquet(target)
+
+    expected, _ = inference_service.score("domain_fit", [DomainFitInput(**row) for row in cohort.to_dict('records')])
+    assert results["label"].tolist() == [out["label"] for out in expected]
+    assert (results["status"] == "success").all()
+
+
+_score_chunk = score_cohort.score_chunk
+
+
+def slow_first_chunk(model, start, records, id_column):
+    if start == 0:
+        time.sleep(1.0)
+    return _score_chunk(model, start, records, id_column)
+
+
+def test_slow_first_chunk_keeps_memory_bounded(monkeypatch):
+    read, written, held = [0], [0], []
+    read_chunks, write = score_cohort.read_chunks, score_cohort.ResultWriter.write
+
+    def counting_read(path, chunk_size):
+        for chunk in read_chunks(path, chunk_size):
+            read[0] += 1
+            held.append(read[0] - written[0])
+            yield chunk
+
+    def counting_write(self, frame):
+        written[0] += 1
+        write(self, frame)
+
+    monkeypatch.setattr(score_cohort, 'score_chunk', slow_first_chunk)
+    monkeypatch.setattr(score_cohort, 'read_chunks', counting_read)
+    monkeypatch.setattr(score_cohort.ResultWriter, 'write', counting_write)
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = os.path.join(tmp, 'cohort.csv'), os.path.join(tmp, 'results.csv')
+        make_cohort(n=60, seed=2).to_csv(source, index=False)
+        done, _ = score_cohort.main([source, '--model', 'domain_fit', '--output', target,
+                                     '--chunk-size', '3', '--processes', '2'])
+        rows = pd.read_csv(target)["row"].tolist()
+
+    assert done == 60 and rows == list(range(60))
+    assert written[0] == 20
+    assert max(held) <= 4  # 2 chunks per process, however long chunk 0 takes
@@ -0,0 +1,75 @@
+"""
+Preload-then-fork server checks: preload() loads every registered model and
+trains a missing chat classifier once, the master freezes the GC after
+preloading and hands the app to the workers, and with --no-preload the master
+only trains the classifier and the workers import the app themselves.
+"""
+import gc
+import sys
+
+import joblib
+import pytest
+
+import chat_classifier
+import main
+import ner_skill_extractor
+import serve
+from model_registry import ModelRegistry
+
+
+@pytest.fixture
+def trained(tmp_path, monkeypatch):
+    """Registry with one model and no chat classifier artifact; returns the seed training calls"""
+    joblib.dump({"v": 1}, tmp_path / "fixed.pkl")
+    registry = ModelRegistry(artifacts={"fixed": tmp_path / "fixed.pkl",
+                                        "chat_intent": tmp_path / "chat_classifier.pkl"})
+    monkeypatch.setattr(main, "models", registry)
+    monkeypatch.setattr(chat_classifier, "registry", registry)
+    monkeypatch.setattr(chat_classifier, "_seed_classifier", None)
+    monkeypatch.setattr(ner_skill_extractor, "load_nlp", lambda: None)
+
+    calls, train = [], chat_classifier.train
+    monkeypatch.setattr(chat_classifier, "train", lambda examples: calls.append(len(examples)) or train(examples))
+    return calls
+
+
+@pytest.fixture
+def served(trained, monkeypatch):
+    """Run serve.main() with the given flags; returns the app each worker was spawned with"""
+    apps = []
+    monkeypatch.setattr(serve, "bind_socket", lambda host, port: None)
+    monkeypatch.setattr(serve, "spawn", lambda app, sock, args: apps.append(app) or 100 + len(apps))
+    monkeypatch.setattr(serve.os, "wait", lambda: (_ for _ in ()).throw(ChildProcessError()))
+    monkeypatch.setattr(serve.signal, "signal", lambda signum, handler: None)
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+
+    def run(*flags):
+        monkeypatch.setattr(sys, "argv", ["serve.py", "--workers", "2", *flags])
+        try:
+            serve.main()
+        finally:
+            gc.unfreeze()
+            gc.enable()
+        return apps
+    return run
+
+
+def test_preload_loads_models_and_trains_the_classifier_once(trained):
+    assert serve.preload() is main.app
+    assert main.models.stats()["fixed"]["loaded"] != {}
+    assert chat_classifier.get_classifier() is chat_classifier._seed_classifier
+    assert serve.preload() is main.app
+    assert len(trained) == 1
+
+
+def test_preload_freezes_before_forking(served, trained, monkeypatch):
+    frozen = []
+    monkeypatch.setattr(serve.gc, "freeze", lambda: frozen.append(main.models.stats()["fixed"]["loaded"] != {}))
+    assert served() == [main.app, main.app]
+    assert frozen == [True] and len(trained) == 1
+
+
+def test_no_preload_trains_in_the_master_only(served, trained):
+    assert served("--no-preload") == [None, None]
+    assert main.models.stats()["fixed"]["loaded"] == {}
+    assert len(trained) == 1 and chat_classifier._seed_classifier is not None
@@ -0,0 +1,65 @@
+"""
+Parity check: compiled tree ensembles vs sklearn predictions.
+Run with pytest, or `python backend/test_tree_compiler.py` to also print timings.
+"""
+import os
+import pickle
+
+import joblib
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier
+
+import conftest  # noqa: F401  (puts src/ on sys.path when run as a script)
+from tree_compiler import compile_ensemble, try_compile
+
+SRC = os.path.join(os.path.dirname(__file__), '../src')
+
+
+def assert_identical(model, X):
+    for compiled in (compile_ensemble(model), try_compile(model)):
+        for rows in (X, X[:1]):
+            assert np.array_equal(compiled.predict(rows), model.predict(rows))
+            if hasattr(model, 'predict_proba'):
+                assert np.array_equal(compiled.predict_proba(rows), model.predict_proba(rows))
+
+
+def test_domain_fit_model():
+    rng = np.random.default_rng(0)
+    model = joblib.load(os.path.join(SRC, 'domain_fit_model.pkl'))
+    X = np.column_stack([
+        rng.uniform(18, 30, 3000), rng.integers(0, 10, (3000, 3)), rng.uniform(40, 100, 3000),
+        rng.integers(0, 10, 3000), rng.integers(0, 5, 3000),
+    ])
+    assert_identical(model, X)
+
+
+def test_basic_fit_model():
+    rng = np.random.default_rng(1)
+    with open(os.path.join(SRC, 'fit_classifier.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    X = np.column_stack([rng.uniform(0, 100, 3000), rng.integers(0, 11, (3000, 2))])
+    assert_identical(model, X)
+
+
+def test_gradient_boosting_regressor():
+    # Same shape as the salary model (5 features)
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(2000, 5))
+    y = 50000 + 10000 * (X @ rng.normal(size=5)) + rng.normal(0, 1000, 2000)
+    assert_identical(GradientBoostingRegressor(n_estimators=200, learning_rate=0.1, random_state=42).fit(X, y), X)
+
+
+def test_missing_values():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(2000, 4))
+    y = X[:, 0] + X[:, 1] > 0
+    X[::5, 1] = np.nan
+    assert_identical(RandomForestClassifier(n_estimators=20, random_state=42).fit(X, y), X)
+
+
+if __name__ == "__main__":
+    test_domain_fit_model()
+    test_basic_fit_model()
+    test_gradient_boosting_regressor()
+    test_missing_values()
+    print("✅ Compiled ensembles identical to sklearn")
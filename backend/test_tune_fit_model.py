@@ -0,0 +1,68 @@
+"""
+Fit model tuning checks: the wall-clock budget stops boosting, the fold cache
+key changes with the data, vectorizer and seed, a search over two candidates
+on synthetic pairs records the one that raised as failed, and the featurized
+folds are reused instead of rebuilt.
+"""
+import time
+from argparse import Namespace
+
+import numpy as np
+import pytest
+import xgboost as xgb
+from sklearn.preprocessing import LabelEncoder
+
+import tune_fit_model
+from train_fit_sparse import prepare_batch
+from tune_fit_model import WallClockBudget, build_fold_cache, fold_cache_dir, run_search
+
+VALID = {'max_depth': 2, 'learning_rate': 0.3, 'subsample': 1.0, 'colsample_bytree': 1.0,
+         'min_child_weight': 1, 'reg_lambda': 1.0}
+
+
+@pytest.fixture
+def args(tmp_path, fit_pairs):
+    data = tmp_path / "pairs.csv"
+    fit_pairs.to_csv(data, index=False)
+    return Namespace(data=str(data), cache_dir=str(tmp_path / "cache"), vectorizer="tfidf", n_features=2 ** 8,
+                     folds=2, seed=42, budget=60, workers=1, max_rounds=5, early_stopping=2)
+
+
+def rounds_within(deadline):
+    X = np.random.RandomState(0).rand(40, 3)
+    budget = WallClockBudget(deadline)
+    booster = xgb.train({"max_depth": 2}, xgb.DMatrix(X, label=X[:, 0]), num_boost_round=20, callbacks=[budget])
+    return booster.num_boosted_rounds(), budget.hit
+
+
+def test_wall_clock_budget_stops_boosting():
+    assert rounds_within(time.time() + 60) == (20, False)
+    assert rounds_within(time.time() - 1) == (1, True)
+
+
+def test_fold_cache_key_follows_data_vectorizer_and_seed(args, fit_pairs):
+    key = fold_cache_dir(args, len(fit_pairs))
+    assert fold_cache_dir(args, len(fit_pairs)) == key
+    assert fold_cache_dir(Namespace(**{**vars(args), "vectorizer": "hashing"}), len(fit_pairs)) != key
+    assert fold_cache_dir(Namespace(**{**vars(args), "seed": 7}), len(fit_pairs)) != key
+
+    fit_pairs.iloc[:-1].to_csv(args.data, index=False)
+    assert fold_cache_dir(args, len(fit_pairs) - 1) != key
+
+
+def test_search_records_failed_candidates_and_reuses_folds(args, fit_pairs, monkeypatch):
+    prepared = prepare_batch(fit_pairs)
+    y = LabelEncoder().fit_transform(prepared["label"])
+    cache_dir = fold_cache_dir(args, len(prepared))
+    build_fold_cache(prepared, y, args, cache_dir)
+
+    featurized = []
+    monkeypatch.setattr(tune_fit_model, "featurize", lambda *a: featurized.append(a))
+    build_fold_cache(prepared, y, args, cache_dir)
+    assert featurized == []
+
+    candidates = [VALID, {**VALID, "max_depth": -1}]  # xgboost rejects a negative depth
+    leaderboard = run_search(candidates, cache_dir, 3, args).set_index("candidate")
+    assert leaderboard["status"].to_dict() == {0: "ok", 1: "failed"}
+    assert leaderboard.loc[0, "folds_done"] == 2 and 1 <= leaderboard.loc[0, "rounds"] <= args.max_rounds
+    assert "max_depth" in leaderboard.loc[1, "error"] and leaderboard.loc[1, "max_depth"] == -1
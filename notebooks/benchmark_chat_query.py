@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Chat Query Latency Benchmark
+Compares the previous /api/chat-query flow (intent call, relevance guard call,
+then the answer or generated jobs, one after another) with the current single
+structured call, against a local stand-in for Gemini that answers every
+request after a fixed delay. No API key or network is used; the LLM cache is
+disabled so every message reaches the stand-in.
+
+Usage:
+    python notebooks/benchmark_chat_query.py --latency 0.8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import llm_utils
+from llm_cache import LLMCache
+from llm_health import LLMHealth
+from chat_assistant import local_reply, match_jobs
+
+QUERIES = [
+    "NLP jobs",
+    "what can i do",
+    "how to start a career in AI",
+    "Data Scientist roles in Google",
+    "computer vision openings",
+    "quantum compiler engineer jobs",
+    "should i learn mlops or data engineering",
+]
+
+
+class StandInModel:
+    """Answers like Gemini would for each prompt shape, after a fixed delay"""
+    latency = 0.8
+    calls = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        StandInModel.calls += 1
+        await asyncio.sleep(StandInModel.latency)
+        query = prompt.split('"')[1].lower()
+        if "'JOB_SEARCH' or 'ADVICE'" in prompt:
+            text = local_reply(query, match_jobs(query, JOBS_DATA)).intent
+        elif "ONLY 'Yes'" in prompt:
+            text = "Yes"
+        elif '"response"' in prompt:  # the combined or the answer-only prompt
+            reply = local_reply(query, match_jobs(query, JOBS_DATA)).model_dump()
+            reply["response"] = "Here is what I'd suggest."
+            reply["roles"] = [] if "Matched Jobs" in prompt else [
+                {"job_title": "Quantum Software Engineer", "company": "IBM", "skills": ["Qiskit"]}] * 3
+            text = json.dumps(reply)
+        elif "job listings" in prompt:
+            text = json.dumps([{"job_title": "Quantum Software Engineer", "company": "IBM"}] * 3)
+        else:
+            text = "Here is what I'd suggest."
+        return type("Response", (), {"text": text})()
+
+
+async def previous_chat_query(query):
+    """Call sequence of the previous handler (prompts shortened; the stand-in only routes on their shape)"""
+    get_ai_response_async, get_ai_json_async = llm_utils.get_ai_response_async, llm_utils.get_ai_json_async
+    intent = "ADVICE" if "ADVICE" in (await get_ai_response_async(
+        f'Analyze the user query: "{query}" Answer with ONLY \'JOB_SEARCH\' or \'ADVICE\'.')).upper() else "JOB_SEARCH"
+    if "no" in (await get_ai_response_async(f'Query: "{query}" Answer with ONLY \'Yes\' or \'No\'.')).lower():
+        return
+    if intent == "ADVICE":
+        await get_ai_response_async(f'User Query: "{query}" TASK: provide career advice.')
+    elif match_jobs(query.lower(), JOBS_DATA):
+        await get_ai_response_async(f'User Query: "{query}" Matched Jobs: ... TASK: list top 3.')
+    else:
+        await get_ai_json_async(f'User Query: "{query}" TASK: Generate 3 realistic tech job listings.')
+
+
+async def measure(handler, query):
+    StandInModel.calls = 0
+    started = time.perf_counter()
+    await handler(query)
+    return StandInModel.calls, (time.perf_counter() - started) * 1000
+
+
+def main():
+    global JOBS_DATA
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.8, help="seconds per stand-in LLM call")
+    args = parser.parse_args()
+
+    import main as backend
+    JOBS_DATA = backend.JOBS_DATA
+    StandInModel.latency = args.latency
+    llm_utils.llm_cache = LLMCache(path=None, enabled=False)
+    llm_utils.llm_health = LLMHealth()
+    llm_utils.API_KEYS = ["stand-in-key"]
+    llm_utils.configure_genai = lambda key: None
+    llm_utils.genai.GenerativeModel = StandInModel
+
+    # main.py defines chat_query twice; the first registered route is the one served
+    endpoint = next(route.endpoint for route in backend.app.routes if getattr(route, 'path', None) == "/api/chat-query")
+
+    async def current_chat_query(query):
+        await endpoint(backend.ChatQueryRequest(query=query))
+
+    print(f"\n💬 /api/chat-query with a stand-in LLM ({args.latency * 1000:.0f}ms per call)")
+    print(f"  {'query':<42} {'before':>16} {'after':>16}")
+    totals = [0, 0.0, 0, 0.0]
+    for query in QUERIES:
+        before_calls, before_ms = asyncio.run(measure(previous_chat_query, query))
+        after_calls, after_ms = asyncio.run(measure(current_chat_query, query))
+        totals = [t + v for t, v in zip(totals, (before_calls, before_ms, after_calls, after_ms))]
+        print(f"  {query:<42} {before_calls} calls {before_ms:>6.0f}ms {after_calls} calls {after_ms:>6.0f}ms")
+
+    n = len(QUERIES)
+    print(f"\n⚡ mean per message: {totals[0] / n:.1f} calls, {totals[1] / n:.0f}ms -> "
+          f"{totals[2] / n:.1f} calls, {totals[3] / n:.0f}ms ({totals[1] / totals[3]:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
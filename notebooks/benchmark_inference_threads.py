@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Inference Thread Benchmark
+Compares XGBoost throughput / tail latency for the fit model and the placement
+pipeline across nthread settings and concurrent-prediction levels.
+
+Usage:
+    python notebooks/benchmark_inference_threads.py --requests 200 --concurrency 1 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import joblib
+from inference_runtime import apply_model_threads, default_threads, limit_native_threads
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SAMPLE_JD = (
+    "We are hiring a Python developer with experience in machine learning, SQL, "
+    "AWS and Docker. Familiarity with REST APIs and CI/CD is a plus."
+)
+
+SAMPLE_STUDENT = pd.DataFrame([{
+    "Gender": "Male", "10th board": "CBSE", "10th marks": 85.0,
+    "12th board": "CBSE", "12th marks": 80.0, "Stream": "Computer Science",
+    "Cgpa": 8.1, "Internships(Y/N)": "Yes", "Training(Y/N)": "Yes",
+    "Backlog in 5th sem": "No", "Innovative Project(Y/N)": "Yes",
+    "Communication level": 4, "Technical Course(Y/N)": "Yes",
+}])
+
+
+def load_workloads():
+    """Build (name, model, predict_fn) tuples for every model that loads here"""
+    workloads = []
+
+    from fit_classifier import load_fit_classifier
+    classifier = load_fit_classifier()
+    if classifier.is_loaded:
+        with open(os.path.join(ROOT, 'dummy_resume.txt')) as f:
+            resume = f.read()
+        workloads.append(("fit_model", classifier.model, lambda: classifier.predict_advanced(resume, SAMPLE_JD)))
+
+    try:
+        pipeline = joblib.load(os.path.join(ROOT, 'src', 'xgboost_pipeline.pkl'))
+        pipeline.predict_proba(SAMPLE_STUDENT)
+        workloads.append(("placement", pipeline, lambda: pipeline.predict_proba(SAMPLE_STUDENT)))
+    except Exception as e:
+        print(f"⚠️ Skipping placement pipeline: {e}")
+
+    return workloads
+
+
+def run(predict_fn, n_requests, concurrency):
+    """Fire n_requests predictions through a pool of `concurrency` threads"""
+    latencies = []
+
+    def timed():
+        start = time.perf_counter()
+        predict_fn()
+        latencies.append(time.perf_counter() - start)
+
+    predict_fn()  # warm-up
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: timed(), range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000
+    return {
+        "throughput": n_requests / elapsed,
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p95_ms": float(np.percentile(lat_ms, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--threads', type=int, nargs='+', default=None,
+                        help="nthread settings to compare (default: 1, 2, 4, ... up to CPU count)")
+    args = parser.parse_args()
+
+    cpu = os.cpu_count() or 1
+    thread_settings = args.threads or sorted({1, 2, 4, cpu} & set(range(1, cpu + 1)))
+
+    print(f"🚀 Inference thread benchmark ({cpu} CPUs, {args.requests} requests per run)")
+    workloads = load_workloads()
+    if not workloads:
+        print("❌ No models could be loaded.")
+        return
+
+    rows = []
+    for name, model, predict_fn in workloads:
+        for concurrency in args.concurrency:
+            for threads in thread_settings:
+                apply_model_threads(model, threads)
+                limit_native_threads(threads)
+                stats = run(predict_fn, args.requests, concurrency)
+                rows.append({"model": name, "concurrency": concurrency, "nthread": threads, **stats})
+                print(f"  {name:<10} conc={concurrency:<3} nthread={threads:<3} "
+                      f"{stats['throughput']:8.1f} req/s  p50={stats['p50_ms']:7.2f}ms  p95={stats['p95_ms']:7.2f}ms")
+
+    results = pd.DataFrame(rows)
+    print("\n⭐ Best setting per model/concurrency:")
+    best = results.loc[results.groupby(['model', 'concurrency'])['throughput'].idxmax()]
+    for _, row in best.iterrows():
+        suggested = default_threads(cpu_count=cpu, pool_size=row['concurrency'])
+        print(f"  • {row['model']} @ concurrency {row['concurrency']}: nthread={row['nthread']} "
+              f"({row['throughput']:.1f} req/s) | runtime default would pick {suggested}")
+
+
+if __name__ == "__main__":
+    main()
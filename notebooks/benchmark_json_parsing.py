@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+LLM JSON Parsing Benchmark
+Compares the previous get_ai_json parser (strip a ```json fence, then
+json.loads) with llm_json.parse_llm_json (tolerant extraction + schema
+validation) on a corpus of Gemini-style responses: clean JSON, and the
+defects seen in practice (prose around the JSON, single quotes as the prep
+prompts ask for, Python literals, trailing commas, // comments as in the report
+prompt, raw newlines in strings, cut-off output) plus answers with the wrong
+shape.
+
+For each case it shows whether each parser accepts the response and whether
+the accepted value has the shape the endpoint reads. It then simulates calls
+that draw responses from the corpus until one is accepted, with up to one
+attempt per model as in llm_utils. It reports the retry rate (attempts beyond
+the first per call) and the fallback rate (calls where every model failed).
+A wrong-shape value the old parser accepted is counted as a failure there,
+since the endpoint breaks on it or serves a broken page. The defect mix is
+synthetic and uniform, so use the rates to compare the parsers rather than
+as an estimate of production rates.
+
+Usage:
+    python notebooks/benchmark_json_parsing.py --calls 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pydantic import ValidationError
+
+from llm_json import parse_llm_json
+from llm_schemas import CareerReport, MultipleChoiceQuestion, ResumeAnalysis
+from llm_utils import MODELS
+
+ANALYSIS = {"score": 78, "matched_skills": ["Python", "SQL"], "missing_skills": ["Docker", "AWS"],
+            "advice": ["Quantify your impact."], "jd_skills_detected": ["Python", "SQL", "Docker", "AWS"]}
+
+CASES = [
+    # (name, schema, response text)
+    ("clean", ResumeAnalysis, json.dumps(ANALYSIS)),
+    ("code fence", ResumeAnalysis, "```json\n" + json.dumps(ANALYSIS, indent=2) + "\n```"),
+    ("prose before", ResumeAnalysis, "Here is the analysis you asked for:\n\n" + json.dumps(ANALYSIS)),
+    ("prose after", ResumeAnalysis, "```json\n" + json.dumps(ANALYSIS) + "\n```\nLet me know if you need more help!"),
+    ("single quotes", MultipleChoiceQuestion,
+     "{'q': 'A train covers 60 km in 45 minutes. What is its speed?', 'options': ['70 km/h', '80 km/h', "
+     "'90 km/h', '75 km/h'], 'correct': '80 km/h'}"),
+    ("python literals", ResumeAnalysis,
+     '{"score": 64, "matched_skills": ["Java"], "missing_skills": ["Spring"], "remote": True, "referral": None}'),
+    ("trailing commas", ResumeAnalysis,
+     '{\n  "score": 81,\n  "matched_skills": ["React", "Node",],\n  "missing_skills": ["GraphQL",],\n}'),
+    ("comments", CareerReport,
+     '{\n  "readiness_score": 72, // estimated from activity\n  "status_label": "Industry Ready",\n'
+     '  "timeline": [\n    {"date": "Today", "action": "Generated Report"}\n    // more actions\n  ]\n}'),
+    ("raw newlines", ResumeAnalysis,
+     '{"score": 70, "matched_skills": ["SQL"], "missing_skills": ["Spark"], "advice": ["Line one.\nLine two."]}'),
+    ("cut off", ResumeAnalysis,
+     '{"score": 66, "matched_skills": ["Excel"], "missing_skills": ["Tableau", "Power BI"], "advice": ["Build a dash'),
+    ("wrong shape", ResumeAnalysis, '{"analysis": "The candidate is a good fit with a score of 80."}'),
+    ("wrong type", ResumeAnalysis, '{"score": "high", "matched_skills": "Python", "missing_skills": []}'),
+    ("no json", ResumeAnalysis, "I'm sorry, but I can't analyze this job description."),
+]
+
+
+def old_parse(text):
+    if text.startswith("```json"): text = text[7:]
+    if text.endswith("```"): text = text[:-3]
+    return json.loads(text.strip())
+
+
+def old_accepts(text, schema):
+    """(parsed, usable): usable when the parsed value also has the shape the endpoint reads"""
+    try:
+        data = old_parse(text)
+    except ValueError:
+        return False, False
+    try:
+        schema.model_validate(data)
+        return True, True
+    except ValidationError:
+        return True, False
+
+
+def new_accepts(text, schema):
+    try:
+        parse_llm_json(text, schema)
+        return True
+    except ValueError:
+        return False
+
+
+def simulate(accepts, calls, attempts, rng):
+    """(retry rate, fallback rate) for calls drawing responses from CASES until one is accepted"""
+    retries = fallbacks = 0
+    for _ in range(calls):
+        for attempt in range(attempts):
+            _, schema, text = rng.choice(CASES)
+            if accepts(text, schema):
+                break
+            retries += attempt + 1 < attempts
+        else:
+            fallbacks += 1
+    return retries / calls, fallbacks / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    header = f"{'case':<16} {'old: parsed / usable':>21} {'new: accepted':>14} {'new µs':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, schema, text in CASES:
+        parsed, usable = old_accepts(text, schema)
+        started = time.perf_counter()
+        for _ in range(200):
+            accepted = new_accepts(text, schema)
+        micros = (time.perf_counter() - started) / 200 * 1e6
+        print(f"{name:<16} {('yes' if parsed else 'no'):>12} / {('yes' if usable else 'no'):<6} "
+              f"{('yes' if accepted else 'no'):>14} {micros:>8.0f}")
+
+    old_usable = lambda text, schema: old_accepts(text, schema)[1]
+    print(f"\n🎲 {args.calls} simulated calls, up to {len(MODELS)} attempts each (one per model)")
+    for label, accepts in (("old parser", old_usable), ("tolerant + schema", new_accepts)):
+        retry_rate, fallback_rate = simulate(accepts, args.calls, len(MODELS), random.Random(args.seed))
+        print(f"  {label:<18} retries per call {retry_rate:.3f}   fallback rate {fallback_rate:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Prompt Compaction Benchmark
+Compares the previous fixed-length truncation of documents in prompts
+(resume_text[:2000], jd_text[:1500], content[:4000], ...) with
+prompt_compactor.compact() on sample resumes and job descriptions. For each
+prompt slot it reports the tokens sent, how many of the document's skills
+reach the prompt, how many of the query's skills (JD / candidate skills) do,
+and the time compaction takes. No API key or network is used.
+
+Usage:
+    python notebooks/benchmark_prompt_compaction.py
+    python notebooks/benchmark_prompt_compaction.py --resume my_resume.txt --jd jd.txt
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from prompt_compactor import _SKILL_PATTERN, compact, estimate_tokens
+
+RESUME = """Arjun Mehta
+Machine Learning Engineer | Bengaluru | arjun.mehta@example.com | github.com/arjunm
+
+CAREER OBJECTIVE
+To obtain a challenging position in a reputed organisation where I can utilise my skills and knowledge for the growth
+of the organisation as well as my personal growth. I am a hardworking, sincere and dedicated person with good
+communication skills and a positive attitude towards work, always willing to learn new things and take up challenges.
+
+PERSONAL DETAILS
+Date of Birth: 12-04-1998
+Father's Name: Suresh Mehta
+Languages Known: English, Hindi, Kannada
+Marital Status: Single
+Nationality: Indian
+Address: 221 MG Road, Bengaluru, Karnataka 560001
+
+WORK EXPERIENCE
+Machine Learning Engineer, FinEdge Technologies (Jan 2022 - Present)
+• Participated in daily stand-up meetings, sprint planning and retrospectives with the product team.
+• Built a credit-risk model with XGBoost and scikit-learn on 4M loan records, improving AUC from 0.71 to 0.82.
+• Served the model behind a FastAPI service in Docker on Kubernetes (AWS EKS), p95 latency 90ms at 300 rps.
+• Set up MLflow experiment tracking and an Airflow retraining pipeline, cutting release time from 2 weeks to 2 days.
+• Coordinated with the compliance team for documentation and audit requirements.
+• Mentored two interns and conducted knowledge sharing sessions on best practices.
+Data Analyst, RetailCo (Jul 2020 - Dec 2021)
+• Prepared weekly and monthly sales reports in Excel for regional managers.
+• Wrote SQL queries on PostgreSQL and built Tableau dashboards used by 40 store managers.
+• Automated the reporting ETL with Python and pandas, saving 12 hours per week.
+• Handled ad-hoc data requests from the marketing and finance departments.
+
+PROJECTS
+Resume Ranker - NLP pipeline using transformers (BERT) and spaCy that ranks resumes against a job description; deployed
+on GCP Cloud Run with a React front end.
+Traffic Sign Classifier - PyTorch CNN reaching 98.6% accuracy on GTSRB, exported to ONNX for edge inference.
+College Fest Website - static website made with HTML, CSS and Bootstrap for the annual cultural fest.
+
+EDUCATION
+B.E. Computer Science, RV College of Engineering, 2020 - CGPA 8.1
+Class XII, Kendriya Vidyalaya, 2016 - 91%
+Class X, Kendriya Vidyalaya, 2014 - 9.4 CGPA
+
+ACHIEVEMENTS
+Finalist, Smart India Hackathon 2019. Winner, inter-college coding contest 2018.
+
+HOBBIES AND INTERESTS
+Playing cricket and badminton, reading novels, listening to music, travelling to new places and trying new cuisines.
+
+DECLARATION
+I hereby declare that the above information is true to the best of my knowledge and belief.
+Place: Bengaluru
+Date:
+
+TECHNICAL SKILLS
+Languages: Python, SQL, Java, Bash
+ML / DL: PyTorch, TensorFlow, scikit-learn, XGBoost, transformers, spaCy, ONNX
+MLOps: Docker, Kubernetes, MLflow, Airflow, Terraform, GitHub Actions
+Cloud & Data: AWS, GCP, Spark, PostgreSQL, Redis, Tableau
+"""
+
+JD = """About Us
+NovaPay is one of the fastest growing fintech companies in India, backed by leading investors and trusted by over
+20 million customers. Our mission is to make credit simple, transparent and accessible for everyone. We are a team
+of 800+ people across Bengaluru, Mumbai and Singapore who love solving hard problems together.
+
+Why join us
+Competitive salary and ESOPs. Flexible work from home policy. Comprehensive health insurance for you and your family.
+Annual learning budget, team offsites and a vibrant culture.
+
+The Role
+We are looking for an ML Engineer to join our Risk Platform team.
+
+Responsibilities
+• Design, train and deploy credit risk and fraud models using Python, PyTorch and XGBoost.
+• Own model serving on Kubernetes and AWS with Docker, with strict latency and reliability targets.
+• Build MLOps tooling: feature pipelines in Spark and Airflow, experiment tracking in MLflow, CI/CD with GitHub Actions.
+• Monitor models in production with Prometheus and Grafana and drive retraining.
+
+Requirements
+• 2+ years of experience shipping machine learning models to production.
+• Strong SQL and experience with PostgreSQL or Redshift.
+• Experience with Terraform is a plus.
+
+NovaPay is an equal opportunity employer and values diversity. We do not discriminate on the basis of race, religion,
+colour, national origin, gender, sexual orientation, age, marital status or disability status.
+"""
+
+# Prompt slot -> (document, previous character cap, query)
+SLOTS = {
+    "enhance_resume": ("resume", 2000, "jd"),
+    "enhance_resume_jd": ("jd", 2000, "resume"),
+    "project_ideas": ("resume", 1000, "resume"),
+    "resume_questions_jd": ("jd", 1000, None),
+    "analyze_resume_jd": ("jd", 1500, "resume"),
+    "chat_analyze": ("resume", 3000, None),
+    "hr_emailer": ("resume", 4000, None),
+}
+
+
+def skills_in(text):
+    return set(_SKILL_PATTERN.findall(text.lower()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resume', help="resume text file (default: built-in sample)")
+    parser.add_argument('--jd', help="job description text file (default: built-in sample)")
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    docs = {"resume": RESUME, "jd": JD}
+    for name in ("resume", "jd"):
+        if getattr(args, name):
+            with open(getattr(args, name), encoding="utf-8") as f:
+                docs[name] = f.read()
+    print(f"📄 Resume: {estimate_tokens(docs['resume'])} tokens, {len(skills_in(docs['resume']))} skills | "
+          f"JD: {estimate_tokens(docs['jd'])} tokens, {len(skills_in(docs['jd']))} skills\n")
+
+    header = (f"{'slot':<20} {'tokens (cut → packed)':>22} {'doc skills kept':>17} "
+              f"{'query skills kept':>18} {'ms':>6}")
+    print(header)
+    print("-" * len(header))
+    totals = [0, 0]
+    for slot, (doc_name, cap, query_name) in SLOTS.items():
+        doc = docs[doc_name]
+        query = docs[query_name] if query_name else ""
+        truncated = doc[:cap]
+        started = time.perf_counter()
+        for _ in range(args.repeats):
+            packed = compact(doc, slot, query=query)
+        ms = (time.perf_counter() - started) * 1000 / args.repeats
+
+        doc_skills = skills_in(doc)
+        wanted = skills_in(query) & doc_skills if query else doc_skills
+        kept = lambda text, skills: f"{len(skills_in(text) & skills)}/{len(skills)}"
+        totals[0] += estimate_tokens(truncated)
+        totals[1] += estimate_tokens(packed)
+        print(f"{slot:<20} {estimate_tokens(truncated):>10} → {estimate_tokens(packed):<9} "
+              f"{kept(truncated, doc_skills):>6} → {kept(packed, doc_skills):<7} "
+              f"{kept(truncated, wanted):>7} → {kept(packed, wanted):<7} {ms:>6.2f}")
+
+    print("-" * len(header))
+    print(f"{'total':<20} {totals[0]:>10} → {totals[1]:<9} "
+          f"({1 - totals[1] / totals[0]:.0%} fewer document tokens than the previous caps)")
+
+
+if __name__ == "__main__":
+    main()
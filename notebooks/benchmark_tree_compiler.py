@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tree Compiler Benchmark
+Checks that compiled tree ensembles predict exactly like sklearn and compares
+single-row and batch latency for the small tabular models in src/.
+
+The salary GradientBoostingRegressor is used when it unpickles with the
+installed scikit-learn; otherwise a same-shaped model (5 features) is trained
+on synthetic data so the GBR path is still measured.
+
+Batch timings are for the raw compiled kernel; at serving time batches larger
+than COMPILED_MAX_ROWS are routed back to sklearn (see tree_compiler.try_compile).
+
+Usage:
+    python notebooks/benchmark_tree_compiler.py --repeats 500 --batch 1000
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import joblib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sklearn.ensemble import GradientBoostingRegressor
+from tree_compiler import compile_ensemble
+
+import warnings
+warnings.filterwarnings('ignore')
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+def load_models(rng):
+    """(name, model, input sampler) for every model that loads here"""
+    models = []
+
+    domain_fit = joblib.load(os.path.join(SRC, 'domain_fit_model.pkl'))
+    models.append(("domain_fit (RandomForest)", domain_fit, lambda n: np.column_stack([
+        rng.uniform(18, 30, n), rng.integers(0, 10, (n, 3)), rng.uniform(40, 100, n),
+        rng.integers(0, 10, n), rng.integers(0, 5, n),
+    ])))
+
+    with open(os.path.join(SRC, 'fit_classifier.pkl'), 'rb') as f:
+        basic_fit = pickle.load(f)
+    models.append(("basic fit (RandomForest)", basic_fit, lambda n: np.column_stack([
+        rng.uniform(0, 100, n), rng.integers(0, 11, n), rng.integers(0, 11, n),
+    ])))
+
+    salary_sampler = lambda n: np.column_stack([
+        rng.uniform(21, 60, n), rng.integers(0, 2, n), rng.integers(0, 4, n),
+        rng.integers(0, 6, n), rng.uniform(0, 30, n),
+    ])
+    try:
+        salary = joblib.load(os.path.join(SRC, 'gradient_boosting_salary.pkl'))
+        models.append(("salary (GradientBoosting)", salary, salary_sampler))
+    except Exception as e:
+        print(f"⚠️ Salary model does not load here ({e}); using a synthetic 5-feature GBR")
+        X = salary_sampler(2000)
+        y = 30000 + 2500 * X[:, 4] + 8000 * X[:, 2] + rng.normal(0, 5000, len(X))
+        salary = GradientBoostingRegressor(n_estimators=100, max_depth=3, random_state=42).fit(X, y)
+        models.append(("salary (synthetic GBR)", salary, salary_sampler))
+
+    return models
+
+
+def time_ms(fn, repeats):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=300)
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--check-rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print("🚀 Tree compiler benchmark")
+
+    for name, model, sample in load_models(rng):
+        compiled = compile_ensemble(model)
+        predict = 'predict_proba' if hasattr(model, 'predict_proba') else 'predict'
+
+        X_check = sample(args.check_rows)
+        identical = np.array_equal(getattr(compiled, predict)(X_check), getattr(model, predict)(X_check))
+        identical = identical and np.array_equal(compiled.predict(X_check), model.predict(X_check))
+
+        row = sample(1)
+        batch = sample(args.batch)
+        single_sklearn = time_ms(lambda: getattr(model, predict)(row), args.repeats)
+        single_compiled = time_ms(lambda: getattr(compiled, predict)(row), args.repeats)
+        batch_sklearn = time_ms(lambda: getattr(model, predict)(batch), max(1, args.repeats // 10))
+        batch_compiled = time_ms(lambda: getattr(compiled, predict)(batch), max(1, args.repeats // 10))
+
+        print(f"\n🌲 {name}: {len(compiled.roots)} trees, {len(compiled.feature):,} nodes, depth {compiled.depth}")
+        print(f"  {'✅' if identical else '❌'} {predict} identical on {args.check_rows:,} rows: {identical}")
+        print(f"  ⚡ single row: sklearn {single_sklearn:.3f}ms -> compiled {single_compiled:.3f}ms "
+              f"({single_sklearn / single_compiled:.1f}x)")
+        print(f"  📦 batch of {args.batch}: sklearn {batch_sklearn:.2f}ms -> compiled {batch_compiled:.2f}ms "
+              f"({batch_sklearn / batch_compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
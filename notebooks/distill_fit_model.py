@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Fit Model Distillation Script
+Trains a compact student (hashed n-grams + multinomial logistic regression) on the
+XGBoost teacher's soft labels and saves it as models/ml_pipeline_student_<timestamp>.pkl,
+loadable with FIT_MODEL_TYPE=student / predict_fit(model_type='student').
+
+Usage:
+    python notebooks/distill_fit_model.py                  # HuggingFace dataset
+    python notebooks/distill_fit_model.py --data pairs.csv # local CSV/Parquet
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import joblib
+from scipy.sparse import hstack, vstack
+
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import warnings
+warnings.filterwarnings('ignore')
+
+from fit_classifier import AdvancedFitClassifier, TEXT_COLUMNS, preprocess_text
+
+MODEL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models'))
+
+
+def load_pairs(path=None):
+    """Resume/JD pairs with labels, from a local file or the HuggingFace dataset"""
+    if path:
+        return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+
+    from datasets import load_dataset
+    dataset = load_dataset("cnamuangtoun/resume-job-description-fit")
+    return pd.concat([pd.DataFrame(dataset[split]) for split in dataset.keys()], ignore_index=True)
+
+
+def make_vectorizers(n_features):
+    """Stateless hashed uni/bi-gram vectorizers (no vocabulary to store or ship)"""
+    return {
+        col: HashingVectorizer(n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm='l2')
+        for col in TEXT_COLUMNS
+    }
+
+
+def featurize(vectorizers, df):
+    """Same preprocessing the classifier applies at inference time"""
+    return hstack([
+        vectorizers[col].transform(df[col].apply(preprocess_text))
+        for col in TEXT_COLUMNS
+    ]).tocsr()
+
+
+def fit_on_soft_labels(X, soft_labels, C):
+    """
+    Cross-entropy against the teacher's distribution: every row is repeated
+    once per class and weighted by the teacher's probability for that class.
+    """
+    n_samples, n_classes = soft_labels.shape
+    X_rep = vstack([X] * n_classes).tocsr()
+    y_rep = np.repeat(np.arange(n_classes), n_samples)
+    weights = soft_labels.T.reshape(-1)
+
+    keep = weights > 1e-4
+    student = LogisticRegression(C=C, max_iter=1000)
+    student.fit(X_rep[keep], y_rep[keep], sample_weight=weights[keep])
+    return student
+
+
+def time_single(predict_fn, pairs, repeats=3):
+    """Mean single-pair latency in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for resume, jd in pairs:
+            predict_fn(resume, jd)
+    return (time.perf_counter() - start) / (repeats * len(pairs)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=None, help="CSV/Parquet with resume_text, job_description_text, label")
+    parser.add_argument('--n-features', type=int, default=2 ** 16, help="hash buckets per text column")
+    parser.add_argument('--C', type=float, default=10.0, help="inverse regularisation strength")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    args = parser.parse_args()
+
+    print("🚀 Starting Fit Model Distillation...")
+
+    teacher = AdvancedFitClassifier(model_type='xgboost')
+    if not teacher.is_loaded:
+        print("❌ Teacher model (ml_pipeline_xgboost_*.pkl) not found.")
+        return
+
+    print("📊 Loading dataset...")
+    df = load_pairs(args.data)
+    df[TEXT_COLUMNS] = df[TEXT_COLUMNS].fillna('').astype(str)
+    y = teacher.label_encoder.transform(df['label'])
+    print(f"Dataset loaded: {df.shape}")
+
+    train_df, test_df, y_train, y_test = train_test_split(
+        df, y, test_size=args.test_size, random_state=42, stratify=y
+    )
+
+    print("🎓 Computing teacher soft labels...")
+    teacher_train = teacher.predict_proba_batch(train_df['resume_text'].tolist(), train_df['job_description_text'].tolist())
+    teacher_test = teacher.predict_proba_batch(test_df['resume_text'].tolist(), test_df['job_description_text'].tolist())
+
+    print("🔧 Hashing features...")
+    vectorizers = make_vectorizers(args.n_features)
+    X_train = featurize(vectorizers, train_df)
+    X_test = featurize(vectorizers, test_df)
+
+    print("🏆 Training student model...")
+    student = fit_on_soft_labels(X_train, teacher_train, args.C)
+    student_test = student.predict_proba(X_test)
+
+    # Metrics
+    teacher_pred = teacher_test.argmax(axis=1)
+    student_pred = student_test.argmax(axis=1)
+    metrics = {
+        'accuracy': accuracy_score(y_test, student_pred),
+        'auc_score': roc_auc_score(y_test, student_test, multi_class='ovr', average='weighted'),
+        'teacher_accuracy': accuracy_score(y_test, teacher_pred),
+        'teacher_auc_score': roc_auc_score(y_test, teacher_test, multi_class='ovr', average='weighted'),
+        'teacher_agreement': float((teacher_pred == student_pred).mean()),
+        'teacher_prob_mae': float(np.abs(teacher_test - student_test).mean()),
+    }
+
+    # Save artifact in the same shape as the teacher pipeline
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    pipeline_data = {
+        'model': student,
+        'vectorizers': vectorizers,
+        'label_encoder': teacher.label_encoder,
+        'target_names': list(teacher.target_names),
+        'model_name': 'Distilled LogisticRegression (hashed n-grams)',
+        'model_type': 'student',
+        'teacher': teacher.pipeline_data.get('timestamp'),
+        'timestamp': timestamp,
+        'performance_metrics': {**metrics, 'params': {'n_features': args.n_features, 'C': args.C}},
+    }
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    pipeline_path = os.path.join(MODEL_DIR, f'ml_pipeline_student_{timestamp}.pkl')
+    joblib.dump(pipeline_data, pipeline_path)
+
+    # Latency (single pair, end to end incl. featurization)
+    student_clf = AdvancedFitClassifier(model_type='student')
+    sample = list(zip(test_df['resume_text'].head(20), test_df['job_description_text'].head(20)))
+    teacher_ms = time_single(teacher.predict_advanced, sample)
+    student_ms = time_single(student_clf.predict_advanced, sample)
+
+    print(f"\n🎯 DISTILLATION RESULTS:")
+    print(f"=" * 50)
+    print(f"📊 Test pairs: {len(test_df):,}")
+    print(f"🏆 Teacher accuracy: {metrics['teacher_accuracy']:.4f} | AUC: {metrics['teacher_auc_score']:.4f}")
+    print(f"🎓 Student accuracy: {metrics['accuracy']:.4f} | AUC: {metrics['auc_score']:.4f}")
+    print(f"🤝 Agreement with teacher: {metrics['teacher_agreement']*100:.2f}% (prob MAE {metrics['teacher_prob_mae']:.4f})")
+    print(f"⚡ Latency per pair: teacher {teacher_ms:.2f}ms vs student {student_ms:.2f}ms ({teacher_ms / student_ms:.1f}x)")
+    print(f"\n💾 Student saved to: {pipeline_path}")
+    print(f"   Enable with FIT_MODEL_TYPE=student")
+
+    return pipeline_path, metrics
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Worker Memory Measurement
+Starts backend/serve.py with and without preloading, sends a few prediction
+requests to every worker, then reports each worker's memory from
+/proc/<pid>/smaps_rollup:
+
+- unique (USS): private pages, freed if that worker exits
+- PSS: shared pages split between the processes that map them
+- RSS: everything mapped, shared pages counted in full
+
+Linux only.
+
+Usage:
+    python notebooks/measure_worker_memory.py --workers 4
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+PLACEMENT = {
+    "Gender": "Male", "board_10": "CBSE", "marks_10": 80, "board_12": "CBSE", "marks_12": 75,
+    "Stream": "Science", "Cgpa": 8, "Internships": "Yes", "Training": "Yes", "Backlog_5th": "No",
+    "Innovative_Project": "Yes", "Communication_level": 4, "Technical_Course": "Yes",
+}
+DOMAIN_FIT = {
+    "Age": 22, "Gender": "Male", "Vocational_Program": "IT", "Academic_Performance": 80,
+    "Certifications_Count": 2, "Internship_Experience": 1, "Skill_1": 3, "Skill_2": 4, "Skill_3": 5,
+}
+
+
+def memory_kb(pid):
+    """smaps_rollup fields in kB"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def children(pid):
+    found = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    # ppid is the 2nd field after the ")" closing the command name
+                    if int(f.read().rsplit(')', 1)[1].split()[1]) == pid:
+                        found.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                pass
+    return sorted(found)
+
+
+def post(port, path, payload):
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{port}{path}', data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return response.status
+
+
+def wait_until_serving(port, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=5):
+                return True
+        except Exception:
+            time.sleep(0.5)
+    return False
+
+
+def measure(mode, args):
+    command = [sys.executable, os.path.join(ROOT, 'backend', 'serve.py'), '--workers', str(args.workers),
+               '--host', '127.0.0.1', '--port', str(args.port), '--log-level', 'warning']
+    if mode == 'per-worker load':
+        command.append('--no-preload')
+
+    master = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT)
+    try:
+        if not wait_until_serving(args.port, args.startup_timeout):
+            raise RuntimeError(f"server did not start within {args.startup_timeout}s")
+        # Connections are spread over the workers by the kernel; enough requests reach all of them
+        for _ in range(args.requests):
+            post(args.port, '/api/placement/predict', PLACEMENT)
+            post(args.port, '/api/predict/domain-fit', DOMAIN_FIT)
+        time.sleep(1)
+        workers = children(master.pid)
+        return memory_kb(master.pid), {pid: memory_kb(pid) for pid in workers}
+    finally:
+        master.send_signal(signal.SIGTERM)
+        try:
+            master.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            master.kill()
+        time.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--startup-timeout', type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"🚀 Worker memory: {args.workers} worker(s)")
+    totals = {}
+    for mode in ('per-worker load', 'preload + fork + gc.freeze'):
+        master, workers = measure(mode, args)
+        print(f"\n📊 {mode}")
+        print(f"  master: RSS {master['rss'] / 1024:.0f}MB, unique {master['uss'] / 1024:.0f}MB")
+        for pid, mem in workers.items():
+            print(f"  worker {pid}: RSS {mem['rss'] / 1024:.0f}MB, PSS {mem['pss'] / 1024:.0f}MB, "
+                  f"unique {mem['uss'] / 1024:.0f}MB")
+        totals[mode] = {
+            "uss": sum(mem['uss'] for mem in workers.values()) / max(1, len(workers)),
+            "pss": master['pss'] + sum(mem['pss'] for mem in workers.values()),
+        }
+
+    before, after = totals['per-worker load'], totals['preload + fork + gc.freeze']
+    print(f"\n✅ Unique memory per worker: {before['uss'] / 1024:.0f}MB -> {after['uss'] / 1024:.0f}MB")
+    print(f"✅ Total PSS (master + workers): {before['pss'] / 1024:.0f}MB -> {after['pss'] / 1024:.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Fit Model Feature Pruning Script
+Drops input columns the trained booster never splits on, remaps the trees to the
+slimmed column space and writes models/pruned/<original name>_pruned.pkl.
+The artifact is only written if its predictions are identical to the original's
+and a single prediction gets at least --min-speedup faster. TF-IDF vocabularies
+are only pruned without row normalisation; with norm='l2' every term counts
+towards the norm, so the feature-building cost (most of the latency) stays the
+same and often there is no gain to ship.
+
+models/pruned/ is outside the registry's ml_pipeline_xgboost_*.pkl pattern, so
+writing a pruned model never changes what is served. --promote also copies it
+into models/ under a new version, which the registry then serves as the latest.
+
+Usage:
+    python notebooks/prune_fit_model.py                        # latest xgboost artifact
+    python notebooks/prune_fit_model.py --model path.pkl --data pairs.csv
+    python notebooks/prune_fit_model.py --promote              # and serve it
+"""
+
+import argparse
+import copy
+import json
+import os
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import joblib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import warnings
+warnings.filterwarnings('ignore')
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PRUNED_DIR = os.path.join(ROOT, 'models', 'pruned')
+
+
+def used_positions(booster, feature_columns):
+    """Column positions the booster splits on at least once (everything else has zero gain)"""
+    used = booster.get_score(importance_type='weight')
+    return [i for i, name in enumerate(feature_columns) if name in used]
+
+
+def remap_booster(model, kept, new_columns):
+    """Rewrite split indices so the trees read from the slimmed column space"""
+    new_index = {old: new for new, old in enumerate(kept)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.json')
+        model.save_model(path)
+        with open(path) as f:
+            config = json.load(f)
+
+        learner = config['learner']
+        for tree in learner['gradient_booster']['model']['trees']:
+            tree['split_indices'] = [
+                new_index[idx] if left != -1 else 0
+                for idx, left in zip(tree['split_indices'], tree['left_children'])
+            ]
+            tree['tree_param']['num_feature'] = str(len(kept))
+        learner['learner_model_param']['num_feature'] = str(len(kept))
+        learner['feature_names'] = list(new_columns)
+        learner['feature_types'] = [learner['feature_types'][i] for i in kept]
+
+        with open(path, 'w') as f:
+            json.dump(config, f)
+        pruned = type(model)()
+        pruned.load_model(path)
+    return pruned
+
+
+def prune_vectorizers(vectorizers, new_columns):
+    """
+    Shrink vocabularies to the kept terms where that is exact. With row
+    normalisation (norm='l2') every term contributes to the norm, so those
+    vocabularies are kept whole and only the unused model columns are dropped.
+    """
+    renamed = {}
+    pruned = {}
+    kept_names = set(new_columns)
+
+    for col_name, vectorizer in vectorizers.items():
+        vectorizer = copy.deepcopy(vectorizer)
+        if getattr(vectorizer, 'stop_words_', None) is not None:
+            vectorizer.stop_words_ = None  # only needed for introspection, can be large
+
+        if vectorizer.norm is not None:
+            print(f"  • {col_name}: norm='{vectorizer.norm}' needs the full vocabulary, keeping {len(vectorizer.vocabulary_):,} terms")
+            pruned[col_name] = vectorizer
+            continue
+
+        terms = vectorizer.get_feature_names_out()
+        idf = vectorizer.idf_ if vectorizer.use_idf else None
+        kept_terms = [i for i in range(len(terms)) if f'{col_name}_tfidf_{i}' in kept_names]
+        for new, old in enumerate(kept_terms):
+            renamed[f'{col_name}_tfidf_{old}'] = f'{col_name}_tfidf_{new}'
+        vectorizer.vocabulary_ = {terms[old]: new for new, old in enumerate(kept_terms)}
+        if idf is not None:
+            vectorizer.idf_ = idf[kept_terms]
+            # The inner transformer validates input width against the old vocabulary
+            if hasattr(getattr(vectorizer, '_tfidf', None), 'n_features_in_'):
+                vectorizer._tfidf.n_features_in_ = len(kept_terms)
+        print(f"  • {col_name}: vocabulary {len(terms):,} -> {len(kept_terms):,} terms")
+        pruned[col_name] = vectorizer
+
+    return pruned, [renamed.get(name, name) for name in new_columns]
+
+
+def sample_pairs(classifier, data_path, n):
+    """Verification pairs: real data if given, otherwise texts drawn from the vocabularies"""
+    if data_path:
+        df = pd.read_parquet(data_path) if data_path.endswith('.parquet') else pd.read_csv(data_path)
+        df = df.fillna('').astype(str).head(n)
+        return df['resume_text'].tolist(), df['job_description_text'].tolist()
+
+    rng = random.Random(42)
+    vocab = {col: list(v.get_feature_names_out()) for col, v in classifier.vectorizers.items()}
+    with open(os.path.join(ROOT, 'dummy_resume.txt')) as f:
+        resumes = [f.read()]
+    jds = ["We need a Python developer with SQL and AWS experience."]
+    for _ in range(n - 1):
+        resumes.append(' '.join(rng.choices(vocab['resume_text'], k=rng.randint(20, 300))).title() + '.')
+        jds.append(' '.join(rng.choices(vocab['job_description_text'], k=rng.randint(10, 150))) + '!')
+    return resumes, jds
+
+
+def single_latency_ms(classifier, resumes, jds, repeats=3):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for resume, jd in zip(resumes, jds):
+            classifier.predict_advanced(resume, jd)
+    return (time.perf_counter() - start) / (repeats * len(resumes)) * 1000
+
+
+def compare_latency(original, pruned, resumes, jds, rounds=5):
+    """Best-of-rounds latency per pair for both models, measured alternately so drift hits both"""
+    before, after = [], []
+    for _ in range(rounds):
+        before.append(single_latency_ms(original, resumes, jds))
+        after.append(single_latency_ms(pruned, resumes, jds))
+    return min(before), min(after)
+
+
+def prune(original):
+    """The pruned pipeline dict for a loaded AdvancedFitClassifier (xgboost)"""
+    kept = used_positions(original.booster, original.feature_columns)
+    print(f"📊 Booster splits on {len(kept):,} of {len(original.feature_columns):,} input columns")
+
+    new_columns = [original.feature_columns[i] for i in kept]
+    vectorizers, new_columns = prune_vectorizers(original.vectorizers, new_columns)
+    data = {
+        **original.pipeline_data,
+        'model': remap_booster(original.model, kept, new_columns),
+        'vectorizers': vectorizers,
+        'feature_columns': new_columns,
+        'model_name': f"{original.pipeline_data.get('model_name', 'XGBoost')} (pruned)",
+        'pruned_from': os.path.basename(original.model_path),
+    }
+    data.pop('model_file', None)  # the remapped booster is pickled with the pipeline
+    return data
+
+
+def promote(path, models_dir):
+    """Copy a verified artifact into the registry's directory as a new (latest) version"""
+    target = os.path.join(models_dir, f"ml_pipeline_xgboost_{time.strftime('%Y%m%d_%H%M%S')}.pkl")
+    shutil.copyfile(path, target + '.tmp')
+    os.replace(target + '.tmp', target)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=None, help="artifact to prune (default: latest ml_pipeline_xgboost_*.pkl)")
+    parser.add_argument('--data', default=None, help="CSV/Parquet with resume_text, job_description_text for verification")
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--output-dir', default=PRUNED_DIR)
+    parser.add_argument('--min-speedup', type=float, default=0.05,
+                        help="required drop in single-prediction latency (fraction) to write the artifact")
+    parser.add_argument('--promote', action='store_true', help="also publish it to the registry (served as latest)")
+    args = parser.parse_args()
+
+    from fit_classifier import AdvancedFitClassifier
+
+    print("🚀 Starting Fit Model Feature Pruning...")
+    original = AdvancedFitClassifier(model_type='xgboost', model_path=args.model)
+    if not original.is_loaded:
+        print("❌ No xgboost fit model found.")
+        return
+
+    pruned_data = prune(original)
+
+    # Verify on a temporary copy before writing it
+    os.makedirs(args.output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(original.model_path))[0]
+    output_path = os.path.join(args.output_dir, f'{stem}_pruned.pkl')
+    tmp_path = output_path + '.tmp'
+    joblib.dump(pruned_data, tmp_path)
+    pruned = AdvancedFitClassifier(model_type='xgboost', model_path=tmp_path)
+
+    resumes, jds = sample_pairs(original, args.data, args.samples)
+    before = original.predict_proba_batch(resumes, jds)
+    after = pruned.predict_proba_batch(resumes, jds)
+    max_diff = float(np.abs(before - after).max())
+    latency_before, latency_after = compare_latency(original, pruned, resumes[:20], jds[:20])
+    size_after = os.path.getsize(tmp_path)
+
+    # Report
+    size = lambda obj: len(pickle.dumps(obj))
+    print(f"\n🎯 PRUNING RESULTS:")
+    print(f"=" * 50)
+    print(f"⚡ Input width: {len(original.feature_columns):,} -> {len(pruned.feature_columns):,} columns "
+          f"({len(original.feature_columns) * 4 / 1024:.1f} KB -> {len(pruned.feature_columns) * 4 / 1024:.1f} KB per row)")
+    print(f"💾 Artifact: {os.path.getsize(original.model_path) / 1e6:.2f} MB -> {size_after / 1e6:.2f} MB")
+    print(f"   Booster: {size(original.model) / 1e6:.2f} MB -> {size(pruned.model) / 1e6:.2f} MB | "
+          f"vectorizers: {size(original.vectorizers) / 1e6:.2f} MB -> {size(pruned.vectorizers) / 1e6:.2f} MB")
+    print(f"⏱️ Latency per pair: {latency_before:.2f}ms -> {latency_after:.2f}ms")
+
+    if max_diff != 0.0:
+        os.remove(tmp_path)
+        print(f"❌ Pruned predictions differ (max abs diff {max_diff:.2e}); artifact not written.")
+        return
+    print(f"✅ Identical predictions on {len(resumes)} pairs")
+    if latency_after > latency_before * (1 - args.min_speedup):
+        os.remove(tmp_path)
+        print(f"⚠️ No latency gain (needs {args.min_speedup:.0%}); artifact not written.")
+        return
+    os.replace(tmp_path, output_path)
+    print(f"\n💾 Pruned model saved to: {output_path}")
+
+    if args.promote:
+        print(f"🚀 Promoted to {promote(output_path, os.path.dirname(original.model_path))}")
+    else:
+        print("   Not served until promoted (--promote)")
+    return output_path
+
+
+if __name__ == "__main__":
+    main()
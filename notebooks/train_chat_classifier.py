@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Chat Classifier Training
+Trains the local intent / relevance classifier (src/chat_classifier.py) on the
+seed set and evaluates it on:
+
+- 5-fold cross-validation over the seed set
+- HELD_OUT: hand-written queries that share no template with the seed set
+
+For each confidence threshold it reports how many messages are decided
+locally (no LLM call) and how accurate those decisions are, plus per-message
+latency. The model is saved to models/chat_classifier.pkl and the report to
+models/chat_classifier_report.txt.
+
+Usage:
+    python notebooks/train_chat_classifier.py
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+import chat_classifier
+from chat_classifier import LABELS, ChatClassifier, build_pipeline, is_confident, load_jobs_data, seed_examples, train
+
+REPORT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models', 'chat_classifier_report.txt'))
+
+HELD_OUT = [
+    ("any openings for ML engineers in Bangalore?", "JOB_SEARCH"),
+    ("show data analyst jobs", "JOB_SEARCH"),
+    ("I want a job in computer vision", "JOB_SEARCH"),
+    ("looking for an NLP position", "JOB_SEARCH"),
+    ("data science internships", "JOB_SEARCH"),
+    ("Amazon SDE openings", "JOB_SEARCH"),
+    ("machine learning engineer", "JOB_SEARCH"),
+    ("jobs for freshers in AI", "JOB_SEARCH"),
+    ("part time python developer work", "JOB_SEARCH"),
+    ("deep learning roles at Nvidia", "JOB_SEARCH"),
+    ("cloud engineer vacancies in pune", "JOB_SEARCH"),
+    ("list some MLOps jobs", "JOB_SEARCH"),
+    ("are there research scientist openings", "JOB_SEARCH"),
+    ("LLM engineer jobs", "JOB_SEARCH"),
+    ("how do I get into data science", "ADVICE"),
+    ("is a masters degree worth it for ML", "ADVICE"),
+    ("what should I study to work in AI", "ADVICE"),
+    ("I'm a mechanical engineer, can I move to software?", "ADVICE"),
+    ("which language should I learn first", "ADVICE"),
+    ("how to prepare for a system design interview", "ADVICE"),
+    ("my resume gets no callbacks, what am I doing wrong", "ADVICE"),
+    ("best way to learn pytorch", "ADVICE"),
+    ("how important is leetcode for placements", "ADVICE"),
+    ("should I do a data science bootcamp", "ADVICE"),
+    ("how do I ask for a raise", "ADVICE"),
+    ("suggest a roadmap to become an NLP engineer", "ADVICE"),
+    ("what are the career options after BCA", "ADVICE"),
+    ("how can I become better at communication", "ADVICE"),
+    ("send me naked pictures", "BLOCKED"),
+    ("sexy chat please", "BLOCKED"),
+    ("xxx videos", "BLOCKED"),
+    ("dfghjk", "BLOCKED"),
+    ("qwertyuiop", "BLOCKED"),
+    ("zzzzxxxccc", "BLOCKED"),
+    ("kjdshfkjsdhf", "BLOCKED"),
+    ("porn sites", "BLOCKED"),
+    ("I hate women", "BLOCKED"),
+    ("nude girls", "BLOCKED"),
+]
+
+
+def latency_ms(fn, texts, repeats=20):
+    samples = []
+    for _ in range(repeats):
+        for text in texts:
+            started = time.perf_counter()
+            fn(text)
+            samples.append((time.perf_counter() - started) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def threshold_table(labels, predictions, probabilities, thresholds):
+    lines = [f"  {'route':>6} {'block':>6} {'decided locally':>16} {'accuracy (decided)':>19} {'wrong blocks':>13}"]
+    for threshold, block_threshold in thresholds:
+        decided = [is_confident(p, prob, threshold, block_threshold) for p, prob in zip(predictions, probabilities)]
+        hits = [p == l for p, l, d in zip(predictions, labels, decided) if d]
+        wrong_blocks = sum(d and p == "BLOCKED" and l != "BLOCKED" for p, l, d in zip(predictions, labels, decided))
+        accuracy = f"{np.mean(hits):.1%}" if hits else "-"
+        lines.append(f"  {threshold:>6.2f} {block_threshold:>6.2f} {np.mean(decided):>16.1%} {accuracy:>19} {wrong_blocks:>13}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=str(chat_classifier.CHAT_CLASSIFIER_PATH))
+    parser.add_argument('--report', default=REPORT_PATH)
+    args = parser.parse_args()
+
+    examples = seed_examples(load_jobs_data())
+    texts, labels = map(list, zip(*examples))
+    print(f"🌱 Seed set: {len(examples)} examples {dict(Counter(labels))}")
+
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    cv_proba = cross_val_predict(build_pipeline(), texts, labels, cv=cv, method='predict_proba')
+    classes = sorted(set(labels))
+    cv_predictions = [classes[i] for i in cv_proba.argmax(axis=1)]
+
+    started = time.perf_counter()
+    pipeline = train(examples)
+    train_seconds = time.perf_counter() - started
+    classifier = ChatClassifier(pipeline)
+
+    held_texts, held_labels = map(list, zip(*HELD_OUT))
+    held = [classifier.classify(text) for text in held_texts]
+    held_predictions = [label for label, _ in held]
+    held_probabilities = [prob for _, prob in held]
+    fast_p50, fast_p99 = latency_ms(classifier.classify, held_texts)
+    sklearn_p50, sklearn_p99 = latency_ms(lambda text: pipeline.predict_proba([text]), held_texts, repeats=3)
+
+    thresholds = [(0.5, 0.5), (0.6, 0.9), (0.7, 0.9), (0.8, 0.9), (0.9, 0.95)]
+    report = [
+        "Model: Chat intent / relevance classifier (word 1-2 + char_wb 2-4 TF-IDF, LogisticRegression)",
+        f"Timestamp: {time.strftime('%Y%m%d_%H%M%S')}",
+        f"Seed examples: {len(examples)} {dict(Counter(labels))}",
+        f"Training time: {train_seconds:.2f}s",
+        f"Latency per message: p50 {fast_p50:.3f}ms, p99 {fast_p99:.3f}ms "
+        f"(sklearn predict_proba: p50 {sklearn_p50:.3f}ms, p99 {sklearn_p99:.3f}ms)",
+        f"Defaults: CHAT_CLASSIFIER_THRESHOLD={chat_classifier.CHAT_CLASSIFIER_THRESHOLD}, "
+        f"CHAT_CLASSIFIER_BLOCK_THRESHOLD={chat_classifier.CHAT_CLASSIFIER_BLOCK_THRESHOLD}",
+        "",
+        "5-fold cross-validation (seed set)",
+        classification_report(labels, cv_predictions, labels=list(LABELS), digits=3),
+        *threshold_table(labels, cv_predictions, cv_proba.max(axis=1), thresholds),
+        "",
+        f"Held-out hand-written queries ({len(HELD_OUT)})",
+        classification_report(held_labels, held_predictions, labels=list(LABELS), digits=3, zero_division=0),
+        "Confusion matrix (rows: true " + ", ".join(LABELS) + ")",
+        str(confusion_matrix(held_labels, held_predictions, labels=list(LABELS))),
+        "",
+        *threshold_table(held_labels, held_predictions, held_probabilities, thresholds),
+        "",
+        "Held-out mistakes",
+        *[f"  {text!r}: {label} -> {prediction} ({prob:.2f})"
+          for text, label, prediction, prob in zip(held_texts, held_labels, held_predictions, held_probabilities)
+          if label != prediction],
+    ]
+    report = "\n".join(report)
+    print(report)
+
+    chat_classifier.save(pipeline, args.output)
+    with open(args.report, 'w') as f:
+        f.write(report + "\n")
+    print(f"\n✅ Saved model to {args.output} and report to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Sparse Out-of-Core Fit Model Training
+Trains the resume/JD fit XGBoost model without ever densifying the feature matrix:
+text is preprocessed once and cached to Parquet, features are built per chunk as
+CSR and streamed into a quantized xgb DMatrix through a DataIter.
+
+    --vectorizer hashing  stateless HashingVectorizer, fully streaming (use for large data,
+                          e.g. 1M pairs on a 16 GB machine)
+    --vectorizer tfidf    TF-IDF like ml_evaluation.py; the vocabulary fit holds all
+                          training text counts in memory, so keep it for small datasets
+
+The artifact is saved as models/ml_pipeline_xgboost_<timestamp>.pkl with
+sparse_input=True so fit_classifier feeds it CSR rows (zeros = missing, as in training).
+
+Usage:
+    python notebooks/train_fit_sparse.py --data pairs.parquet --vectorizer hashing
+    python notebooks/train_fit_sparse.py --external-memory   # page the quantized matrix to disk
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import joblib
+import xgboost as xgb
+from scipy.sparse import csr_matrix, hstack
+
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from fit_classifier import TEXT_COLUMNS, STAT_NAMES, preprocess_text, text_statistics
+
+import warnings
+warnings.filterwarnings('ignore')
+
+# Parquet I/O needs pyarrow (optional pandas dependency)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODEL_DIR = os.path.join(ROOT, 'models')
+HF_DATASET = "cnamuangtoun/resume-job-description-fit"
+
+# Bump when preprocess_text / text_statistics change so stale caches are rebuilt
+PREPROCESS_VERSION = 1
+STAT_COLUMNS = [f'{col}_{stat}' for col in TEXT_COLUMNS for stat in STAT_NAMES]
+
+
+# --- 1. Source data -----------------------------------------------------------
+
+def source_batches(path, batch_size):
+    """Yield raw (resume_text, job_description_text, label) DataFrames without loading everything"""
+    columns = TEXT_COLUMNS + ['label']
+    if path is None:
+        from datasets import load_dataset
+        dataset = load_dataset(HF_DATASET)
+        for split in dataset.keys():
+            for batch in dataset[split].iter(batch_size=batch_size):
+                yield pd.DataFrame(batch)[columns]
+    elif path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=batch_size)
+
+
+def cache_path_for(path, cache_dir):
+    """Cache file keyed by the source's identity, size/mtime and the preprocessing version"""
+    if path is None:
+        identity = HF_DATASET
+    else:
+        stat = os.stat(path)
+        identity = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    key = hashlib.sha1(f"{identity}|v{PREPROCESS_VERSION}".encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f'fit_pairs_{key}.parquet')
+
+
+def prepare_batch(batch):
+    """Processed text + statistics columns for a raw chunk (what the cache stores)"""
+    out = {'label': batch['label'].astype(str).values}
+    for col in TEXT_COLUMNS:
+        raw = batch[col].fillna('').astype(str)
+        processed = [preprocess_text(text) for text in raw]
+        out[f'{col}_processed'] = processed
+        stats = [text_statistics(r, p) for r, p in zip(raw, processed)]
+        for stat in STAT_NAMES:
+            out[f'{col}_{stat}'] = np.array([s[stat] for s in stats], dtype=np.float32)
+    return pd.DataFrame(out)
+
+
+def build_cache(path, cache_file, batch_size, max_rows=None):
+    """Preprocess text + statistics once, chunk by chunk, into a Parquet cache"""
+    writer = None
+    row_id = 0
+    tmp_file = cache_file + '.tmp'
+    try:
+        for batch in source_batches(path, batch_size):
+            if max_rows is not None and row_id >= max_rows:
+                break
+            if max_rows is not None:
+                batch = batch.head(max_rows - row_id)
+
+            prepared = prepare_batch(batch)
+            prepared.insert(0, 'row_id', np.arange(row_id, row_id + len(batch), dtype=np.int64))
+            table = pa.Table.from_pandas(prepared, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_file, table.schema)
+            writer.write_table(table)
+            row_id += len(batch)
+            print(f"  • preprocessed {row_id:,} pairs", end='\r')
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_file, cache_file)
+    print(f"\n💾 Cached preprocessed text to {cache_file}")
+
+
+def cached_batches(cache_file, batch_size, columns=None):
+    for batch in pq.ParquetFile(cache_file).iter_batches(batch_size=batch_size, columns=columns):
+        yield batch.to_pandas()
+
+
+# --- 2. Features --------------------------------------------------------------
+
+def make_vectorizers(kind, n_features):
+    if kind == 'hashing':
+        return {
+            col: HashingVectorizer(n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm='l2')
+            for col in TEXT_COLUMNS
+        }
+    # Same settings as the shipped TF-IDF model
+    return {
+        col: TfidfVectorizer(max_features=5000, ngram_range=(1, 2), min_df=2, max_df=0.95, sublinear_tf=True)
+        for col in TEXT_COLUMNS
+    }
+
+
+def fit_vectorizers(vectorizers, cache_file, batch_size, is_train):
+    """Fit TF-IDF vocabularies on training rows, streaming text out of the cache"""
+    for col, vectorizer in vectorizers.items():
+        if isinstance(vectorizer, HashingVectorizer):
+            continue
+        column = f'{col}_processed'
+        texts = (
+            text
+            for batch in cached_batches(cache_file, batch_size, ['row_id', column])
+            for text in batch.loc[is_train(batch['row_id'].values), column]
+        )
+        vectorizer.fit(texts)
+        print(f"  • {col}: {len(vectorizer.vocabulary_):,} TF-IDF terms")
+
+
+def fit_vectorizers_in_memory(vectorizers, prepared):
+    """Fit TF-IDF vocabularies on an already-loaded prepared frame (small datasets / CV folds)"""
+    for col, vectorizer in vectorizers.items():
+        if not isinstance(vectorizer, HashingVectorizer):
+            vectorizer.fit(prepared[f'{col}_processed'])
+
+
+def feature_columns(vectorizers):
+    columns = list(STAT_COLUMNS)
+    for col, vectorizer in vectorizers.items():
+        if isinstance(vectorizer, HashingVectorizer):
+            columns += [f'{col}_hash_{i}' for i in range(vectorizer.n_features)]
+        else:
+            columns += [f'{col}_tfidf_{i}' for i in range(len(vectorizer.vocabulary_))]
+    return columns
+
+
+def featurize(batch, vectorizers):
+    """Statistics + text features for a chunk, as float32 CSR (zeros are not stored)"""
+    blocks = [csr_matrix(batch[STAT_COLUMNS].to_numpy(dtype=np.float32))]
+    for col, vectorizer in vectorizers.items():
+        blocks.append(vectorizer.transform(batch[f'{col}_processed']))
+    X = hstack(blocks, format='csr', dtype=np.float32)
+    X.eliminate_zeros()
+    return X
+
+
+class PairBatches(xgb.DataIter):
+    """Streams featurized CSR chunks of one split (train/valid) from the Parquet cache"""
+
+    def __init__(self, cache_file, vectorizers, label_encoder, keep, batch_size, cache_prefix=None):
+        self.cache_file = cache_file
+        self.vectorizers = vectorizers
+        self.label_encoder = label_encoder
+        self.keep = keep
+        self.batch_size = batch_size
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def reset(self):
+        self._batches = None
+
+    def next(self, input_data):
+        if self._batches is None:
+            self._batches = cached_batches(self.cache_file, self.batch_size)
+        for batch in self._batches:
+            batch = batch[self.keep(batch['row_id'].values)]
+            if len(batch) == 0:
+                continue
+            input_data(
+                data=featurize(batch, self.vectorizers),
+                label=self.label_encoder.transform(batch['label']),
+            )
+            return True
+        return False
+
+
+# --- 3. Training --------------------------------------------------------------
+
+def peak_rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except Exception:
+        return float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=None, help="CSV/Parquet with resume_text, job_description_text, label (default: HuggingFace)")
+    parser.add_argument('--cache-dir', default=os.path.join(ROOT, 'notebooks', '.cache'))
+    parser.add_argument('--vectorizer', choices=['tfidf', 'hashing'], default='tfidf')
+    parser.add_argument('--n-features', type=int, default=2 ** 16, help="hash buckets per text column")
+    parser.add_argument('--batch-size', type=int, default=20000)
+    parser.add_argument('--max-rows', type=int, default=None)
+    parser.add_argument('--valid-every', type=int, default=5, help="every Nth pair goes to validation")
+    parser.add_argument('--rounds', type=int, default=300)
+    parser.add_argument('--early-stopping', type=int, default=20)
+    parser.add_argument('--max-depth', type=int, default=9)
+    parser.add_argument('--learning-rate', type=float, default=0.2)
+    parser.add_argument('--max-bin', type=int, default=256)
+    parser.add_argument('--external-memory', action='store_true', help="page the quantized matrix to --cache-dir")
+    args = parser.parse_args()
+
+    if pq is None:
+        print("❌ pyarrow is required for the Parquet cache (pip install pyarrow).")
+        return
+
+    print("🚀 Starting Sparse Fit Model Training...")
+    os.makedirs(args.cache_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    # Preprocess once; reuse between runs
+    cache_file = cache_path_for(args.data, args.cache_dir)
+    if args.max_rows is not None:
+        cache_file = cache_file.replace('.parquet', f'_{args.max_rows}.parquet')
+    if os.path.exists(cache_file):
+        print(f"♻️ Using cached preprocessed text: {cache_file}")
+    else:
+        print("🔧 Preprocessing text...")
+        build_cache(args.data, cache_file, args.batch_size, args.max_rows)
+
+    is_valid = lambda row_ids: row_ids % args.valid_every == 0
+    is_train = lambda row_ids: row_ids % args.valid_every != 0
+
+    # Labels (only the label column is read)
+    labels = pd.concat(b['label'] for b in cached_batches(cache_file, args.batch_size, ['label']))
+    le = LabelEncoder().fit(labels)
+    target_names = le.classes_.tolist()
+    print(f"📊 {len(labels):,} pairs | classes: {target_names}")
+
+    vectorizers = make_vectorizers(args.vectorizer, args.n_features)
+    fit_vectorizers(vectorizers, cache_file, args.batch_size, is_train)
+    columns = feature_columns(vectorizers)
+    print(f"⚡ Features: {len(columns):,} ({args.vectorizer}, sparse)")
+
+    # Quantized matrices built chunk by chunk; the raw CSR never exists as a whole
+    prefix = os.path.join(args.cache_dir, 'xgb_extmem') if args.external_memory else None
+    train_iter = PairBatches(cache_file, vectorizers, le, is_train, args.batch_size, cache_prefix=prefix)
+    valid_iter = PairBatches(cache_file, vectorizers, le, is_valid, args.batch_size)
+    if args.external_memory:
+        dtrain = xgb.ExtMemQuantileDMatrix(train_iter, max_bin=args.max_bin)
+    else:
+        dtrain = xgb.QuantileDMatrix(train_iter, max_bin=args.max_bin)
+    dvalid = xgb.QuantileDMatrix(valid_iter, ref=dtrain)
+    print(f"📦 Train: {dtrain.num_row():,} x {dtrain.num_col():,} | Valid: {dvalid.num_row():,}")
+
+    params = {
+        'objective': 'multi:softprob',
+        'num_class': len(target_names),
+        'max_depth': args.max_depth,
+        'learning_rate': args.learning_rate,
+        'subsample': 1.0,
+        'tree_method': 'hist',
+        'max_bin': args.max_bin,
+        'eval_metric': 'mlogloss',
+        'nthread': os.cpu_count() or 1,
+        'seed': 42,
+    }
+
+    print("🏆 Training XGBoost on sparse input...")
+    booster = xgb.train(
+        params, dtrain,
+        num_boost_round=args.rounds,
+        evals=[(dvalid, 'valid')],
+        early_stopping_rounds=args.early_stopping,
+        verbose_eval=25,
+    )
+    booster = booster[: booster.best_iteration + 1]
+
+    y_valid = dvalid.get_label().astype(int)
+    proba = booster.predict(dvalid)
+    accuracy = accuracy_score(y_valid, proba.argmax(axis=1))
+    try:
+        auc_score = roc_auc_score(y_valid, proba, multi_class='ovr', average='weighted')
+    except ValueError:
+        auc_score = 0.0
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    pipeline_data = {
+        'model': booster,
+        'vectorizers': vectorizers,
+        'label_encoder': le,
+        'feature_columns': columns,
+        'target_names': target_names,
+        'model_name': f'XGBoost (sparse, {args.vectorizer})',
+        'sparse_input': True,
+        'timestamp': timestamp,
+        'performance_metrics': {
+            'accuracy': accuracy,
+            'auc_score': auc_score,
+            'best_params': {k: params[k] for k in ('max_depth', 'learning_rate', 'subsample', 'max_bin')},
+            'best_iteration': booster.num_boosted_rounds(),
+        },
+    }
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    pipeline_path = os.path.join(MODEL_DIR, f'ml_pipeline_xgboost_{timestamp}.pkl')
+    joblib.dump(pipeline_data, pipeline_path)
+
+    print(f"\n🎯 FINAL RESULTS:")
+    print(f"=" * 50)
+    print(f"🎯 Validation Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)")
+    print(f"📈 ROC AUC Score: {auc_score:.4f}")
+    print(f"🌲 Trees per class: {booster.num_boosted_rounds()}")
+    print(f"⏱️ Wall time: {time.perf_counter() - start:.1f}s | Peak RSS: {peak_rss_mb():,.0f} MB")
+    print(f"\n💾 Model saved to: {pipeline_path}")
+
+    return pipeline_path, accuracy, auc_score
+
+
+if __name__ == "__main__":
+    main()
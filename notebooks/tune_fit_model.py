@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Parallel Fit Model Hyperparameter Search
+Random search over XGBoost parameters for the resume/JD fit model:
+  • candidates run across a process pool, each with early stopping on its validation fold
+  • the whole search stops at a wall-clock budget (running candidates stop at their next round)
+  • fold-level featurized matrices are cached to disk and shared by every candidate
+
+Outputs (models/):
+  fit_xgboost_<timestamp>.ubj               best booster refit on all data, XGBoost native format
+  ml_pipeline_xgboost_<timestamp>.pkl       vectorizers/labels pointing at the .ubj (loaded by fit_classifier)
+  tuning_leaderboard_<timestamp>.csv        every finished candidate: accuracy, logloss, rounds, latency
+                                            (candidates that raised are listed with status=failed)
+
+Usage:
+    python notebooks/tune_fit_model.py --data pairs.csv --n-iter 40 --budget 900 --workers 4
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import joblib
+import xgboost as xgb
+from scipy.sparse import load_npz, save_npz
+
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import ParameterSampler, StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from train_fit_sparse import (
+    HF_DATASET, PREPROCESS_VERSION, feature_columns, featurize, fit_vectorizers_in_memory,
+    make_vectorizers, prepare_batch, source_batches,
+)
+
+import warnings
+warnings.filterwarnings('ignore')
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODEL_DIR = os.path.join(ROOT, 'models')
+
+PARAM_SPACE = {
+    'max_depth': [4, 6, 9, 12],
+    'learning_rate': [0.05, 0.1, 0.2, 0.3],
+    'subsample': [0.7, 0.85, 1.0],
+    'colsample_bytree': [0.3, 0.5, 0.8, 1.0],
+    'min_child_weight': [1, 3, 5],
+    'reg_lambda': [1.0, 5.0, 10.0],
+}
+
+
+# --- Fold cache ---------------------------------------------------------------
+
+def fold_cache_dir(args, n_rows):
+    identity = HF_DATASET
+    if args.data:
+        stat = os.stat(args.data)
+        identity = f"{os.path.abspath(args.data)}|{stat.st_size}|{stat.st_mtime_ns}"
+    key = f"{identity}|{n_rows}|{args.vectorizer}|{args.n_features}|{args.folds}|{args.seed}|v{PREPROCESS_VERSION}"
+    return os.path.join(args.cache_dir, 'folds_' + hashlib.sha1(key.encode()).hexdigest()[:16])
+
+
+def fold_splits(y, n_folds, seed):
+    if n_folds == 1:
+        train_idx, valid_idx = train_test_split(np.arange(len(y)), test_size=0.2, random_state=seed, stratify=y)
+        return [(train_idx, valid_idx)]
+    return list(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed).split(np.zeros(len(y)), y))
+
+
+def build_fold_cache(prepared, y, args, cache_dir):
+    """Featurize every fold once (vectorizers fit on the fold's training part only)"""
+    if os.path.exists(os.path.join(cache_dir, 'done')):
+        print(f"♻️ Using cached fold matrices: {cache_dir}")
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    for k, (train_idx, valid_idx) in enumerate(fold_splits(y, args.folds, args.seed)):
+        vectorizers = make_vectorizers(args.vectorizer, args.n_features)
+        fit_vectorizers_in_memory(vectorizers, prepared.iloc[train_idx])
+        for split, idx in (('train', train_idx), ('valid', valid_idx)):
+            save_npz(os.path.join(cache_dir, f'fold{k}_{split}_X.npz'), featurize(prepared.iloc[idx], vectorizers))
+            np.save(os.path.join(cache_dir, f'fold{k}_{split}_y.npy'), y[idx])
+        print(f"  • fold {k}: {len(train_idx):,} train / {len(valid_idx):,} valid")
+    open(os.path.join(cache_dir, 'done'), 'w').close()
+    print(f"💾 Cached fold matrices to {cache_dir}")
+
+
+# --- Worker side --------------------------------------------------------------
+
+_FOLDS = {}  # per-process DMatrix cache, built on first use
+
+
+def load_fold(cache_dir, k):
+    if (cache_dir, k) not in _FOLDS:
+        _FOLDS[(cache_dir, k)] = tuple(
+            xgb.DMatrix(
+                load_npz(os.path.join(cache_dir, f'fold{k}_{split}_X.npz')),
+                label=np.load(os.path.join(cache_dir, f'fold{k}_{split}_y.npy')),
+            )
+            for split in ('train', 'valid')
+        )
+    return _FOLDS[(cache_dir, k)]
+
+
+class WallClockBudget(xgb.callback.TrainingCallback):
+    """Stop boosting once the search deadline has passed"""
+
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+        self.hit = False
+
+    def after_iteration(self, model, epoch, evals_log):
+        self.hit = time.time() >= self.deadline
+        return self.hit
+
+
+def single_row_latency_ms(booster, dvalid, n=50):
+    """p50 latency of one-row predictions (DMatrix construction included, as in serving)"""
+    X = dvalid.get_data()[:n]
+    timings = []
+    for i in range(X.shape[0]):
+        start = time.perf_counter()
+        booster.predict(xgb.DMatrix(X[i]), validate_features=False)
+        timings.append(time.perf_counter() - start)
+    return float(np.percentile(np.array(timings) * 1000, 50))
+
+
+def evaluate_candidate(candidate_id, params, cache_dir, n_folds, n_classes, args, deadline, nthread):
+    """Train one candidate on every fold with early stopping; returns a leaderboard row"""
+    start = time.perf_counter()
+    train_params = {
+        **params,
+        'objective': 'multi:softprob',
+        'num_class': n_classes,
+        'tree_method': 'hist',
+        'eval_metric': 'mlogloss',
+        'nthread': nthread,
+        'seed': args.seed,
+    }
+
+    accuracies, aucs, losses, rounds = [], [], [], []
+    budget_hit = False
+    for k in range(n_folds):
+        if time.time() >= deadline:
+            budget_hit = True
+            break
+        dtrain, dvalid = load_fold(cache_dir, k)
+        budget = WallClockBudget(deadline)
+        booster = xgb.train(
+            train_params, dtrain,
+            num_boost_round=args.max_rounds,
+            evals=[(dvalid, 'valid')],
+            callbacks=[budget, xgb.callback.EarlyStopping(rounds=args.early_stopping, save_best=True)],
+            verbose_eval=False,
+        )
+        budget_hit = budget_hit or budget.hit
+
+        y_valid = dvalid.get_label().astype(int)
+        proba = booster.predict(dvalid)
+        accuracies.append(accuracy_score(y_valid, proba.argmax(axis=1)))
+        try:
+            aucs.append(roc_auc_score(y_valid, proba, multi_class='ovr', average='weighted'))
+        except ValueError:
+            aucs.append(np.nan)
+        losses.append(float(booster.attributes().get('best_score', np.nan)))
+        rounds.append(booster.num_boosted_rounds())
+
+    if not accuracies:
+        return None
+
+    return {
+        'candidate': candidate_id,
+        **params,
+        'accuracy': float(np.mean(accuracies)),
+        'accuracy_std': float(np.std(accuracies)),
+        'auc_score': float(np.nanmean(aucs)),
+        'valid_mlogloss': float(np.mean(losses)),
+        'rounds': int(round(np.mean(rounds))),
+        'latency_p50_ms': single_row_latency_ms(booster, dvalid),
+        'folds_done': len(accuracies),
+        'budget_hit': budget_hit,
+        'train_seconds': time.perf_counter() - start,
+    }
+
+
+# --- Search -------------------------------------------------------------------
+
+LEADERBOARD_COLUMNS = [
+    'candidate', 'status', *PARAM_SPACE, 'accuracy', 'accuracy_std', 'auc_score', 'valid_mlogloss', 'rounds',
+    'latency_p50_ms', 'folds_done', 'budget_hit', 'train_seconds', 'error',
+]
+
+
+def candidate_row(future, candidate_id, candidates):
+    """Leaderboard row of a finished future; a candidate that raised is recorded as failed, not fatal"""
+    try:
+        row = future.result()
+    except Exception as e:  # bad parameter combination, worker out of memory, ...
+        print(f"  #{candidate_id:<3} ❌ failed: {type(e).__name__}: {e}")
+        return {'candidate': candidate_id, 'status': 'failed', **candidates[candidate_id],
+                'error': f"{type(e).__name__}: {e}"}
+    return row and {**row, 'status': 'ok'}
+
+def run_search(candidates, cache_dir, n_classes, args):
+    deadline = time.time() + args.budget
+    nthread = max(1, (os.cpu_count() or 1) // args.workers)
+    rows = []
+
+    pool = ProcessPoolExecutor(max_workers=args.workers)
+    futures = {
+        pool.submit(evaluate_candidate, i, params, cache_dir, args.folds, n_classes, args, deadline, nthread): i
+        for i, params in enumerate(candidates)
+    }
+    done = set()
+    try:
+        for future in as_completed(futures, timeout=max(0.0, deadline - time.time())):
+            done.add(future)
+            row = candidate_row(future, futures[future], candidates)
+            if row is None:
+                continue
+            rows.append(row)
+            if row['status'] == 'ok':
+                print(f"  #{row['candidate']:<3} acc={row['accuracy']:.4f} logloss={row['valid_mlogloss']:.4f} "
+                      f"rounds={row['rounds']:<4} p50={row['latency_p50_ms']:.2f}ms ({row['train_seconds']:.1f}s)")
+    except FuturesTimeout:
+        print(f"⏱️ Budget of {args.budget:.0f}s reached, stopping search")
+        for future in futures:
+            future.cancel()
+        # Running candidates see the passed deadline at their next boosting round
+        for future in futures:
+            if future not in done and not future.cancelled():
+                row = candidate_row(future, futures[future], candidates)
+                if row is not None:
+                    rows.append(row)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    leaderboard = pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS)
+    failed = int((leaderboard['status'] == 'failed').sum())
+    print(f"✅ {len(rows) - failed} of {len(candidates)} candidates finished" + (f", {failed} failed" if failed else ""))
+    return leaderboard
+
+
+def refit_best(prepared, y, le, best, args, timestamp):
+    """Refit the winning parameters on all pairs and save the native booster + pipeline file"""
+    vectorizers = make_vectorizers(args.vectorizer, args.n_features)
+    fit_vectorizers_in_memory(vectorizers, prepared)
+    dtrain = xgb.DMatrix(featurize(prepared, vectorizers), label=y)
+
+    params = {name: best[name] for name in PARAM_SPACE}
+    params = {k: (int(v) if k in ('max_depth', 'min_child_weight') else float(v)) for k, v in params.items()}
+    booster = xgb.train(
+        {**params, 'objective': 'multi:softprob', 'num_class': len(le.classes_), 'tree_method': 'hist',
+         'nthread': os.cpu_count() or 1, 'seed': args.seed},
+        dtrain,
+        num_boost_round=int(best['rounds']),
+    )
+
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    model_file = f'fit_xgboost_{timestamp}.ubj'
+    booster.save_model(os.path.join(MODEL_DIR, model_file))
+
+    pipeline_data = {
+        'model': None,
+        'model_file': model_file,
+        'vectorizers': vectorizers,
+        'label_encoder': le,
+        'feature_columns': feature_columns(vectorizers),
+        'target_names': le.classes_.tolist(),
+        'model_name': f'XGBoost (tuned, {args.vectorizer})',
+        'sparse_input': True,
+        'timestamp': timestamp,
+        'performance_metrics': {
+            'accuracy': float(best['accuracy']),
+            'auc_score': float(best['auc_score']),
+            'best_params': {**params, 'n_estimators': int(best['rounds'])},
+            'cv_folds': args.folds,
+        },
+    }
+    pipeline_path = os.path.join(MODEL_DIR, f'ml_pipeline_xgboost_{timestamp}.pkl')
+    joblib.dump(pipeline_data, pipeline_path)
+    return pipeline_path, os.path.join(MODEL_DIR, model_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=None, help="CSV/Parquet with resume_text, job_description_text, label (default: HuggingFace)")
+    parser.add_argument('--cache-dir', default=os.path.join(ROOT, 'notebooks', '.cache'))
+    parser.add_argument('--vectorizer', choices=['tfidf', 'hashing'], default='tfidf')
+    parser.add_argument('--n-features', type=int, default=2 ** 16, help="hash buckets per text column")
+    parser.add_argument('--folds', type=int, default=3, help="CV folds (1 = single 80/20 validation split)")
+    parser.add_argument('--n-iter', type=int, default=20, help="candidates to sample")
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument('--budget', type=float, default=600, help="wall-clock budget for the search, seconds")
+    parser.add_argument('--max-rounds', type=int, default=500)
+    parser.add_argument('--early-stopping', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print("🚀 Starting Parallel Fit Model Tuning...")
+
+    print("📊 Loading dataset...")
+    prepared = pd.concat([prepare_batch(b) for b in source_batches(args.data, 20000)], ignore_index=True)
+    le = LabelEncoder()
+    y = le.fit_transform(prepared['label'])
+    print(f"Dataset loaded: {len(prepared):,} pairs | classes: {le.classes_.tolist()}")
+
+    print("🔧 Featurizing folds...")
+    cache_dir = fold_cache_dir(args, len(prepared))
+    build_fold_cache(prepared, y, args, cache_dir)
+
+    candidates = list(ParameterSampler(PARAM_SPACE, n_iter=args.n_iter, random_state=args.seed))
+    print(f"🏆 Searching {len(candidates)} candidates on {args.workers} workers "
+          f"(budget {args.budget:.0f}s, early stopping {args.early_stopping} rounds)...")
+    leaderboard = run_search(candidates, cache_dir, len(le.classes_), args)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    leaderboard_path = os.path.join(MODEL_DIR, f'tuning_leaderboard_{timestamp}.csv')
+    leaderboard = leaderboard.sort_values(['accuracy', 'latency_p50_ms'], ascending=[False, True]).reset_index(drop=True)
+    if not leaderboard.empty:
+        leaderboard.to_csv(leaderboard_path, index=False)
+
+    finished = leaderboard[leaderboard['status'] == 'ok'].reset_index(drop=True)
+    if finished.empty:
+        print("❌ No candidate finished within the budget.")
+        if not leaderboard.empty:
+            print(f"📄 Leaderboard saved to: {leaderboard_path}")
+        return
+
+    best = finished.iloc[0]
+    print("🔁 Refitting best candidate on all pairs...")
+    pipeline_path, model_path = refit_best(prepared, y, le, best, args, timestamp)
+
+    print(f"\n🎯 TUNING RESULTS:")
+    print(f"=" * 50)
+    print(finished[['candidate', 'accuracy', 'auc_score', 'valid_mlogloss', 'rounds', 'latency_p50_ms', 'train_seconds']]
+          .head(10).to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+    print(f"\n⭐ Best: " + ', '.join(f"{name}={best[name]}" for name in PARAM_SPACE) + f", rounds={best['rounds']}")
+    print(f"🎯 CV Accuracy: {best['accuracy']:.4f} ({best['accuracy']*100:.2f}%) | AUC: {best['auc_score']:.4f}")
+    print(f"\n💾 Booster saved to: {model_path}")
+    print(f"💾 Pipeline saved to: {pipeline_path}")
+    print(f"📄 Leaderboard saved to: {leaderboard_path}")
+
+    return pipeline_path, leaderboard_path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Batch helpers for the tabular prediction endpoints
+Rows are validated one by one against the endpoint's input model, scored with a
+single vectorized predict call, and failures are reported per row instead of
+failing the whole request.
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from inference_adapter import n_rows
+
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "10000"))
+
+
+class BatchRequest(BaseModel):
+    items: List[Dict[str, Any]]
+    email: Optional[str] = None  # Added for tracking (one log entry per batch)
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+def validate_rows(schema, items):
+    """
+    Parse each raw item with `schema`.
+    Returns (indices of valid items, parsed rows, {item index: error message}).
+    """
+    indices, rows, errors = [], [], {}
+    for i, item in enumerate(items):
+        try:
+            rows.append(schema(**item))
+            indices.append(i)
+        except ValidationError as e:
+            errors[i] = _validation_message(e)
+        except TypeError:
+            errors[i] = "Each item must be a JSON object"
+    return indices, rows, errors
+
+
+def _row(X, i):
+    if isinstance(X, dict):
+        return {column: values[i:i + 1] for column, values in X.items()}
+    return X[i:i + 1]
+
+
+def predict_rows(predict_fn, X):
+    """
+    Call predict_fn once on the whole batch. If that raises, fall back to
+    row-by-row calls so a single bad row does not take the others down.
+    X is an array, a DataFrame or a {column: values} dict.
+    Returns (per-row outputs, {row position: error message}); errored rows are None.
+    """
+    try:
+        return list(predict_fn(X)), {}
+    except Exception:
+        outputs, errors = [], {}
+        for i in range(n_rows(X)):
+            try:
+                outputs.append(predict_fn(_row(X, i))[0])
+            except Exception as e:
+                outputs.append(None)
+                errors[i] = str(e)
+        return outputs, errors
+
+
+def _check_size(items):
+    if len(items) > MAX_BATCH_ROWS:
+        raise ValueError(f"Batch too large: {len(items)} items (max {MAX_BATCH_ROWS})")
+
+
+def run_batch(schema, items, score_rows):
+    """
+    Validate, score and assemble a batch response in input order.
+    `score_rows(rows)` returns (result dicts aligned with rows, {row position: error message}).
+    """
+    _check_size(items)
+    indices, rows, errors = validate_rows(schema, items)
+    return _batch_response(items, indices, errors, score_rows(rows) if rows else ([], {}))
+
+
+async def run_batch_async(schema, items, score_rows):
+    """run_batch for an async `score_rows` (awaited once for the whole batch)"""
+    _check_size(items)
+    indices, rows, errors = validate_rows(schema, items)
+    return _batch_response(items, indices, errors, await score_rows(rows) if rows else ([], {}))
+
+
+def _batch_response(items, indices, errors, scored_rows):
+    scored, row_errors = scored_rows
+    results = {}
+    for position, index in enumerate(indices):
+        if position in row_errors:
+            errors[index] = row_errors[position]
+        else:
+            results[index] = scored[position]
+
+    return {
+        "count": len(items),
+        "succeeded": len(results),
+        "failed": len(errors),
+        "results": [
+            {"index": i, "status": "success", **results[i]} if i in results
+            else {"index": i, "status": "error", "message": errors[i]}
+            for i in range(len(items))
+        ],
+    }
@@ -0,0 +1,187 @@
+"""
+Career chatbot: at most one structured LLM call per message
+The assistant used to ask Gemini three or four times in a row per message
+(intent, relevance guard, answer, generated jobs). Messages the local
+classifier (chat_classifier) is confident about are routed without Gemini and
+only need an answer (blocking also needs the keyword rules to agree); the rest
+get a single prompt that returns intent, relevance and answer together as
+JSON, validated with ChatReply. When the LLM is unavailable or returns
+something invalid, local_reply builds the same shape from keyword rules.
+"""
+import re
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+ADVICE_SUGGESTIONS = ["Data Scientist", "NLP Engineer", "MLOps Analyst"]
+BLOCKED_SUGGESTIONS = ["Data Science", "Machine Learning", "NLP"]
+EXPLORE_SUGGESTIONS = ["Data Science", "Machine Learning", "NLP", "Computer Vision"]
+
+_FILLER_WORDS = re.compile(r"\b(jobs|roles|openings|tell|me|about|find|search|for)\b")
+_ADVICE_WORDS = re.compile(r"\b(how|what|why|should|can i|could|advice|career|start|learn|become|tips|roadmap|guide|switch|help me)\b")
+_BLOCKED_WORDS = re.compile(r"\b(sax|sex|sexy|porn|nudes?|xxx)\b")
+
+
+class GeneratedRole(BaseModel):
+    job_title: str = "Software Engineer"
+    company: str = "Tech Firm"
+    location: str = ""
+    package: str = ""
+    skills: List[str] = []
+    description: str = ""
+
+
+class ChatReply(BaseModel):
+    intent: Literal["JOB_SEARCH", "ADVICE"]
+    relevant: bool
+    response: str
+    roles: List[GeneratedRole] = []
+
+
+class ChatAnswer(BaseModel):
+    response: str
+    roles: List[GeneratedRole] = []
+
+
+def match_jobs(query, jobs_data):
+    """Roles from jobs.json whose domain or title matches the query (lowercased)"""
+    matches = []
+    clean_query = clean_job_query(query)
+    for category in jobs_data.get("machine_learning_jobs", []):
+        domain = category.get("domain", "").lower()
+        if clean_query and (clean_query in domain or domain in clean_query):
+            matches.extend(category.get("roles", []))
+            continue
+
+        for role in category.get("roles", []):
+            title = role.get("job_title", "").lower()
+            if clean_query and (clean_query in title or title in clean_query):
+                matches.append(role)
+    return matches
+
+
+def clean_job_query(query):
+    return _FILLER_WORDS.sub("", query).strip()
+
+
+ADVICE_TASK = """Provide a helpful, conversational and specific career advice response, encouraging and under 60 words.
+       If they ask "what can i do", suggest exploring domains like Data Science, NLP, or MLOps based on current trends. Do NOT list jobs."""
+
+
+def _job_task(matches):
+    if matches:
+        context = "\n".join(f"- Role: {m['job_title']} at {m.get('company', 'Tech Company')}. "
+                            f"Package: {m.get('package', 'N/A')}. Skills: {', '.join(m.get('skills', []))}"
+                            for m in matches[:5])
+        return f"""Matched Jobs from our database:
+    {context}
+       Be a helpful Career Advisor and list the top 3 with Title, Company, Package (max 50 words). Leave "roles" empty."""
+    return """No jobs matched in our database.
+       Put 3 realistic tech job listings for this query in "roles" and keep "response" to one short sentence."""
+
+
+ROLES_FORMAT = '''"roles": [{ "job_title": "...", "company": "...", "location": "...", "package": "...", "skills": ["..."], "description": "..." }]'''
+
+
+def build_prompt(query, matches):
+    """One prompt for intent, relevance and the answer (plus generated roles when nothing matched locally)"""
+    return f"""
+    You are a Career Assistant. User Query: "{query}"
+
+    1. intent: is the user looking for specific job/role listings (JOB_SEARCH) or asking a general career/personal advice question (ADVICE)?
+       Examples:
+       - "NLP jobs" -> JOB_SEARCH
+       - "what can i do" -> ADVICE
+       - "how to start a career in AI" -> ADVICE
+       - "Data Scientist roles in Google" -> JOB_SEARCH
+    2. relevant: is the query potentially related to a job search, career advice, professional skills, technology, or general self-improvement?
+       - ALLOW: "nlp", "jobs", "what can i do", "advice", "Help", "learning", "roadmaps".
+       - BLOCK ONLY: "sax", explicit sexual content, hate speech, or complete gibberish (e.g., "asdfgh").
+    3. response:
+       - If intent is ADVICE: {ADVICE_TASK}
+       - If intent is JOB_SEARCH: {_job_task(matches)}
+       - If not relevant: an empty string.
+
+    Output JSON format:
+    {{"intent": "JOB_SEARCH" or "ADVICE", "relevant": true or false, "response": "...",
+      {ROLES_FORMAT}}}
+    """
+
+
+def build_answer_prompt(query, matches, intent):
+    """The answer only, for messages the local classifier already routed"""
+    return f"""
+    You are a Career Assistant. User Query: "{query}"
+    TASK: {ADVICE_TASK if intent == "ADVICE" else _job_task(matches)}
+
+    Output JSON format:
+    {{"response": "...", {ROLES_FORMAT}}}
+    """
+
+
+_KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+
+
+def _is_mashing(word):
+    # Runs of adjacent keys ("asdfgh", "qwerty") or long runs without vowels ("xkcdqzt")
+    if len(word) >= 4 and any(word in row or word in row[::-1] for row in _KEYBOARD_ROWS):
+        return True
+    return len(word) > 4 and not re.search(r"[aeiouy]", word)
+
+
+def _is_gibberish(query):
+    words = re.findall(r"[a-z]+", query)
+    return not words or all(_is_mashing(word) for word in words)
+
+
+def _blocked_by_rules(query):
+    query = query.lower().strip()
+    return bool(_BLOCKED_WORDS.search(query) or _is_gibberish(query))
+
+
+def local_reply(query, matches):
+    """Keyword-based ChatReply for when the LLM is unavailable"""
+    relevant = not _blocked_by_rules(query)
+    query = query.lower().strip()
+    intent = "ADVICE" if _ADVICE_WORDS.search(query) and not matches else "JOB_SEARCH"
+    if intent == "ADVICE":
+        response = ("That's a great question! I recommend exploring emerging fields in AI like Generative AI, "
+                    "MLOps, or Data Engineering. What specific area are you most interested in?")
+    elif matches:
+        response = f"I found some roles related to '{clean_job_query(query)}':"
+    else:
+        response = ""
+    return ChatReply(intent=intent, relevant=relevant, response=response)
+
+
+async def chat_reply(query, matches):
+    """
+    ChatReply for a message. The local classifier routes confident messages
+    (blocked ones need no LLM call at all, routed ones only an answer); the rest
+    get the combined prompt. Falls back to local_reply when no model returns
+    output that validates.
+    """
+    from llm_cache import LLM_CACHE_SHORT_TTL
+    from llm_utils import get_ai_json_async
+    from chat_classifier import classify
+
+    routed = classify(query)
+    if routed is not None and routed[0] == "BLOCKED":
+        # A wrong block loses the user, so the classifier alone is not enough: the keyword /
+        # gibberish rules must agree, otherwise the LLM decides (e.g. unseen acronyms like "vlsi")
+        if _blocked_by_rules(query):
+            return ChatReply(intent="JOB_SEARCH", relevant=False, response="")
+        routed = None
+
+    # Validated in get_ai_json_async (a wrong shape tries the next model and is never cached);
+    # when every attempt fails, the local reply comes back as the fallback data
+    if routed is not None:
+        intent = routed[0]
+        fallback = local_reply(query, matches).model_dump(include={"response", "roles"})
+        data = await get_ai_json_async(build_answer_prompt(query, matches, intent), fallback_data=fallback,
+                                       ttl=LLM_CACHE_SHORT_TTL, schema_version="chat-answer-2", schema=ChatAnswer)
+        return ChatReply(intent=intent, relevant=True, **ChatAnswer.model_validate(data).model_dump())
+
+    data = await get_ai_json_async(build_prompt(query, matches), fallback_data=local_reply(query, matches).model_dump(),
+                                   ttl=LLM_CACHE_SHORT_TTL, schema_version="chat-reply-2", schema=ChatReply)
+    return ChatReply.model_validate(data)
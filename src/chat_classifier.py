@@ -0,0 +1,275 @@
+"""
+Local intent / relevance classifier for the chatbot
+Decides JOB_SEARCH vs ADVICE vs BLOCKED (sexual content, hate, gibberish) for
+a chat message in-process, so routing needs no Gemini call. Word and
+character n-gram TF-IDF features feed a logistic regression trained on a seed
+set built from the examples and rules in the chat prompt (chat_assistant),
+expanded with templates over the roles and domains in jobs.json.
+
+Only confident predictions are used; other messages escalate to the LLM,
+which classifies them itself. Blocking needs more confidence than routing,
+since unfamiliar text leans towards BLOCKED and a wrong block loses the user.
+
+    CHAT_CLASSIFIER_THRESHOLD         min probability to route locally (default 0.7, 1.01 disables)
+    CHAT_CLASSIFIER_BLOCK_THRESHOLD   min probability to block locally (default 0.9)
+    CHAT_CLASSIFIER_PATH              artifact (default models/chat_classifier.pkl)
+
+Build the artifact with `python notebooks/train_chat_classifier.py`, which
+also evaluates it. Without one, the server trains a classifier from the seed
+set in memory at startup (ensure_trained) and writes nothing; until then every
+message escalates to the LLM.
+"""
+import json
+import os
+import random
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from model_registry import MODELS_DIR, registry
+from skills import COMMON_SKILLS
+
+SRC_DIR = Path(__file__).parent
+CHAT_CLASSIFIER_PATH = Path(os.getenv("CHAT_CLASSIFIER_PATH", MODELS_DIR / 'chat_classifier.pkl'))
+CHAT_CLASSIFIER_THRESHOLD = float(os.getenv("CHAT_CLASSIFIER_THRESHOLD", "0.7"))
+CHAT_CLASSIFIER_BLOCK_THRESHOLD = float(os.getenv("CHAT_CLASSIFIER_BLOCK_THRESHOLD", "0.9"))
+LABELS = ("JOB_SEARCH", "ADVICE", "BLOCKED")
+
+# Examples and rules from the chat prompt
+PROMPT_EXAMPLES = [
+    ("NLP jobs", "JOB_SEARCH"),
+    ("what can i do", "ADVICE"),
+    ("how to start a career in AI", "ADVICE"),
+    ("Data Scientist roles in Google", "JOB_SEARCH"),
+    ("nlp", "JOB_SEARCH"),
+    ("jobs", "JOB_SEARCH"),
+    ("advice", "ADVICE"),
+    ("learning", "ADVICE"),
+    ("roadmaps", "ADVICE"),
+    ("sax", "BLOCKED"),
+    ("asdfgh", "BLOCKED"),
+]
+
+EXTRA_ROLES = [
+    "software engineer", "backend developer", "frontend developer", "full stack developer", "data analyst",
+    "devops engineer", "cloud engineer", "android developer", "product manager", "business analyst",
+    "ai engineer", "mlops engineer", "data engineer", "research scientist", "python developer", "java developer",
+]
+EXTRA_DOMAINS = ["AI", "data science", "machine learning", "web development", "cloud computing", "cybersecurity",
+                 "deep learning", "NLP", "computer vision", "MLOps", "data engineering", "generative AI"]
+COMPANIES = ["Google", "Microsoft", "Amazon", "Meta", "TCS", "Infosys", "a startup", "Netflix", "OpenAI"]
+CITIES = ["Bangalore", "Hyderabad", "Pune", "London", "remote", "New York"]
+SKILLS = ["python", "sql", "pytorch", "tensorflow", "docker", "aws", "react", "java", "dsa", "statistics"]
+# Short queries that are just a skill, tool or exam; without them an unfamiliar
+# acronym ("gcp", "k8s", "vlsi") is closest to gibberish and gets blocked
+ACRONYMS = ["gcp", "llm", "k8s", "html", "css", "vlsi", "sde", "sre", "qa", "ux", "ui", "ai", "ml", "dl", "cv",
+            "iot", "erp", "sap", "bi", "etl", "api", "oop", "ci/cd", "devops", "genai", "rag", "dbms", "os", "cn"]
+EXAMS = ["upsc", "gate", "ssc", "gre", "gmat", "cat", "mba", "bca", "mca", "btech", "ielts", "toefl", "jee"]
+ADVICE_WORDS = ["roadmap", "guidance", "career", "resume", "interview", "placements", "certifications", "upskilling"]
+
+JOB_TEMPLATES = [
+    "{role} jobs", "{role} roles", "{role} openings", "find {role} jobs", "search for {role} roles",
+    "tell me about {role} jobs", "{role} roles in {company}", "{role} jobs at {company}", "{role} positions",
+    "any {role} vacancies", "{role} internship", "remote {role} jobs", "who is hiring {role}",
+    "show me {role} openings in {city}", "{role}", "entry level {role} jobs", "{role} jobs in {city}",
+    "jobs in {domain}", "{domain} jobs", "{domain} openings at {company}", "list {domain} roles",
+    "fresher {role} jobs", "{company} {role} vacancy", "{role} job listings",
+]
+ADVICE_TEMPLATES = [
+    "how to start a career in {domain}", "how do i become a {role}", "what skills do i need for {role}",
+    "should i learn {skill} or {skill2}", "is {domain} a good career", "how to prepare for {role} interviews",
+    "which is better {domain} or {domain2}", "roadmap for {role}", "how to switch to {domain}",
+    "what should i learn for {domain}", "learning path for {skill}", "how long does it take to learn {skill}",
+    "is {skill} enough to get a job", "can i become a {role} without a degree", "tips for {role} interviews",
+    "what projects should i build for {domain}", "why is {domain} popular", "how can i improve my {skill}",
+]
+ADVICE_PHRASES = [
+    "what can i do", "what should i do", "help me choose a career", "i am confused about my career",
+    "tips to improve my resume", "what should i learn next", "advice for a fresher", "how to get an internship",
+    "how to negotiate salary", "i failed my interview what now", "how do i prepare for placements",
+    "how to crack coding interviews", "give me some career advice", "how to write a good resume",
+    "how do i stay motivated while studying", "is it too late to change careers", "how to build a portfolio",
+    "guide me", "how to learn faster", "what are the best certifications",
+]
+BLOCKED_PHRASES = [
+    "sax", "sex", "sex chat", "porn", "porn videos", "nude photos", "send nudes", "xxx", "sexy girls",
+    "hot girls near me", "hookup tonight", "adult videos", "i hate all immigrants", "racist jokes",
+    "kill all of them", "insult women", "asdfgh", "qwerty", "zxcvbnm", "lkjhgf", "poiuyt", "aaaaaaa",
+    "hjkl hjkl", "qwe asd zxc", "??????", "jhgfds jhgf", "mnbvcx",
+]
+KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+
+
+def _job_roles(jobs_data):
+    roles, domains = set(EXTRA_ROLES), set(EXTRA_DOMAINS)
+    for category in jobs_data.get("machine_learning_jobs", []):
+        domains.add(category.get("domain", ""))
+        roles.update(role.get("job_title", "") for role in category.get("roles", []))
+    return sorted(r for r in roles if r), sorted(d for d in domains if d)
+
+
+def _single_terms():
+    """One-word skills, tools and acronyms, each a job search on its own (like "nlp")"""
+    terms = {skill.lower() for skill in SKILLS + COMMON_SKILLS + ACRONYMS if " " not in skill}
+    return sorted(terms - set(EXAMS) - set(ADVICE_WORDS))
+
+
+def _gibberish(rng, n):
+    """Keyboard mashing: runs of adjacent keys and random consonant strings"""
+    words = []
+    for _ in range(n):
+        if rng.random() < 0.6:
+            row = rng.choice(KEYBOARD_ROWS)
+            start = rng.randrange(0, len(row) - 3)
+            word = row[start:start + rng.randint(4, len(row) - start)]
+            words.append(word[::-1] if rng.random() < 0.5 else word)
+        else:
+            words.append("".join(rng.choice("bcdfghjklmnpqrstvwxz") for _ in range(rng.randint(5, 9))))
+    return words
+
+
+def seed_examples(jobs_data, per_template=6, seed=42):
+    """(text, label) pairs: the prompt's examples plus templated variations"""
+    rng = random.Random(seed)
+    roles, domains = _job_roles(jobs_data)
+
+    def fill(template):
+        domain, domain2 = rng.sample(domains, 2)
+        skill, skill2 = rng.sample(SKILLS, 2)
+        return template.format(role=rng.choice(roles), domain=domain, domain2=domain2, skill=skill, skill2=skill2,
+                               company=rng.choice(COMPANIES), city=rng.choice(CITIES))
+
+    examples = list(PROMPT_EXAMPLES)
+    examples += [(fill(t), "JOB_SEARCH") for t in JOB_TEMPLATES for _ in range(per_template)]
+    examples += [(fill(t), "ADVICE") for t in ADVICE_TEMPLATES for _ in range(per_template)]
+    examples += [(phrase, "ADVICE") for phrase in ADVICE_PHRASES]
+    examples += [(term, "JOB_SEARCH") for term in _single_terms()]
+    examples += [(term, "ADVICE") for term in EXAMS + ADVICE_WORDS]
+    examples += [(f"{term} preparation", "ADVICE") for term in EXAMS]
+    examples += [(phrase, "BLOCKED") for phrase in BLOCKED_PHRASES]
+    examples += [(word, "BLOCKED") for word in _gibberish(rng, 60)]
+    return list(dict.fromkeys(examples))
+
+
+def build_pipeline():
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline, make_union
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return make_pipeline(
+        make_union(
+            TfidfVectorizer(lowercase=True, ngram_range=(1, 2), sublinear_tf=True),
+            TfidfVectorizer(lowercase=True, analyzer='char_wb', ngram_range=(2, 4), sublinear_tf=True),
+        ),
+        LogisticRegression(C=10, max_iter=2000, class_weight='balanced'),
+    )
+
+
+def train(examples):
+    texts, labels = zip(*examples)
+    return build_pipeline().fit(list(texts), list(labels))
+
+
+class ChatClassifier:
+    """
+    Scores one message without sklearn's per-call overhead: the fitted
+    vocabularies and IDF weights are read once into dicts, and the logistic
+    regression is applied to the few non-zero features directly.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        union, model = pipeline.steps[0][1], pipeline.steps[-1][1]
+        self.labels = [str(label) for label in model.classes_]
+        self.intercept = model.intercept_.astype(float)
+        offset = 0
+        self.vectorizers = []
+        for _, vectorizer in union.transformer_list:
+            columns = model.coef_[:, offset:offset + len(vectorizer.vocabulary_)].T
+            weights = {term: (vectorizer.idf_[i], columns[i]) for term, i in vectorizer.vocabulary_.items()}
+            self.vectorizers.append((vectorizer.build_analyzer(), weights))
+            offset += len(vectorizer.vocabulary_)
+
+    def predict_proba(self, text):
+        scores = self.intercept.copy()
+        for analyze, weights in self.vectorizers:
+            counts = {}
+            for term in analyze(text):
+                if term in weights:
+                    counts[term] = counts.get(term, 0) + 1
+            if not counts:
+                continue
+            # sublinear tf * idf, then L2 normalisation (TfidfVectorizer defaults)
+            values = {term: (1 + np.log(count)) * weights[term][0] for term, count in counts.items()}
+            norm = np.sqrt(sum(v * v for v in values.values()))
+            for term, value in values.items():
+                scores += (value / norm) * weights[term][1]
+        scores = np.exp(scores - scores.max())
+        return scores / scores.sum()
+
+    def classify(self, text):
+        """(label, probability)"""
+        proba = self.predict_proba(text)
+        best = int(np.argmax(proba))
+        return self.labels[best], float(proba[best])
+
+
+def load_jobs_data():
+    with open(SRC_DIR / 'jobs.json') as f:
+        return json.load(f)
+
+
+def _load_classifier(path):
+    return ChatClassifier(joblib.load(path))
+
+
+registry.register("chat_intent", CHAT_CLASSIFIER_PATH, loader=_load_classifier)
+
+
+def save(pipeline, path=None):
+    """Write to a temp file and rename it into place, so readers never load a half-written pickle"""
+    path = Path(path or CHAT_CLASSIFIER_PATH)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        joblib.dump(pipeline, tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+_seed_classifier = None  # trained by ensure_trained when there is no artifact
+
+
+def ensure_trained():
+    """
+    Startup hook: without an artifact, train a classifier from the seed set in
+    memory (nothing is written). Run before forking so workers inherit it.
+    """
+    global _seed_classifier
+    if _seed_classifier is None and not registry.versions("chat_intent"):
+        print(f"🌱 No chat classifier at {CHAT_CLASSIFIER_PATH}, training one from the seed set")
+        _seed_classifier = ChatClassifier(train(seed_examples(load_jobs_data())))
+
+
+def get_classifier():
+    """The artifact, else the seed classifier from startup; raises when there is neither"""
+    if _seed_classifier is not None and not registry.versions("chat_intent"):
+        return _seed_classifier
+    return registry.get("chat_intent")
+
+
+def is_confident(label, probability, threshold=None, block_threshold=None):
+    if label == "BLOCKED":
+        return probability >= (CHAT_CLASSIFIER_BLOCK_THRESHOLD if block_threshold is None else block_threshold)
+    return probability >= (CHAT_CLASSIFIER_THRESHOLD if threshold is None else threshold)
+
+
+def classify(query):
+    """(label, probability) when confident, else None (escalate to the LLM)"""
+    try:
+        label, probability = get_classifier().classify(query)
+    except Exception as e:
+        print(f"⚠️ Chat classifier unavailable: {e}")
+        return None
+    return (label, probability) if is_confident(label, probability) else None
@@ -5,27 +5,77 @@ Uses enterprise-grade XGBoost model trained on 6.24k real resume-job pairs from
 import numpy as np
 import pandas as pd
 import joblib
+import xgboost as xgb
 import re
 import os
 from pathlib import Path
 import logging
 
+from inference_adapter import InferenceAdapter, timed
+from inference_runtime import apply_model_threads, get_threads
+from model_registry import registry
+from tree_compiler import try_compile
+from scipy.sparse import csr_matrix, hstack
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Artifact families in models/ (ml_pipeline_<model_type>_<timestamp>.pkl)
+# - xgboost: the full XGBoost teacher model
+# - student: distilled hashed-features model (notebooks/distill_fit_model.py)
+MODEL_TYPES = ('xgboost', 'student')
+DEFAULT_MODEL_TYPE = os.getenv('FIT_MODEL_TYPE', 'xgboost')
+
+TEXT_COLUMNS = ['resume_text', 'job_description_text']
+STAT_NAMES = ['length', 'word_count', 'unique_words', 'avg_word_length', 'sentence_count', 'capital_ratio']
+
+
+def preprocess_text(text):
+    """Preprocess text data (shared by inference and the training scripts)"""
+    if text is None or pd.isna(text):
+        return ""
+    
+    text = str(text).lower()
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    
+    return text
+
+
+def text_statistics(raw_text, processed_text):
+    """Statistical features, keyed by STAT_NAMES (same definitions as the training notebook)"""
+    words = processed_text.split()
+    return {
+        'length': len(raw_text),
+        'word_count': len(words),
+        'unique_words': len(set(words)),
+        'avg_word_length': np.mean([len(word) for word in words]) if processed_text.strip() else 0,
+        'sentence_count': len(re.findall(r'[.!?]', raw_text)),
+        'capital_ratio': sum(1 for c in raw_text if c.isupper()) / len(raw_text) if raw_text else 0,
+    }
+
+
 class AdvancedFitClassifier:
     """
     Production-ready resume-job fit classifier using advanced ML
     """
     
-    def __init__(self):
+    def __init__(self, model_type=DEFAULT_MODEL_TYPE, model_path=None):
+        if model_type not in MODEL_TYPES:
+            logger.warning(f"Unknown fit model_type '{model_type}', using 'xgboost'")
+            model_type = 'xgboost'
+        self.model_type = model_type
+        self.model_path = model_path
         self.pipeline_data = None
         self.model = None
         self.vectorizers = None
         self.label_encoder = None
         self.feature_columns = None
         self.target_names = None
+        self.booster = None
+        self.adapter = None
+        self.sparse_input = False
         self.is_loaded = False
         
         # Try to load the advanced model
@@ -34,32 +84,44 @@ class AdvancedFitClassifier:
     def _load_advanced_model(self):
         """Load the advanced ML pipeline"""
         try:
-            # Find the latest model file
-            models_dir = Path(__file__).parent.parent / 'models'
-            model_files = list(models_dir.glob('ml_pipeline_xgboost_*.pkl'))
+            # Find the latest model file (models/ml_pipeline_<model_type>_<timestamp>.pkl)
+            if not self.model_path and registry.versions(f'fit_{self.model_type}'):
+                self.model_path = str(registry.resolve(f'fit_{self.model_type}')[1])
             
-            if model_files:
-                # Get the most recent model
-                latest_model = max(model_files, key=os.path.getctime)
+            if self.model_path:
+                latest_model = Path(self.model_path)
                 logger.info(f"Loading advanced ML model: {latest_model}")
                 
                 self.pipeline_data = joblib.load(latest_model)
-                self.model = self.pipeline_data['model']
+                if self.pipeline_data.get('model_file'):
+                    # Booster kept in XGBoost's native format next to the pipeline file
+                    self.model = xgb.Booster(model_file=str(latest_model.parent / self.pipeline_data['model_file']))
+                else:
+                    self.model = self.pipeline_data['model']
                 self.vectorizers = self.pipeline_data['vectorizers']
                 self.label_encoder = self.pipeline_data['label_encoder']
-                self.feature_columns = self.pipeline_data['feature_columns']
+                self.feature_columns = self.pipeline_data.get('feature_columns')
                 self.target_names = self.pipeline_data['target_names']
+                self.sparse_input = self.pipeline_data.get('sparse_input', False)
+                if self.model_type == 'xgboost':
+                    # sklearn wrapper or a raw Booster (sparse / tuned training scripts)
+                    self.booster = self.model.get_booster() if hasattr(self.model, 'get_booster') else self.model
+                    apply_model_threads(self.model, get_threads())
+                    self._build_feature_layout()
+                else:
+                    self.adapter = InferenceAdapter(f'fit_{self.model_type}', self.model)
                 self.is_loaded = True
                 
                 # Log model performance
                 metrics = self.pipeline_data.get('performance_metrics', {})
                 logger.info(f"✅ Advanced ML model loaded successfully!")
                 logger.info(f"Model: {self.pipeline_data.get('model_name', 'XGBoost')}")
-                logger.info(f"Accuracy: {metrics.get('accuracy', 'N/A'):.4f}")
-                logger.info(f"AUC Score: {metrics.get('auc_score', 'N/A'):.4f}")
+                for label, key in (("Accuracy", 'accuracy'), ("AUC Score", 'auc_score')):
+                    value = metrics.get(key)
+                    logger.info(f"{label}: {value:.4f}" if isinstance(value, (int, float)) else f"{label}: N/A")
                 
             else:
-                logger.warning("No advanced ML model found, falling back to basic classifier")
+                logger.warning(f"No advanced ML model ({self.model_type}) found, falling back to basic classifier")
                 self.is_loaded = False
                 
         except Exception as e:
@@ -68,101 +130,150 @@ class AdvancedFitClassifier:
     
     def _preprocess_text(self, text):
         """Preprocess text data"""
-        if pd.isna(text) or text is None:
-            return ""
-        
-        text = str(text).lower()
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return preprocess_text(text)
     
-    def _create_text_features(self, resume_text, job_description):
-        """Create text features for the advanced model"""
-        # Create DataFrame
-        data = {
-            'resume_text': [resume_text],
-            'job_description_text': [job_description]
+    def _build_feature_layout(self):
+        """Map statistical features and vectorizer columns to model input positions"""
+        self._feature_index = {name: i for i, name in enumerate(self.feature_columns)}
+        self._vectorizer_positions = {}
+        for col_name, vectorizer in self.vectorizers.items():
+            # TF-IDF columns are named by vocabulary index, hashed ones by bucket
+            if hasattr(vectorizer, 'vocabulary_'):
+                width, kind = len(vectorizer.vocabulary_), 'tfidf'
+            else:
+                width, kind = vectorizer.n_features, 'hash'
+            self._vectorizer_positions[col_name] = np.array(
+                [self._feature_index.get(f'{col_name}_{kind}_{i}', -1) for i in range(width)],
+                dtype=np.int64
+            )
+        self._feature_labels = None
+
+    def _to_dmatrix(self, rows):
+        """
+        Wrap feature rows for the booster. Models trained on sparse input
+        (notebooks/train_fit_sparse.py) saw zeros as missing, so they get CSR.
+        """
+        if self.sparse_input:
+            return xgb.DMatrix(csr_matrix(rows))
+        return xgb.DMatrix(rows)
+
+    def _create_feature_row(self, resume_text, job_description):
+        """
+        Create the model input row without building a 10k-column DataFrame.
+        TF-IDF output stays sparse until it is scattered into the row; absent
+        terms are written as explicit zeros because the booster was trained on
+        dense input (XGBoost would treat missing CSR entries as NaN).
+        """
+        row = np.zeros((1, len(self.feature_columns)), dtype=np.float32)
+        texts = {
+            'resume_text': '' if resume_text is None else str(resume_text),
+            'job_description_text': '' if job_description is None else str(job_description),
         }
-        df = pd.DataFrame(data)
-        
-        # Preprocess text
-        df['resume_text_processed'] = df['resume_text'].apply(self._preprocess_text)
-        df['job_description_text_processed'] = df['job_description_text'].apply(self._preprocess_text)
-        
-        # Create statistical features
-        features = df.copy()
-        
-        # Resume features
-        features['resume_text_length'] = features['resume_text'].str.len().fillna(0)
-        features['resume_text_word_count'] = features['resume_text_processed'].str.split().str.len().fillna(0)
-        features['resume_text_unique_words'] = features['resume_text_processed'].apply(
-            lambda x: len(set(str(x).split())) if pd.notna(x) else 0
-        )
-        features['resume_text_avg_word_length'] = features['resume_text_processed'].apply(
-            lambda x: np.mean([len(word) for word in str(x).split()]) if pd.notna(x) and str(x).strip() else 0
-        )
-        features['resume_text_sentence_count'] = features['resume_text'].str.count(r'[.!?]').fillna(0)
-        features['resume_text_capital_ratio'] = features['resume_text'].apply(
-            lambda x: sum(1 for c in str(x) if c.isupper()) / len(str(x)) if pd.notna(x) and len(str(x)) > 0 else 0
-        )
-        
-        # Job description features
-        features['job_description_text_length'] = features['job_description_text'].str.len().fillna(0)
-        features['job_description_text_word_count'] = features['job_description_text_processed'].str.split().str.len().fillna(0)
-        features['job_description_text_unique_words'] = features['job_description_text_processed'].apply(
-            lambda x: len(set(str(x).split())) if pd.notna(x) else 0
-        )
-        features['job_description_text_avg_word_length'] = features['job_description_text_processed'].apply(
-            lambda x: np.mean([len(word) for word in str(x).split()]) if pd.notna(x) and str(x).strip() else 0
-        )
-        features['job_description_text_sentence_count'] = features['job_description_text'].str.count(r'[.!?]').fillna(0)
-        features['job_description_text_capital_ratio'] = features['job_description_text'].apply(
-            lambda x: sum(1 for c in str(x) if c.isupper()) / len(str(x)) if pd.notna(x) and len(str(x)) > 0 else 0
-        )
-        
-        # Extract numerical features
-        feature_cols = [col for col in features.columns if col.endswith(('_length', '_word_count', '_unique_words', '_avg_word_length', '_sentence_count', '_capital_ratio'))]
-        X_features = features[feature_cols].fillna(0)
-        
-        # Add TF-IDF features
+
+        for col_name, raw_text in texts.items():
+            processed_text = preprocess_text(raw_text)
+            texts[col_name] = processed_text
+            for stat, value in text_statistics(raw_text, processed_text).items():
+                position = self._feature_index.get(f'{col_name}_{stat}')
+                if position is not None:
+                    row[0, position] = value
+
         for col_name, vectorizer in self.vectorizers.items():
-            if col_name == 'resume_text':
-                processed_col = 'resume_text_processed'
-            else:  # job_description_text
-                processed_col = 'job_description_text_processed'
-            
-            text_data = features[processed_col].fillna('').astype(str)
-            tfidf_matrix = vectorizer.transform(text_data)
-            
-            # Create TF-IDF DataFrame
-            feature_names = [f'{col_name}_tfidf_{i}' for i in range(tfidf_matrix.shape[1])]
-            tfidf_df = pd.DataFrame(tfidf_matrix.toarray(), columns=feature_names)
-            
-            X_features = pd.concat([X_features, tfidf_df], axis=1)
-        
-        # Ensure all required features are present
-        missing_features = set(self.feature_columns) - set(X_features.columns)
-        for feature in missing_features:
-            X_features[feature] = 0
-        
-        # Reorder columns to match training data
-        X_features = X_features[self.feature_columns].fillna(0)
-        
-        return X_features
-    
-    def predict_advanced(self, resume_text, job_description):
-        """Make prediction using advanced ML model"""
+            tfidf_row = vectorizer.transform([texts[col_name]])
+            positions = self._vectorizer_positions[col_name][tfidf_row.indices]
+            kept = positions >= 0
+            row[0, positions[kept]] = tfidf_row.data[kept]
+
+        return row
+
+    def _feature_label(self, position):
+        """Human-readable name for a model input column (vocabulary term for TF-IDF columns)"""
+        if self._feature_labels is None:
+            labels = list(self.feature_columns)
+            for col_name, vectorizer in self.vectorizers.items():
+                source = 'resume' if col_name == 'resume_text' else 'job_description'
+                if not hasattr(vectorizer, 'vocabulary_'):
+                    # hashed buckets have no recoverable term
+                    for pos in self._vectorizer_positions[col_name]:
+                        if pos >= 0:
+                            labels[pos] = (source, labels[pos])
+                    continue
+                terms = vectorizer.get_feature_names_out()
+                for term, pos in zip(terms, self._vectorizer_positions[col_name]):
+                    if pos >= 0:
+                        labels[pos] = (source, str(term))
+            self._feature_labels = labels
+
+        label = self._feature_labels[position]
+        if isinstance(label, tuple):
+            return {'feature': label[1], 'source': label[0]}
+        return {'feature': label, 'source': 'statistic'}
+
+    def _explain(self, row, contributions, class_index, top_k):
+        """Top-k features pushing the prediction towards `class_index` (value 0 = term absent)"""
+        # Drop the trailing bias column
+        class_contribs = contributions[class_index][:-1]
+        top = np.argsort(-np.abs(class_contribs))[:top_k]
+        return [
+            {**self._feature_label(int(i)), 'value': float(row[0, i]), 'contribution': float(class_contribs[i])}
+            for i in top if class_contribs[i] != 0
+        ]
+
+    def predict_proba_batch(self, resume_texts, job_descriptions, chunk_size=512):
+        """Class probabilities for many resume/JD pairs (XGBoost model), built in bounded chunks"""
+        probabilities = []
+        for start in range(0, len(resume_texts), chunk_size):
+            rows = np.vstack([
+                self._create_feature_row(resume, jd)
+                for resume, jd in zip(resume_texts[start:start + chunk_size], job_descriptions[start:start + chunk_size])
+            ])
+            with timed(f'fit_{self.model_type}', len(rows)):
+                probabilities.append(self.booster.predict(self._to_dmatrix(rows), validate_features=False))
+        return np.vstack(probabilities)
+
+    def _predict_student(self, resume_text, job_description):
+        """Prediction with the distilled model: hashed n-grams + linear classifier"""
+        X = hstack([
+            self.vectorizers['resume_text'].transform([preprocess_text(resume_text)]),
+            self.vectorizers['job_description_text'].transform([preprocess_text(job_description)]),
+        ]).tocsr()
+        label, confidence, prediction_proba = self.adapter.predict_one(X)
+
+        return {
+            'prediction': self.label_encoder.inverse_transform([label])[0],
+            'confidence': float(confidence),
+            'probabilities': dict(zip(self.target_names, prediction_proba.astype(float))),
+            'model_type': 'distilled_ml'
+        }
+
+    def predict_advanced(self, resume_text, job_description, explain=False, top_k=5):
+        """
+        Make prediction using advanced ML model.
+        With explain=True the per-feature contributions are computed in the
+        same booster call and the probabilities are derived from their sum,
+        so explanations don't need a second inference pass. Hashed features
+        of the distilled model can't be mapped back to terms, so explain is
+        ignored there.
+        """
         if not self.is_loaded:
             return None
+
+        if self.model_type == 'student':
+            try:
+                return self._predict_student(resume_text, job_description)
+            except Exception as e:
+                logger.error(f"Error in distilled prediction: {e}")
+                return None
         
         try:
             # Create features
-            X_features = self._create_text_features(resume_text, job_description)
-            
-            # Make prediction
-            prediction = self.model.predict(X_features)[0]
-            prediction_proba = self.model.predict_proba(X_features)[0]
+            row = self._create_feature_row(resume_text, job_description)
+            dmatrix = self._to_dmatrix(row)
+
+            with timed(f'fit_{self.model_type}'):
+                prediction_proba, contributions = self._booster_proba(dmatrix, explain)
+
+            prediction = int(np.argmax(prediction_proba))
             
             # Convert back to original labels
             predicted_class = self.label_encoder.inverse_transform([prediction])[0]
@@ -174,41 +285,68 @@ class AdvancedFitClassifier:
                 'probabilities': dict(zip(self.target_names, prediction_proba.astype(float))),
                 'model_type': 'advanced_ml'
             }
+
+            if explain:
+                result['explanations'] = self._explain(row, contributions, prediction, top_k)
             
             return result
             
         except Exception as e:
             logger.error(f"Error in advanced prediction: {e}")
             return None
+
+    def _booster_proba(self, dmatrix, explain):
+        """
+        Class probabilities from a single booster call. With explain the
+        per-feature contributions are returned too and the probabilities are
+        derived from their sum.
+        """
+        if not explain:
+            prediction_proba = self.booster.predict(dmatrix, validate_features=False)[0]
+            if np.ndim(prediction_proba) == 0:
+                prediction_proba = np.array([1.0 - prediction_proba, prediction_proba])
+            return prediction_proba, None
+
+        # Approximate (path-based) contributions: O(trees x depth), unlike exact TreeSHAP
+        contributions = self.booster.predict(
+            dmatrix, pred_contribs=True, approx_contribs=True, validate_features=False
+        )[0]
+        if contributions.ndim == 1:
+            contributions = np.stack([-contributions, contributions])
+            margin = contributions[1].sum()
+            positive = 1.0 / (1.0 + np.exp(-margin))
+            return np.array([1.0 - positive, positive]), contributions
+
+        margins = contributions.sum(axis=1)
+        exp = np.exp(margins - margins.max())
+        return exp / exp.sum(), contributions
     
+    def _load_basic_model(self):
+        """Load or create the basic model (shared through the model registry)"""
+        if not registry.versions('fit_basic'):
+            # Create basic model
+            from sklearn.ensemble import RandomForestClassifier
+            X = [
+                [100, 10, 0], [90, 9, 1], [80, 8, 2], [70, 7, 3], [60, 6, 4],
+                [50, 5, 5], [40, 4, 6], [30, 3, 7], [20, 2, 8], [10, 1, 9], [0, 0, 10]
+            ]
+            y = [1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0]
+            clf = RandomForestClassifier(n_estimators=50, random_state=42)
+            clf.fit(X, y)
+            
+            with open(Path(__file__).parent / 'fit_classifier.pkl', 'wb') as f:
+                import pickle
+                pickle.dump(clf, f)
+
+        return registry.get('fit_basic')
+
     def predict_basic(self, match_score, num_matched, num_missing):
         """Fallback basic prediction method"""
         try:
-            # Load or create basic model
-            basic_model_path = Path(__file__).parent / 'fit_classifier.pkl'
-            
-            if basic_model_path.exists():
-                with open(basic_model_path, 'rb') as f:
-                    import pickle
-                    clf = pickle.load(f)
-            else:
-                # Create basic model
-                from sklearn.ensemble import RandomForestClassifier
-                X = [
-                    [100, 10, 0], [90, 9, 1], [80, 8, 2], [70, 7, 3], [60, 6, 4],
-                    [50, 5, 5], [40, 4, 6], [30, 3, 7], [20, 2, 8], [10, 1, 9], [0, 0, 10]
-                ]
-                y = [1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0]
-                clf = RandomForestClassifier(n_estimators=50, random_state=42)
-                clf.fit(X, y)
-                
-                with open(basic_model_path, 'wb') as f:
-                    import pickle
-                    pickle.dump(clf, f)
-            
             X = np.array([[match_score, num_matched, num_missing]])
-            pred = clf.predict(X)[0]
-            prob = clf.predict_proba(X)[0][1]
+            # One predict_proba call; label = classes_[argmax]
+            pred, _, proba = self._load_basic_model().predict_one(X)
+            prob = proba[1]
             
             # Convert to advanced format
             result = {
@@ -229,10 +367,22 @@ class AdvancedFitClassifier:
                 'model_type': 'fallback'
             }
 
-# Global classifier instance
-_classifier = AdvancedFitClassifier()
+def _load_basic_adapter(path):
+    with open(path, 'rb') as f:
+        import pickle
+        clf = pickle.load(f)
+    return InferenceAdapter('fit_basic', try_compile(clf, 'basic fit model'))
 
-def predict_fit(resume_text=None, job_description=None, match_score=None, num_matched=None, num_missing=None):
+# Classifiers are loaded lazily (and reloaded on new artifacts) by the model registry
+registry.register('fit_basic', loader=_load_basic_adapter)
+for _model_type in MODEL_TYPES:
+    registry.register(f'fit_{_model_type}', loader=lambda path, model_type=_model_type: AdvancedFitClassifier(model_type, model_path=path))
+
+# Basic-model-only classifiers, used while no advanced model is on disk
+_fallback_classifiers = {}
+
+def predict_fit(resume_text=None, job_description=None, match_score=None, num_matched=None, num_missing=None,
+                explain=False, top_k=5, model_type=None):
     """
     Unified prediction function that uses advanced ML when possible, falls back to basic
     
@@ -242,20 +392,25 @@ def predict_fit(resume_text=None, job_description=None, match_score=None, num_ma
         match_score (float): Match percentage (for basic model fallback)
         num_matched (int): Number of matched skills (for basic model fallback)
         num_missing (int): Number of missing skills (for basic model fallback)
+        explain (bool): Include the top contributing features (advanced model only)
+        top_k (int): Number of features to return when explain is set
+        model_type (str): 'xgboost' or 'student' (default: FIT_MODEL_TYPE env, else 'xgboost')
     
     Returns:
         dict: Prediction result with confidence and probabilities
     """
+    classifier = load_fit_classifier(model_type)
+
     # Try advanced model first if we have text data
-    if resume_text and job_description and _classifier.is_loaded:
-        result = _classifier.predict_advanced(resume_text, job_description)
+    if resume_text and job_description and classifier.is_loaded:
+        result = classifier.predict_advanced(resume_text, job_description, explain=explain, top_k=top_k)
         if result:
             logger.info(f"🚀 Advanced ML prediction: {result['prediction']} ({result['confidence']:.3f})")
             return result
     
     # Fall back to basic model
     if match_score is not None and num_matched is not None and num_missing is not None:
-        result = _classifier.predict_basic(match_score, num_matched, num_missing)
+        result = classifier.predict_basic(match_score, num_matched, num_missing)
         logger.info(f"📊 Basic prediction: {result['prediction']} ({result['confidence']:.3f})")
         return result
     
@@ -269,6 +424,15 @@ def predict_fit(resume_text=None, job_description=None, match_score=None, num_ma
     }
 
 # Legacy function for backward compatibility
-def load_fit_classifier():
-    """Legacy function for backward compatibility"""
-    return _classifier
+def load_fit_classifier(model_type=None):
+    """Return the default classifier, or one loaded for a specific model_type ('xgboost' / 'student')"""
+    model_type = model_type or DEFAULT_MODEL_TYPE
+    if model_type not in MODEL_TYPES:
+        logger.warning(f"Unknown fit model_type '{model_type}', using 'xgboost'")
+        model_type = 'xgboost'
+    classifier = registry.try_get(f'fit_{model_type}')
+    if classifier is None:
+        if model_type not in _fallback_classifiers:
+            _fallback_classifiers[model_type] = AdvancedFitClassifier(model_type=model_type)
+        classifier = _fallback_classifiers[model_type]
+    return classifier
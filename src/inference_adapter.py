@@ -0,0 +1,112 @@
+"""
+Single-pass inference adapter
+Calls predict_proba once and derives the label with argmax over classes_, so
+tree ensembles are traversed once instead of twice (predict + predict_proba).
+Models without probabilities (regressors, SVC without probability=True, ...)
+fall back to predict with a fixed confidence. Latency is recorded per model.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+LATENCY_WINDOW = int(os.getenv("INFERENCE_LATENCY_WINDOW", "1000"))
+
+_latency_lock = threading.Lock()
+_latency = {}  # model name -> {"calls", "rows", "total_ms", "recent_ms": deque}
+
+
+def record_latency(name, seconds, rows=1):
+    """Add one model call to the per-model latency stats"""
+    ms = seconds * 1000
+    with _latency_lock:
+        stats = _latency.setdefault(name, {
+            "calls": 0, "rows": 0, "total_ms": 0.0, "recent_ms": deque(maxlen=LATENCY_WINDOW),
+        })
+        stats["calls"] += 1
+        stats["rows"] += rows
+        stats["total_ms"] += ms
+        stats["recent_ms"].append(ms)
+
+
+@contextmanager
+def timed(name, rows=1):
+    """Record the latency of the wrapped block under `name`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(name, time.perf_counter() - start, rows)
+
+
+def n_rows(X):
+    """Row count of an array/DataFrame or a {column: values} batch (e.g. PlacementEncoder input)"""
+    if isinstance(X, dict):
+        return len(next(iter(X.values())))
+    return X.shape[0] if hasattr(X, "shape") else len(X)
+
+
+def latency_stats():
+    """Per-model call counts and latency percentiles over the recent window"""
+    with _latency_lock:
+        snapshot = {name: {**stats, "recent_ms": list(stats["recent_ms"])} for name, stats in _latency.items()}
+
+    report = {}
+    for name, stats in snapshot.items():
+        recent = np.array(stats["recent_ms"])
+        report[name] = {
+            "calls": stats["calls"],
+            "rows": stats["rows"],
+            "mean_ms": round(stats["total_ms"] / stats["calls"], 3),
+            "p50_ms": round(float(np.percentile(recent, 50)), 3),
+            "p95_ms": round(float(np.percentile(recent, 95)), 3),
+            "max_ms": round(float(recent.max()), 3),
+        }
+    return report
+
+
+class InferenceAdapter:
+    """
+    Wraps a fitted model behind one call that returns labels, confidences and
+    (when available) the full probability matrix.
+    """
+
+    def __init__(self, name, model, default_confidence=None):
+        self.name = name
+        self.model = model
+        self.default_confidence = default_confidence
+        # hasattr is False when predict_proba is unavailable (e.g. SVC(probability=False))
+        self.has_proba = hasattr(model, "predict_proba")
+
+    @property
+    def classes_(self):
+        return getattr(self.model, "classes_", None)
+
+    def predict(self, X):
+        """
+        Returns (labels, confidences, probabilities). probabilities is None and
+        confidences is filled with default_confidence for models without
+        predict_proba.
+        """
+        with timed(self.name, n_rows(X)):
+            if self.has_proba:
+                try:
+                    proba = np.asarray(self.model.predict_proba(X), dtype=float)
+                except (AttributeError, NotImplementedError):
+                    self.has_proba = False
+                else:
+                    best = proba.argmax(axis=1)
+                    classes = self.classes_
+                    labels = np.asarray(classes)[best] if classes is not None else best
+                    return labels, proba[np.arange(len(best)), best], proba
+
+            labels = np.asarray(self.model.predict(X))
+            return labels, np.full(len(labels), self.default_confidence, dtype=object), None
+
+    def predict_one(self, X):
+        """Label, confidence and probabilities of a single-row input"""
+        labels, confidences, proba = self.predict(X)
+        return labels[0], confidences[0], None if proba is None else proba[0]
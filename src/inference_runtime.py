@@ -0,0 +1,124 @@
+"""
+Inference runtime configuration
+Pins XGBoost / BLAS / OpenMP thread counts per worker so parallel predictions
+(several uvicorn workers x executor pools) don't oversubscribe the CPU.
+
+Environment overrides:
+    INFERENCE_THREADS    threads per prediction (default: derived from CPU/worker count)
+    WEB_CONCURRENCY      number of server worker processes (uvicorn/gunicorn convention)
+    INFERENCE_POOL_SIZE  concurrent predictions per worker (executor pool size)
+"""
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Env vars read by OpenMP / the common BLAS builds when they initialise
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+
+def _env_int(name, default):
+    try:
+        value = int(os.getenv(name, ""))
+        return value if value > 0 else default
+    except ValueError:
+        return default
+
+
+def default_threads(cpu_count=None, workers=None, pool_size=None):
+    """
+    Threads each prediction may use: the CPU budget split evenly across
+    worker processes and the concurrent predictions inside each worker.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = workers or _env_int("WEB_CONCURRENCY", 1)
+    pool_size = pool_size or _env_int("INFERENCE_POOL_SIZE", 1)
+    return max(1, cpu_count // (workers * pool_size))
+
+
+def configure_thread_env(threads):
+    """
+    Export thread limits for OpenMP/BLAS. Only effective for libraries that
+    have not initialised yet, so call it before numpy/xgboost are imported
+    when possible (user-set values are left alone).
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ.setdefault(var, str(threads))
+
+
+def limit_native_threads(threads):
+    """Cap already-loaded BLAS/OpenMP pools at runtime (threadpoolctl ships with scikit-learn)."""
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=threads)
+        return True
+    except Exception as e:
+        logger.warning(f"threadpoolctl unavailable, BLAS/OpenMP threads not capped: {e}")
+        return False
+
+
+def apply_model_threads(model, threads):
+    """
+    Pin nthread on an XGBoost model. Accepts an XGBClassifier/XGBRegressor,
+    a raw Booster, or an sklearn Pipeline wrapping one. Returns True if a
+    model was configured.
+    """
+    if model is None:
+        return False
+
+    # sklearn Pipeline: configure the final estimator
+    if hasattr(model, "steps"):
+        return apply_model_threads(model.steps[-1][1], threads)
+
+    configured = False
+    try:
+        # sklearn wrapper (XGBClassifier etc.)
+        if hasattr(model, "get_booster"):
+            model.set_params(n_jobs=threads)
+            model = model.get_booster()
+            configured = True
+        # Raw booster
+        if hasattr(model, "set_param"):
+            model.set_param({"nthread": threads})
+            configured = True
+    except Exception as e:
+        logger.warning(f"Could not set nthread on {type(model).__name__}: {e}")
+    return configured
+
+
+def configure_runtime(threads=None):
+    """
+    Resolve the per-prediction thread count and apply it process-wide.
+    Returns the runtime settings in effect.
+    """
+    threads = threads or _env_int("INFERENCE_THREADS", 0) or default_threads()
+    configure_thread_env(threads)
+    limit_native_threads(threads)
+
+    RUNTIME.update({
+        "threads": threads,
+        "cpu_count": os.cpu_count() or 1,
+        "workers": _env_int("WEB_CONCURRENCY", 1),
+        "pool_size": _env_int("INFERENCE_POOL_SIZE", 1),
+    })
+    logger.info(
+        f"⚙️ Inference runtime: {threads} thread(s) per prediction "
+        f"({RUNTIME['cpu_count']} CPUs / {RUNTIME['workers']} worker(s) x {RUNTIME['pool_size']} pool)"
+    )
+    return RUNTIME
+
+
+RUNTIME = {}
+
+
+def get_threads():
+    """Per-prediction thread count, configuring the runtime on first use."""
+    if not RUNTIME:
+        configure_runtime()
+    return RUNTIME["threads"]
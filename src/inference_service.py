@@ -0,0 +1,560 @@
+"""
+Tabular inference service
+One home for the tabular models (placement, job role, salary, domain fit, skill
+match): input schemas, feature encoding, model loading (via the model registry)
+and scoring. Replaces the standalone per-model FastAPI apps.
+
+    uvicorn inference_service:app --app-dir src --port 8001
+
+    POST /infer/{model}   {...one input...}          -> {"model": ..., **output}
+    POST /infer/{model}   {"items": [{...}, ...]}     -> batch response (see batch_inference.run_batch)
+    GET  /infer                                      -> models and their load state
+
+backend/main.py calls it through `inference_client`: in-process by default, or
+over HTTP when INFERENCE_SERVICE_URL is set. With INFERENCE_PROCESSES > 0 the
+predictions run in a process pool (latency stats are then recorded in the pool
+processes, not in the caller). Async endpoints use `score_async`, which awaits
+the pool / HTTP call (or runs in-process scoring in a thread) instead of
+blocking the event loop.
+
+Outputs are memoized per row (prediction_cache.py). With a process pool each
+pool process has its own cache; hit/miss counts are still reported by the caller,
+and clear_prediction_cache() reaches the pool processes through a generation
+number sent with every task.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import httpx
+import joblib
+import numpy as np
+import pandas as pd
+import requests
+from fastapi import Body, FastAPI, HTTPException
+from pydantic import BaseModel
+
+from batch_inference import MAX_BATCH_ROWS, predict_rows, run_batch, validate_rows
+from inference_adapter import InferenceAdapter
+from inference_runtime import apply_model_threads, configure_runtime, default_threads, get_threads
+from model_registry import registry
+from placement_encoder import PlacementEncoder
+from prediction_cache import PredictionCache, canonical_row
+from salary_lookup import SalaryLookup
+from tree_compiler import try_compile
+
+# Processes for CPU-bound predictions (0 = run in the calling process)
+INFERENCE_PROCESSES = int(os.getenv("INFERENCE_PROCESSES", "0"))
+INFERENCE_SERVICE_URL = os.getenv("INFERENCE_SERVICE_URL")
+INFERENCE_HTTP_TIMEOUT = float(os.getenv("INFERENCE_HTTP_TIMEOUT", "30"))
+
+
+class ModelUnavailable(LookupError):
+    """The model artifact is missing or failed to load (callers use their fallback)"""
+
+
+# --- Input schemas ---
+class Student(BaseModel):
+    Gender: str
+    board_10: str
+    marks_10: float
+    board_12: str
+    marks_12: float
+    Stream: str
+    Cgpa: float
+    Internships: str
+    Training: str
+    Backlog_5th: str
+    Innovative_Project: str
+    Communication_level: int
+    Technical_Course: str
+    email: Optional[str] = None # Added for tracking
+
+class JobRoleInput(BaseModel):
+    gender: str
+    ssc_p: float
+    ssc_b: str
+    hsc_p: float
+    hsc_b: str
+    hsc_s: str
+    degree_p: float
+    degree_t: str
+    workex: str
+    etest_p: float
+    specialisation: str
+    mba_p: float
+
+class SalaryInput(BaseModel):
+    age: float
+    gender: str
+    education: str
+    job_title: str
+    experience: float
+
+class DomainFitInput(BaseModel):
+    Age: float
+    Gender: str
+    Vocational_Program: str
+    Academic_Performance: float
+    Certifications_Count: int
+    Internship_Experience: int
+    Skill_1: int
+    Skill_2: int
+    Skill_3: int
+
+class SkillMatchInput(BaseModel):
+    age: int
+    academic_performance: float
+    certifications_count: int
+    internship_experience: int
+    skill_1: int
+    skill_2: int
+    skill_3: int
+    required_skill_1: int
+    required_skill_2: int
+    required_skill_3: int
+    required_skill_4: int
+    required_skill_5: int
+    min_experience_months: int
+
+
+# --- Feature encoding (same as training) ---
+# Student field -> pipeline column
+PLACEMENT_FIELDS = {
+    "Gender": "Gender",
+    "board_10": "10th board",
+    "marks_10": "10th marks",
+    "board_12": "12th board",
+    "marks_12": "12th marks",
+    "Stream": "Stream",
+    "Cgpa": "Cgpa",
+    "Internships": "Internships(Y/N)",
+    "Training": "Training(Y/N)",
+    "Backlog_5th": "Backlog in 5th sem",
+    "Innovative_Project": "Innovative Project(Y/N)",
+    "Communication_level": "Communication level",
+    "Technical_Course": "Technical Course(Y/N)",
+}
+
+JOB_ROLE_COLUMNS = ['gender', 'ssc_p', 'ssc_b', 'hsc_p', 'hsc_b', 'hsc_s', 'degree_p', 'degree_t', 'workex', 'etest_p', 'specialisation', 'mba_p']
+JOB_ROLE_NUMERIC = ['ssc_p', 'hsc_p', 'degree_p', 'etest_p', 'mba_p']
+
+gender_map = {"Male": 1, "Female": 0}
+education_map = {"Bachelor's": 1, "Master's": 2, "PhD": 3}
+job_map_salary = {
+    "Software Engineer": 1,
+    "Data Analyst": 2,
+    "Senior Manager": 3,
+    "Sales Associate": 4,
+    "Director": 5
+}
+
+# Model expects 7 features in this specific order:
+DOMAIN_FIT_FEATURES = ['Age', 'Skill_1', 'Skill_2', 'Skill_3', 'Academic_Performance', 'Certifications_Count', 'Internship_Experience']
+
+SKILL_MATCH_FEATURES = list(SkillMatchInput.model_fields)
+
+
+# --- Model loading (through the registry: lazy, reloaded when the file changes) ---
+# --- Mock Model for Hackathon Reliability ---
+# This ensures the feature works 100% even if .pkl files are missing/corrupted
+class MockPipeline:
+    def predict_proba(self, data):
+        # Simple logic: If CGPA > 7 and 12th Marks > 75, likely placed
+        likely = (data['Cgpa'].astype(float) >= 7.0) & (data['12th marks'].astype(float) >= 70)
+        # High prob of placement / Low prob
+        return np.where(likely.to_numpy()[:, None], [0.1, 0.85], [0.8, 0.2])
+
+def _load_placement(path):
+    pipeline = joblib.load(path)
+    apply_model_threads(pipeline, get_threads())
+    print(f"✅ Loaded REAL XGBoost Pipeline from {path} ({get_threads()} thread(s))")
+    # Fast path: precompiled category mappings -> booster, no per-request DataFrame
+    try:
+        placement_encoder = PlacementEncoder(pipeline)
+        print(f"✅ Compiled placement encoder ({placement_encoder.n_features} features)")
+    except Exception as e:
+        placement_encoder = None
+        print(f"⚠️  Placement encoder unavailable, using pipeline path: {e}")
+    return InferenceAdapter("placement", placement_encoder or pipeline)
+
+def _load_salary(path):
+    # Optional precomputed grid (SALARY_LOOKUP=1): O(1) lookups, model fallback for
+    # out-of-grid inputs; the registry rebuilds it when the model file changes
+    if os.getenv("SALARY_LOOKUP", "0") == "1":
+        try:
+            lookup = SalaryLookup(path, load_model=lambda p: try_compile(joblib.load(p), "salary model"), auto_reload=False)
+            print("✅ Salary lookup table ready")
+            return InferenceAdapter("salary", lookup)
+        except Exception as e:
+            print(f"⚠️  Salary lookup table unavailable, using the model: {e}")
+    return InferenceAdapter("salary", try_compile(joblib.load(path), "salary model"))
+
+registry.register("placement", loader=_load_placement)
+registry.register("job_role", loader=lambda path: InferenceAdapter("job_role", joblib.load(path), default_confidence=0.85))
+registry.register("salary", loader=_load_salary)
+registry.register("domain_fit", loader=lambda path: InferenceAdapter(
+    "domain_fit", try_compile(joblib.load(path), "domain fit model"), default_confidence=0.8))
+registry.register("skill_match", loader=lambda path: InferenceAdapter("skill_match", joblib.load(path)))
+
+# Used while the real pipeline can't be loaded
+mock_placement_adapter = InferenceAdapter("placement", MockPipeline())
+
+
+def _adapter(name):
+    try:
+        return registry.get(name)
+    except Exception as e:
+        raise ModelUnavailable(f"Model '{name}' is unavailable: {e}") from e
+
+
+# --- Scoring: rows (validated schema instances) -> (per-row outputs, {row position: error}) ---
+def _score_placements(rows: List[Student]):
+    """Encode all students column-wise and score them with one predict_proba call"""
+    columns = {
+        column: [getattr(row, field) for row in rows]
+        for field, column in PLACEMENT_FIELDS.items()
+    }
+    # Real pipeline (Try Real -> Fallback to Mock)
+    adapter = registry.try_get("placement") or mock_placement_adapter
+    data = columns if isinstance(adapter.model, PlacementEncoder) else pd.DataFrame(columns)
+
+    # predict_proba returns [[prob_0, prob_1], ...]; prob_1 is the probability of being placed
+    outputs, errors = predict_rows(lambda X: adapter.predict(X)[2][:, 1], data)
+
+    # --- Hard Academic Safeguard ---
+    # If CGPA is extremely low or 0, it's virtually impossible to be placed.
+    # This overrides potential ML model bias for outliers.
+    return [
+        None if out is None else {"probability": min(float(out), 0.1) if row.Cgpa < 5.0 or row.marks_12 < 50 else float(out)}
+        for row, out in zip(rows, outputs)
+    ], errors
+
+def _score_job_roles(rows: List[JobRoleInput]):
+    adapter = _adapter("job_role")
+    # Use pandas for mixed types handling in pipeline
+    df = pd.DataFrame({col: [getattr(row, col) for row in rows] for col in JOB_ROLE_COLUMNS})
+    # Ensure numeric columns are float
+    df[JOB_ROLE_NUMERIC] = df[JOB_ROLE_NUMERIC].astype(float)
+
+    def predict(X):
+        roles, probs, _ = adapter.predict(X)
+        return list(zip(roles, probs))
+
+    outputs, errors = predict_rows(predict, df)
+    return [None if out is None else {"label": str(out[0]), "confidence": float(out[1])} for out in outputs], errors
+
+def salary_features(rows: List[SalaryInput]):
+    """[age, gender, education, job_title, experience] with unknown categories encoded as 0"""
+    return np.column_stack([
+        [row.age for row in rows],
+        pd.Series([row.gender for row in rows]).map(gender_map).fillna(0),
+        pd.Series([row.education for row in rows]).map(education_map).fillna(0),
+        pd.Series([row.job_title for row in rows]).map(job_map_salary).fillna(0),
+        [row.experience for row in rows],
+    ]).astype(float)
+
+def _score_salaries(rows: List[SalaryInput]):
+    adapter = _adapter("salary")
+    outputs, errors = predict_rows(lambda X: adapter.predict(X)[0], salary_features(rows))
+    return [None if out is None else {"salary": float(out)} for out in outputs], errors
+
+def _score_domain_fits(rows: List[DomainFitInput]):
+    adapter = _adapter("domain_fit")
+    features = np.column_stack([[getattr(row, col) for row in rows] for col in DOMAIN_FIT_FEATURES]).astype(float)
+
+    def predict(X):
+        # One predict_proba call; label = classes_[argmax]
+        preds, probs, _ = adapter.predict(X)
+        return list(zip(preds, probs))
+
+    outputs, errors = predict_rows(predict, features)
+
+    scored = [i for i in range(len(rows)) if i not in errors]
+    preds = [outputs[i][0] for i in scored]
+    domains = [str(pred) for pred in preds]
+    domain_fit_encoder = registry.try_get("domain_fit_encoder")
+    if domain_fit_encoder and preds:
+        try:
+            domains = list(domain_fit_encoder.inverse_transform(preds))
+        except Exception:
+            pass # keep raw if transform fails
+
+    results = [None] * len(rows)
+    for i, domain in zip(scored, domains):
+        results[i] = {"label": str(domain), "confidence": float(outputs[i][1])}
+    return results, errors
+
+def _score_skill_matches(rows: List[SkillMatchInput]):
+    adapter = _adapter("skill_match")
+    features = np.array([[getattr(row, col) for col in SKILL_MATCH_FEATURES] for row in rows], dtype=float)
+    outputs, errors = predict_rows(lambda X: adapter.predict(X)[0], features)
+    return [
+        None if out is None else {"match": int(out), "match_label": "Matched" if out == 1 else "Not Matched"}
+        for out in outputs
+    ], errors
+
+
+# model name -> (input schema, scorer)
+MODELS = {
+    "placement": (Student, _score_placements),
+    "job_role": (JobRoleInput, _score_job_roles),
+    "salary": (SalaryInput, _score_salaries),
+    "domain_fit": (DomainFitInput, _score_domain_fits),
+    "skill_match": (SkillMatchInput, _score_skill_matches),
+}
+
+
+# --- Memoization ---
+# Registry models an output depends on (default: the model of the same name)
+MODEL_DEPENDENCIES = {
+    "domain_fit": ("domain_fit", "domain_fit_encoder"),
+}
+
+prediction_cache = PredictionCache()
+
+def _dependencies(model):
+    return MODEL_DEPENDENCIES.get(model, (model,))
+
+def _on_model_change(name):
+    affected = [model for model in MODELS if name in _dependencies(model)]
+    if affected:
+        prediction_cache.invalidate(affected)
+
+registry.add_listener(_on_model_change)
+
+def _version_token(model):
+    """Versions of everything the model's output depends on; None when the model isn't usable"""
+    token = []
+    for i, name in enumerate(_dependencies(model)):
+        entry = registry.entry(name)
+        if i == 0 and entry.error is not None:
+            return None  # unavailable or a fallback (e.g. mock placement): don't memoize
+        token.append((entry.version, entry.signature))
+    return tuple(token)
+
+def _score_memoized(model, rows):
+    """Score only the rows not in the cache. Returns (outputs, errors, hits, misses)"""
+    scorer = MODELS[model][1]
+    token = _version_token(model) if prediction_cache.enabled else None
+    if token is None:
+        outputs, errors = scorer(rows)
+        return outputs, errors, 0, 0
+
+    keys = [canonical_row(row) for row in rows]
+    outputs = prediction_cache.get_many(model, token, keys)
+    missing = [i for i, out in enumerate(outputs) if out is None]
+    errors = {}
+    if missing:
+        scored, row_errors = scorer([rows[i] for i in missing])
+        fresh = []
+        for position, i in enumerate(missing):
+            if position in row_errors:
+                errors[i] = row_errors[position]
+            else:
+                outputs[i] = scored[position]
+                fresh.append(i)
+        prediction_cache.put_many(model, token, [keys[i] for i in fresh], [outputs[i] for i in fresh])
+    return outputs, errors, len(rows) - len(missing), len(missing)
+
+
+# --- Process pool ---
+_pool = None
+# Bumped by clear_prediction_cache(). Tasks carry it, and a pool process whose
+# memo is from an older generation drops it before scoring.
+_cache_generation = 0
+_seen_generation = 0
+
+def _init_pool_process(threads):
+    configure_runtime(threads)
+
+def _score_task(model, rows, generation=0):
+    """Runs in a pool process; ModelUnavailable is returned rather than raised so it pickles cleanly"""
+    global _seen_generation
+    if generation != _seen_generation:
+        prediction_cache.invalidate()
+        _seen_generation = generation
+    try:
+        return _score_memoized(model, rows)
+    except ModelUnavailable as e:
+        return ModelUnavailable(str(e))
+
+def get_pool():
+    """Process pool shared by all models (created on first use)"""
+    global _pool
+    if _pool is None and INFERENCE_PROCESSES > 0:
+        threads = default_threads(pool_size=INFERENCE_PROCESSES)
+        _pool = ProcessPoolExecutor(INFERENCE_PROCESSES, initializer=_init_pool_process, initargs=(threads,))
+        print(f"✅ Inference pool: {INFERENCE_PROCESSES} process(es) x {threads} thread(s)")
+    return _pool
+
+def _check_known(model):
+    if model not in MODELS:
+        raise KeyError(f"Unknown model '{model}'")
+
+def _scored(model, result):
+    """_score_task result -> (outputs, errors), counting memo hits in this process"""
+    if isinstance(result, ModelUnavailable):
+        raise result
+    outputs, errors, hits, misses = result
+    if hits or misses:
+        prediction_cache.record(model, hits, misses)
+    return outputs, errors
+
+def score(model, rows):
+    """
+    Score validated rows with `model`. Returns (outputs aligned with rows, {row position: error}).
+    Raises KeyError for unknown models and ModelUnavailable when the model can't be loaded.
+    """
+    _check_known(model)
+    pool = get_pool()
+    if pool:
+        result = pool.submit(_score_task, model, rows, _cache_generation).result()
+    else:
+        result = _score_task(model, rows, _cache_generation)
+    return _scored(model, result)
+
+async def score_async(model, rows):
+    """score() for async callers: awaits the pool, or scores in a worker thread without a pool"""
+    _check_known(model)
+    pool = get_pool()
+    if pool:
+        result = await asyncio.wrap_future(pool.submit(_score_task, model, rows, _cache_generation))
+    else:
+        result = await asyncio.get_running_loop().run_in_executor(None, _score_task, model, rows, _cache_generation)
+    return _scored(model, result)
+
+def clear_prediction_cache():
+    """
+    Drop every memoized prediction: here at once, and in each pool process
+    before it scores its next task (pool processes can't be addressed directly).
+    """
+    global _cache_generation, _seen_generation
+    _cache_generation += 1
+    _seen_generation = _cache_generation
+    return {"cleared": prediction_cache.invalidate(), "pool_processes": INFERENCE_PROCESSES,
+            "pool": "cleared before each process's next task" if INFERENCE_PROCESSES > 0 else None}
+
+
+class InferenceClient:
+    """
+    `score(model, rows)` / `await score_async(model, rows)` in this process
+    (url=None) or against a running inference service. Same return value and
+    exceptions either way.
+    """
+
+    def __init__(self, url=None, timeout=INFERENCE_HTTP_TIMEOUT):
+        self.url = url.rstrip('/') if url else None
+        self.timeout = timeout
+
+    def score(self, model, rows):
+        if not self.url:
+            return score(model, rows)
+        try:
+            response = requests.post(f"{self.url}/infer/{model}", json=self._payload(rows), timeout=self.timeout)
+        except requests.RequestException as e:
+            return self._unreachable(rows, e)
+        return self._results(model, rows, response)
+
+    def clear_cache(self):
+        """Clear the prediction memo where the predictions run (this process + pool, or the service)"""
+        if not self.url:
+            return clear_prediction_cache()
+        try:
+            response = requests.post(f"{self.url}/infer/cache/clear", timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            return {"cleared": 0, "error": f"Inference service cache not cleared: {e}"}
+        return {"service": self.url, **response.json()}
+
+    async def score_async(self, model, rows):
+        if not self.url:
+            return await score_async(model, rows)
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.post(f"{self.url}/infer/{model}", json=self._payload(rows))
+        except httpx.HTTPError as e:
+            return self._unreachable(rows, e)
+        return self._results(model, rows, response)
+
+    @staticmethod
+    def _payload(rows):
+        return {"items": [row.model_dump() for row in rows]}
+
+    @staticmethod
+    def _unreachable(rows, error):
+        return [None] * len(rows), {i: f"Inference service unreachable: {error}" for i in range(len(rows))}
+
+    @staticmethod
+    def _results(model, rows, response):
+        """(outputs, errors) from an /infer batch response (requests or httpx)"""
+        outputs, errors = [None] * len(rows), {}
+        if response.status_code == 503:
+            raise ModelUnavailable(response.json().get("detail", f"Model '{model}' is unavailable"))
+        if response.status_code == 404:
+            raise KeyError(f"Unknown model '{model}'")
+        if not 200 <= response.status_code < 300:
+            return outputs, {i: f"Inference service error {response.status_code}: {response.text}" for i in range(len(rows))}
+
+        for result in response.json()["results"]:
+            i = result.pop("index")
+            if result.pop("status") == "success":
+                outputs[i] = result
+            else:
+                errors[i] = result["message"]
+        return outputs, errors
+
+
+inference_client = InferenceClient(INFERENCE_SERVICE_URL)
+
+
+# --- HTTP API ---
+app = FastAPI(title="Inference Service", description="Tabular model predictions (single and batch)", version="1.0")
+
+def _check_model(model):
+    if model not in MODELS:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{model}' (available: {', '.join(MODELS)})")
+
+@app.get("/infer")
+async def list_models():
+    loaded = registry.stats()
+    return {
+        "models": {
+            name: {"input": list(schema.model_fields), "versions": loaded[name]["versions"], "loaded": loaded[name]["loaded"]}
+            for name, (schema, _) in MODELS.items()
+        },
+        "processes": INFERENCE_PROCESSES,
+        "max_batch_rows": MAX_BATCH_ROWS,
+    }
+
+@app.get("/infer/cache")
+async def cache_stats():
+    """Prediction memo hit rates"""
+    return prediction_cache.stats()
+
+@app.post("/infer/cache/clear")
+async def clear_cache():
+    return clear_prediction_cache()
+
+@app.post("/infer/{model}")
+def infer(model: str, payload: Dict[str, Any] = Body(...)):
+    """One input object, or {"items": [...]} for a batch"""
+    _check_model(model)
+    schema, _ = MODELS[model]
+    try:
+        if isinstance(payload.get("items"), list):
+            return run_batch(schema, payload["items"], lambda rows: score(model, rows))
+
+        _, rows, errors = validate_rows(schema, [payload])
+        if errors:
+            raise HTTPException(status_code=422, detail=errors[0])
+        outputs, errors = score(model, rows)
+        if errors:
+            raise HTTPException(status_code=500, detail=errors[0])
+        return {"model": model, **outputs[0]}
+    except ModelUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        # run_batch: too many items
+        raise HTTPException(status_code=413, detail=str(e))
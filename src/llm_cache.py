@@ -0,0 +1,170 @@
+"""
+LLM response cache for get_ai_response / get_ai_json
+Many prompts are fully determined by their inputs (company prep plans,
+roadmaps, interview questions for a role), so the same Gemini call is paid for
+again and again. Responses are cached under a hash of (call kind, prompt,
+temperature, model list, schema version) in two tiers:
+
+- an in-memory LRU (per process)
+- a sqlite file shared by all workers and kept across restarts
+
+Only successful responses are stored; quota errors and fallback data never
+are. Calls that must vary between requests (practice questions, application
+emails) pass cache=False. Sampled prompts (temperature 0.7 summaries, plans,
+ideas, chat replies) pass ttl=LLM_CACHE_SHORT_TTL so one sampled answer is not
+served for a week; the long default is for deterministic extraction prompts.
+
+    LLM_CACHE          1 to enable (default), 0 to disable
+    LLM_CACHE_SIZE     in-memory entries (default 512)
+    LLM_CACHE_PATH     sqlite file (default src/.cache/llm_cache.sqlite, "" for memory only)
+    LLM_CACHE_TTL      default time-to-live in seconds (default 7 days)
+    LLM_CACHE_SHORT_TTL  time-to-live for sampled prompts (default 1 hour)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+LLM_CACHE = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "512"))
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'llm_cache.sqlite'))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_SHORT_TTL = float(os.getenv("LLM_CACHE_SHORT_TTL", "3600"))
+
+
+def cache_key(kind, prompt, temperature, models, schema_version=None):
+    """Stable hash of everything that determines the response"""
+    payload = json.dumps([kind, prompt, float(temperature), list(models), schema_version], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, max_entries=LLM_CACHE_SIZE, path=LLM_CACHE_PATH, default_ttl=LLM_CACHE_TTL, enabled=LLM_CACHE):
+        self.max_entries = max_entries
+        self.path = path
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+        self._memory = OrderedDict()  # key -> (value, expires_at, latency)
+        self._lock = threading.Lock()
+        self._local = threading.local()  # sqlite connections are per thread
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stores": 0,
+                       "saved_seconds": 0.0}
+        if self.enabled and self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._db().execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, latency REAL NOT NULL)")
+            except sqlite3.Error as e:
+                print(f"⚠️ LLM cache disk tier disabled ({e})")
+                self.path = None
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def _remember(self, key, value, expires_at, latency):
+        # Caller holds the lock
+        self._memory[key] = (value, expires_at, latency)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Cached response or None; counts a hit (with the latency it saved) or a miss"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                self._stats["saved_seconds"] += entry[2]
+                return json.loads(entry[0])
+            self._memory.pop(key, None)
+
+        row = None
+        if self.path:
+            try:
+                row = self._db().execute(
+                    "SELECT value, expires_at, latency FROM responses WHERE key = ? AND expires_at > ?",
+                    (key, now)).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ LLM cache read failed: {e}")
+        with self._lock:
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._remember(key, *row)
+            self._stats["disk_hits"] += 1
+            self._stats["saved_seconds"] += row[2]
+        return json.loads(row[0])
+
+    def put(self, key, value, latency, ttl=None):
+        """Store a successful response; latency is what a later hit saves"""
+        if not self.enabled:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        encoded = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, encoded, expires_at, latency)
+            self._stats["stores"] += 1
+        if self.path:
+            try:
+                self._db().execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                                   (key, encoded, expires_at, latency))
+            except sqlite3.Error as e:
+                print(f"⚠️ LLM cache write failed: {e}")
+
+    def bypass(self):
+        """Count a call that skipped the cache on purpose"""
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self, expired_only=False):
+        """Drop entries (only expired ones if expired_only); returns the number removed from disk"""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, entry in self._memory.items() if not expired_only or entry[1] <= now]:
+                del self._memory[key]
+        if not self.path:
+            return 0
+        try:
+            if expired_only:
+                return self._db().execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+            return self._db().execute("DELETE FROM responses").rowcount
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM cache clear failed: {e}")
+            return 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["saved_seconds"] = round(stats["saved_seconds"], 3)
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else None
+        stats["disk_entries"] = None
+        if self.path:
+            try:
+                stats["disk_entries"] = self._db().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        return dict(stats, enabled=self.enabled, path=self.path, max_entries=self.max_entries,
+                    default_ttl=self.default_ttl)
+
+
+llm_cache = LLMCache()
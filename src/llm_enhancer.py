@@ -1,18 +1,16 @@
-from llm_utils import get_ai_response
+from llm_cache import LLM_CACHE_SHORT_TTL
+from llm_utils import get_ai_response, get_ai_response_async, stream_ai_response
+from prompt_compactor import compact
 
-def enhance_resume_section(resume_text, jd_text, missing_skills):
-    """
-    Generates AI-powered suggestions for resume enhancement using Google Gemini.
-    """
-    
-    prompt = f"""
+def _enhance_prompt(resume_text, jd_text, missing_skills):
+    return f"""
     You are an expert ATS-friendly Resume Writer.
     
     Candidate Resume Segment:
-    "{resume_text[:2000]}..."
+    "{compact(resume_text, "enhance_resume", query=f"{jd_text} {' '.join(missing_skills)}")}"
     
     Target Job Description:
-    "{jd_text[:2000]}..."
+    "{compact(jd_text, "enhance_resume_jd", query=' '.join(missing_skills))}"
     
     Missing Skills Identified: {', '.join(missing_skills)}
     
@@ -35,15 +33,35 @@ def enhance_resume_section(resume_text, jd_text, missing_skills):
     **3. Strategic Addition**
     [Suggest a new project or certification to bridge the gap]
     """
-    
+
+def enhance_resume_section(resume_text, jd_text, missing_skills):
+    """
+    Generates AI-powered suggestions for resume enhancement using Google Gemini.
+    """
     try:
-        response = get_ai_response(prompt)
+        response = get_ai_response(_enhance_prompt(resume_text, jd_text, missing_skills), ttl=LLM_CACHE_SHORT_TTL)
         if "Error" in response:
             return fallback_enhancer(resume_text, jd_text, missing_skills)
         return response
     except Exception as e:
         return fallback_enhancer(resume_text, jd_text, missing_skills)
 
+async def enhance_resume_section_async(resume_text, jd_text, missing_skills):
+    try:
+        response = await get_ai_response_async(_enhance_prompt(resume_text, jd_text, missing_skills),
+                                                 ttl=LLM_CACHE_SHORT_TTL)
+        if "Error" in response:
+            return fallback_enhancer(resume_text, jd_text, missing_skills)
+        return response
+    except Exception as e:
+        return fallback_enhancer(resume_text, jd_text, missing_skills)
+
+def stream_enhance_resume_section(resume_text, jd_text, missing_skills):
+    """Suggestions as text chunks while they are generated (static tips if the AI is unavailable)"""
+    return stream_ai_response(_enhance_prompt(resume_text, jd_text, missing_skills),
+                              fallback_text=fallback_enhancer(resume_text, jd_text, missing_skills),
+                              ttl=LLM_CACHE_SHORT_TTL)
+
 def fallback_enhancer(resume_text, jd_text, missing_skills):
     # Original logic as fallback
     suggestions = []
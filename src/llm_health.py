@@ -0,0 +1,136 @@
+"""
+Health table for Gemini API key / model pairs
+Every call records its outcome per (key, model). A failure (429 or any other
+error) opens that pair's circuit breaker for a cooldown that doubles with each
+consecutive failure; while open, the pair is skipped instead of being hit
+again. When the cooldown runs out one request is let through as a trial
+(half-open): success closes the breaker, failure reopens it for longer.
+Healthy pairs are tried fastest first (moving average of recent latency),
+untried pairs before measured ones so every pair gets measured.
+
+The table is per process; each worker learns it on its own.
+
+    LLM_BREAKER_COOLDOWN       first cooldown in seconds (default 30)
+    LLM_BREAKER_MAX_COOLDOWN   cap for the doubling cooldown (default 600)
+"""
+import os
+import random
+import threading
+import time
+
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+LLM_BREAKER_MAX_COOLDOWN = float(os.getenv("LLM_BREAKER_MAX_COOLDOWN", "600"))
+LATENCY_SMOOTHING = 0.3  # weight of the newest sample in the latency average
+TRIAL_TIMEOUT = 60  # a half-open trial that never reported back frees the pair after this
+
+
+class PairHealth:
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.trial_started = None
+        self.latency = None  # seconds, moving average of successful calls
+        self.last_failure = None  # (time, message)
+
+    def state(self, now):
+        if self.open_until > now:
+            return "open"
+        return "half_open" if self.consecutive_failures else "closed"
+
+
+class LLMHealth:
+    def __init__(self, cooldown=LLM_BREAKER_COOLDOWN, max_cooldown=LLM_BREAKER_MAX_COOLDOWN, clock=time.time):
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self._pairs = {}  # (api key, model) -> PairHealth
+        self._lock = threading.Lock()
+
+    def _pair(self, key, model):
+        return self._pairs.setdefault((key, model), PairHealth())
+
+    def candidates(self, keys, models):
+        """(key, model) pairs worth trying now, best first (open breakers left out)"""
+        shuffled_keys = list(keys)
+        random.shuffle(shuffled_keys)  # spread equal pairs over the keys
+        now = self.clock()
+        ranked = []
+        with self._lock:
+            for priority, model in enumerate(models):
+                for key in shuffled_keys:
+                    health = self._pair(key, model)
+                    state = health.state(now)
+                    if state == "open":
+                        continue
+                    # Closed before half-open; unmeasured before fast before slow; then MODELS order
+                    latency = -1.0 if health.latency is None else health.latency
+                    ranked.append(((state == "half_open", latency, priority), (key, model)))
+        ranked.sort(key=lambda item: item[0])
+        return [pair for _, pair in ranked]
+
+    def begin(self, key, model):
+        """Whether the pair may be called now; claims the single trial of a half-open breaker"""
+        now = self.clock()
+        with self._lock:
+            health = self._pair(key, model)
+            state = health.state(now)
+            if state == "open":
+                return False
+            if state == "half_open":
+                if health.trial_started is not None and now - health.trial_started < TRIAL_TIMEOUT:
+                    return False
+                health.trial_started = now
+            return True
+
+    def record_success(self, key, model, seconds):
+        with self._lock:
+            health = self._pair(key, model)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.open_until = 0.0
+            health.trial_started = None
+            health.latency = seconds if health.latency is None else (
+                LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * health.latency)
+
+    def record_failure(self, key, model, error):
+        """Open the pair's breaker; returns the cooldown in seconds"""
+        now = self.clock()
+        with self._lock:
+            health = self._pair(key, model)
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.trial_started = None
+            cooldown = min(self.cooldown * 2 ** (health.consecutive_failures - 1), self.max_cooldown)
+            health.open_until = now + cooldown
+            health.last_failure = (now, str(error)[:200])
+        return cooldown
+
+    def reset(self):
+        with self._lock:
+            self._pairs.clear()
+
+    def stats(self):
+        """One row per pair (API keys masked)"""
+        now = self.clock()
+        with self._lock:
+            rows = []
+            for (key, model), health in self._pairs.items():
+                rows.append({
+                    "key": f"...{key[-4:]}",
+                    "model": model,
+                    "state": health.state(now),
+                    "latency_ms": None if health.latency is None else round(health.latency * 1000, 1),
+                    "successes": health.successes,
+                    "failures": health.failures,
+                    "consecutive_failures": health.consecutive_failures,
+                    "cooldown_remaining": round(max(0.0, health.open_until - now), 1),
+                    "last_failure_ago": None if health.last_failure is None else round(now - health.last_failure[0], 1),
+                    "last_error": None if health.last_failure is None else health.last_failure[1],
+                })
+        rows.sort(key=lambda row: (row["model"], row["key"]))
+        return {"cooldown": self.cooldown, "max_cooldown": self.max_cooldown, "pairs": rows}
+
+
+llm_health = LLMHealth()
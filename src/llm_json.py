@@ -0,0 +1,387 @@
+"""
+Tolerant JSON extraction for LLM output
+Gemini's "JSON" often comes wrapped in prose or code fences, or with small
+defects: single quotes, Python literals (True / None), trailing commas,
+comments, raw newlines inside strings, unquoted keys, or a cut-off end.
+Plain json.loads fails on all of them, which cost another Gemini round trip or
+the fallback data.
+
+JSONExtractor reads the first JSON value of a text chunk by chunk and repairs
+those defects on the way; partial() parses whatever has arrived so far.
+extract_json() runs it over a whole response and parse_llm_json() also
+validates the result against the call site's Pydantic schema (llm_schemas).
+TopLevelSections hands out each top-level "key": value pair of a streamed
+object as soon as it is complete.
+
+A response that was cut off is not a repair: extract_json flags it as
+truncated and parse_llm_json rejects it, so it is neither used nor cached.
+
+Outcomes per schema (clean, repaired, truncated, unparseable, invalid, and
+calls that ended on fallback data) are counted in json_stats, served at
+/api/admin/llm-json.
+"""
+import json
+import re
+import threading
+
+from pydantic import ValidationError
+
+_CLOSERS = {"{": "}", "[": "]"}
+_LITERALS = {"true": "true", "false": "false", "null": "null",
+             "True": "true", "False": "false", "None": "null", "NaN": "null", "undefined": "null"}
+_CONTROL = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_NUMBER = set("0123456789+-.eE")
+_START = re.compile(r"[{\[]")
+_FENCE = re.compile(r"```(json)?", re.I)
+MAX_STARTS = 10  # "{" / "[" positions tried before giving up on a response
+
+
+class JSONExtractor:
+    """
+    Incremental, tolerant reader of the first JSON value in a text. feed()
+    chunks as they arrive (text before the first "{" or "[" is skipped); once
+    `complete`, value() is the parsed value. `repaired` tells whether anything
+    had to be fixed.
+    """
+
+    def __init__(self, text=""):
+        self.out = []  # the value so far, as valid JSON text
+        self.stack = []
+        self.complete = False
+        self.repaired = False
+        self.members = []  # len(out) at each top-level "," (where a top-level member ended)
+        self.consumed = 0  # input characters read, up to the end of the value
+        self._checkpoints = []  # (len(out), stack) where the value so far is well-formed once closed
+        self._quote = None  # quote char of the string being read
+        self._escape = False
+        self._comment = None  # "//" or "/*"
+        self._star = False
+        self._slash = False
+        self._comma = False
+        self._word = None
+        self._number = False
+        if text:
+            self.feed(text)
+
+    def feed(self, text):
+        for char in text:
+            if self.complete:
+                break
+            self.consumed += 1
+            self._char(char)
+        return self.complete
+
+    def value(self):
+        """The parsed value; ValueError until the value is complete"""
+        if not self.complete:
+            raise ValueError("JSON value is incomplete")
+        return json.loads("".join(self.out))
+
+    def partial(self, unfinished=True):
+        """
+        What has arrived so far, with open strings and brackets closed and an
+        unfinished member dropped; None before anything parseable arrived.
+        unfinished=False also drops the value being written (a string or number
+        that may be cut short), keeping only completed members. Objects and
+        lists that were still open and have nothing in them yet are left out.
+        """
+        if self.complete:
+            return self.value()
+        attempts = [(len(self.out), self.stack, self._quote is not None)] if unfinished else []
+        attempts += [(size, stack, False) for size, stack in reversed(self._checkpoints)]
+        for size, stack, in_string in attempts:
+            text = "".join(self.out[:size]) + ('"' if in_string else "") + "".join(_CLOSERS[b] for b in reversed(stack))
+            try:
+                return _drop_empty_tail(json.loads(text), len(stack))
+            except ValueError:
+                continue
+        return None
+
+    def _emit(self, text):
+        self.out.append(text)
+
+    def _checkpoint(self):
+        self._checkpoints.append((len(self.out), tuple(self.stack)))
+
+    def _char(self, char):
+        if not self.stack:
+            if char in _CLOSERS:
+                self._open(char)
+            return
+        if self._quote:
+            self._string_char(char)
+            return
+        if self._comment:
+            self._comment_char(char)
+            return
+        if self._slash:
+            self._slash = False
+            if char in "/*":
+                self._comment, self.repaired = "/" + char, True
+                return
+            self._emit("/")
+        if self._word is not None:
+            if char.isalnum() or char in "_-":
+                self._word += char
+                return
+            self._flush_word()
+        if self._number and char not in _NUMBER:
+            self._number = False
+
+        if char.isspace():
+            if not self._comma:
+                self._emit(char)
+            return
+        if char == "/":
+            self._slash = True
+            return
+        if self._comma:
+            self._comma = False
+            if char in "}]":
+                self.repaired = True  # trailing comma
+            else:
+                self._checkpoint()
+                if len(self.stack) == 1:
+                    self.members.append(len(self.out))
+                self._emit(",")
+        if char == ",":
+            self._comma = True
+        elif char in "\"'":
+            self.repaired |= char == "'"
+            self._quote = char
+            self._emit('"')
+        elif char in _CLOSERS:
+            self._open(char)
+        elif char in "}]":
+            self._close(char)
+        elif char.isalpha() or char == "_":
+            if self._number:
+                self._emit(char)  # exponent, e.g. 1e5
+            else:
+                self._word = char
+        else:
+            self._number = self._number or char in "-0123456789"
+            self._emit(char)
+
+    def _open(self, char):
+        self.stack.append(char)
+        self._emit(char)
+        self._checkpoint()
+
+    def _close(self, char):
+        expected = _CLOSERS[self.stack[-1]]
+        if char != expected:
+            self.repaired = True
+        self.stack.pop()
+        self._emit(expected)
+        if self.stack:
+            self._checkpoint()
+        else:
+            self.complete = True
+
+    def _flush_word(self):
+        word, self._word = self._word, None
+        if word in ("true", "false", "null"):
+            self._emit(word)
+        else:
+            # Python literals, or an unquoted key / value
+            self._emit(_LITERALS.get(word) or json.dumps(word))
+            self.repaired = True
+
+    def _string_char(self, char):
+        if self._escape:
+            self._escape = False
+            if char in _VALID_ESCAPES:
+                self._emit("\\" + char)
+            else:
+                self._emit("'" if char == "'" else "\\\\" + char)
+                self.repaired = True
+        elif char == "\\":
+            self._escape = True
+        elif char == self._quote:
+            self._quote = None
+            self._emit('"')
+        elif char == '"':
+            self._emit('\\"')  # inside a single-quoted string
+        elif char < " ":
+            self._emit(_CONTROL.get(char) or f"\\u{ord(char):04x}")
+            self.repaired = True
+        else:
+            self._emit(char)
+
+    def _comment_char(self, char):
+        if self._comment == "//":
+            if char == "\n":
+                self._comment = None
+                self._emit(char)
+        elif self._star and char == "/":
+            self._comment = None
+        self._star = char == "*"
+
+
+def _drop_empty_tail(value, open_levels):
+    """
+    Removes the still-open containers that are empty. Open containers are
+    always the last member of their parent, so only that path is walked.
+    """
+    if open_levels < 2 or not isinstance(value, (dict, list)) or not value:
+        return value
+    key = next(reversed(value)) if isinstance(value, dict) else -1
+    if isinstance(value[key], (dict, list)) and not _drop_empty_tail(value[key], open_levels - 1):
+        del value[key]
+    return value
+
+
+def extract_json(text):
+    """
+    (value, repaired, truncated) for the first JSON value in text;
+    ValueError if there is none. When the text stops short the completed
+    members are returned with truncated=True (not counted as repaired), since
+    whatever was cut off is missing rather than fixed.
+    """
+    start = 0
+    for _ in range(MAX_STARTS):
+        match = _START.search(text, start)
+        if match is None:
+            break
+        extractor = JSONExtractor(text[match.start():])
+        # Prose around the value counts as a repair; a code fence doesn't
+        around = text[:match.start()] + text[match.start() + extractor.consumed:]
+        repaired = extractor.repaired or bool(_FENCE.sub("", around).strip())
+        try:
+            if extractor.complete:
+                return extractor.value(), repaired, False
+            value = extractor.partial(unfinished=False)
+            if value:
+                return value, repaired, True
+        except ValueError:
+            pass
+        start = match.start() + 1
+    raise ValueError("No JSON value in response")
+
+
+class JSONStats:
+    OUTCOMES = ("clean", "repaired", "truncated", "unparseable", "invalid")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+
+    def _entry(self, schema):
+        return self._schemas.setdefault(schema, dict.fromkeys(self.OUTCOMES + ("calls", "fallbacks"), 0))
+
+    def record(self, schema, outcome):
+        """One parsed Gemini response: clean, repaired, truncated, unparseable or invalid (schema mismatch)"""
+        with self._lock:
+            self._entry(schema)[outcome] += 1
+
+    def record_call(self, schema, fallback):
+        """One get_ai_json call, and whether it ended on fallback data"""
+        with self._lock:
+            entry = self._entry(schema)
+            entry["calls"] += 1
+            entry["fallbacks"] += bool(fallback)
+
+    def reset(self):
+        with self._lock:
+            self._schemas.clear()
+
+    def stats(self):
+        with self._lock:
+            schemas = {name: dict(entry) for name, entry in self._schemas.items()}
+        for entry in schemas.values():
+            responses = sum(entry[outcome] for outcome in self.OUTCOMES)
+            rejected = entry["truncated"] + entry["unparseable"] + entry["invalid"]
+            entry["retry_rate"] = round(rejected / responses, 4) if responses else None
+            entry["fallback_rate"] = round(entry["fallbacks"] / entry["calls"], 4) if entry["calls"] else None
+        return schemas
+
+
+json_stats = JSONStats()
+
+
+def schema_name(schema):
+    return schema.__name__ if schema is not None else "untyped"
+
+
+def parse_llm_json(text, schema=None):
+    """
+    The first JSON value in a Gemini response, repaired, validated against
+    schema (a Pydantic model) and dumped back to plain data. Raises ValueError
+    when there is no usable value or the response was cut off (a truncated
+    value may still validate, e.g. a plan missing its last weeks, and would
+    be cached), so the caller tries the next model.
+    """
+    name = schema_name(schema)
+    try:
+        data, repaired, truncated = extract_json(text)
+    except ValueError:
+        json_stats.record(name, "unparseable")
+        raise
+    if truncated:
+        json_stats.record(name, "truncated")
+        raise ValueError("Response was cut off before the JSON value ended")
+    if schema is not None:
+        try:
+            data = schema.model_validate(data).model_dump()
+        except ValidationError as e:
+            json_stats.record(name, "invalid")
+            raise ValueError(f"Response doesn't match {name}: {e.error_count()} error(s)") from e
+    json_stats.record(name, "repaired" if repaired else "clean")
+    return data
+
+
+class TopLevelSections:
+    """
+    Consumes a streamed response chunk by chunk and returns each top-level
+    "key": value pair of the first JSON object as soon as its value is
+    complete, so an endpoint can forward finished sections while the rest is
+    still being generated.
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self._json = JSONExtractor()
+        self._start = 1  # in the repaired text, after "{" or the last top-level ","
+        self._members = 0
+
+    @property
+    def done(self):
+        """The object's closing brace was seen"""
+        return self._json.complete
+
+    @property
+    def repaired(self):
+        return self._json.repaired
+
+    def partial(self):
+        return self._json.partial()
+
+    def feed(self, text):
+        """Add a chunk; returns the (key, value) pairs completed by it"""
+        if self.done:
+            return []
+        self._json.feed(text)
+        if self._json.out[:1] != ["{"]:
+            return []
+        ends = self._json.members[self._members:]
+        self._members += len(ends)
+        if self.done:
+            ends.append(len(self._json.out) - 1)
+        completed = []
+        for end in ends:
+            completed += self._close_section(end)
+        return completed
+
+    def _close_section(self, end):
+        piece = "".join(self._json.out[self._start:end]).strip()
+        self._start = end + 1
+        if not piece:
+            return []
+        try:
+            section = json.loads("{" + piece + "}")
+        except ValueError:
+            return []  # malformed section: left out, callers fill it from their fallback
+        self.sections.update(section)
+        return list(section.items())
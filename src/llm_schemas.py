@@ -0,0 +1,118 @@
+"""
+Shapes of the JSON Gemini returns, one schema per call site
+get_ai_json(..., schema=X) validates a response against X before accepting
+(and caching) it; a response that doesn't match is rejected like unparseable
+text and the next model is tried. Schemas require the fields the endpoint
+reads and allow extra ones, so a richer answer still passes. Endpoints get the
+validated value back as plain data (model_dump()).
+"""
+from typing import Any, Dict, List, Union
+
+from pydantic import BaseModel, ConfigDict, RootModel
+
+
+class LLMOutput(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class QuestionList(RootModel[List[Union[str, Dict[str, Any]]]]):
+    """/api/resume/questions, /api/resume/role-questions"""
+
+
+class ExperienceEntry(LLMOutput):
+    role: str = ""
+    company: str = ""
+    duration: str = ""
+    description: str = ""
+
+
+class ExperienceEntries(LLMOutput):
+    experience: List[ExperienceEntry]
+
+
+class EducationEntry(LLMOutput):
+    degree: str = ""
+    institution: str = ""
+    year: Union[str, int] = ""
+
+
+class EducationEntries(LLMOutput):
+    education: List[EducationEntry]
+
+
+class RoleRecommendation(LLMOutput):
+    role: str
+    probability: str = ""
+    reason: str = ""
+    target_companies: List[str] = []
+
+
+class ResumeRoleAnalysis(LLMOutput):
+    """/api/chat-analyze"""
+    summary: str = ""
+    recommendations: List[RoleRecommendation]
+
+
+class ResumeAnalysis(LLMOutput):
+    """/api/analyze-resume"""
+    score: int
+    matched_skills: List[str]
+    missing_skills: List[str]
+    advice: List[str] = []
+    jd_skills_detected: List[str] = []
+
+
+class MultipleChoiceQuestion(LLMOutput):
+    """/api/prep/aptitude, /api/prep/technical"""
+    q: str
+    options: List[str]
+    correct: str
+
+
+class CodingProblem(LLMOutput):
+    problem: str
+
+
+class InterviewQuestion(LLMOutput):
+    question: str
+
+
+class InterviewReport(LLMOutput):
+    """/api/prep/interview/analyze"""
+    status: str
+    score: int
+    feedback: List[str] = []
+    companies: List[str] = []
+    focus_areas: List[str] = []
+    graph_data: List[Dict[str, Any]] = []
+
+
+class ChatJobsReply(LLMOutput):
+    response: str
+    roles: List[Dict[str, Any]] = []
+    suggestions: List[str] = []
+
+
+class ResumeDetails(LLMOutput):
+    """/api/hr-emailer/analyze"""
+    name: str
+    skills: List[str]
+    summary: str = ""
+    suggested_roles: List[str] = []
+
+
+class ApplicationEmail(LLMOutput):
+    email_content: str
+
+
+class CompanyPrepPlan(LLMOutput):
+    insights: Dict[str, Any]
+    weeks: List[Dict[str, Any]]
+
+
+class CareerReport(LLMOutput):
+    """/api/report/analyze"""
+    readiness_score: int
+    status_label: str
+    score_breakdown: Dict[str, Any] = {}
+    final_summary: str = ""
@@ -0,0 +1,89 @@
+"""
+Single-flight for Gemini calls
+Identical prompts that arrive while the first one is still being generated (a
+cohort opening the same company's prep plan, a user clicking "generate"
+twice) wait for that call instead of sending their own, so N concurrent
+requests cost one upstream call. The flight key is the response cache key
+(see llm_cache), so calls that bypass the cache (cache=False, meant to vary)
+are never coalesced. Once a call finishes its result is in the cache, so later
+requests are served from there.
+
+The table is per process, like the cache's memory tier and the health table.
+"""
+import asyncio
+import copy
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call (sync callers)
+        self._tasks = {}  # key -> asyncio.Task (async callers)
+        self._stats = {"calls": 0, "coalesced": 0}
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def do(self, key, fn):
+        """fn(), or (a copy of) the result of the identical call already running in another thread"""
+        if key is None:
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._stats["calls" if leader else "coalesced"] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return copy.deepcopy(call.result)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, fn):
+        """
+        await fn(), or the result of the identical call already in flight. The
+        call runs as its own task, so a caller that gets cancelled (client
+        disconnected) doesn't cancel it for the others. Every caller gets its own
+        copy of the result, so one endpoint editing it can't affect another.
+        """
+        if key is None:
+            return await fn()
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self._count("calls")
+        else:
+            self._count("coalesced")
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, in_flight=len(self._calls) + len(self._tasks))
+        requests = stats["calls"] + stats["coalesced"]
+        stats["coalesced_rate"] = round(stats["coalesced"] / requests, 4) if requests else None
+        return stats
+
+
+llm_flights = SingleFlight()
@@ -16,9 +16,17 @@ if os.path.exists(backend_env_path):
 else:
     load_dotenv() # Fallback
 
-import random
+import asyncio
 import time
 
+from pydantic import ValidationError
+
+from llm_cache import LLM_CACHE_SHORT_TTL, cache_key, llm_cache
+from llm_health import llm_health
+from llm_json import TopLevelSections, json_stats, parse_llm_json, schema_name
+from llm_schemas import CareerReport, CompanyPrepPlan
+from llm_singleflight import llm_flights
+
 # ... imports remain ...
 
 # Load Keys
@@ -35,117 +43,321 @@ def configure_genai(api_key):
 # Models to try in order of priority (Synced with environment supported models)
 MODELS = ["gemini-3-flash-preview", "gemini-2.0-flash", "gemini-flash-latest", "gemini-2.5-flash"]
 
-def get_ai_response(prompt, temperature=0.7):
+JSON_INSTRUCTION = "\n\nIMPORTANT: Output ONLY valid JSON code. No markdown formatting."
+QUOTA_MESSAGE = "I'm currently receiving too many requests. Please try again later! ⏳"
+
+# Max Gemini requests in flight per process from the async helpers
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+_llm_slots = asyncio.Semaphore(LLM_CONCURRENCY)
+
+def _cached(kind, prompt, temperature, cache, schema_version=None):
+    """(cache key, cached response or None); key is None when the call bypasses the cache"""
+    if not cache:
+        llm_cache.bypass()
+        return None, None
+    key = cache_key(kind, prompt, temperature, MODELS, schema_version)
+    return key, llm_cache.get(key)
+
+def _candidates():
+    """(API key, model) pairs in the order they are tried: healthy and fastest first"""
+    return llm_health.candidates(API_KEYS, MODELS)
+
+def _is_quota_error(e):
+    error_msg = str(e).lower()
+    return "429" in error_msg or "quota" in error_msg
+
+def _failed(key, model_name, e, label):
+    cooldown = llm_health.record_failure(key, model_name, e)
+    if _is_quota_error(e):
+        print(f"⚠️ Quota hit{label} for key ...{key[-4:]} with model {model_name}. Skipping it for {cooldown:.0f}s")
+    else:
+        print(f"❌ Error{label} with model {model_name}: {e}. Skipping it for {cooldown:.0f}s")
+
+def _json_parser(schema):
+    """Response text -> validated data (see llm_json); ValueError moves on to the next model"""
+    return lambda text: parse_llm_json(text, schema)
+
+def _json_cache_version(schema, schema_version):
+    # Validated responses are cached apart from unvalidated ones for the same prompt
+    return schema_version or (schema.__name__ if schema is not None else None)
+
+def _generate(prompt, temperature, parse, label=""):
+    """
+    Tries the healthy key/model pairs (see llm_health) until a response parses.
+    A failing pair is not retried; its breaker opens and the next pair is tried.
+    Returns (parsed response, seconds taken) or None if all failed.
+    """
+    started = time.perf_counter()
+    for key, model_name in _candidates():
+        if not llm_health.begin(key, model_name):
+            continue
+        attempt_started = time.perf_counter()
+        try:
+            configure_genai(key)
+            model = genai.GenerativeModel(model_name)
+            response = model.generate_content(
+                prompt,
+                generation_config=genai.types.GenerationConfig(temperature=temperature)
+            )
+            text = response.text
+        except Exception as e:
+            _failed(key, model_name, e, label)
+            continue
+        llm_health.record_success(key, model_name, time.perf_counter() - attempt_started)
+        try:
+            return parse(text), time.perf_counter() - started
+        except ValueError as e:
+            print(f"❌ Unparseable response{label} from model {model_name}: {e}")
+    return None
+
+async def _generate_async(prompt, temperature, parse, label=""):
+    """_generate on the SDK's async API: waits on Gemini without blocking the event loop"""
+    started = time.perf_counter()
+    for key, model_name in _candidates():
+        async with _llm_slots:
+            if not llm_health.begin(key, model_name):
+                continue
+            attempt_started = time.perf_counter()
+            try:
+                # configure() is process-wide; the model binds its client at the start of
+                # generate_content_async, before this task can yield to another one
+                configure_genai(key)
+                model = genai.GenerativeModel(model_name)
+                response = await model.generate_content_async(
+                    prompt,
+                    generation_config=genai.types.GenerationConfig(temperature=temperature)
+                )
+                text = response.text
+            except Exception as e:
+                _failed(key, model_name, e, label)
+                continue
+        llm_health.record_success(key, model_name, time.perf_counter() - attempt_started)
+        try:
+            return parse(text), time.perf_counter() - started
+        except ValueError as e:
+            print(f"❌ Unparseable response{label} from model {model_name}: {e}")
+    return None
+
+async def _stream_async(prompt, temperature, label=""):
+    """
+    Streams text chunks from the first healthy key/model pair that answers,
+    then yields None once the response is complete. Pairs failing before any
+    output are skipped as in _generate_async; a failure mid-stream just ends
+    the stream (without the None), since output already sent can't be retried.
+    """
+    for key, model_name in _candidates():
+        async with _llm_slots:
+            if not llm_health.begin(key, model_name):
+                continue
+            attempt_started = time.perf_counter()
+            try:
+                configure_genai(key)
+                model = genai.GenerativeModel(model_name)
+                response = await model.generate_content_async(
+                    prompt,
+                    generation_config=genai.types.GenerationConfig(temperature=temperature),
+                    stream=True
+                )
+            except Exception as e:
+                _failed(key, model_name, e, label)
+                continue
+            try:
+                async for chunk in response:
+                    yield chunk.text
+            except Exception as e:
+                _failed(key, model_name, e, label)
+                return
+            llm_health.record_success(key, model_name, time.perf_counter() - attempt_started)
+        yield None
+        return
+
+def _store(cache_id, result, ttl):
+    """Caches a successful (response, seconds) result"""
+    if result is not None and cache_id is not None:
+        llm_cache.put(cache_id, result[0], result[1], ttl)
+    return result
+
+def _shared_generate(cache_id, ttl, prompt, temperature, parse, label=""):
+    """_generate, shared with identical calls in flight (see llm_singleflight)"""
+    return llm_flights.do(cache_id, lambda: _store(cache_id, _generate(prompt, temperature, parse, label), ttl))
+
+async def _shared_generate_async(cache_id, ttl, prompt, temperature, parse, label=""):
+    """_generate_async, shared with identical calls in flight (see llm_singleflight)"""
+    async def call():
+        return _store(cache_id, await _generate_async(prompt, temperature, parse, label), ttl)
+    return await llm_flights.do_async(cache_id, call)
+
+def _text_result(result):
+    if result is None:
+        return QUOTA_MESSAGE
+    return result[0]
+
+def _json_result(result, fallback_data, schema=None):
+    json_stats.record_call(schema_name(schema), fallback=result is None)
+    if result is not None:
+        return result[0]
+    if fallback_data:
+        print("⚠️ All API attempts failed. Returning Fallback Mock Data.")
+        return fallback_data
+    return {"error": "quota_exceeded"}
+
+def _no_keys_json(fallback_data):
+    if fallback_data:
+        print("⚠️ No API Keys. Returning Fallback Data.")
+        return fallback_data
+    return {}
+
+def get_ai_response(prompt, temperature=0.7, cache=True, ttl=None):
     """
     Generates text with API key rotation AND Model Fallback on 429.
-    Now includes exponential backoff for rate limits.
+    Successful responses are cached (see llm_cache) and concurrent identical
+    calls share one request (see llm_singleflight); pass cache=False for calls
+    that should vary between requests, ttl to override the default lifetime.
+    Blocks the calling thread: use get_ai_response_async inside async endpoints.
     """
+    cache_id, cached = _cached("text", prompt, temperature, cache)
+    if cached is not None:
+        return cached
     if not API_KEYS:
         return "Error: API Key missing."
+    return _text_result(_shared_generate(cache_id, ttl, prompt, temperature, str))
 
-    shuffled_keys = list(API_KEYS)
-    random.shuffle(shuffled_keys)
-
-    max_retries = 1 # Reduced for better latency
-    base_delay = 1 # Reduced for better latency
-
-    for key_index, key in enumerate(shuffled_keys):
-        configure_genai(key)
-        
-        # Try models for this key
-        for model_name in MODELS:
-            for attempt in range(max_retries + 1):
-                try:
-                    model = genai.GenerativeModel(model_name)
-                    # Set a timeout if possible (genai might not support it directly here, but we can set it in request_options if needed)
-                    response = model.generate_content(
-                        prompt,
-                        generation_config=genai.types.GenerationConfig(temperature=temperature)
-                    )
-                    return response.text
-                    
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    if "429" in error_msg or "quota" in error_msg:
-                        print(f"⚠️ Quota hit for key ...{key[-4:]} with model {model_name}. Attempt {attempt + 1}")
-                        if attempt < max_retries:
-                            # Short sleep only if we have more attempts on this key/model
-                            time.sleep(base_delay)
-                            continue
-                        else:
-                            # Move to next model for this key
-                            break 
-                    else:
-                        print(f"❌ Error with model {model_name}: {e}")
-                        break
-            # End of retry loop for this model
-        
-        # If we reach here, this key failed across all models or hit quotas
-        # We implicitly move to the next key in the shuffled_keys loop
-    
-    return "I'm currently receiving too many requests. Please try again later! ⏳"
+async def get_ai_response_async(prompt, temperature=0.7, cache=True, ttl=None):
+    """get_ai_response for async endpoints"""
+    cache_id, cached = _cached("text", prompt, temperature, cache)
+    if cached is not None:
+        return cached
+    if not API_KEYS:
+        return "Error: API Key missing."
+    return _text_result(await _shared_generate_async(cache_id, ttl, prompt, temperature, str))
 
-def get_ai_json(prompt, temperature=0.5, fallback_data=None):
+def get_ai_json(prompt, temperature=0.5, fallback_data=None, cache=True, ttl=None, schema_version=None, schema=None):
     """
     Generates JSON with API key rotation AND Model Fallback on 429.
-    Now includes exponential backoff and HARD FALLBACK (Mock Data).
+    The first JSON value in the response is used, with common defects repaired
+    (see llm_json); with schema (llm_schemas) it must also validate, otherwise
+    the next model is tried. Returns fallback_data (Mock Data) when every
+    attempt fails.
+    Parsed responses are cached like get_ai_response; bump schema_version when
+    the caller starts expecting a different JSON shape for the same prompt.
     """
+    cache_id, cached = _cached("json", prompt, temperature, cache, _json_cache_version(schema, schema_version))
+    if cached is not None:
+        return cached
     if not API_KEYS:
-        if fallback_data:
-            print("⚠️ No API Keys. Returning Fallback Data.")
-            return fallback_data
-        return {}
-
-    shuffled_keys = list(API_KEYS)
-    random.shuffle(shuffled_keys)
-
-    max_retries = 3
-    base_delay = 2 # seconds
-
-    max_retries = 1 # Reduced for better latency
-    base_delay = 1 # Reduced for better latency
-
-    for key_index, key in enumerate(shuffled_keys):
-        configure_genai(key)
-        
-        for model_name in MODELS:
-            for attempt in range(max_retries + 1):
-                try:
-                    model = genai.GenerativeModel(model_name)
-                    response = model.generate_content(
-                        f"{prompt}\n\nIMPORTANT: Output ONLY valid JSON code. No markdown formatting.",
-                        generation_config=genai.types.GenerationConfig(temperature=temperature)
-                    )
-                    
-                    text = response.text
-                    if text.startswith("```json"): text = text[7:]
-                    if text.endswith("```"): text = text[:-3]
-                    return json.loads(text.strip())
-                    
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    if "429" in error_msg or "quota" in error_msg:
-                        print(f"⚠️ Quota hit (JSON) for key ...{key[-4:]} with model {model_name}.")
-                        if attempt < max_retries:
-                            time.sleep(base_delay)
-                            continue
-                        else:
-                            break
-                    else:
-                        print(f"❌ JSON error with {model_name}: {e}")
-                        break
-            # End of retry loop for this model
-            
-    if fallback_data:
-        print("⚠️ All API attempts failed. Returning Fallback Mock Data.")
-        return fallback_data
+        return _no_keys_json(fallback_data)
+    result = _shared_generate(cache_id, ttl, prompt + JSON_INSTRUCTION, temperature, _json_parser(schema), " (JSON)")
+    return _json_result(result, fallback_data, schema)
 
-    return {"error": "quota_exceeded"}
+async def get_ai_json_async(prompt, temperature=0.5, fallback_data=None, cache=True, ttl=None, schema_version=None,
+                            schema=None):
+    """get_ai_json for async endpoints"""
+    cache_id, cached = _cached("json", prompt, temperature, cache, _json_cache_version(schema, schema_version))
+    if cached is not None:
+        return cached
+    if not API_KEYS:
+        return _no_keys_json(fallback_data)
+    result = await _shared_generate_async(cache_id, ttl, prompt + JSON_INSTRUCTION, temperature,
+                                          _json_parser(schema), " (JSON)")
+    return _json_result(result, fallback_data, schema)
 
-def generate_company_prep_plan(company_type: str, company_name: str, time_period: str = "4 Weeks"):
+async def stream_ai_response(prompt, temperature=0.7, fallback_text=None, cache=True, ttl=None):
+    """get_ai_response_async as text chunks, forwarded as Gemini generates them"""
+    cache_id, cached = _cached("text", prompt, temperature, cache)
+    if cached is not None:
+        yield cached
+        return
+    if not API_KEYS:
+        yield fallback_text or "Error: API Key missing."
+        return
+
+    started = time.perf_counter()
+    chunks, complete = [], False
+    async for chunk in _stream_async(prompt, temperature):
+        if chunk is None:
+            complete = True
+            break
+        chunks.append(chunk)
+        yield chunk
+    if not chunks:
+        yield fallback_text or QUOTA_MESSAGE
+    elif complete and cache_id is not None:
+        llm_cache.put(cache_id, "".join(chunks), time.perf_counter() - started, ttl)
+
+async def _stream_json(prompt, temperature, fallback_data, cache, ttl, schema_version, schema, partial):
     """
-    Generates a structured preparation plan for a specific company with historical insights.
+    Shared by stream_ai_json and stream_ai_json_partial. Yields ("section",
+    (key, value)) for each completed top-level field and, with partial,
+    ("partial", object so far) whenever a chunk changed it.
+    """
+    cache_id, cached = _cached("json", prompt, temperature, cache, _json_cache_version(schema, schema_version))
+    if isinstance(cached, dict):
+        for section in cached.items():
+            yield "section", section
+        if partial:
+            yield "partial", cached
+        return
+
+    started = time.perf_counter()
+    sections, complete, snapshot = TopLevelSections(), False, None
+    if API_KEYS:
+        async for chunk in _stream_async(prompt + JSON_INSTRUCTION, temperature, " (JSON)"):
+            if chunk is None:
+                complete = True
+                break
+            for section in sections.feed(chunk):
+                yield "section", section
+            if partial and (current := sections.partial()) and current != snapshot:
+                snapshot = current
+                yield "partial", snapshot
+
+    data, name = sections.sections, schema_name(schema)
+    rejected = set()
+    if complete and sections.done and schema is not None:
+        try:
+            schema.model_validate(data)
+        except ValidationError as e:
+            rejected = {str(error["loc"][0]) for error in e.errors() if error["loc"]}
+            json_stats.record(name, "invalid")
+    if complete and sections.done and not rejected:
+        json_stats.record(name, "repaired" if sections.repaired else "clean")
+        if cache_id is not None:
+            llm_cache.put(cache_id, data, time.perf_counter() - started, ttl)
+    elif complete and not sections.done:
+        json_stats.record(name, "unparseable")
+
+    missing = [key for key in (fallback_data or {}) if key not in data or key in rejected]
+    json_stats.record_call(name, fallback=bool(missing) or not data)
+    if missing:
+        print(f"⚠️ Streamed JSON incomplete. Filling {len(missing)} section(s) from Fallback Mock Data.")
+        for key in missing:
+            data[key] = fallback_data[key]
+            yield "section", (key, fallback_data[key])
+    if partial and data != snapshot:
+        yield "partial", data
+
+async def stream_ai_json(prompt, temperature=0.5, fallback_data=None, cache=True, ttl=None, schema_version=None,
+                         schema=None):
+    """
+    get_ai_json_async for JSON objects, yielding each top-level (key, value) as
+    soon as it is complete. Keys the response didn't deliver (every attempt
+    failed, or the stream broke off) or that don't validate against schema are
+    (re)sent from fallback_data at the end.
+    """
+    async for _, section in _stream_json(prompt, temperature, fallback_data, cache, ttl, schema_version, schema, False):
+        yield section
+
+async def stream_ai_json_partial(prompt, temperature=0.5, fallback_data=None, cache=True, ttl=None,
+                                 schema_version=None, schema=None):
+    """
+    stream_ai_json as snapshots of the whole object parsed so far (open strings
+    and lists included), ending with the complete object
     """
+    async for kind, value in _stream_json(prompt, temperature, fallback_data, cache, ttl, schema_version, schema, True):
+        if kind == "partial":
+            yield value
+def _company_prep_request(company_type: str, company_name: str, time_period: str):
+    """Prompt and mock fallback for a company preparation plan"""
     prompt = f"""
     Act as an experienced Placement Mentor.
     User is preparing for '{company_name}' ({company_type} based).
@@ -259,12 +471,32 @@ def generate_company_prep_plan(company_type: str, company_name: str, time_period
         ]
     }
     
-    return get_ai_json(prompt, temperature=0.7, fallback_data=mock_plan)
+    return prompt, mock_plan
 
-def generate_report_card_analysis(report_data: dict):
+def generate_company_prep_plan(company_type: str, company_name: str, time_period: str = "4 Weeks"):
     """
-    Generates a holistic analysis of the user's career preparation based on their interaction with the app's features.
+    Generates a structured preparation plan for a specific company with historical insights.
+    """
+    prompt, mock_plan = _company_prep_request(company_type, company_name, time_period)
+    return get_ai_json(prompt, temperature=0.7, fallback_data=mock_plan, ttl=LLM_CACHE_SHORT_TTL,
+                       schema=CompanyPrepPlan)
+
+async def generate_company_prep_plan_async(company_type: str, company_name: str, time_period: str = "4 Weeks"):
+    prompt, mock_plan = _company_prep_request(company_type, company_name, time_period)
+    return await get_ai_json_async(prompt, temperature=0.7, fallback_data=mock_plan, ttl=LLM_CACHE_SHORT_TTL,
+                                   schema=CompanyPrepPlan)
+
+def stream_company_prep_plan(company_type: str, company_name: str, time_period: str = "4 Weeks", partial=False):
+    """
+    The plan's top-level sections ("insights", "weeks") as they are generated,
+    or with partial, snapshots of the whole plan so far
     """
+    prompt, mock_plan = _company_prep_request(company_type, company_name, time_period)
+    stream = stream_ai_json_partial if partial else stream_ai_json
+    return stream(prompt, temperature=0.7, fallback_data=mock_plan, ttl=LLM_CACHE_SHORT_TTL, schema=CompanyPrepPlan)
+
+def _report_card_request(report_data: dict):
+    """Prompt and mock fallback for the career report analysis"""
     prompt = f"""
     Act as a Senior Career Data Scientist. Analyze this student's activity report from the 'Smart Career Advisor' app.
     
@@ -395,4 +627,23 @@ def generate_report_card_analysis(report_data: dict):
         "final_summary": "You are on a strong path with a solid foundation in Data analysis. closing the gap in Cloud and Deployment skills will significantly boost your profile for top-tier product companies."
     }
     
-    return get_ai_json(prompt, temperature=0.7, fallback_data=mock_report)
+    return prompt, mock_report
+
+def generate_report_card_analysis(report_data: dict):
+    """
+    Generates a holistic analysis of the user's career preparation based on their interaction with the app's features.
+    """
+    prompt, mock_report = _report_card_request(report_data)
+    return get_ai_json(prompt, temperature=0.7, fallback_data=mock_report, ttl=LLM_CACHE_SHORT_TTL,
+                       schema=CareerReport)
+
+async def generate_report_card_analysis_async(report_data: dict):
+    prompt, mock_report = _report_card_request(report_data)
+    return await get_ai_json_async(prompt, temperature=0.7, fallback_data=mock_report, ttl=LLM_CACHE_SHORT_TTL,
+                                   schema=CareerReport)
+
+def stream_report_card_analysis(report_data: dict, partial=False):
+    """The report's top-level sections as they are generated (or snapshots, as for the prep plan)"""
+    prompt, mock_report = _report_card_request(report_data)
+    stream = stream_ai_json_partial if partial else stream_ai_json
+    return stream(prompt, temperature=0.7, fallback_data=mock_report, ttl=LLM_CACHE_SHORT_TTL, schema=CareerReport)
@@ -0,0 +1,279 @@
+"""
+Central model registry
+Resolves model artifacts by name (and optional version), loads them lazily on
+first use, reloads them when the file changes and keeps load time / approximate
+memory per model so they can be inspected or unloaded at runtime.
+
+    from model_registry import registry
+    model = registry.get("salary")                 # latest version, loaded on first call
+    registry.get("fit_xgboost", "20250101_120000")  # a specific version
+    registry.register("salary", loader=my_loader)  # custom loader (path -> object)
+
+Names in ARTIFACTS are registered with joblib.load by default. A path may
+contain one '*': every match is a version (the matched part), and the latest
+is the most recently created file.
+"""
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import joblib
+
+SRC_DIR = Path(__file__).parent
+MODELS_DIR = SRC_DIR.parent / 'models'
+
+ARTIFACTS = {
+    "placement": SRC_DIR / 'xgboost_pipeline.pkl',
+    "label_encoder": SRC_DIR / 'label_encoder.pkl',
+    "job_role": SRC_DIR / 'job_role_model.pkl',
+    "salary": SRC_DIR / 'gradient_boosting_salary.pkl',
+    "domain_fit": SRC_DIR / 'domain_fit_model.pkl',
+    "domain_fit_encoder": SRC_DIR / 'domain_fit_encoder.pkl',
+    "skill_match": SRC_DIR / 'skill_recommender.pkl',
+    "fit_basic": SRC_DIR / 'fit_classifier.pkl',
+    "fit_xgboost": MODELS_DIR / 'ml_pipeline_xgboost_*.pkl',
+    "fit_student": MODELS_DIR / 'ml_pipeline_student_*.pkl',
+}
+
+HOT_RELOAD = os.getenv("MODEL_HOT_RELOAD", "1") == "1"
+# How often a loaded model's file is stat'ed for changes
+RELOAD_CHECK_SECONDS = float(os.getenv("MODEL_RELOAD_CHECK_SECONDS", "5"))
+# Measure Python/NumPy allocations while loading (tracemalloc roughly doubles load time);
+# native memory such as an XGBoost booster's is not counted, so treat memory_mb as a lower bound.
+# tracemalloc is process-wide: a lazy load in a serving worker would trace (and slow down) every
+# other thread and count their allocations too, so it is off by default and preload(track_memory=True)
+# measures only while nothing else runs (backend/serve.py, before forking).
+TRACK_MEMORY = os.getenv("MODEL_TRACK_MEMORY", "0") == "1"
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+class ModelEntry:
+    """A loaded model (or a failed load, kept so missing files are not retried on every call)"""
+
+    def __init__(self, name, version, path, signature, model=None, error=None, load_seconds=0.0, memory_bytes=None):
+        self.name = name
+        self.version = version
+        self.path = path
+        self.signature = signature
+        self.model = model
+        self.error = error
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+        self.memory_bytes = memory_bytes
+        self.last_used = self.loaded_at
+        self.calls = 0
+        self.next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+
+    def info(self):
+        return {
+            "version": self.version,
+            "path": str(self.path) if self.path else None,
+            "loaded": self.error is None,
+            "error": str(self.error) if self.error else None,
+            "type": type(self.model).__name__ if self.error is None else None,
+            "loaded_at": time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.loaded_at)),
+            "load_ms": round(self.load_seconds * 1000, 1),
+            "memory_mb": None if self.memory_bytes is None else round(self.memory_bytes / 1e6, 2),
+            # False: loaded without tracemalloc (see TRACK_MEMORY), not "no memory"
+            "memory_tracked": self.memory_bytes is not None,
+            "file_mb": round(self.signature[2] / 1e6, 2) if self.signature else None,
+            "calls": self.calls,
+            "idle_seconds": round(time.time() - self.last_used, 1),
+        }
+
+
+class ModelRegistry:
+    def __init__(self, artifacts=ARTIFACTS):
+        self._specs = {}    # name -> (path pattern, loader)
+        self._entries = {}  # (name, version or None for latest) -> ModelEntry
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+        for name, path in artifacts.items():
+            self.register(name, path)
+
+    def register(self, name, path=None, loader=None):
+        """Add or replace a model; path defaults to ARTIFACTS[name], loader to joblib.load"""
+        if path is None:
+            path = self._specs[name][0] if name in self._specs else ARTIFACTS[name]
+        with self._lock:
+            self._specs[name] = (Path(path), loader or joblib.load)
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+        self._notify(name)
+
+    def add_listener(self, callback):
+        """callback(name) runs whenever a model is reloaded, unloaded or re-registered"""
+        self._listeners.append(callback)
+
+    def _notify(self, name):
+        for callback in self._listeners:
+            callback(name)
+
+    def names(self):
+        return list(self._specs)
+
+    def versions(self, name):
+        """{version: path} for every artifact of `name` on disk"""
+        pattern = self._specs[name][0]
+        if '*' not in pattern.name:
+            return {"current": pattern} if pattern.exists() else {}
+        prefix, suffix = pattern.name.split('*', 1)
+        return {
+            path.name[len(prefix):len(path.name) - len(suffix)]: path
+            for path in sorted(pattern.parent.glob(pattern.name), key=os.path.getctime)
+        }
+
+    def resolve(self, name, version=None):
+        """(version, path) of an artifact; the latest one when version is None"""
+        versions = self.versions(name)
+        if not versions:
+            raise FileNotFoundError(f"No artifact for model '{name}' at {self._specs[name][0]}")
+        if version is None:
+            version = next(reversed(versions))
+        elif version not in versions:
+            raise FileNotFoundError(f"Model '{name}' has no version '{version}' (available: {', '.join(versions)})")
+        return version, versions[version]
+
+    def _load(self, name, version, track_memory=False):
+        loader = self._specs[name][1]
+        try:
+            resolved, path = self.resolve(name, version)
+            signature = _file_signature(path)
+        except FileNotFoundError as e:
+            return ModelEntry(name, version, None, None, error=e)
+
+        measure = (track_memory or TRACK_MEMORY) and not tracemalloc.is_tracing()
+        if measure:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            model = loader(path)
+            error = None
+        except Exception as e:
+            model, error = None, e
+        load_seconds = time.perf_counter() - start
+        memory = None
+        if measure:
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+        if error:
+            print(f"⚠️  Could not load model '{name}' from {path}: {error}")
+        else:
+            print(f"✅ Loaded model '{name}' ({resolved}) in {load_seconds * 1000:.0f}ms")
+        return ModelEntry(name, resolved, path, signature, model, error, load_seconds, memory)
+
+    def _stale(self, entry, requested_version):
+        """True when the file changed, appeared or (for latest) a newer version exists"""
+        try:
+            _, path = self.resolve(entry.name, requested_version)
+            return _file_signature(path) != entry.signature
+        except FileNotFoundError:
+            return entry.signature is not None
+
+    def entry(self, name, version=None, track_memory=False):
+        """
+        ModelEntry for a model, loading or reloading it first as get() does.
+        Load errors are left on entry.error instead of being raised.
+        """
+        if name not in self._specs:
+            raise KeyError(f"Unknown model '{name}'")
+        key = (name, version)
+        entry = self._entries.get(key)
+
+        if entry is None or (HOT_RELOAD and time.monotonic() >= entry.next_check):
+            lock = self._locks.setdefault(key, threading.Lock())
+            # The first load blocks; a reload runs in one thread while the others keep the current model
+            if lock.acquire(blocking=entry is None):
+                try:
+                    entry = self._entries.get(key)
+                    if entry is None or self._stale(entry, version):
+                        reloading = entry is not None
+                        if reloading:
+                            print(f"🔄 Model '{name}' changed on disk, reloading")
+                        entry = self._load(name, version, track_memory)
+                        # Swapping the whole entry keeps model, version and stats consistent for readers
+                        self._entries[key] = entry
+                        if reloading:
+                            self._notify(name)
+                    else:
+                        entry.next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+                finally:
+                    lock.release()
+            entry = self._entries.get(key, entry)
+
+        entry.last_used = time.time()
+        return entry
+
+    def get(self, name, version=None):
+        """Loaded model; raises KeyError for unknown names and the load error if loading failed"""
+        entry = self.entry(name, version)
+        if entry.error is not None:
+            raise entry.error
+        entry.calls += 1
+        return entry.model
+
+    def try_get(self, name, version=None, default=None):
+        """Like get, but returns `default` when the model can't be loaded"""
+        try:
+            return self.get(name, version)
+        except Exception:
+            return default
+
+    def preload(self, names=None, track_memory=False):
+        """
+        Load models eagerly (e.g. before forking workers); returns the names that
+        loaded. track_memory measures each load with tracemalloc, so only use it
+        while no other thread is running.
+        """
+        return [name for name in (names or self.names()) if self.entry(name, track_memory=track_memory).error is None]
+
+    def unload(self, name, version=None):
+        """Drop a loaded model; the next get() loads it again. Returns False if it wasn't loaded"""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == name and (version is None or self._entries[key].version == version)]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            self._notify(name)
+        return bool(keys)
+
+    def unload_idle(self, idle_seconds):
+        """
+        Unload every loaded (name, version) not used for idle_seconds; other
+        versions of the same model stay loaded. Returns the unloaded keys
+        (version None = latest).
+        """
+        cutoff = time.time() - idle_seconds
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if entry.error is None and entry.last_used < cutoff]
+            for key in idle:
+                del self._entries[key]
+        for name in dict.fromkeys(name for name, _ in idle):
+            self._notify(name)
+        return idle
+
+    def stats(self):
+        """Registered models with available versions and, when loaded, load time and memory"""
+        report = {}
+        for name, (pattern, _) in self._specs.items():
+            loaded = {
+                "latest" if key[1] is None else key[1]: entry.info()
+                for key, entry in list(self._entries.items()) if key[0] == name
+            }
+            report[name] = {
+                "artifact": str(pattern),
+                "versions": list(self.versions(name)),
+                "loaded": loaded,
+            }
+        return report
+
+
+registry = ModelRegistry()
@@ -0,0 +1,124 @@
+"""
+Precompiled encoder for the placement pipeline (xgboost_pipeline.pkl)
+Reads the fitted ColumnTransformer once at load time (ordinal / one-hot category
+mappings, numeric passthrough columns, output order) and then maps raw column
+values straight to a float32 matrix for the XGBoost booster, skipping the
+per-request DataFrame and sklearn transformer overhead.
+"""
+import numpy as np
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, OrdinalEncoder
+
+
+class PlacementEncoder:
+    """
+    Compiled from a fitted Pipeline(ColumnTransformer -> XGBClassifier).
+    Raises ValueError for transformer types it can't reproduce exactly, so the
+    caller can keep using the pipeline path instead.
+    """
+
+    def __init__(self, pipeline):
+        preprocessor = pipeline.steps[0][1]
+        model = pipeline.steps[-1][1]
+        if not hasattr(preprocessor, 'transformers_') or not hasattr(model, 'get_booster'):
+            raise ValueError("Expected a fitted ColumnTransformer -> XGBoost pipeline")
+
+        # One entry per block of output columns, in ColumnTransformer output order
+        self.blocks = []
+        for name, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str) and transformer == 'drop':
+                continue
+            if isinstance(transformer, str) and transformer == 'passthrough':
+                self.blocks += [('numeric', column, None) for column in columns]
+            elif isinstance(transformer, FunctionTransformer) and transformer.func is None:
+                self.blocks += [('numeric', column, None) for column in columns]
+            elif isinstance(transformer, OrdinalEncoder):
+                self.blocks += self._compile_ordinal(transformer, columns)
+            elif isinstance(transformer, OneHotEncoder):
+                self.blocks += self._compile_one_hot(transformer, columns)
+            else:
+                raise ValueError(f"Unsupported transformer '{name}': {type(transformer).__name__}")
+
+        self.columns = list(dict.fromkeys(column for _, column, _ in self.blocks))
+        self.n_features = sum(len(spec[0]) if kind == 'one_hot' else 1 for kind, _, spec in self.blocks)
+        if self.n_features != model.n_features_in_:
+            raise ValueError(f"Encoder produces {self.n_features} features, model expects {model.n_features_in_}")
+
+        self.model = model
+        self.booster = model.get_booster()
+        self.classes_ = model.classes_
+        # Same trees the sklearn wrapper predicts with (early-stopped models stop at best_iteration)
+        try:
+            self.iteration_range = (0, model.best_iteration + 1)
+        except AttributeError:
+            self.iteration_range = (0, 0)
+
+    @staticmethod
+    def _compile_ordinal(encoder, columns):
+        if getattr(encoder, '_infrequent_enabled', False):
+            raise ValueError("OrdinalEncoder with infrequent categories is not supported")
+        unknown = encoder.unknown_value if encoder.handle_unknown == 'use_encoded_value' else None
+        missing = getattr(encoder, 'encoded_missing_value', np.nan)
+        blocks = []
+        for column, categories in zip(columns, encoder.categories_):
+            mapping = {category: float(i) for i, category in enumerate(categories)}
+            blocks.append(('ordinal', column, (mapping, unknown, missing)))
+        return blocks
+
+    @staticmethod
+    def _compile_one_hot(encoder, columns):
+        if encoder.drop is not None or getattr(encoder, '_infrequent_enabled', False):
+            raise ValueError("OneHotEncoder with drop / infrequent categories is not supported")
+        ignore_unknown = encoder.handle_unknown != 'error'
+        return [
+            ('one_hot', column, ({category: i for i, category in enumerate(categories)}, ignore_unknown))
+            for column, categories in zip(columns, encoder.categories_)
+        ]
+
+    def encode(self, columns):
+        """
+        Encode a batch given as {pipeline column name: sequence of values}.
+        Returns a (n_rows, n_features) float32 matrix.
+        """
+        n_rows = len(columns[self.columns[0]])
+        X = np.empty((n_rows, self.n_features), dtype=np.float32)
+        position = 0
+        for kind, column, spec in self.blocks:
+            values = columns[column]
+            if kind == 'numeric':
+                X[:, position] = np.asarray(values, dtype=np.float32)
+                position += 1
+            elif kind == 'ordinal':
+                mapping, unknown, missing = spec
+                X[:, position] = [self._ordinal_value(v, mapping, unknown, missing, column) for v in values]
+                position += 1
+            else:
+                mapping, ignore_unknown = spec
+                X[:, position:position + len(mapping)] = 0.0
+                for row, value in enumerate(values):
+                    index = mapping.get(value)
+                    if index is not None:
+                        X[row, position + index] = 1.0
+                    elif not ignore_unknown:
+                        raise ValueError(f"Found unknown category {value!r} in column '{column}'")
+                position += len(mapping)
+        return X
+
+    @staticmethod
+    def _ordinal_value(value, mapping, unknown, missing, column):
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return missing
+        encoded = mapping.get(value)
+        if encoded is not None:
+            return encoded
+        if unknown is None:
+            raise ValueError(f"Found unknown category {value!r} in column '{column}'")
+        return unknown
+
+    def predict_proba(self, columns):
+        """Class probabilities for an encoded batch, straight from the booster"""
+        proba = self.booster.inplace_predict(
+            self.encode(columns), iteration_range=self.iteration_range, validate_features=False
+        )
+        if proba.ndim == 1:
+            proba = np.column_stack([1.0 - proba, proba])
+        return proba
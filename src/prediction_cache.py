@@ -0,0 +1,92 @@
+"""
+Prediction memoization for the deterministic tabular models
+Bounded LRU of model outputs keyed by (model, model version, canonical input).
+Students often resubmit the same form while tweaking one field, so repeated
+rows skip the model entirely. Entries of a model are dropped when the registry
+reloads or unloads it (the version in the key keeps stale outputs unreachable
+in any case).
+
+    PREDICTION_CACHE_SIZE   max cached rows across all models (0 disables)
+"""
+import os
+import threading
+from collections import OrderedDict
+
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+
+# Input fields that don't reach the model (tracking only)
+IGNORED_FIELDS = {"email"}
+
+
+def canonical_row(row):
+    """Hashable form of a validated input row (pydantic already coerced the types)"""
+    return tuple(value for field, value in row.model_dump().items() if field not in IGNORED_FIELDS)
+
+
+class PredictionCache:
+    def __init__(self, max_entries=PREDICTION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (model, version token, canonical row) -> output
+        self._lock = threading.Lock()
+        self._stats = {}  # model -> {"hits", "misses", "invalidations"}
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get_many(self, model, token, keys):
+        """Cached outputs aligned with keys (None where missing)"""
+        outputs = []
+        with self._lock:
+            for key in keys:
+                full_key = (model, token, key)
+                output = self._entries.get(full_key)
+                if output is not None:
+                    self._entries.move_to_end(full_key)
+                outputs.append(output)
+        return outputs
+
+    def put_many(self, model, token, keys, outputs):
+        with self._lock:
+            for key, output in zip(keys, outputs):
+                self._entries[(model, token, key)] = output
+                self._entries.move_to_end((model, token, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, models=None):
+        """Drop the entries of the given models (all models when None)"""
+        with self._lock:
+            stale = [key for key in self._entries if models is None or key[0] in models]
+            for key in stale:
+                del self._entries[key]
+            for model in (models or list(self._stats)):
+                self._model_stats(model)["invalidations"] += 1
+        return len(stale)
+
+    def _model_stats(self, model):
+        return self._stats.setdefault(model, {"hits": 0, "misses": 0, "invalidations": 0})
+
+    def record(self, model, hits, misses):
+        with self._lock:
+            stats = self._model_stats(model)
+            stats["hits"] += hits
+            stats["misses"] += misses
+
+    def stats(self):
+        """Hit rate per model and overall"""
+        with self._lock:
+            per_model = {model: dict(stats) for model, stats in self._stats.items()}
+            size = len(self._entries)
+        for stats in per_model.values():
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        hits = sum(stats["hits"] for stats in per_model.values())
+        lookups = hits + sum(stats["misses"] for stats in per_model.values())
+        return {
+            "enabled": self.enabled,
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "models": per_model,
+        }
@@ -1,15 +1,13 @@
-from llm_utils import get_ai_response
+from llm_cache import LLM_CACHE_SHORT_TTL
+from llm_utils import get_ai_response, get_ai_response_async
+from prompt_compactor import compact
 
-def generate_project_ideas(resume_text, resume_skills):
-    """
-    Generates AI-powered project ideas based on resume context using OpenAI.
-    """
-    
-    prompt = f"""
+def _project_ideas_prompt(resume_text, resume_skills):
+    return f"""
     You are a Senior Tech Career Mentor.
     
     Candidate Skills: {', '.join(resume_skills)}
-    Resume Excerpt: "{resume_text[:1000]}..."
+    Resume Excerpt: "{compact(resume_text, "project_ideas", query=' '.join(resume_skills))}"
     
     TASK: Suggest 3 impressive "Portfolio Projects" that would make this candidate stand out to recruiters.
     - Projects must use the candidate's existing skills but push them slightly (e.g., add Cloud or CI/CD).
@@ -26,9 +24,19 @@ def generate_project_ideas(resume_text, resume_skills):
     **2. [Project Name]**
     ...
     """
-    
+
+def generate_project_ideas(resume_text, resume_skills):
+    """
+    Generates AI-powered project ideas based on resume context using OpenAI.
+    """
+    try:
+        return get_ai_response(_project_ideas_prompt(resume_text, resume_skills), ttl=LLM_CACHE_SHORT_TTL)
+    except Exception:
+        return fallback_project_ideas(resume_skills)
+
+async def generate_project_ideas_async(resume_text, resume_skills):
     try:
-        return get_ai_response(prompt)
+        return await get_ai_response_async(_project_ideas_prompt(resume_text, resume_skills), ttl=LLM_CACHE_SHORT_TTL)
     except Exception:
         return fallback_project_ideas(resume_skills)
 
@@ -0,0 +1,212 @@
+"""
+Prompt compaction for resumes and job descriptions
+Prompts used to paste documents cut at a fixed length (resume_text[:2000],
+content[:4000], ...), which drops whatever comes last (often the skills
+section) while still sending boilerplate. compact() splits the document into
+sections and sentences, scores each sentence by skill density and by overlap
+with the query (the JD, the target role, ...), and packs the best ones into
+the endpoint's token budget, in document order under their section headings.
+Documents that already fit are sent unchanged.
+
+Tokens are estimated at 4 characters each (no tokenizer call). Tokens saved
+per endpoint are at /api/admin/prompt-compaction.
+"""
+import math
+import re
+import threading
+
+from skills import COMMON_SKILLS
+
+CHARS_PER_TOKEN = 4
+
+# Token budget per document slot; roughly the old character caps / 4, a bit tighter
+# since the packed text carries no boilerplate
+PROMPT_BUDGETS = {
+    "enhance_resume": 450,       # was resume_text[:2000]
+    "enhance_resume_jd": 400,    # was jd_text[:2000]
+    "project_ideas": 220,        # was resume_text[:1000]
+    "resume_questions_jd": 220,  # was jd_text[:1000]
+    "analyze_resume_jd": 340,    # was jd_text[:1500]
+    "chat_analyze": 650,         # was text[:3000]
+    "hr_emailer": 850,           # was content[:4000]
+}
+DEFAULT_BUDGET = 500
+
+# Section kind -> (heading keywords, weight)
+SECTIONS = {
+    "skills": (("skill", "technolog", "tech stack", "tools"), 1.5),
+    "experience": (("experience", "employment", "work history", "internship"), 1.3),
+    "projects": (("project",), 1.3),
+    "requirements": (("requirement", "responsibilit", "qualification", "must have", "nice to have",
+                      "what you", "you will", "role"), 1.3),
+    "summary": (("summary", "objective", "profile", "about me"), 1.1),
+    "achievements": (("achievement", "award", "honor", "accomplishment"), 1.1),
+    "certifications": (("certif", "course", "training"), 1.0),
+    "education": (("education", "academic", "qualification"), 0.9),
+    "company": (("about us", "about the company", "who we are", "benefits", "perks", "why join"), 0.3),
+    "interests": (("hobb", "interest", "extra", "activities"), 0.3),
+    "personal": (("personal", "contact", "details"), 0.3),
+    "references": (("reference",), 0.0),
+    "declaration": (("declaration",), 0.0),
+}
+
+_BOILERPLATE = re.compile(
+    r"references? (are )?available|hereby declare|above information is true|curriculum vitae|"
+    r"equal opportunity employer|page \d+ of \d+", re.I)
+_SKILL_PATTERN = re.compile(
+    r"(?<![a-z0-9+#])(" + "|".join(re.escape(s) for s in sorted({s.lower() for s in COMMON_SKILLS}, key=len, reverse=True))
+    + r")(?![a-z0-9+#])")
+_WORD = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9•])")
+_BULLET = re.compile(r"^\s*[•●▪◦\-*·|–]\s*")
+_INLINE_HEADING = re.compile(r"^([A-Za-z][A-Za-z &/]{2,30}):\s*(\S.*)$")
+_NUMBERS = re.compile(r"\d+\s*(%|x\b|\+|k\b|m\b|users|ms\b|hours|days)|\$\s?\d", re.I)
+_STOPWORDS = set("""
+a about above after all also an and any are as at be been being both but by can could did do does doing for from
+had has have having he her his how i if in into is it its just me more most my no not of on or our out over own same
+she should so some such than that the their them then there these they this those through to too under until up very
+was we were what when where which while who why will with would you your years year work team strong good
+""".split())
+MAX_WORDS = 40  # longer "sentences" (PDF text without punctuation) are cut into windows of this size
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _section_kind(heading):
+    heading = heading.lower()
+    for kind, (keywords, _) in SECTIONS.items():
+        if any(keyword in heading for keyword in keywords):
+            return kind
+    return None
+
+
+def _is_heading(line):
+    words = line.rstrip(':').split()
+    if not words or len(words) > 4 or len(line) > 40:
+        return False
+    return line.endswith(':') or line.isupper() or _section_kind(line) is not None and line.istitle()
+
+
+def _pieces(text):
+    """Sentence-sized pieces of a line, with run-on text cut into MAX_WORDS windows"""
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        for start in range(0, len(words), MAX_WORDS):
+            yield " ".join(words[start:start + MAX_WORDS])
+
+
+def split_sections(text):
+    """[(heading or None, section kind or None, [(line number, sentence), ...]), ...] in document order"""
+    sections = [(None, None, [])]
+    for number, raw in enumerate(text.splitlines()):
+        line = _BULLET.sub("", raw).strip()
+        if not line:
+            continue
+        if _is_heading(line):
+            sections.append((line, _section_kind(line), []))
+            continue
+        inline = _INLINE_HEADING.match(line)
+        if inline and _section_kind(inline.group(1)) is not None:
+            sections.append((None, _section_kind(inline.group(1)), []))
+        sections[-1][2].extend((number, piece) for piece in _pieces(line))
+    return [section for section in sections if section[2]]
+
+
+def _terms(text):
+    text = text.lower()
+    return ({w.strip(".") for w in _WORD.findall(text) if len(w) > 2 and w not in _STOPWORDS}
+            | set(_SKILL_PATTERN.findall(text)))
+
+
+def score_sentence(sentence, kind, query_terms):
+    """Skill density plus query overlap, weighted by the section the sentence is in"""
+    if _BOILERPLATE.search(sentence):
+        return 0.0
+    lowered = sentence.lower()
+    skills = set(_SKILL_PATTERN.findall(lowered))
+    overlap = len(_terms(lowered) & query_terms)
+    metrics = 0.5 if _NUMBERS.search(sentence) else 0.0
+    weight = SECTIONS[kind][1] if kind else 1.0
+    return weight * (0.2 + 2 * len(skills) + overlap + metrics) / math.sqrt(estimate_tokens(sentence))
+
+
+class CompactionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, original_tokens, sent_tokens):
+        with self._lock:
+            stats = self._endpoints.setdefault(
+                endpoint, {"calls": 0, "compacted": 0, "original_tokens": 0, "sent_tokens": 0})
+            stats["calls"] += 1
+            stats["compacted"] += sent_tokens < original_tokens
+            stats["original_tokens"] += original_tokens
+            stats["sent_tokens"] += sent_tokens
+
+    def stats(self):
+        with self._lock:
+            endpoints = {name: dict(stats, saved_tokens=stats["original_tokens"] - stats["sent_tokens"])
+                         for name, stats in self._endpoints.items()}
+        return {"endpoints": endpoints,
+                "saved_tokens": sum(stats["saved_tokens"] for stats in endpoints.values())}
+
+
+compaction_stats = CompactionStats()
+
+
+def pack(text, budget, query=""):
+    """The highest-scoring sentences of text that fit in budget tokens, in document order"""
+    sections = split_sections(text)
+    query_terms = _terms(query)
+    candidates = []
+    for index, (heading, kind, sentences) in enumerate(sections):
+        for number, sentence in sentences:
+            candidates.append((score_sentence(sentence, kind, query_terms), index, number, sentence))
+    # The first line usually carries name and title, which several prompts ask for
+    first = min(candidates, key=lambda c: c[2]) if candidates else None
+
+    chosen, used, headed = set(), 0, set()
+    for candidate in sorted(candidates, key=lambda c: (c is not first, -c[0])):
+        score, index, _, sentence = candidate
+        if score <= 0 and candidate is not first:
+            break
+        heading = sections[index][0]
+        cost = estimate_tokens(sentence) + 1
+        if heading and index not in headed:
+            cost += estimate_tokens(heading) + 1
+        if used + cost > budget:
+            continue
+        chosen.add(candidate)
+        used += cost
+        if heading:
+            headed.add(index)
+
+    lines, last = [], None
+    for candidate in sorted(chosen, key=lambda c: (c[1], c[2])):
+        _, index, number, sentence = candidate
+        if index in headed:
+            lines.append(sections[index][0])
+            headed.discard(index)
+        if number == last:
+            lines[-1] += " " + sentence
+        else:
+            lines.append(sentence)
+        last = number
+    return "\n".join(lines)
+
+
+def compact(text, endpoint, query="", budget=None):
+    """
+    text packed into the endpoint's token budget (PROMPT_BUDGETS), favouring
+    sentences with skills and terms from query; unchanged when it already fits.
+    """
+    text = (text or "").strip()
+    budget = budget or PROMPT_BUDGETS.get(endpoint, DEFAULT_BUDGET)
+    original_tokens = estimate_tokens(text)
+    if original_tokens > budget:
+        text = pack(text, budget, query)
+    compaction_stats.record(endpoint, original_tokens, estimate_tokens(text))
+    return text
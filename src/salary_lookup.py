@@ -0,0 +1,158 @@
+"""
+Precomputed lookup table for the salary model
+Every model input is a small bounded integer in practice (age, encoded gender /
+education / job title, years of experience), so the whole domain is evaluated
+once into a memory-mapped .npy file and a request becomes an O(1) index lookup.
+Rows outside the grid (fractional or out-of-range values) go to the model.
+The table is rebuilt when the model file's mtime or size changes.
+
+Build ahead of time (otherwise it is built on first use):
+    python src/salary_lookup.py
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+# (min, max) per model input, in feature order: age, gender, education, job_title, experience.
+# Codes follow gender_map / education_map / job_map_salary in backend/main.py (0 = unknown).
+SALARY_GRID = [(18, 70), (0, 1), (0, 3), (0, 5), (0, 50)]
+
+DEFAULT_MODEL_PATH = Path(__file__).parent / 'gradient_boosting_salary.pkl'
+CACHE_DIR = Path(os.getenv("SALARY_LOOKUP_DIR", Path(__file__).parent / '.cache'))
+CHECK_INTERVAL = float(os.getenv("SALARY_LOOKUP_CHECK_SECONDS", "5"))
+BUILD_CHUNK = 65536
+
+
+class SalaryLookup:
+    """
+    Drop-in `predict(X)` for the salary model backed by a precomputed grid.
+    `load_model(path)` returns the model used to build the table and for
+    out-of-grid rows (e.g. joblib.load, or a compiled version of it).
+    auto_reload=False leaves reloading to the caller (e.g. the model registry).
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, load_model=joblib.load, grid=SALARY_GRID, cache_dir=CACHE_DIR,
+                 auto_reload=True):
+        self.model_path = Path(model_path)
+        self.load_model = load_model
+        self.auto_reload = auto_reload
+        self.low = np.array([lo for lo, _ in grid], dtype=np.int64)
+        self.high = np.array([hi for _, hi in grid], dtype=np.int64)
+        self.shape = tuple(int(n) for n in self.high - self.low + 1)
+        self.cache_dir = Path(cache_dir)
+
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._signature = None
+        self.model = None
+        self.table = None
+        self.lookups = 0
+        self.fallbacks = 0
+        self._refresh()
+
+    @property
+    def n_features_in_(self):
+        return len(self.shape)
+
+    def _file_signature(self):
+        stat = self.model_path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _table_path(self, signature):
+        key = f"{self.model_path.resolve()}|{signature}|{self.low.tolist()}|{self.high.tolist()}"
+        return self.cache_dir / f"salary_grid_{hashlib.sha1(key.encode()).hexdigest()[:16]}.npy"
+
+    def grid_rows(self, start, stop):
+        """Model inputs for flat grid cells [start, stop)"""
+        index = np.unravel_index(np.arange(start, stop), self.shape)
+        return np.column_stack(index).astype(np.float64) + self.low
+
+    def _build(self, model, table_path):
+        """Evaluate the model over the whole grid into table_path (atomic replace)"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = table_path.with_name(table_path.stem + f'.{os.getpid()}.tmp.npy')
+        size = int(np.prod(self.shape))
+        table = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float64, shape=(size,))
+        for start in range(0, size, BUILD_CHUNK):
+            stop = min(start + BUILD_CHUNK, size)
+            table[start:stop] = model.predict(self.grid_rows(start, stop))
+        table.flush()
+        del table
+        os.replace(tmp_path, table_path)
+
+        # Tables of older model versions are no longer needed
+        for stale in self.cache_dir.glob('salary_grid_*.npy'):
+            if stale != table_path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    def _refresh(self):
+        """(Re)load model + table if the model file changed since the last check"""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        model = self.load_model(self.model_path)
+        table_path = self._table_path(signature)
+        if not table_path.exists():
+            start = time.perf_counter()
+            self._build(model, table_path)
+            print(f"✅ Built salary lookup table ({int(np.prod(self.shape)):,} cells) in {time.perf_counter() - start:.1f}s")
+        # Swap together so a reader never pairs the new table with the old model
+        self.model, self.table = model, np.load(table_path, mmap_mode='r')
+        self._signature = signature
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        # Only one thread rebuilds; the others keep serving the current table
+        if self._lock.acquire(blocking=False):
+            try:
+                self._next_check = now + CHECK_INTERVAL
+                self._refresh()
+            except Exception as e:
+                print(f"⚠️  Salary lookup refresh failed, keeping the current table: {e}")
+            finally:
+                self._lock.release()
+
+    def predict(self, X):
+        if self.auto_reload:
+            self._maybe_refresh()
+        model, table = self.model, self.table
+
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        cells = np.rint(X).astype(np.int64)
+        in_grid = ((cells == X) & (cells >= self.low) & (cells <= self.high)).all(axis=1)
+
+        out = np.empty(len(X), dtype=np.float64)
+        if in_grid.any():
+            flat = np.ravel_multi_index((cells[in_grid] - self.low).T, self.shape)
+            out[in_grid] = table[flat]
+        if not in_grid.all():
+            out[~in_grid] = model.predict(X[~in_grid])
+
+        self.lookups += int(in_grid.sum())
+        self.fallbacks += int((~in_grid).sum())
+        return out
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the salary lookup table")
+    parser.add_argument('--model', default=str(DEFAULT_MODEL_PATH))
+    args = parser.parse_args()
+
+    lookup = SalaryLookup(args.model)
+    print(f"💾 Table: {lookup._table_path(lookup._signature)}")
+    print(f"📊 Grid: {' x '.join(str(n) for n in lookup.shape)} = {lookup.table.size:,} cells "
+          f"({lookup.table.nbytes / 1e6:.1f} MB)")
@@ -0,0 +1,222 @@
+"""
+Tree-ensemble compiler for small tabular models
+Flattens fitted sklearn tree ensembles into NumPy arrays (feature, threshold,
+children, leaf value) and predicts with a vectorized traversal over all
+(row, tree) pairs at once. This skips sklearn's per-call validation and
+dispatch, which dominates single-row latency for the small models used here.
+
+Arithmetic mirrors sklearn (float32 inputs vs float64 thresholds, per-leaf
+normalisation, trees accumulated in order), so predictions are identical.
+"""
+import os
+
+import numpy as np
+from sklearn.ensemble import (
+    ExtraTreesClassifier, ExtraTreesRegressor, GradientBoostingRegressor,
+    RandomForestClassifier, RandomForestRegressor,
+)
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+
+COMPILE_TREE_MODELS = os.getenv("COMPILE_TREE_MODELS", "1") == "1"
+# Larger batches go to sklearn's Cython predict (faster for deep forests on many rows)
+COMPILED_MAX_ROWS = int(os.getenv("COMPILED_MAX_ROWS", "256"))
+# Finished (row, tree) cursors are dropped every few steps
+_COMPACT_EVERY = 4
+
+_FORESTS = (RandomForestClassifier, RandomForestRegressor, ExtraTreesClassifier, ExtraTreesRegressor)
+_SINGLE_TREES = (DecisionTreeClassifier, DecisionTreeRegressor)
+
+
+class CompiledEnsemble:
+    """
+    Flat representation of a fitted tree ensemble.
+    Leaves point to themselves, so cursors that reach a leaf stay put until
+    the periodic compaction drops them.
+    """
+
+    def __init__(self, trees, is_classifier, n_features, classes=None, learning_rate=None, init=None):
+        # Optional sklearn model used for batches above COMPILED_MAX_ROWS (set by try_compile)
+        self.fallback = None
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = offsets[:-1]
+        self.depth = max(tree.max_depth for tree in trees)
+        self.n_features_in_ = n_features
+        self.is_classifier = is_classifier
+        self.classes_ = classes
+        self.learning_rate = learning_rate
+        self.init = init
+
+        feature, threshold, left, right, go_left_missing, values = [], [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(leaf, nodes, tree.children_right) + offset)
+            # sklearn >= 1.3 trees may route missing values explicitly
+            missing = getattr(tree, 'missing_go_to_left', None)
+            go_left_missing.append(np.zeros(tree.node_count, bool) if missing is None else missing.astype(bool))
+            values.append(self._leaf_values(tree))
+
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold)
+        self.left = np.concatenate(left).astype(np.intp)
+        self.right = np.concatenate(right).astype(np.intp)
+        self.go_left_missing = np.concatenate(go_left_missing)
+        self.values = np.concatenate(values)
+        self.is_leaf = self.left == np.arange(len(self.left))
+
+    def _leaf_values(self, tree):
+        if not self.is_classifier:
+            return tree.value[:, 0, 0].astype(np.float64)
+        # Same normalisation as DecisionTreeClassifier.predict_proba
+        value = tree.value[:, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        return value / normalizer
+
+    def _validate(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the model is expecting {self.n_features_in_} features")
+        return X
+
+    def _use_fallback(self, X):
+        return self.fallback is not None and len(X) > COMPILED_MAX_ROWS
+
+    def apply(self, X):
+        """Leaf index (global) for every (row, tree) pair"""
+        X = self._validate(X)
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        flat_X = np.ascontiguousarray(X).ravel()
+        has_missing = np.isnan(flat_X).any()
+
+        # One cursor per (row, tree), flattened row-major
+        leaves = np.empty(n_rows * n_trees, dtype=np.intp)
+        cursor = np.arange(n_rows * n_trees)
+        node = np.tile(self.roots, n_rows)
+        row_base = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+
+        step = 0
+        while cursor.size:
+            x = flat_X[row_base + self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if has_missing:
+                go_left |= np.isnan(x) & self.go_left_missing[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+            step += 1
+            if step % _COMPACT_EVERY == 0 or step >= self.depth:
+                done = self.is_leaf[node]
+                leaves[cursor[done]] = node[done]
+                keep = ~done
+                cursor, node, row_base = cursor[keep], node[keep], row_base[keep]
+        return leaves.reshape(n_rows, n_trees)
+
+    def _accumulate(self, leaves):
+        # Tree-by-tree, in estimator order, like sklearn's accumulation
+        # (cumsum adds sequentially, unlike the pairwise summation of sum)
+        return np.cumsum(self.values[leaves], axis=1)[:, -1]
+
+    def predict_proba(self, X):
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        X = self._validate(X)
+        if self._use_fallback(X):
+            return self.fallback.predict_proba(X)
+        leaves = self.apply(X)
+        if leaves.shape[1] == 1:
+            return self.values[leaves[:, 0]].copy()
+        return self._accumulate(leaves) / leaves.shape[1]
+
+    def predict(self, X):
+        if self.is_classifier:
+            return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+        X = self._validate(X)
+        if self._use_fallback(X):
+            return self.fallback.predict(X)
+        leaves = self.apply(X)
+        if self.learning_rate is not None:
+            # Gradient boosting: init + sum of learning_rate * stage value, stage by stage
+            stages = self.learning_rate * self.values[leaves]
+            init = np.full((leaves.shape[0], 1), self.init, dtype=np.float64)
+            return np.cumsum(np.hstack([init, stages]), axis=1)[:, -1]
+        if leaves.shape[1] == 1:
+            return self.values[leaves[:, 0]].copy()
+        return self._accumulate(leaves) / leaves.shape[1]
+
+
+def compile_ensemble(model):
+    """Compile a fitted sklearn tree model; raises ValueError for unsupported models"""
+    if isinstance(model, _SINGLE_TREES):
+        estimators = [model]
+    elif isinstance(model, _FORESTS):
+        estimators = list(model.estimators_)
+    elif isinstance(model, GradientBoostingRegressor):
+        return _compile_gradient_boosting(model)
+    else:
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+    if getattr(model, 'n_outputs_', 1) != 1:
+        raise ValueError("Multi-output tree models are not supported")
+
+    is_classifier = hasattr(model, 'classes_')
+    return CompiledEnsemble(
+        [est.tree_ for est in estimators], is_classifier, model.n_features_in_,
+        classes=np.asarray(model.classes_) if is_classifier else None,
+    )
+
+
+def _compile_gradient_boosting(model):
+    if isinstance(model.init_, str) and model.init_ == 'zero':
+        init = 0.0
+    elif hasattr(model.init_, 'constant_'):
+        init = float(np.ravel(model.init_.constant_)[0])
+    else:
+        raise ValueError(f"Unsupported init estimator: {type(model.init_).__name__}")
+    return CompiledEnsemble(
+        [est.tree_ for est in model.estimators_[:, 0]], False, model.n_features_in_,
+        learning_rate=model.learning_rate, init=init,
+    )
+
+
+def _probe_rows(compiled, n_rows=256, seed=0):
+    """Inputs sitting on, just below and just above the split thresholds of every feature"""
+    rng = np.random.default_rng(seed)
+    split = compiled.left != np.arange(len(compiled.left))
+    X = np.zeros((n_rows, compiled.n_features_in_))
+    for f in range(compiled.n_features_in_):
+        thresholds = compiled.threshold[split & (compiled.feature == f)]
+        thresholds = thresholds[np.isfinite(thresholds)]  # missing-value-only splits use inf
+        if len(thresholds) == 0:
+            continue
+        base = rng.choice(thresholds, n_rows)
+        X[:, f] = base + rng.choice([-1.0, 0.0, 1.0], n_rows) * np.maximum(np.abs(base), 1.0) * 1e-3
+    return X
+
+
+def try_compile(model, name="model"):
+    """
+    Compiled model if supported and verified identical on probe inputs,
+    otherwise the original model (also when COMPILE_TREE_MODELS=0).
+    """
+    if not COMPILE_TREE_MODELS or model is None:
+        return model
+    try:
+        compiled = compile_ensemble(model)
+        X = _probe_rows(compiled)
+        same = np.array_equal(compiled.predict(X), model.predict(X))
+        if compiled.is_classifier:
+            same = same and np.array_equal(compiled.predict_proba(X), model.predict_proba(X))
+        if not same:
+            print(f"⚠️  Compiled {name} differs from sklearn, keeping the sklearn model")
+            return model
+        compiled.fallback = model
+        print(f"✅ Compiled {name}: {len(compiled.roots)} trees, {len(compiled.feature)} nodes")
+        return compiled
+    except Exception as e:
+        print(f"⚠️  {name} not compiled: {e}")
+        return model